@@ -0,0 +1,630 @@
+# backend/benchmarks/aws_standins.py
+# Local stand-ins for the AWS services the orchestrator calls
+# Owner: Manoj RS
+#
+# install() patches boto3.client / boto3.resource so that every client the
+# orchestrator (and its utils) creates is a local fake with configurable
+# per-call latency. boto3 itself must be importable (the orchestrator uses
+# boto3.dynamodb.conditions directly); no AWS credentials or network needed.
+#
+# Services covered: bedrock-runtime (converse / converse_stream), lambda
+# (invoke of the tool Lambdas), dynamodb (resource + Table), translate,
+# polly, s3, cloudwatch. Anything else gets a no-op client.
+#
+# Latency spec strings (milliseconds):
+#   "fixed:50"  "uniform:20:80"  "normal:120:30"  "lognormal:1800:0.35"  "0"
+# Keys are "<service>.<operation>" with "<service>" as a fallback, e.g.
+#   bedrock-runtime.converse=lognormal:1800:0.35  dynamodb=fixed:8
+
+import io
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+
+DEFAULT_LATENCY_MS = {
+    'bedrock-runtime.converse': 'lognormal:1800:0.35',
+    'bedrock-runtime.converse_stream': 'lognormal:1800:0.35',
+    # FOUNDATION_MODEL_LITE (model id containing 'lite')
+    'bedrock-runtime.converse.lite': 'lognormal:900:0.35',
+    'bedrock-runtime.converse_stream.lite': 'lognormal:900:0.35',
+    'lambda.invoke': 'lognormal:250:0.4',
+    'lambda.invoke.cold': 'uniform:600:1200',
+    'dynamodb.get_item': 'lognormal:8:0.3',
+    'dynamodb.query': 'lognormal:12:0.3',
+    'dynamodb.put_item': 'lognormal:10:0.3',
+    'dynamodb.update_item': 'lognormal:10:0.3',
+    'dynamodb.batch_write': 'lognormal:15:0.3',
+    'dynamodb.delete_item': 'lognormal:10:0.3',
+    'translate.translate_text': 'lognormal:150:0.35',
+    'polly.synthesize_speech': 'lognormal:450:0.3',
+    's3.put_object': 'lognormal:60:0.3',
+    's3.head_object': 'lognormal:20:0.3',
+    'cloudwatch': '0',
+}
+
+
+class LatencyModel:
+    """Samples per-call latency (seconds) from distribution specs."""
+
+    def __init__(self, overrides=None, scale=1.0, seed=None):
+        self.specs = dict(DEFAULT_LATENCY_MS)
+        self.specs.update(overrides or {})
+        self.scale = float(scale)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _spec_for(self, op):
+        # Most specific first: 'a.b.c' → 'a.b' → 'a'
+        while op:
+            if op in self.specs:
+                return self.specs[op]
+            op = op.rpartition('.')[0]
+        return '0'
+
+    def sample_ms(self, op):
+        spec = str(self._spec_for(op)).strip()
+        kind, _, args = spec.partition(':')
+        params = [float(a) for a in args.split(':') if a] if args else []
+        with self._lock:
+            rng = self._rng
+            if kind in ('0', '', 'none'):
+                value = 0.0
+            elif kind == 'fixed':
+                value = params[0]
+            elif kind == 'uniform':
+                value = rng.uniform(params[0], params[1])
+            elif kind == 'normal':
+                value = rng.gauss(params[0], params[1])
+            elif kind == 'lognormal':
+                value = params[0] * math.exp(rng.gauss(0.0, params[1]))
+            else:
+                value = float(kind)
+        return max(0.0, value) * self.scale
+
+    def sleep(self, op):
+        ms = self.sample_ms(op)
+        if ms:
+            time.sleep(ms / 1000.0)
+        return ms
+
+
+# ── Pseudo-translation ──
+# Indic targets get each Latin letter mapped into the target script so the
+# orchestrator's Latin-ratio quality checks pass; MKTK_* markdown tokens are
+# left untouched exactly like Amazon Translate does.
+
+_SCRIPT_BASE = {
+    'hi': 0x0915, 'mr': 0x0915, 'bn': 0x0995, 'as': 0x0995, 'pa': 0x0A15,
+    'gu': 0x0A95, 'or': 0x0B15, 'ta': 0x0B95, 'te': 0x0C15, 'kn': 0x0C95,
+    'ml': 0x0D15, 'ur': 0x0628,
+}
+_SCRIPT_RANGES = (
+    (0x0B80, 0x0BFF, 'ta'), (0x0C00, 0x0C7F, 'te'), (0x0C80, 0x0CFF, 'kn'),
+    (0x0D00, 0x0D7F, 'ml'), (0x0980, 0x09FF, 'bn'), (0x0A00, 0x0A7F, 'pa'),
+    (0x0A80, 0x0AFF, 'gu'), (0x0B00, 0x0B7F, 'or'), (0x0600, 0x06FF, 'ur'),
+    (0x0900, 0x097F, 'hi'),
+)
+_TOKEN_RE = re.compile(r'(MKTK_\w+)')
+
+
+def detect_script_language(text):
+    for ch in text or '':
+        cp = ord(ch)
+        for lo, hi, lang in _SCRIPT_RANGES:
+            if lo <= cp <= hi:
+                return lang
+    return 'en'
+
+
+def pseudo_translate(text, target):
+    base = _SCRIPT_BASE.get(target)
+    if base is None:
+        return text
+
+    def _map(segment):
+        out = []
+        for ch in segment:
+            if 'a' <= ch.lower() <= 'z':
+                out.append(chr(base + (ord(ch.lower()) - 97) % 20))
+            else:
+                out.append(ch)
+        return ''.join(out)
+
+    return ''.join(part if _TOKEN_RE.fullmatch(part) else _map(part) for part in _TOKEN_RE.split(text))
+
+
+# ── Fake clients ──
+
+class _FakeClient:
+    service = 'generic'
+
+    def __init__(self, latency, **_kwargs):
+        self.latency = latency
+        self.meta = type('Meta', (), {'region_name': _kwargs.get('region_name', 'ap-south-1')})()
+
+    def __getattr__(self, name):
+        # Unknown operations succeed with an empty response (no-op client).
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        def _noop(*_args, **_kwargs):
+            self.latency.sleep(f"{self.service}.{name}")
+            return {}
+        return _noop
+
+
+class FakeCloudWatch(_FakeClient):
+    service = 'cloudwatch'
+
+
+_TOOL_KEYWORDS = (
+    ('get_weather', ('weather', 'rain', 'forecast', 'temperature', 'monsoon', 'humidity')),
+    ('search_schemes', ('scheme', 'subsidy', 'yojana', 'loan', 'insurance', 'kisan')),
+    ('get_pest_alert', ('pest', 'disease', 'insect', 'yellow', 'spots', 'wilting', 'fungus')),
+    ('get_crop_advisory', ('crop', 'sow', 'fertilizer', 'soil', 'variety', 'irrigation', 'water', 'grow', 'msp', 'price')),
+)
+
+
+PROMPT_CACHE_TTL_SEC = 300
+
+
+class FakeBedrockRuntime(_FakeClient):
+    """Deterministic model: asks for keyword-matched tools once, then answers.
+
+    Emulates prompt caching: the request prefix up to the last cachePoint
+    (order tools → system) is written on first use and read while it was used
+    within the last PROMPT_CACHE_TTL_SEC seconds; reported as
+    cacheWriteInputTokens / cacheReadInputTokens.
+    Latency is not reduced for cache reads — compare token counts.
+    """
+    service = 'bedrock-runtime'
+
+    def __init__(self, latency, prompt_cache=None, **kwargs):
+        super().__init__(latency, **kwargs)
+        self.prompt_cache = prompt_cache if prompt_cache is not None else {}
+
+    @staticmethod
+    def _last_user_text(messages):
+        for msg in reversed(messages or []):
+            if msg.get('role') != 'user':
+                continue
+            texts = [b.get('text', '') for b in msg.get('content', []) if 'text' in b]
+            if texts:
+                return ' '.join(texts)
+        return ''
+
+    @staticmethod
+    def _has_tool_results(messages):
+        last = (messages or [{}])[-1]
+        return any('toolResult' in b for b in last.get('content', []))
+
+    def _plan(self, kwargs):
+        messages = kwargs.get('messages', [])
+        prompt = self._last_user_text(messages)
+        if prompt.startswith('Translate this agricultural advisory'):
+            target = re.search(r"language code '(\w+)'", prompt)
+            advisory = prompt.split('Advisory:\n', 1)[-1]
+            return 'end_turn', [{'text': pseudo_translate(advisory, target.group(1) if target else 'hi')}]
+
+        if kwargs.get('toolConfig') and not self._has_tool_results(messages):
+            lowered = prompt.lower()
+            tools = []
+            for tool_name, words in _TOOL_KEYWORDS:
+                if any(w in lowered for w in words):
+                    tools.append(tool_name)
+            if tools:
+                location = re.search(r'Location=([^,\]]+)', prompt)
+                loc = location.group(1).strip() if location else 'Coimbatore'
+                inputs = {
+                    'get_weather': {'location': loc},
+                    'search_schemes': {'query': 'farmer support schemes'},
+                    'get_pest_alert': {'query': prompt[-200:], 'crop': 'Rice'},
+                    'get_crop_advisory': {'location': loc, 'crop': 'Rice', 'query_type': 'recommendation'},
+                }
+                return 'tool_use', [
+                    {'toolUse': {'toolUseId': f"tooluse_{uuid.uuid4().hex[:20]}", 'name': t, 'input': inputs[t]}}
+                    for t in tools[:2]
+                ]
+
+        answer = (
+            "## Advisory\n\n"
+            "Based on the latest data for your area, here is what you can do this week:\n\n"
+            "- **Irrigation:** water early in the morning; skip irrigation if rainfall above 10 mm is forecast.\n"
+            "- **Nutrients:** apply 25 kg urea per acre in two split doses after weeding.\n"
+            "- **Pest watch:** inspect the lower leaves every 3 days for yellowing or brown spots.\n"
+            "- **Market:** check the nearest mandi rate before harvest and compare with MSP.\n\n"
+            "Keep records of inputs and yields so the next season's plan can be improved."
+        )
+        return 'end_turn', [{'text': answer}]
+
+    def _usage(self, kwargs, content):
+        tools = (kwargs.get('toolConfig') or {}).get('tools', [])
+        prefix_blocks = list(tools) + list(kwargs.get('system', []))
+        in_tokens = (len(json.dumps(kwargs.get('messages', []), default=str))
+                     + len(json.dumps(prefix_blocks, default=str))) // 4
+        out_tokens = len(json.dumps(content)) // 4
+        usage = {'inputTokens': in_tokens, 'outputTokens': out_tokens, 'totalTokens': in_tokens + out_tokens}
+
+        cache_points = [i for i, block in enumerate(prefix_blocks) if 'cachePoint' in block]
+        if cache_points:
+            prefix = json.dumps([kwargs.get('modelId')] + prefix_blocks[:cache_points[-1]], default=str)
+            prefix_tokens = len(prefix) // 4
+            now = time.time()
+            written_at = self.prompt_cache.get(prefix)
+            if written_at is not None and now - written_at < PROMPT_CACHE_TTL_SEC:
+                usage['cacheReadInputTokens'] = prefix_tokens
+            else:
+                usage['cacheWriteInputTokens'] = prefix_tokens
+            self.prompt_cache[prefix] = now  # a hit refreshes the TTL, as on Bedrock
+            usage['inputTokens'] = max(0, in_tokens - prefix_tokens)
+        return usage
+
+    @staticmethod
+    def _op(name, kwargs):
+        return f"bedrock-runtime.{name}.lite" if 'lite' in str(kwargs.get('modelId', '')) else f"bedrock-runtime.{name}"
+
+    def converse(self, **kwargs):
+        self.latency.sleep(self._op('converse', kwargs))
+        stop_reason, content = self._plan(kwargs)
+        return {
+            'output': {'message': {'role': 'assistant', 'content': content}},
+            'stopReason': stop_reason,
+            'usage': self._usage(kwargs, content),
+        }
+
+    def converse_stream(self, **kwargs):
+        total_ms = self.latency.sample_ms(self._op('converse_stream', kwargs))
+        stop_reason, content = self._plan(kwargs)
+        usage = self._usage(kwargs, content)
+
+        def _events():
+            time.sleep(total_ms * 0.3 / 1000.0)  # time to first token
+            for idx, block in enumerate(content):
+                if 'toolUse' in block:
+                    tu = block['toolUse']
+                    yield {'contentBlockStart': {'contentBlockIndex': idx, 'start': {'toolUse': {'toolUseId': tu['toolUseId'], 'name': tu['name']}}}}
+                    yield {'contentBlockDelta': {'contentBlockIndex': idx, 'delta': {'toolUse': {'input': json.dumps(tu['input'])}}}}
+                    continue
+                words = re.split(r'(\s+)', block['text'])
+                chunks = [''.join(words[i:i + 8]) for i in range(0, len(words), 8)] or ['']
+                per_chunk = total_ms * 0.7 / 1000.0 / len(chunks)
+                for chunk in chunks:
+                    time.sleep(per_chunk)
+                    yield {'contentBlockDelta': {'contentBlockIndex': idx, 'delta': {'text': chunk}}}
+            yield {'messageStop': {'stopReason': stop_reason}}
+            yield {'metadata': {'usage': usage}}
+        return {'stream': _events()}
+
+
+_TOOL_RESPONSES = {
+    'weather': {
+        'location': 'Coimbatore', 'current': {'temperature': 31.2, 'humidity': 62, 'description': 'scattered clouds',
+                                              'wind_speed': 3.4, 'rainfall_mm': 0},
+        'forecast': [{'date': f'2026-06-0{d}', 'temp_max': 33, 'temp_min': 24, 'rain_mm': d % 3 * 4} for d in range(1, 6)],
+        'farming_advisory': ['Good window for weeding and fertilizer application.'],
+    },
+    'crop': {
+        'results': [{'content': 'Rice (kharif): transplant 21-25 day old seedlings at 20x15 cm spacing. '
+                                'Apply NPK 120:60:40 kg/ha in splits.', 'score': 0.71, 'source': 'kb://crop/rice.md'}],
+        'quality': {'good_count': 1},
+    },
+    'schemes': {
+        'schemes': [{'name': 'PM-KISAN', 'benefit': 'Rs 6,000 per year in three instalments'},
+                    {'name': 'PMFBY', 'benefit': 'Crop insurance at 2% premium for kharif'}],
+    },
+    'profile': {'farmer_id': 'bench', 'name': 'Bench Farmer', 'state': 'Tamil Nadu', 'district': 'Coimbatore'},
+}
+
+
+class FakeLambda(_FakeClient):
+    """Tool Lambdas: returns a canned proxy response per function; first call per function is 'cold'.
+    InvocationType='Event' calls are queued on async_invocations for the harness to run."""
+    service = 'lambda'
+
+    def __init__(self, latency, cold_functions=None, async_invocations=None, **kwargs):
+        super().__init__(latency, **kwargs)
+        self._warm = cold_functions if cold_functions is not None else set()
+        self._async = async_invocations if async_invocations is not None else []
+
+    def invoke(self, FunctionName='', Payload=b'', InvocationType='RequestResponse', **_kwargs):
+        self.latency.sleep('lambda.invoke')
+        if InvocationType == 'Event':
+            self._async.append((FunctionName, json.loads(Payload or b'{}')))
+            return {'StatusCode': 202}
+        if FunctionName not in self._warm:
+            self._warm.add(FunctionName)
+            self.latency.sleep('lambda.invoke.cold')
+        name = FunctionName.lower()
+        if 'weather' in name:
+            body = _TOOL_RESPONSES['weather']
+        elif 'scheme' in name:
+            body = _TOOL_RESPONSES['schemes']
+        elif 'profile' in name:
+            body = _TOOL_RESPONSES['profile']
+        else:
+            body = _TOOL_RESPONSES['crop']
+        payload = json.dumps({'statusCode': 200, 'body': json.dumps({'status': 'success', 'data': body})})
+        return {'StatusCode': 200, 'Payload': io.BytesIO(payload.encode())}
+
+
+class FakeTranslate(_FakeClient):
+    service = 'translate'
+
+    def __init__(self, latency, known_translations=None, **kwargs):
+        super().__init__(latency, **kwargs)
+        self.known = known_translations or {}
+
+    def translate_text(self, Text='', SourceLanguageCode='auto', TargetLanguageCode='en', **_kwargs):
+        self.latency.sleep('translate.translate_text')
+        source = detect_script_language(Text) if SourceLanguageCode == 'auto' else SourceLanguageCode
+        if source == TargetLanguageCode:
+            translated = Text
+        elif TargetLanguageCode == 'en':
+            translated = self.known.get(Text.strip(), Text)
+        else:
+            translated = pseudo_translate(Text, TargetLanguageCode)
+        return {'TranslatedText': translated, 'SourceLanguageCode': source, 'TargetLanguageCode': TargetLanguageCode}
+
+
+class FakePolly(_FakeClient):
+    service = 'polly'
+
+    def synthesize_speech(self, Text='', **_kwargs):
+        self.latency.sleep('polly.synthesize_speech')
+        return {'AudioStream': io.BytesIO(b'ID3' + b'\x00' * min(4096, len(Text) * 8))}
+
+
+class FakeS3(_FakeClient):
+    service = 's3'
+
+    def __init__(self, latency, store=None, **kwargs):
+        super().__init__(latency, **kwargs)
+        self.store = store if store is not None else {}
+
+    def put_object(self, Bucket='', Key='', Body=b'', **_kwargs):
+        self.latency.sleep('s3.put_object')
+        self.store[(Bucket, Key)] = len(Body or b'')
+        return {'ETag': uuid.uuid4().hex}
+
+    def head_object(self, Bucket='', Key='', **_kwargs):
+        self.latency.sleep('s3.head_object')
+        if (Bucket, Key) not in self.store:
+            raise KeyError(Key)
+        return {'ContentLength': self.store[(Bucket, Key)]}
+
+    def head_bucket(self, **_kwargs):
+        return {}
+
+    def generate_presigned_url(self, _op='get_object', Params=None, ExpiresIn=3600, **_kwargs):
+        params = Params or {}
+        return f"https://local-s3/{params.get('Bucket')}/{params.get('Key')}?X-Amz-Expires={ExpiresIn}"
+
+
+# ── DynamoDB (resource API, in-memory, shared by every Table handle) ──
+
+def _condition_value(condition):
+    """Extract the equality value from boto3.dynamodb.conditions.Key(...).eq(v)."""
+    try:
+        expr = condition.get_expression()
+        values = expr.get('values', ())
+        return values[1] if len(values) > 1 else None
+    except AttributeError:
+        return None
+
+
+_COMPARISON_RE = re.compile(r'^(#?\w+)\s*(=|<>|<=|>=|<|>)\s*(:\w+)$')
+_ATTR_FN_RE = re.compile(r'^(attribute_not_exists|attribute_exists)\((#?\w+)\)$')
+
+
+def _condition_holds(expression, item, values=None, names=None):
+    """Evaluate the small ConditionExpression subset used by the orchestrator:
+    attribute_(not_)exists(a), a <op> :v, joined by AND / OR (AND binds tighter)."""
+    values, names = values or {}, names or {}
+    item = item or {}
+
+    def _attr(token):
+        return names.get(token, token)
+
+    def _term(term):
+        term = term.strip()
+        fn = _ATTR_FN_RE.match(term)
+        if fn:
+            present = _attr(fn.group(2)) in item
+            return present if fn.group(1) == 'attribute_exists' else not present
+        cmp = _COMPARISON_RE.match(term)
+        if not cmp:
+            raise ValueError(f"Unsupported condition in stand-in: {term!r}")
+        left, op, right = item.get(_attr(cmp.group(1))), cmp.group(2), values.get(cmp.group(3))
+        if left is None:
+            return False
+        try:
+            left, right = float(left), float(right)
+        except (TypeError, ValueError):
+            left, right = str(left), str(right)
+        return {'=': left == right, '<>': left != right, '<': left < right,
+                '>': left > right, '<=': left <= right, '>=': left >= right}[op]
+
+    return any(all(_term(t) for t in re.split(r'\s+AND\s+', clause))
+               for clause in re.split(r'\s+OR\s+', expression))
+
+
+def _conditional_check_failed(operation):
+    try:
+        from botocore.exceptions import ClientError
+    except ImportError:  # pragma: no cover — boto3 is required by the harness anyway
+        return RuntimeError('ConditionalCheckFailedException')
+    return ClientError({'Error': {'Code': 'ConditionalCheckFailedException',
+                                  'Message': 'The conditional request failed'}}, operation)
+
+
+class _BatchWriter:
+    def __init__(self, table):
+        self.table = table
+        self.items = []
+
+    def __enter__(self):
+        return self
+
+    def put_item(self, Item):
+        self.items.append(Item)
+
+    def __exit__(self, *exc):
+        self.table.latency.sleep('dynamodb.batch_write')
+        for item in self.items:
+            self.table._put(item)
+        return False
+
+
+class FakeTable:
+    def __init__(self, name, store, latency):
+        self.name = name
+        self.store = store.setdefault(name, {})
+        self.latency = latency
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(key):
+        return tuple(sorted((k, str(v)) for k, v in key.items()))
+
+    def _primary(self, item):
+        for pk, sk in (('session_id', 'timestamp'), ('rate_key', 'window'), ('farmer_id', None)):
+            if pk in item:
+                return self._key({k: item[k] for k in (pk, sk) if k and k in item})
+        return self._key(item)
+
+    def _put(self, item):
+        with self._lock:
+            self.store[self._primary(item)] = dict(item)
+
+    def get_item(self, Key, **_kwargs):
+        self.latency.sleep('dynamodb.get_item')
+        item = self.store.get(self._key(Key))
+        return {'Item': dict(item)} if item else {}
+
+    def put_item(self, Item, ConditionExpression=None, ExpressionAttributeValues=None,
+                 ExpressionAttributeNames=None, **_kwargs):
+        self.latency.sleep('dynamodb.put_item')
+        with self._lock:
+            key = self._primary(Item)
+            if ConditionExpression and not _condition_holds(
+                    ConditionExpression, self.store.get(key), ExpressionAttributeValues, ExpressionAttributeNames):
+                raise _conditional_check_failed('PutItem')
+            self.store[key] = dict(Item)
+        return {}
+
+    def delete_item(self, Key, ConditionExpression=None, ExpressionAttributeValues=None,
+                    ExpressionAttributeNames=None, **_kwargs):
+        self.latency.sleep('dynamodb.delete_item')
+        with self._lock:
+            key = self._key(Key)
+            if ConditionExpression and not _condition_holds(
+                    ConditionExpression, self.store.get(key), ExpressionAttributeValues, ExpressionAttributeNames):
+                raise _conditional_check_failed('DeleteItem')
+            self.store.pop(key, None)
+        return {}
+
+    def update_item(self, Key, UpdateExpression='', ExpressionAttributeValues=None,
+                    ExpressionAttributeNames=None, ConditionExpression=None, **_kwargs):
+        # Modelled shapes: "SET a = :v, #b = :w" (utils/response_cache.py) and the
+        # atomic counter used by utils/rate_limiter.py.
+        self.latency.sleep('dynamodb.update_item')
+        with self._lock:
+            key = self._key(Key)
+            if ConditionExpression and not _condition_holds(
+                    ConditionExpression, self.store.get(key), ExpressionAttributeValues, ExpressionAttributeNames):
+                raise _conditional_check_failed('UpdateItem')
+            item = self.store.setdefault(key, dict(Key))
+            if 'hit_count' in UpdateExpression or not UpdateExpression.strip().upper().startswith('SET '):
+                item['hit_count'] = int(item.get('hit_count', 0)) + 1
+                return {'Attributes': {'hit_count': item['hit_count']}}
+            names, values = ExpressionAttributeNames or {}, ExpressionAttributeValues or {}
+            for assignment in UpdateExpression.strip()[4:].split(','):
+                attr, value = (part.strip() for part in assignment.split('=', 1))
+                item[names.get(attr, attr)] = values[value]
+            return {}
+
+    def query(self, KeyConditionExpression=None, Select=None, ScanIndexForward=True, Limit=None, **_kwargs):
+        self.latency.sleep('dynamodb.query')
+        pk_value = _condition_value(KeyConditionExpression)
+        with self._lock:
+            items = [dict(i) for i in self.store.values() if i.get('session_id') == pk_value]
+        items.sort(key=lambda i: str(i.get('timestamp', '')), reverse=not ScanIndexForward)
+        if Limit:
+            items = items[:Limit]
+        if Select == 'COUNT':
+            return {'Count': len(items)}
+        return {'Items': items, 'Count': len(items)}
+
+    def scan(self, **_kwargs):
+        self.latency.sleep('dynamodb.query')
+        with self._lock:
+            return {'Items': [dict(i) for i in self.store.values()]}
+
+    def batch_writer(self, **_kwargs):
+        return _BatchWriter(self)
+
+
+class FakeDynamoDBResource:
+    def __init__(self, latency, store):
+        self.latency = latency
+        self.store = store
+
+    def Table(self, name):
+        return FakeTable(name, self.store, self.latency)
+
+
+# ── Installation ──
+
+class StandIns:
+    """Shared state for all fake clients in this process (DynamoDB items, S3 objects, warm Lambdas)."""
+
+    def __init__(self, latency, known_translations=None):
+        self.latency = latency
+        self.known_translations = known_translations or {}
+        self.dynamodb_store = {}
+        self.s3_store = {}
+        self.warm_functions = set()
+        self.prompt_cache = {}
+        self.async_invocations = []
+
+    def client(self, service_name, *_args, **kwargs):
+        kwargs.pop('config', None)
+        if service_name == 'bedrock-runtime':
+            return FakeBedrockRuntime(self.latency, prompt_cache=self.prompt_cache, **kwargs)
+        if service_name == 'lambda':
+            return FakeLambda(self.latency, cold_functions=self.warm_functions,
+                              async_invocations=self.async_invocations, **kwargs)
+        if service_name == 'translate':
+            return FakeTranslate(self.latency, known_translations=self.known_translations, **kwargs)
+        if service_name == 'polly':
+            return FakePolly(self.latency, **kwargs)
+        if service_name == 's3':
+            return FakeS3(self.latency, store=self.s3_store, **kwargs)
+        if service_name == 'cloudwatch':
+            return FakeCloudWatch(self.latency, **kwargs)
+        client = _FakeClient(self.latency, **kwargs)
+        client.service = service_name
+        return client
+
+    def resource(self, service_name, *_args, **_kwargs):
+        if service_name != 'dynamodb':
+            raise ValueError(f"No local stand-in for boto3.resource('{service_name}')")
+        return FakeDynamoDBResource(self.latency, self.dynamodb_store)
+
+    def reset_cold_lambdas(self):
+        self.warm_functions.clear()
+
+
+def install(latency, known_translations=None):
+    """Patch boto3.client / boto3.resource with local stand-ins. Returns the StandIns."""
+    import boto3
+    import boto3.dynamodb.conditions  # noqa: F401 — orchestrator references it via boto3.dynamodb
+
+    standins = StandIns(latency, known_translations)
+    boto3.client = standins.client
+    boto3.resource = standins.resource
+    return standins
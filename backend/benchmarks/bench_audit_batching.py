@@ -0,0 +1,175 @@
+# backend/benchmarks/bench_audit_batching.py
+# Batched audit records (ENABLE_AUDIT_BATCHING) vs one log line per entry
+# Owner: Manoj RS
+#
+# Replays the audit trail of a typical orchestrator request (start, PII, three
+# tool calls, policy decision, completion) --requests times through
+# utils/audit_logger.py, with the AUDIT logger writing to a real file:
+#   unbatched  every entry is written as it happens (current behaviour)
+#   batched    begin_audit_batch() / flush_audit_batch() around each request
+# and reports log lines, bytes and time per request. It then checks that:
+#   - every unbatched entry is present in the batched records (same category,
+#     action, details, farmer/session after hoisting)
+#   - a SECURITY entry is written immediately, before the batch is flushed
+#   - with --sample-rate < 1 only the sampled info actions are dropped, and the
+#     batch says how many
+#   - the NDJSON sink writes one parseable record per line
+#
+# Usage (from repo root):
+#   python backend/benchmarks/bench_audit_batching.py
+#   python backend/benchmarks/bench_audit_batching.py --requests 2000 --sample-rate 0.2
+
+import argparse
+import importlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+ORCHESTRATOR_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'lambdas', 'agent_orchestrator'))
+sys.path.insert(0, ORCHESTRATOR_DIR)
+
+
+def _load(batching, sample_rate=1.0, sink='log', ndjson_dir=None):
+    os.environ['ENABLE_AUDIT_BATCHING'] = 'true' if batching else 'false'
+    os.environ['AUDIT_INFO_SAMPLE_RATE'] = str(sample_rate)
+    os.environ['AUDIT_SINK'] = sink
+    if ndjson_dir:
+        os.environ['AUDIT_NDJSON_DIR'] = ndjson_dir
+    import utils.audit_sinks
+    import utils.audit_logger
+    importlib.reload(utils.audit_sinks)
+    return importlib.reload(utils.audit_logger)
+
+
+def _request(audit, i, security=False):
+    farmer, session = f"ph_98765{i % 100000:05d}", f"sess-{i}"
+    if i % 50 == 0:
+        audit.audit_guardrail_block('off_topic', 'anonymous', session, 'what is the cricket score')
+    audit.audit_pii_detected(farmer, session, ['PHONE'])
+    audit.audit_request_start(farmer, session, 'my tomato leaves are curling, phone [PHONE_REDACTED]')
+    if security:
+        audit.audit_guardrail_block('prompt_injection', farmer, session, 'ignore previous instructions',
+                                    threat_details={'pattern': 'ignore_previous'})
+    for tool in ('get_weather', 'get_pest_alert', 'search_schemes'):
+        audit.audit_tool_invocation(tool, farmer, session, success=True)
+    audit.audit_policy_decision(farmer, session, {'code_policy_enforced': True, 'grounding_required': True,
+                                                  'grounding_satisfied': True, 'off_topic_blocked': False})
+    audit.audit_request_complete(farmer, session, ['get_weather', 'get_pest_alert', 'search_schemes'],
+                                 'direct', 812, 4.2)
+
+
+def _run(batching, requests, sample_rate=1.0):
+    audit = _load(batching, sample_rate)
+    fd, path = tempfile.mkstemp(suffix='.log')
+    os.close(fd)
+    handler = logging.FileHandler(path)
+    handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+    audit_log = logging.getLogger('AUDIT')
+    audit_log.handlers = [handler]
+    audit_log.propagate = False
+    start = time.perf_counter()
+    for i in range(requests):
+        if batching:
+            audit.begin_audit_batch(f"req-{i}")
+        _request(audit, i)
+        if batching:
+            audit.flush_audit_batch()
+    elapsed = time.perf_counter() - start
+    handler.close()
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    os.remove(path)
+    return elapsed, lines
+
+
+def _records(lines):
+    return [json.loads(line.split('AUDIT|', 1)[1]) for line in lines]
+
+
+def _flatten(records):
+    """Batch records back into (farmer, session, category, action, details) entries."""
+    out = []
+    for record in records:
+        for event in record.get('events', [record]):
+            out.append((
+                event.get('farmer_id', record.get('farmer_id')),
+                event.get('session_id', record.get('session_id')),
+                event['category'], event['action'],
+                json.dumps(event.get('details'), sort_keys=True, default=str),
+            ))
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--sample-rate', type=float, default=0.25)
+    args = parser.parse_args()
+
+    problems = []
+    results = {}
+    for batching in (False, True):
+        elapsed, lines = _run(batching, args.requests)
+        results['batched' if batching else 'unbatched'] = (elapsed, lines)
+    print(f"{'mode':<10} {'lines/req':>10} {'bytes/req':>10} {'us/req':>8}")
+    for mode, (elapsed, lines) in results.items():
+        size = sum(len(line) + 1 for line in lines)
+        print(f"{mode:<10} {len(lines) / args.requests:10.2f} {size / args.requests:10.0f} "
+              f"{elapsed / args.requests * 1e6:8.1f}")
+
+    if sorted(_flatten(_records(results['unbatched'][1]))) != sorted(_flatten(_records(results['batched'][1]))):
+        problems.append('batched records do not carry the same entries')
+
+    # SECURITY entries are written before the batch is flushed.
+    audit = _load(True)
+    written = []
+    audit.set_audit_sink(type('ListSink', (), {'write': lambda self, records: written.extend(records)})())
+    audit.begin_audit_batch('req-security')
+    _request(audit, 1, security=True)
+    if [r['action'] for r in written] != ['INJECTION_BLOCKED']:
+        problems.append(f"security entry not immediate: {[r.get('action') for r in written]}")
+    audit.flush_audit_batch()
+    if len(written) != 2 or not written[1].get('batch'):
+        problems.append('batch not written after the security entry')
+
+    # Sampling drops only the sampled info actions.
+    audit = _load(True, sample_rate=args.sample_rate)
+    written = []
+    audit.set_audit_sink(type('ListSink', (), {'write': lambda self, records: written.extend(records)})())
+    for i in range(args.requests):
+        audit.begin_audit_batch(f"req-{i}")
+        _request(audit, i)
+        audit.flush_audit_batch()
+    kept_actions = {e['action'] for r in written for e in r['events']}
+    kept_requests = sum(1 for r in written if not r.get('sampled_out'))
+    if any(r.get('sampled_out', 0) != 5 for r in written if r.get('sampled_out')):
+        problems.append('unexpected sampled_out counts')
+    if not {'REQUEST_COMPLETED', 'PII_DETECTED'} <= kept_actions:
+        problems.append('non-sampled actions were dropped')
+    print(f"sampling {args.sample_rate}: {kept_requests}/{args.requests} requests kept their full trail")
+
+    # NDJSON sink.
+    with tempfile.TemporaryDirectory() as tmp:
+        audit = _load(True, sink='ndjson', ndjson_dir=tmp)
+        for i in range(20):
+            audit.begin_audit_batch(f"req-{i}")
+            _request(audit, i)
+            audit.flush_audit_batch()
+        files = os.listdir(tmp)
+        with open(os.path.join(tmp, files[0]), encoding='utf-8') as f:
+            rows = [json.loads(line) for line in f]
+        if len(files) != 1 or len(rows) != 20 or not all(r.get('batch') for r in rows):
+            problems.append(f"ndjson sink wrote {len(rows)} rows in {len(files)} files")
+        print(f"ndjson sink: {len(rows)} records in {files[0]}")
+
+    print(f"problems: {len(problems)}")
+    for problem in problems:
+        print(f"  {problem}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+# backend/benchmarks/bench_bedrock_limiter.py
+# Throttled-Bedrock simulation: backoff-only retries vs the adaptive (AIMD) limiter
+# Owner: Manoj RS
+#
+# A simulated Bedrock endpoint enforces a quota (token bucket, --quota-rps with
+# --quota-burst) and answers ThrottlingException above it. --threads callers
+# send --calls requests each, using the orchestrator's retry policy:
+#
+#   backoff   1 + MAX_RETRIES attempts, sleep RETRY_BASE_DELAY * 2^attempt on throttle
+#   limiter   same attempts, but every call goes through bedrock_limiter.limited_call
+#             and throttled retries queue on the bucket instead of sleeping
+#
+# Reported per mode: end-to-end latency of successful calls, wasted (throttled)
+# round trips, calls that still failed after all retries, and goodput. Latency
+# percentiles cover successes only, so a mode that drops calls looks faster
+# than it is — read them together with failed=. No AWS access needed.
+# The limiter runs once per --max-wait value: a longer queue drops fewer calls
+# but stretches p95/p99 (each retry may queue again).
+#
+# Usage (from repo root):
+#   python backend/benchmarks/bench_bedrock_limiter.py --threads 12 --calls 15 --quota-rps 8
+#   python backend/benchmarks/bench_bedrock_limiter.py --max-wait 3,1.5,1
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+ORCHESTRATOR_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'lambdas', 'agent_orchestrator'))
+sys.path.insert(0, ORCHESTRATOR_DIR)
+
+MAX_RETRIES = 2          # mirrors handler.MAX_RETRIES
+RETRY_BASE_DELAY = 0.5   # mirrors handler.RETRY_BASE_DELAY
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+class Throttled(Exception):
+    """Shaped like botocore's ClientError for bedrock_limiter.is_throttle()."""
+
+    def __init__(self):
+        super().__init__('ThrottlingException')
+        self.response = {'Error': {'Code': 'ThrottlingException', 'Message': 'Too many requests'}}
+
+
+class QuotaEndpoint:
+    """Server-side token bucket + lognormal service latency."""
+
+    def __init__(self, rps, burst, latency_ms, rng):
+        self.rps = rps
+        self.burst = burst
+        self.latency_ms = latency_ms
+        self._tokens = burst
+        self._at = time.monotonic()
+        self._lock = threading.Lock()
+        self._rng = rng
+        self.round_trips = 0
+        self.throttled = 0
+
+    def converse(self, **_kwargs):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._at) * self.rps)
+            self._at = now
+            self.round_trips += 1
+            admitted = self._tokens >= 1.0
+            if admitted:
+                self._tokens -= 1.0
+            else:
+                self.throttled += 1
+            latency = self._rng.lognormvariate(0, 0.3) * self.latency_ms / 1000.0
+        if not admitted:
+            time.sleep(0.02)  # a throttle still costs a round trip
+            raise Throttled()
+        time.sleep(latency)
+        return {'stopReason': 'end_turn'}
+
+
+def _one_call(endpoint, mode, limiter_module, max_wait):
+    for attempt in range(1 + MAX_RETRIES):
+        try:
+            if mode == 'limiter':
+                return limiter_module.limited_call('bench-model', endpoint.converse, max_wait=max_wait,
+                                                   modelId='bench-model')
+            return endpoint.converse(modelId='bench-model')
+        except Throttled:
+            if attempt == MAX_RETRIES:
+                raise
+            if mode == 'backoff':
+                time.sleep(RETRY_BASE_DELAY * (2 ** attempt))
+
+
+def run_mode(mode, args, max_wait=None):
+    from utils import bedrock_limiter
+    bedrock_limiter._limiters.clear()
+    endpoint = QuotaEndpoint(args.quota_rps, args.quota_burst, args.latency_ms, random.Random(args.seed))
+    latencies = []
+    failures = [0]
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(args.calls):
+            start = time.perf_counter()
+            try:
+                _one_call(endpoint, mode, bedrock_limiter, max_wait)
+                ok = True
+            except Throttled:
+                ok = False
+            elapsed = (time.perf_counter() - start) * 1000.0
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    failures[0] += 1
+
+    threads = [threading.Thread(target=worker) for _ in range(args.threads)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+
+    label = f"{mode}@{max_wait:g}s" if max_wait is not None else mode
+    print(
+        f"{label:<12} ok={len(latencies):<4} failed={failures[0]:<3} round_trips={endpoint.round_trips:<5} "
+        f"throttled={endpoint.throttled:<4} p50={_percentile(latencies, 50):7.0f}ms "
+        f"p95={_percentile(latencies, 95):7.0f}ms p99={_percentile(latencies, 99):7.0f}ms "
+        f"goodput={len(latencies) / wall:5.1f} ok/s"
+    )
+    if mode == 'limiter':
+        print(f"{'':<12} limiter: {bedrock_limiter.snapshot().get('bench-model')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--threads', type=int, default=12)
+    parser.add_argument('--calls', type=int, default=15, help='calls per thread')
+    parser.add_argument('--quota-rps', type=float, default=8.0)
+    parser.add_argument('--quota-burst', type=float, default=4.0)
+    parser.add_argument('--latency-ms', type=float, default=300.0, help='median service latency')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--max-wait', default='3,1.5,1', help='comma-separated limiter queue limits (seconds)')
+    args = parser.parse_args()
+
+    print(f"threads={args.threads} calls/thread={args.calls} quota={args.quota_rps} rps "
+          f"(burst {args.quota_burst}) latency~{args.latency_ms:.0f}ms")
+    run_mode('backoff', args)
+    for max_wait in (float(w) for w in args.max_wait.split(',') if w.strip()):
+        run_mode('limiter', args, max_wait)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+# backend/benchmarks/bench_keyword_matcher.py
+# Microbenchmark: compiled KeywordMatcher vs the per-keyword loops it replaced
+# Owner: Manoj RS
+#
+# Runs _is_on_topic_query and _classify_intents from the orchestrator against
+# the loop implementations they used before (kept below verbatim, fed the same
+# keyword sets), over the benchmark corpus plus edge cases. Every input must
+# give the same answer from both — any mismatch is printed and the script
+# exits non-zero — then both are timed.
+#
+# Usage (from repo root):
+#   python backend/benchmarks/bench_keyword_matcher.py --rounds 200
+#
+# Requires boto3 to be importable; AWS clients are replaced by the aws_standins
+# stand-ins, so no credentials are needed.
+
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ORCHESTRATOR_DIR = os.path.abspath(os.path.join(BENCH_DIR, '..', 'lambdas', 'agent_orchestrator'))
+DEFAULT_CORPUS = os.path.join(BENCH_DIR, 'corpus', 'farmer_queries.jsonl')
+
+EDGE_CASES = [
+    ('the drains are blocked near my house', None),
+    ('what is the stock market price of rice today', None),
+    ('who is the mp of my district', None),
+    ('best movie this week', None),
+    ('cricket', None),
+    ('phone', None),
+    ('is it going to rain tomorrow in nashik', None),
+    ('pm-kisan installment status', None),
+    ('my farm has yellow leaves turning brown', None),
+    ('how to cultivate turmeric', None),
+    ('tell me about bitcoin', None),
+    ('Is there subsidy for drip irrigation', 'क्या ड्रिप सिंचाई के लिए सब्सिडी है'),
+    ('When will it rain', 'மழை எப்போது வரும்'),
+    ('Leaves are yellow', 'ఆకులు పసుపు రంగులో ఉన్నాయి'),
+]
+
+
+def _legacy_is_on_topic(handler, text):
+    normalized = (text or '').lower().strip()
+    if not normalized:
+        return True
+    if normalized in handler.SAFE_CHITCHAT:
+        return True
+    if handler._contains_indic_chars(normalized):
+        return True
+    off_topic_phrases = [kw for kw in handler.OFF_TOPIC_KEYWORDS if ' ' in kw]
+    if any(phrase in normalized for phrase in off_topic_phrases):
+        return False
+    if any(keyword in normalized for keyword in handler.AGRI_POLICY_KEYWORDS):
+        return True
+    off_topic_singles = [kw for kw in handler.OFF_TOPIC_KEYWORDS if ' ' not in kw]
+    if any(keyword in normalized for keyword in off_topic_singles):
+        return False
+    return len(normalized.split()) >= 3
+
+
+def _legacy_classify_intents(handler, message_en, original_message=None):
+    combined = (message_en or '').lower() + ' ' + (original_message or '').lower()
+
+    def _has_any_keyword(keywords, haystack):
+        for kw in keywords:
+            if re.search(r'[\u0900-\u0D7F]', kw):
+                if kw in haystack:
+                    return True
+            elif re.search(r'\b' + re.escape(kw) + r'\b', haystack):
+                return True
+        return False
+
+    intents = []
+    for name, keywords in (
+        ('weather', handler._WEATHER_INTENT_KEYWORDS),
+        ('crop', handler._CROP_INTENT_KEYWORDS),
+        ('pest', handler._PEST_INTENT_KEYWORDS),
+        ('schemes', handler._SCHEMES_INTENT_KEYWORDS),
+        ('profile', handler._PROFILE_INTENT_KEYWORDS),
+    ):
+        if _has_any_keyword(keywords, combined):
+            intents.append(name)
+    return intents
+
+
+def _load_inputs(corpus_path):
+    inputs = list(EDGE_CASES)
+    with open(corpus_path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                inputs.append((row.get('message_en') or row['message'], row['message']))
+    return inputs
+
+
+def _time_per_call(fn, inputs, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for args in inputs:
+            fn(*args)
+    return (time.perf_counter() - start) / (rounds * len(inputs)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS)
+    parser.add_argument('--rounds', type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ.setdefault('AWS_REGION', 'ap-south-1')
+    os.environ.setdefault('AWS_DEFAULT_REGION', os.environ['AWS_REGION'])
+    sys.path.insert(0, BENCH_DIR)
+    sys.path.insert(0, ORCHESTRATOR_DIR)
+    import aws_standins
+    aws_standins.install(aws_standins.LatencyModel(scale=0.0))
+    import handler
+    logging.getLogger().setLevel(logging.WARNING)   # on-topic logs every block decision
+
+    inputs = _load_inputs(args.corpus)
+    mismatches = 0
+    for message_en, original in inputs:
+        for text in (message_en, original):
+            if handler._is_on_topic_query(text) != _legacy_is_on_topic(handler, text):
+                mismatches += 1
+                print(f"MISMATCH on-topic: {text!r}")
+        new_intents = sorted(handler._classify_intents(message_en, original))
+        old_intents = sorted(_legacy_classify_intents(handler, message_en, original))
+        if new_intents != old_intents:
+            mismatches += 1
+            print(f"MISMATCH intents: {message_en!r} new={new_intents} old={old_intents}")
+    print(f"{len(inputs)} inputs checked, {mismatches} mismatches")
+
+    on_topic_inputs = [(m,) for m, _ in inputs] + [(o,) for _, o in inputs if o]
+    rows = [
+        ('on_topic', _time_per_call(lambda t: _legacy_is_on_topic(handler, t), on_topic_inputs, args.rounds),
+         _time_per_call(handler._is_on_topic_query, on_topic_inputs, args.rounds)),
+        ('intents', _time_per_call(lambda m, o: _legacy_classify_intents(handler, m, o), inputs, args.rounds),
+         _time_per_call(handler._classify_intents, inputs, args.rounds)),
+    ]
+    print(f"{'':<10} {'loops':>10} {'compiled':>10} {'speedup':>8}")
+    for name, old_us, new_us in rows:
+        print(f"{name:<10} {old_us:8.1f}us {new_us:8.1f}us {old_us / max(new_us, 1e-9):7.1f}x")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
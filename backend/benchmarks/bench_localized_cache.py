@@ -0,0 +1,156 @@
+# backend/benchmarks/bench_localized_cache.py
+# Cache hits with per-language variants (ENABLE_LOCALIZED_CACHE) vs re-localizing every hit
+# Owner: Manoj RS
+#
+# Drives the real orchestrator handler (aws_standins, no AWS access) with one
+# Tamil, one Hindi and one English question, each asked --repeats times. The
+# first ask is a cache miss; the rest are response-cache hits. Like the chat
+# UI, every reply that comes back with audio_pending triggers the async
+# generate_tts call. gTTS itself is emulated (--gtts-ms per chunk); Polly,
+# Translate, Bedrock and S3 are the usual stand-ins.
+#
+# For each mode it reports, per language, the median hit latency and the
+# service calls made per hit (Bedrock converse, Translate, Polly, S3 uploads,
+# gTTS chunks). One Translate call per request is the inbound
+# detect_and_translate, which the cache key needs; with the variants on, a
+# repeat hit should make no other call.
+# Checks: hits return the same localized reply, and once the first audio
+# exists every later hit returns an audio_url (no audio_pending).
+#
+# Usage (from repo root; needs boto3 importable):
+#   python backend/benchmarks/bench_localized_cache.py
+#   python backend/benchmarks/bench_localized_cache.py --repeats 10 --latency-scale 0.5
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+import aws_standins  # noqa: E402
+import load_test_orchestrator as harness  # noqa: E402
+
+sys.path.insert(0, harness.ORCHESTRATOR_DIR)
+
+QUESTIONS = ('ta-crop-1', 'hi-pest-1', 'en-irrigation-1')
+COUNTED = {
+    'bedrock': ('bedrock-runtime.converse', 'bedrock-runtime.converse_stream'),
+    'translate': ('translate.translate_text',),
+    'polly': ('polly.synthesize_speech',),
+    's3_put': ('s3.put_object',),
+    'gtts': ('gtts',),
+}
+
+
+class CountingLatency(aws_standins.LatencyModel):
+    """LatencyModel that also counts calls per operation."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = {}
+
+    def sleep(self, op):
+        self.calls[op] = self.calls.get(op, 0) + 1
+        return super().sleep(op)
+
+
+def _counts(latency):
+    return {name: sum(latency.calls.get(op, 0) for op in ops) for name, ops in COUNTED.items()}
+
+
+def _post(handler, body):
+    with contextlib.redirect_stdout(io.StringIO()):   # EMF metric lines
+        response = handler.lambda_handler({'httpMethod': 'POST', 'body': json.dumps(body, ensure_ascii=False)},
+                                          harness.BenchContext())
+    return json.loads(response['body']).get('data') or {}
+
+
+def run_mode(localized, args, corpus):
+    os.environ.update(harness.BENCH_ENV)
+    os.environ['ENABLE_LOCALIZED_CACHE'] = 'true' if localized else 'false'
+    latency = CountingLatency({'gtts': f"fixed:{args.gtts_ms}"}, scale=args.latency_scale, seed=args.seed)
+    aws_standins.install(latency)
+    handler, _init_ms = harness._load_handler()
+
+    from utils import polly_helper
+
+    def _fake_gtts_chunk(chunk_text, language_code, chunk_index=1, total_chunks=1):
+        latency.sleep('gtts')
+        return b'ID3' + chunk_text.encode('utf-8')[:64]
+    polly_helper._gtts_tts_chunk = _fake_gtts_chunk
+
+    results = {}
+    problems = []
+    for qid in QUESTIONS:
+        query = corpus[qid]
+        lang = query['language']
+        body = {'message': query['message'], 'session_id': f"bench-localized-{qid}-{'x' * 24}",
+                'farmer_id': 'anonymous', 'language': lang}
+        hit_ms, hit_calls, replies, audio_on_hit = [], [], [], []
+        audio_made = False
+        for i in range(args.repeats):
+            before = _counts(latency)
+            start = time.perf_counter()
+            data = _post(handler, body)
+            if data.get('audio_pending') and data.get('reply'):
+                # The UI's async TTS request (frontend/src/utils/asyncTts.js).
+                tts = _post(handler, {'generate_tts': True, 'tts_text': data['reply'], 'tts_language': lang})
+                audio_made = audio_made or bool(tts.get('audio_url'))
+            elapsed = (time.perf_counter() - start) * 1000.0
+            after = _counts(latency)
+            if data.get('pipeline_mode') != 'cache_hit':
+                audio_made = audio_made or bool(data.get('audio_url'))
+                continue
+            hit_ms.append(elapsed)
+            hit_calls.append({k: after[k] - before[k] for k in after})
+            replies.append(data.get('reply'))
+            audio_on_hit.append((audio_made, bool(data.get('audio_url'))))
+            audio_made = audio_made or bool(data.get('audio_url'))
+        if not hit_ms:
+            problems.append(f"{qid}: no cache hits")
+            continue
+        if localized:
+            if len(set(replies)) != 1:
+                problems.append(f"{qid}: cached replies differ between hits")
+            if any(before and not now for before, now in audio_on_hit[1:]):
+                problems.append(f"{qid}: audio existed but a later hit had no audio_url")
+            if any(sum(calls.values()) - min(calls['translate'], 1) for calls in hit_calls[2:]):
+                problems.append(f"{qid}: repeat hits still call services: {hit_calls[-1]}")
+        mean_calls = {k: statistics.mean(c[k] for c in hit_calls[1:] or hit_calls) for k in COUNTED}
+        results[lang] = (statistics.median(hit_ms[1:] or hit_ms), mean_calls)
+    return results, problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeats', type=int, default=6, help='asks per question (first one is the miss)')
+    parser.add_argument('--latency-scale', type=float, default=0.2, help='scale on stand-in latencies')
+    parser.add_argument('--gtts-ms', type=float, default=4000.0, help='emulated gTTS time per chunk')
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = {q['id']: q for q in harness.load_corpus(harness.DEFAULT_CORPUS)}
+    all_problems = []
+    print(f"{args.repeats} asks per question, latency scale {args.latency_scale}, gTTS {args.gtts_ms}ms/chunk")
+    print(f"{'mode':<10} {'lang':<5} {'hit p50 ms':>10}  calls per repeat hit")
+    for localized in (False, True):
+        results, problems = run_mode(localized, args, corpus)
+        all_problems.extend(problems)
+        for lang, (p50, calls) in results.items():
+            summary = ' '.join(f"{k}={v:.1f}" for k, v in calls.items())
+            print(f"{'variants' if localized else 'reply_en':<10} {lang:<5} {p50:>10.1f}  {summary}")
+
+    print(f"problems: {len(all_problems)}")
+    for problem in all_problems:
+        print(f"  {problem}")
+    sys.exit(1 if all_problems else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+# backend/benchmarks/bench_metrics.py
+# Buffered EMF metrics (utils/metrics.py) vs synchronous put_metric_data
+# Owner: Manoj RS
+#
+# 1. Format check: fills a buffer past the EMF limits (histogram > 100 values,
+#    > 100 metrics in one group, high-resolution, no-dimension and multi-
+#    dimension metrics), flushes it, and verifies every record against the EMF
+#    rules (each defined metric present, at most 100 metrics / 100 values,
+#    dimension keys present) and that every buffered value comes out once.
+# 2. Request overhead: the metrics of one orchestrator request with --tools
+#    tool calls (duration + success per tool, a prefetch counter, 3 bulkhead
+#    gauges), emitted
+#      legacy    one put_metric_data call per emit site, each costing
+#                --put-latency-ms (an emulated CloudWatch round trip)
+#      buffered  put_metric()/count() during the request + one flush to stdout
+#                (here a null writer)
+#
+# Usage (from repo root):
+#   python backend/benchmarks/bench_metrics.py
+#   python backend/benchmarks/bench_metrics.py --tools 3 --put-latency-ms 30 --requests 200
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+ORCHESTRATOR_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'lambdas', 'agent_orchestrator'))
+sys.path.insert(0, ORCHESTRATOR_DIR)
+
+from utils.metrics import MetricsBuffer, MAX_METRICS_PER_RECORD, MAX_VALUES_PER_METRIC  # noqa: E402
+
+
+def check_format():
+    lines = []
+    buffer = MetricsBuffer(writer=lines.append)
+    expected = {}
+
+    def put(name, value, dims, **kw):
+        buffer.put(name, value, dimensions=dims, **kw)
+        expected.setdefault((name, tuple(sorted(dims.items()))), []).append(float(value))
+
+    for i in range(250):
+        put('ToolExecutionDurationMs', i, {'ToolName': 'get_weather'}, unit='Milliseconds', namespace='SmartRuralAI/Tools')
+    for i in range(130):
+        put(f'Gauge{i}', i, {'Bulkhead': 'crop'}, unit='Count', namespace='SmartRuralAI/Tools')
+    put('ColdStart', 1, {}, unit='Count', high_resolution=True)
+    put('Latency', 12.5, {'Stage': 'translate', 'PipelineMode': 'direct'}, unit='Milliseconds')
+    for _ in range(7):
+        buffer.count('SpeculativePrefetchHit', dimensions={'ToolName': 'get_weather'}, namespace='SmartRuralAI/Tools')
+    expected[('SpeculativePrefetchHit', (('ToolName', 'get_weather'),))] = [7.0]
+
+    written = buffer.flush(properties={'request_id': 'bench'})
+    problems = []
+    seen = {}
+    for line in lines:
+        record = json.loads(line)
+        directive = record['_aws']['CloudWatchMetrics'][0]
+        dims = directive['Dimensions'][0]
+        if len(directive['Metrics']) > MAX_METRICS_PER_RECORD:
+            problems.append(f"{len(directive['Metrics'])} metrics in one record")
+        for key in dims:
+            if key not in record:
+                problems.append(f"dimension {key} missing")
+        for definition in directive['Metrics']:
+            name = definition['Name']
+            if name not in record:
+                problems.append(f"metric {name} defined but missing")
+                continue
+            values = record[name] if isinstance(record[name], list) else [record[name]]
+            if len(values) > MAX_VALUES_PER_METRIC:
+                problems.append(f"{name}: {len(values)} values")
+            if name == 'ColdStart' and definition.get('StorageResolution') != 1:
+                problems.append('high resolution lost')
+            seen.setdefault((name, tuple(sorted((d, record[d]) for d in dims))), []).extend(values)
+    if seen != expected:
+        problems.append('values differ after flush')
+    if buffer.pending():
+        problems.append('buffer not drained')
+    print(f"format: {written} EMF records, {len(seen)} metric series, problems: {len(problems)}")
+    for problem in problems[:10]:
+        print(f"  {problem}")
+    return not problems
+
+
+def _legacy_request(tools, put_latency_s):
+    # One synchronous PutMetricData per emit site (old _emit_* helpers).
+    calls = tools + 2   # tool metrics per call, one prefetch metric, one bulkhead batch
+    for _ in range(calls):
+        time.sleep(put_latency_s)
+
+
+def _buffered_request(buffer, tools):
+    for i in range(tools):
+        dims = {'ToolName': f'tool_{i}'}
+        buffer.put('ToolExecutionDurationMs', 800.0 + i, unit='Milliseconds', dimensions=dims, namespace='SmartRuralAI/Tools')
+        buffer.put('ToolExecutionSuccess', 1.0, unit='Count', dimensions=dims, namespace='SmartRuralAI/Tools')
+    buffer.count('SpeculativePrefetchHit', dimensions={'ToolName': 'tool_0'}, namespace='SmartRuralAI/Tools')
+    dims = {'Bulkhead': 'crop'}
+    for name in ('BulkheadQueueDepth', 'BulkheadSaturation', 'BulkheadRejected'):
+        buffer.put(name, 0.0, unit='Count', dimensions=dims, namespace='SmartRuralAI/Tools')
+    buffer.flush(properties={'request_id': 'bench'})
+
+
+def bench(args):
+    null_buffer = MetricsBuffer(writer=lambda _line: None)
+    results = {}
+    for label, run in (
+        ('legacy', lambda: _legacy_request(args.tools, args.put_latency_ms / 1000.0)),
+        ('buffered', lambda: _buffered_request(null_buffer, args.tools)),
+    ):
+        samples = []
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            run()
+            samples.append((time.perf_counter() - start) * 1000.0)
+        samples.sort()
+        results[label] = (statistics.median(samples), samples[int(len(samples) * 0.99) - 1])
+    print(f"request metric overhead, {args.tools} tools, put_metric_data = {args.put_latency_ms}ms:")
+    for label, (p50, p99) in results.items():
+        print(f"  {label:<9} p50 {p50:8.3f}ms  p99 {p99:8.3f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tools', type=int, default=2, help='tool calls per request')
+    parser.add_argument('--put-latency-ms', type=float, default=25.0, help='emulated PutMetricData round trip')
+    parser.add_argument('--requests', type=int, default=100)
+    args = parser.parse_args()
+    ok = check_format()
+    bench(args)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
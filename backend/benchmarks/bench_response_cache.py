@@ -0,0 +1,176 @@
+# backend/benchmarks/bench_response_cache.py
+# Response cache with the in-memory LRU tier (ENABLE_RESPONSE_CACHE_LRU) vs DynamoDB only
+# Owner: Manoj RS
+#
+# Replays --requests chat requests over --containers orchestrator containers
+# (each with its own tier 1, one shared DynamoDB stand-in). Queries are drawn
+# Zipf-style from a pool of --distinct question signatures; a miss "runs the
+# pipeline" and stores the answer with cache_response(), as the handler does.
+# Reports DynamoDB get_item calls, tier-1/tier-2 hit ratios and lookup latency.
+#
+# Checks:
+#   - a memory hit is a fresh copy (mutating it does not change the next hit)
+#   - a repeated miss is answered by the negative entry without a get_item,
+#     and cache_response() in the same container clears it
+#   - skip_negative=True (single-flight polling) sees another container's write
+#   - entries expire with their category TTL, and tier 1 stays within its bounds
+#
+# Usage (from repo root; needs boto3 importable, no AWS access):
+#   python backend/benchmarks/bench_response_cache.py
+#   python backend/benchmarks/bench_response_cache.py --requests 5000 --containers 8 --distinct 400
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+ORCHESTRATOR_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'lambdas', 'agent_orchestrator'))
+sys.path.insert(0, ORCHESTRATOR_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import aws_standins  # noqa: E402
+
+TOPICS = ['weather forecast for this week', 'best fertilizer for paddy', 'pm kisan subsidy eligibility',
+          'drip irrigation for sugarcane', 'yellow leaves on tomato plants', 'when to sow groundnut',
+          'crop insurance claim', 'pest spray for cotton bollworm']
+DISTRICTS = ['Coimbatore', 'Madurai', 'Salem', 'Thanjavur', 'Erode', 'Guntur', 'Nashik', 'Ludhiana']
+
+
+class CountingTable:
+    """Wraps the stand-in table and counts get_item calls."""
+
+    def __init__(self, table):
+        self.table = table
+        self.get_items = 0
+
+    def get_item(self, **kwargs):
+        self.get_items += 1
+        return self.table.get_item(**kwargs)
+
+    def put_item(self, **kwargs):
+        return self.table.put_item(**kwargs)
+
+
+def _signatures(distinct, seed):
+    rng = random.Random(seed)
+    return [(f"{rng.choice(TOPICS)} {i}", rng.choice(DISTRICTS), rng.choice(['paddy', 'cotton', ''])) for i in range(distinct)]
+
+
+def replay(response_cache, args, lru):
+    import boto3
+    response_cache.ENABLE_RESPONSE_CACHE_LRU = lru
+    table = CountingTable(boto3.resource('dynamodb').Table(f"bench_sessions_{int(lru)}"))
+    response_cache._table = table
+    response_cache.clear_memory_tier()
+    tiers = [response_cache._MemoryTier(response_cache.RESPONSE_CACHE_LRU_MAX_ENTRIES,
+                                        response_cache.RESPONSE_CACHE_LRU_MAX_BYTES) for _ in range(args.containers)]
+    signatures = _signatures(args.distinct, args.seed)
+    weights = [1.0 / (i + 1) ** 1.05 for i in range(len(signatures))]
+    rng = random.Random(args.seed)
+    lookup_ms = []
+    for i in range(args.requests):
+        query, location, crop = rng.choices(signatures, weights=weights)[0]
+        response_cache._memory = tiers[i % args.containers]
+        start = time.perf_counter()
+        cached = response_cache.get_cached_response(query, location, crop)
+        lookup_ms.append((time.perf_counter() - start) * 1000.0)
+        if not cached:
+            response_cache.cache_response(query, location, crop, None,
+                                          {'reply_en': f"Advice for {query} in {location}", 'tools_used': [],
+                                           'sources': 'KB'})
+    stats = response_cache.response_cache_stats()
+    return table.get_items, lookup_ms, stats
+
+
+def checks(response_cache):
+    import boto3
+    problems = []
+    response_cache.ENABLE_RESPONSE_CACHE_LRU = True
+    table = CountingTable(boto3.resource('dynamodb').Table('bench_sessions_checks'))
+    response_cache._table = table
+    container_a = response_cache._MemoryTier(64, 1024 * 1024)
+    container_b = response_cache._MemoryTier(64, 1024 * 1024)
+
+    response_cache._memory = container_a
+    response_cache.cache_response('rain tomorrow', 'Salem', '', None, {'reply_en': 'Light rain', 'tools_used': []})
+    first = response_cache.get_cached_response('rain tomorrow', 'Salem', '')
+    first['reply_en'] = 'mutated'
+    second = response_cache.get_cached_response('rain tomorrow', 'Salem', '')
+    if table.get_items or second.get('reply_en') != 'Light rain' or second.get('_cache_tier') != 'memory':
+        problems.append('memory hit missing or shared between callers')
+
+    before = table.get_items
+    response_cache.get_cached_response('cotton price', 'Erode', 'cotton')
+    response_cache.get_cached_response('cotton price', 'Erode', 'cotton')
+    if table.get_items - before != 1:
+        problems.append('repeated miss went to DynamoDB again')
+    response_cache.cache_response('cotton price', 'Erode', 'cotton', None, {'reply_en': 'Rs 7000/qtl'})
+    if not response_cache.get_cached_response('cotton price', 'Erode', 'cotton'):
+        problems.append('negative entry survived cache_response')
+
+    response_cache._memory = container_b
+    response_cache.get_cached_response('wheat rust', 'Karnal', 'wheat')      # B remembers the miss
+    response_cache._memory = container_a
+    response_cache.cache_response('wheat rust', 'Karnal', 'wheat', None, {'reply_en': 'Spray propiconazole'})
+    response_cache._memory = container_b
+    if response_cache.get_cached_response('wheat rust', 'Karnal', 'wheat'):
+        problems.append('negative entry not used')
+    polled = response_cache.get_cached_response('wheat rust', 'Karnal', 'wheat', skip_negative=True)
+    if not polled or polled.get('_cache_tier') != 'dynamodb':
+        problems.append('skip_negative did not reach DynamoDB')
+
+    ttl = response_cache.CACHE_TTL['weather']
+    response_cache.CACHE_TTL['weather'] = 1
+    response_cache.cache_response('weather forecast', 'Madurai', '', None, {'reply_en': 'Sunny'})
+    response_cache.CACHE_TTL['weather'] = ttl
+    time.sleep(1.1)
+    if response_cache.get_cached_response('weather forecast', 'Madurai', ''):
+        problems.append('expired entry was served')
+
+    small = response_cache._MemoryTier(10, 2000)
+    response_cache._memory = small
+    for i in range(40):
+        response_cache.cache_response(f"question {i}", 'Salem', '', None, {'reply_en': 'x' * 150})
+    entries, size = small.size()
+    if entries > 10 or size > 2000:
+        problems.append(f"tier 1 over its bounds: {entries} entries, {size} bytes")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=3000)
+    parser.add_argument('--containers', type=int, default=6)
+    parser.add_argument('--distinct', type=int, default=300, help='distinct question signatures')
+    parser.add_argument('--latency-scale', type=float, default=0.1, help='scale on stand-in latencies')
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+
+    aws_standins.install(aws_standins.LatencyModel(scale=args.latency_scale, seed=args.seed))
+    from utils import response_cache
+
+    print(f"{args.requests} requests, {args.distinct} signatures, {args.containers} containers "
+          f"(latency scale {args.latency_scale})")
+    print(f"{'mode':<14} {'get_item':>9} {'tier1':>7} {'tier2':>7} {'neg':>6} {'hit%':>6} "
+          f"{'p50 ms':>7} {'mean ms':>8}")
+    for lru in (False, True):
+        get_items, lookup_ms, stats = replay(response_cache, args, lru)
+        lookup_ms.sort()
+        # Hit ratios are only counted with the LRU tier on.
+        ratios = (f"{stats['tier1_hit_ratio'] * 100:>6.1f}% {stats['tier2_hit_ratio'] * 100:>6.1f}% "
+                  f"{stats['negative']:>6} {stats['hit_ratio'] * 100:>5.1f}%") if lru else \
+            f"{'-':>7} {'-':>7} {'-':>6} {'-':>6}"
+        print(f"{'lru' if lru else 'dynamodb-only':<14} {get_items:>9} {ratios} "
+              f"{lookup_ms[len(lookup_ms) // 2]:>7.2f} {statistics.mean(lookup_ms):>8.2f}")
+
+    problems = checks(response_cache)
+    print(f"problems: {len(problems)}")
+    for problem in problems:
+        print(f"  {problem}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == '__main__':
+    main()
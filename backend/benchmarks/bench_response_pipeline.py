@@ -0,0 +1,275 @@
+# backend/benchmarks/bench_response_pipeline.py
+# Golden-output check + benchmark for utils/response_pipeline.py
+# Owner: Manoj RS
+#
+# 1. Golden outputs: corpus/postprocess_golden.jsonl holds inputs and the
+#    outputs the old helpers produced (benchmarks/legacy_postprocess.py).
+#    Every row must come out of the pipeline byte-for-byte identical.
+# 2. Fuzz: --fuzz random answers assembled from markdown / Indic / unit /
+#    junk-character fragments go through both implementations.
+# 3. Benchmark: old chain vs pipeline on long English answers and long
+#    Hindi / Tamil / Telugu replies.
+#
+# Any mismatch is printed and the script exits non-zero.
+#
+# Usage (from repo root):
+#   python backend/benchmarks/bench_response_pipeline.py
+#   python backend/benchmarks/bench_response_pipeline.py --fuzz 5000 --rounds 50
+#   python backend/benchmarks/bench_response_pipeline.py --write-golden   # only after an intended output change
+#
+# Requires boto3 to be importable; AWS clients are replaced by the aws_standins
+# stand-ins, so no credentials are needed.
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ORCHESTRATOR_DIR = os.path.abspath(os.path.join(BENCH_DIR, '..', 'lambdas', 'agent_orchestrator'))
+GOLDEN_PATH = os.path.join(BENCH_DIR, 'corpus', 'postprocess_golden.jsonl')
+
+ENGLISH_CASES = [
+    ('markdown-basic', "## Advisory\n\nWater early in the morning.\n\n* **Irrigation:** every 3 days\n* **Urea:** 25 kg/acre\n\nSources: get_weather"),
+    ('markdown-indented-headings', "   ### Soil Health\n  #Fertilizer Plan\n    •  Apply DAP at sowing\n\t• Top dress urea\n\n\n\nDone.   \n"),
+    ('markdown-hash-only-line', "Intro\n   ##\n\n    ## Next heading\n  ## Another\r\nEnd"),
+    ('markdown-whitespace-lines', "First\n\n  \n\nSecond\n\t\n\n\nThird\n"),
+    ('markdown-crlf', "# Title\r\n\r\n\r\n\r\n- one\r\n- two  \r\n"),
+    ('agri-terms', "Sow in the Cardiff season, harvest before Rabby. Zaidh crops need water. KHARIFF sowing starts in June."),
+    ('limitation-rice-wheat', "I only have data for rice and wheat. For cotton, irrigate every 10 days. Apply potash at flowering."),
+    ('limitation-tools', "The tools I checked only cover rice and wheat. Unfortunately, the data doesn't include specific details for millets. Use FYM 5 t/acre."),
+    ('limitation-none', "Rice and wheat prices rose this week. Sell in the mandi after grading."),
+    ('sources-multiline', "Spray neem oil at 5 ml/litre.\n\n  Sources: CropAdvisoryFunction(KB), WeatherFunction(OpenWeather)"),
+]
+
+LOCALIZED_CASES = [
+    ('en', 'en-headings', "## Weather\nRain expected.\n## Crop\n**Sow** maize.\n## Market\n* Price Rs. 22/kg\n* Rs 1,250 per kg for turmeric\n\n\n\n1) First\n1) Second\n1) Third"),
+    ('en', 'en-few-headings', "# Only one\n- bullet\n- another *star*\n   # indented heading\n#"),
+    ('hi', 'hi-basic', "## मौसम\nअगले 3 दिन बारिश की संभावना है।\n\n1। खेत में पानी निकालें\n1। यूरिया का छिड़काव रोकें\n\n* **कीमत:** ₹ 22 प्रति किलोग्राम\n* दर रु. 1,800/किलो\naमिट्टी की जांच करें b"),
+    ('ta', 'ta-basic', "### வானிலை\nமழை  பெய்யும்    வாய்ப்பு உள்ளது.\n\n• நெல்  விதைக்கவும்\n1) முதல்\n2) இரண்டு\n\nவிலை ₹20/கிலோ கிராம்\nகுயிண்டல் விலை அதிகம்"),
+    ('te', 'te-basic', "## వాతావరణం\nవర్షం  పడే అవకాశం ఉంది.\n* ధర రూ. 25 ప్రతి కిలో\nక్వింటల్ ధర\n\n\n\nxపంట బాగుంది"),
+    ('kn', 'kn-junk', "<span class='x'>ಬೆಳೆ</span> ಮಾಹಿತಿ​\n‌ಮಣ್ಣು﻿ ಪರೀಕ್ಷೆ\x07\nನೀರು�\r\n  - ಗೊಬ್ಬರ"),
+    ('mr', 'mr-numbered-runs', "1. पहिले\n1. दुसरे\n   1. उप\n   1. उप२\n2. तिसरे\n\n1. नवीन"),
+    ('xx', 'unknown-lang', "## Heading\n**bold** text\n‍zwj\n"),
+]
+
+_FUZZ_FRAGMENTS = [
+    '## Heading', '  ### Indented heading', '#NoSpace', '   ##', '#', '# ', '####### seven',
+    '- dash item', '* star item', '• unicode bullet', '  •  indented bullet', '*lonely', '**bold** words',
+    '1) first', '1. again', '1। हिंदी', '2۔ urdu', '12) twelve', '  1. nested', '\t1) tabbed',
+    'Rs. 22/kg', '₹ 1,250 per kg', 'रु. 18 प्रति किलोग्राम', 'ரூ. 30/கிலோ', 'రూ 40 ప్రతి కిలో', 'INR 5 ko kilo',
+    'क्विन्टल', 'किलो ग्राम', 'குயிண்டல்', 'கிலோ கிராம்', 'క్వింటా', 'కిలో గ్రాము',
+    'aमिट्टी', 'पानीb', 'xநீர்', 'నీరుy', 'plain english line', 'only rice and wheat are covered.',
+    'Cardiff sowing', 'rabbi season', '<span>tag</span>', '<SPAN style="x">', '​', '‌‍', '﻿',
+    '�', '\x07', '', '\x0b', '  ', '\t', '', '', '', 'trailing   ', 'Sources: get_weather',
+    'multiple   inner   spaces', 'ಕನ್ನಡ  ಪದ', 'বাংলা  শব্দ',
+]
+_FUZZ_LANGS = ['en', 'hi', 'ta', 'te', 'kn', 'ml', 'mr', 'bn', 'gu', 'pa', 'or', 'ur', 'xx']
+
+_LONG_PARAGRAPHS = {
+    'hi': (
+        "## फसल सलाह\n"
+        "इस सप्ताह आपके जिले में हल्की बारिश की संभावना है, इसलिए सिंचाई दो दिन के लिए रोक दें।\n\n"
+        "1। **उर्वरक:** बुवाई के 25 दिन बाद प्रति एकड़ 25 किलोग्राम यूरिया डालें।\n"
+        "1। **कीट नियंत्रण:** पत्तियों के नीचे सफेद मक्खी की जांच हर तीसरे दिन करें।\n"
+        "1। **बाजार:** मंडी में आज का भाव ₹ 22 प्रति किलोग्राम है, MSP से तुलना करें।\n\n"
+        "* नीम  तेल 5 मिली प्रति लीटर पानी में मिलाकर छिड़काव करें।\n"
+        "* खेत की मेड़ों को साफ रखें ताकि कीटों का प्रकोप कम हो।\n\n\n"
+    ),
+    'ta': (
+        "### பயிர் ஆலோசனை\n"
+        "இந்த வாரம் உங்கள் மாவட்டத்தில் லேசான மழை  பெய்யும் வாய்ப்பு உள்ளது.\n\n"
+        "1) **உரம்:** விதைத்த 25 நாட்களுக்குப் பிறகு ஏக்கருக்கு 25 கிலோகிராம் யூரியா இடவும்.\n"
+        "1) **பூச்சி:** இலைகளின் அடியில் வெள்ளை ஈ உள்ளதா என்று பார்க்கவும்.\n"
+        "1) **சந்தை:** இன்றைய விலை ₹20/கிலோ, குயிண்டல் விலையுடன் ஒப்பிடவும்.\n\n"
+        "• வேப்ப எண்ணெய் 5 மிலி ஒரு லிட்டர் தண்ணீரில் கலந்து தெளிக்கவும்.\n\n\n"
+    ),
+    'te': (
+        "## పంట సలహా\n"
+        "ఈ వారం మీ జిల్లాలో తేలికపాటి  వర్షం పడే అవకాశం ఉంది.\n\n"
+        "1. **ఎరువు:** విత్తిన 25 రోజుల తర్వాత ఎకరానికి 25 కిలోగ్రాము యూరియా వేయండి.\n"
+        "1. **పురుగు:** ఆకుల కింద తెల్లదోమ ఉందో చూడండి.\n"
+        "1. **మార్కెట్:** నేటి ధర రూ. 25 ప్రతి కిలో, క్వింటల్ ధరతో పోల్చండి.\n\n"
+        "* వేప నూనె 5 మి.లీ. లీటరు నీటిలో కలిపి పిచికారీ చేయండి.\n\n\n"
+    ),
+}
+_LONG_ENGLISH = (
+    "## Weekly Advisory\n\n"
+    "   ### Irrigation\n"
+    "Water early in the morning; skip irrigation if rainfall above 10 mm is forecast for the Cardiff crop.\n\n"
+    "  • **Nutrients:** apply 25 kg urea per acre in two split doses after weeding.\n"
+    "  • **Pest watch:** inspect the lower leaves every 3 days for yellowing or brown spots.\n\n\n\n"
+    "#Market\n"
+    "Check the nearest mandi rate before harvest and compare with MSP.   \n\n"
+)
+
+
+def _import_modules():
+    os.environ.setdefault('AWS_REGION', 'ap-south-1')
+    os.environ.setdefault('AWS_DEFAULT_REGION', os.environ['AWS_REGION'])
+    sys.path.insert(0, BENCH_DIR)
+    sys.path.insert(0, ORCHESTRATOR_DIR)
+    import aws_standins
+    aws_standins.install(aws_standins.LatencyModel(scale=0.0))
+    import legacy_postprocess
+    from utils import response_pipeline
+    from utils.translate_helper import normalize_language_code
+    logging.getLogger().setLevel(logging.WARNING)
+    return legacy_postprocess, response_pipeline, normalize_language_code
+
+
+def _legacy_output(legacy, stage, text, lang=None, strip_symbols=True):
+    if stage == 'clean':
+        return legacy._post_process_response(text)
+    if stage == 'markdown':
+        return legacy._normalize_output_markdown(text)
+    if stage == 'sources':
+        return list(legacy._strip_sources_line(text))
+    legacy.STRIP_LOCAL_MARKDOWN_SYMBOLS = strip_symbols
+    try:
+        return legacy._strip_local_markdown_symbols(text, lang)
+    finally:
+        legacy.STRIP_LOCAL_MARKDOWN_SYMBOLS = True
+
+
+def _new_output(pipeline, normalize_language_code, stage, text, lang=None, strip_symbols=True):
+    if stage == 'clean':
+        return pipeline.clean_model_text(text)
+    if stage == 'markdown':
+        return pipeline.normalize_markdown(text)
+    if stage == 'sources':
+        return list(pipeline.strip_sources_line(text))
+    return pipeline.clean_localized_text(
+        text, normalize_language_code(lang or 'en', default='en'), strip_symbols=strip_symbols)
+
+
+def _golden_inputs():
+    rows = []
+    for case_id, text in ENGLISH_CASES:
+        for stage in ('clean', 'markdown', 'sources'):
+            rows.append({'id': f'{stage}:{case_id}', 'stage': stage, 'input': text})
+    for lang, case_id, text in LOCALIZED_CASES:
+        for strip_symbols in (True, False):
+            rows.append({'id': f'localized:{case_id}:{"strip" if strip_symbols else "keep"}',
+                         'stage': 'localized', 'lang': lang, 'strip_symbols': strip_symbols, 'input': text})
+    for lang, paragraph in _LONG_PARAGRAPHS.items():
+        rows.append({'id': f'localized:long-{lang}', 'stage': 'localized', 'lang': lang,
+                     'strip_symbols': True, 'input': paragraph * 4})
+    return rows
+
+
+def write_golden(legacy):
+    rows = _golden_inputs()
+    with open(GOLDEN_PATH, 'w', encoding='utf-8') as f:
+        for row in rows:
+            row['expected'] = _legacy_output(legacy, row['stage'], row['input'], row.get('lang'),
+                                             row.get('strip_symbols', True))
+            f.write(json.dumps(row, ensure_ascii=False) + '\n')
+    print(f"Wrote {len(rows)} golden rows → {GOLDEN_PATH}")
+
+
+def check_golden(pipeline, normalize_language_code):
+    mismatches = 0
+    rows = 0
+    with open(GOLDEN_PATH, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            rows += 1
+            got = _new_output(pipeline, normalize_language_code, row['stage'], row['input'],
+                              row.get('lang'), row.get('strip_symbols', True))
+            if got != row['expected']:
+                mismatches += 1
+                print(f"GOLDEN MISMATCH {row['id']}\n  expected={row['expected']!r}\n  got     ={got!r}")
+    print(f"golden: {rows} rows, {mismatches} mismatches")
+    return mismatches
+
+
+def fuzz(legacy, pipeline, normalize_language_code, iterations, seed):
+    rng = random.Random(seed)
+    mismatches = 0
+    for i in range(iterations):
+        parts = []
+        for _ in range(rng.randint(1, 14)):
+            fragment = rng.choice(_FUZZ_FRAGMENTS)
+            if rng.random() < 0.3:
+                fragment = rng.choice(['  ', '\t', ' ', '']) + fragment
+            if rng.random() < 0.2:
+                fragment += rng.choice([' ', '  ', '\t', '\r'])
+            parts.append(fragment)
+        text = rng.choice(['\n', '\n', '\r\n', ' ']).join(parts)
+        for stage in ('clean', 'markdown', 'sources', 'localized'):
+            lang = rng.choice(_FUZZ_LANGS)
+            strip_symbols = rng.random() < 0.8
+            expected = _legacy_output(legacy, stage, text, lang, strip_symbols)
+            got = _new_output(pipeline, normalize_language_code, stage, text, lang, strip_symbols)
+            if got != expected:
+                mismatches += 1
+                if mismatches <= 5:
+                    print(f"FUZZ MISMATCH #{i} stage={stage} lang={lang} strip={strip_symbols}\n"
+                          f"  input   ={text!r}\n  expected={expected!r}\n  got     ={got!r}")
+    print(f"fuzz: {iterations} answers x 4 stages, {mismatches} mismatches")
+    return mismatches
+
+
+def _time_us(fn, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def benchmark(legacy, pipeline, normalize_language_code, rounds, repeat):
+    english = _LONG_ENGLISH * repeat
+
+    def legacy_english():
+        text = legacy._post_process_response(english)
+        text = legacy._normalize_output_markdown(text)
+        return legacy._strip_sources_line(text)
+
+    def new_english():
+        text = pipeline.clean_model_text(english)
+        text = pipeline.normalize_markdown(text)
+        return pipeline.strip_sources_line(text)
+
+    rows = [('english chain', len(english), _time_us(legacy_english, rounds), _time_us(new_english, rounds))]
+    for lang, paragraph in _LONG_PARAGRAPHS.items():
+        text = paragraph * repeat
+        code = normalize_language_code(lang)
+        rows.append((
+            f'localized {lang}', len(text),
+            _time_us(lambda: legacy._strip_local_markdown_symbols(text, lang), rounds),
+            _time_us(lambda: pipeline.clean_localized_text(text, code), rounds),
+        ))
+
+    print(f"\n{'':<16} {'chars':>7} {'old':>10} {'pipeline':>10} {'speedup':>8}")
+    for name, chars, old_us, new_us in rows:
+        print(f"{name:<16} {chars:>7} {old_us:8.0f}us {new_us:8.0f}us {old_us / max(new_us, 1e-9):7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--write-golden', action='store_true', help='regenerate goldens from legacy_postprocess.py')
+    parser.add_argument('--fuzz', type=int, default=2000, help='random answers compared against the old code')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--rounds', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=8, help='paragraph repetitions per long response')
+    args = parser.parse_args()
+
+    legacy, pipeline, normalize_language_code = _import_modules()
+    if args.write_golden:
+        write_golden(legacy)
+        return
+
+    mismatches = check_golden(pipeline, normalize_language_code)
+    mismatches += fuzz(legacy, pipeline, normalize_language_code, args.fuzz, args.seed)
+    benchmark(legacy, pipeline, normalize_language_code, args.rounds, args.repeat)
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
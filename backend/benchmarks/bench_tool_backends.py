@@ -0,0 +1,107 @@
+# backend/benchmarks/bench_tool_backends.py
+# Compare tool execution latency: in-process handler call vs Lambda-to-Lambda invoke
+# Owner: Manoj RS
+#
+# Usage (from repo root):
+#   python backend/benchmarks/bench_tool_backends.py --tool search_schemes \
+#       --input '{"query": "all", "state": "Tamil Nadu"}' --iterations 50
+#   # add --lambda-name smart-rural-ai-GovtSchemes... to also measure the invoke path
+#
+# The in-process path needs no AWS access for govt_schemes; weather/crop/profile
+# tools call their own AWS/HTTP dependencies either way, so the difference
+# measured there is the invoke + payload serialization overhead.
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+ORCHESTRATOR_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'lambdas', 'agent_orchestrator'))
+sys.path.insert(0, ORCHESTRATOR_DIR)
+
+
+def _tool_event(tool_name, tool_input):
+    # Mirrors handler._tool_event without importing the orchestrator (and its AWS clients).
+    if tool_name == 'get_weather':
+        return {'pathParameters': {'location': tool_input.get('location', 'Chennai')}}
+    if tool_name == 'get_farmer_profile':
+        return {'pathParameters': {'farmerId': tool_input.get('farmer_id', '')}}
+    return {'queryStringParameters': dict(tool_input)}
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def _report(label, samples_ms, extra=''):
+    print(
+        f"{label:<12} n={len(samples_ms):<4} "
+        f"mean={statistics.mean(samples_ms):8.2f}ms  p50={_percentile(samples_ms, 50):8.2f}ms  "
+        f"p95={_percentile(samples_ms, 95):8.2f}ms  max={max(samples_ms):8.2f}ms {extra}"
+    )
+
+
+def bench_in_process(tool_name, tool_input, iterations):
+    os.environ['IN_PROCESS_TOOLS'] = tool_name
+    from utils import tool_backends
+    tool_backends.IN_PROCESS_TOOLS.add(tool_name)
+
+    load_start = time.perf_counter()
+    tool_backends.preload_in_process_tools()
+    load_ms = (time.perf_counter() - load_start) * 1000.0
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        response = tool_backends.invoke_in_process(tool_name, _tool_event(tool_name, tool_input))
+        json.loads(response['body'])
+        samples.append((time.perf_counter() - start) * 1000.0)
+    _report('in-process', samples, extra=f"(handler import {load_ms:.1f}ms)")
+    return samples
+
+
+def bench_lambda_invoke(tool_name, tool_input, iterations, lambda_name):
+    import boto3
+    client = boto3.client('lambda', region_name=os.environ.get('AWS_REGION', 'ap-south-1'))
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        response = client.invoke(
+            FunctionName=lambda_name,
+            InvocationType='RequestResponse',
+            Payload=json.dumps(_tool_event(tool_name, tool_input)).encode(),
+        )
+        payload = json.loads(response['Payload'].read().decode())
+        json.loads(payload['body'])
+        samples.append((time.perf_counter() - start) * 1000.0)
+    _report('lambda', samples)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tool', default='search_schemes')
+    parser.add_argument('--input', default='{"query": "all", "state": "Tamil Nadu"}')
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--lambda-name', default='', help='Deployed tool function name for the invoke path')
+    args = parser.parse_args()
+
+    tool_input = json.loads(args.input)
+    print(f"Tool: {args.tool} | input={tool_input} | iterations={args.iterations}")
+    in_proc = bench_in_process(args.tool, tool_input, args.iterations)
+    if args.lambda_name:
+        invoke = bench_lambda_invoke(args.tool, tool_input, args.iterations, args.lambda_name)
+        speedup = _percentile(invoke, 50) / max(_percentile(in_proc, 50), 1e-6)
+        print(f"p50 speedup (lambda / in-process): {speedup:.1f}x")
+    else:
+        print("Lambda invoke path skipped (pass --lambda-name to compare against a deployed function)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+# backend/benchmarks/bench_tool_cache.py
+# Tool-result cache (utils/tool_cache.py, ENABLE_TOOL_RESULT_CACHE) vs invoking every tool call
+# Owner: Manoj RS
+#
+# Replays --calls tool calls from a farmer population spread over --containers
+# orchestrator containers (each with its own memory tier, one shared DynamoDB
+# stand-in). Inputs are drawn Zipf-style from districts / states / crops, with
+# the casing and spacing variations farmers and the model actually produce
+# ("Coimbatore", " coimbatore", "COIMBATORE"), plus some get_farmer_profile
+# calls that must never be cached. Reports per tool: tool Lambda invocations,
+# hit ratio by tier, and per-call latency with and without the cache.
+#
+# Checks:
+#   - a cached result equals the result of a fresh invocation
+#   - get_farmer_profile and error results are never stored
+#   - entries expire after their TTL (memory and DynamoDB)
+#   - the memory tier never grows past TOOL_CACHE_MAX_ENTRIES
+#
+# Usage (from repo root; needs boto3 importable, no AWS access):
+#   python backend/benchmarks/bench_tool_cache.py
+#   python backend/benchmarks/bench_tool_cache.py --calls 4000 --containers 20 --latency-scale 0.2
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from collections import OrderedDict
+
+ORCHESTRATOR_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'lambdas', 'agent_orchestrator'))
+sys.path.insert(0, ORCHESTRATOR_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import aws_standins  # noqa: E402
+
+DISTRICTS = ['Coimbatore', 'Madurai', 'Salem', 'Thanjavur', 'Erode', 'Tiruppur', 'Vellore', 'Guntur',
+             'Nashik', 'Ludhiana', 'Mysuru', 'Warangal', 'Karnal', 'Indore', 'Rajkot', 'Hassan',
+             'Belagavi', 'Nagpur', 'Bathinda', 'Kurnool']
+STATES = ['Tamil Nadu', 'Karnataka', 'Maharashtra', 'Punjab', 'Andhra Pradesh', 'Telangana',
+          'Madhya Pradesh', 'Gujarat', 'Haryana', 'Kerala']
+CROPS = ['paddy', 'cotton', 'sugarcane', 'tomato', 'groundnut', 'maize', 'wheat', 'banana', 'chilli', 'onion']
+TOOL_MIX = [('get_weather', 0.4), ('search_schemes', 0.25), ('get_crop_advisory', 0.2),
+            ('get_pest_alert', 0.1), ('get_farmer_profile', 0.05)]
+LAMBDA_FOR = {'get_weather': 'WeatherFunction', 'search_schemes': 'GovtSchemesFunction',
+              'get_crop_advisory': 'CropAdvisoryFunction', 'get_pest_alert': 'CropAdvisoryFunction',
+              'get_farmer_profile': 'FarmerProfileFunction'}
+
+
+def _zipf(rng, items, s=1.1):
+    weights = [1.0 / (i + 1) ** s for i in range(len(items))]
+    return rng.choices(items, weights=weights)[0]
+
+
+def _vary(rng, text):
+    return rng.choice([text, text.lower(), text.upper(), f" {text}", f"{text}  ", text.title()])
+
+
+def _tool_call(rng):
+    tool = rng.choices([t for t, _ in TOOL_MIX], weights=[w for _, w in TOOL_MIX])[0]
+    if tool == 'get_weather':
+        return tool, {'location': _vary(rng, _zipf(rng, DISTRICTS))}
+    if tool == 'search_schemes':
+        return tool, {'query': 'all', 'state': _vary(rng, _zipf(rng, STATES))}
+    if tool == 'get_farmer_profile':
+        return tool, {'farmer_id': f"ph_98765{rng.randint(0, 99999):05d}"}
+    state, crop = _zipf(rng, STATES), _zipf(rng, CROPS)
+    if tool == 'get_pest_alert':
+        return tool, {'crop': _vary(rng, crop), 'state': state, 'symptoms': 'leaf curl', 'query_type': 'pest'}
+    return tool, {'crop': _vary(rng, crop), 'state': _vary(rng, state), 'season': 'kharif', 'query': ''}
+
+
+class ToolInvoker:
+    """Invokes the tool 'Lambdas' on the stand-in client and counts calls per tool."""
+
+    def __init__(self):
+        import boto3
+        self.client = boto3.client('lambda')
+        self.invocations = {}
+        self.fail_next = False
+
+    def __call__(self, tool_name, tool_input):
+        self.invocations[tool_name] = self.invocations.get(tool_name, 0) + 1
+        if self.fail_next:
+            self.fail_next = False
+            return {'error': 'Tool invocation failed'}
+        resp = self.client.invoke(FunctionName=LAMBDA_FOR[tool_name], Payload=json.dumps(tool_input).encode())
+        return json.loads(json.loads(resp['Payload'].read())['body'])
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))] if ordered else 0.0
+
+
+def replay(tool_cache, calls, containers, seed, cached):
+    tool_cache.ENABLE_TOOL_RESULT_CACHE = cached
+    tool_cache.clear_tool_cache()
+    invoker = ToolInvoker()
+    memories = [OrderedDict() for _ in range(containers)]
+    rng = random.Random(seed)
+    latencies = {}
+    for _ in range(calls):
+        tool, tool_input = _tool_call(rng)
+        tool_cache._memory = rng.choice(memories)
+        start = time.perf_counter()
+        tool_cache.cached_tool_call(tool, tool_input, invoker)
+        latencies.setdefault(tool, []).append((time.perf_counter() - start) * 1000.0)
+    return invoker.invocations, latencies, tool_cache.tool_cache_stats(), memories
+
+
+def checks(tool_cache):
+    problems = []
+    tool_cache.ENABLE_TOOL_RESULT_CACHE = True
+    tool_cache._memory = OrderedDict()
+    tool_cache.clear_tool_cache()
+    invoker = ToolInvoker()
+
+    fresh = invoker('get_weather', {'location': 'Pollachi'})
+    tool_cache.cached_tool_call('get_weather', {'location': 'Pollachi'}, invoker)
+    hit = tool_cache.cached_tool_call('get_weather', {'location': '  POLLACHI ', 'days': None}, invoker)
+    if hit != fresh or invoker.invocations['get_weather'] != 2:
+        problems.append('canonical weather input did not hit, or hit differs from a fresh result')
+
+    tool_cache.cached_tool_call('get_farmer_profile', {'farmer_id': 'ph_1'}, invoker)
+    tool_cache.cached_tool_call('get_farmer_profile', {'farmer_id': 'ph_1'}, invoker)
+    if invoker.invocations['get_farmer_profile'] != 2 or 'get_farmer_profile' in tool_cache.tool_cache_stats():
+        problems.append('get_farmer_profile was cached')
+
+    invoker.fail_next = True
+    tool_cache.cached_tool_call('search_schemes', {'state': 'Kerala'}, invoker)
+    tool_cache.cached_tool_call('search_schemes', {'state': 'Kerala'}, invoker)
+    if invoker.invocations['search_schemes'] != 2:
+        problems.append('an error result was cached')
+
+    ttl = tool_cache.TOOL_CACHE_TTL['get_pest_alert']
+    tool_cache.TOOL_CACHE_TTL['get_pest_alert'] = 0.05
+    tool_cache.cached_tool_call('get_pest_alert', {'crop': 'tomato'}, invoker)
+    time.sleep(0.1)
+    tool_cache._memory = OrderedDict()   # a different container: DynamoDB tier only
+    tool_cache.cached_tool_call('get_pest_alert', {'crop': 'tomato'}, invoker)
+    tool_cache.TOOL_CACHE_TTL['get_pest_alert'] = ttl
+    if invoker.invocations['get_pest_alert'] != 2:
+        problems.append('expired entry was served')
+
+    limit = tool_cache.TOOL_CACHE_MAX_ENTRIES
+    for i in range(limit + 50):
+        tool_cache.cached_tool_call('get_weather', {'location': f"village-{i}"}, invoker)
+    if len(tool_cache._memory) > limit:
+        problems.append(f"memory tier holds {len(tool_cache._memory)} > {limit} entries")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--calls', type=int, default=2000)
+    parser.add_argument('--containers', type=int, default=10)
+    parser.add_argument('--latency-scale', type=float, default=0.1, help='scale on stand-in latencies')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    aws_standins.install(aws_standins.LatencyModel(scale=args.latency_scale, seed=args.seed))
+    from utils import tool_cache
+
+    runs = {}
+    for cached in (False, True):
+        runs[cached] = replay(tool_cache, args.calls, args.containers, args.seed, cached)
+
+    base_calls, base_lat, _, _ = runs[False]
+    calls, lat, stats, memories = runs[True]
+    print(f"{args.calls} tool calls over {args.containers} containers (latency scale {args.latency_scale})")
+    print(f"{'tool':<20} {'invokes':>8} {'cached':>7} {'mem':>6} {'ddb':>6} {'hit%':>6} "
+          f"{'p50 ms':>8} {'->':>2} {'p50 ms':>7} {'mean ms':>8} {'->':>2} {'mean ms':>7}")
+    for tool, _ in TOOL_MIX:
+        s = stats.get(tool, {})
+        print(f"{tool:<20} {base_calls.get(tool, 0):>8} {calls.get(tool, 0):>7} {s.get('memory', 0):>6} "
+              f"{s.get('dynamodb', 0):>6} {s.get('hit_ratio', 0.0) * 100:>5.1f}% "
+              f"{_percentile(base_lat.get(tool, []), 50):>8.1f} {'':>2} {_percentile(lat.get(tool, []), 50):>7.1f} "
+              f"{statistics.mean(base_lat.get(tool, [0])):>8.1f} {'':>2} {statistics.mean(lat.get(tool, [0])):>7.1f}")
+    print(f"tool Lambda invocations: {sum(base_calls.values())} -> {sum(calls.values())}; "
+          f"largest memory tier {max(len(m) for m in memories)} entries")
+
+    problems = checks(tool_cache)
+    print(f"problems: {len(problems)}")
+    for problem in problems:
+        print(f"  {problem}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+# backend/benchmarks/cold_start_entrypoints.py
+# Cold-start cost of the orchestrator entry point vs the slim history entry point
+# Owner: Manoj RS
+#
+# Each sample is a fresh Python process (a cold container), which:
+#   1. imports the entry module   (handler / history_handler)
+#   2. calls lambda_handler once  with a list_sessions body for an anonymous
+#                                 farmer (answered without any network call)
+# and reports import time, first-call time, boto3 clients/resources built at
+# import and by the first call, and the number of loaded modules.
+#
+# Default: real boto3, so client construction (botocore service-model loading)
+# is measured as it happens in Lambda. No credentials or network are needed.
+# --standins: boto3 clients are the aws_standins fakes, and --client-init-ms adds
+# an emulated per-client construction cost.
+#
+# Usage (from repo root):
+#   python backend/benchmarks/cold_start_entrypoints.py --samples 5
+#   python backend/benchmarks/cold_start_entrypoints.py --standins --client-init-ms 60
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ORCHESTRATOR_DIR = os.path.abspath(os.path.join(BENCH_DIR, '..', 'lambdas', 'agent_orchestrator'))
+
+ENTRY_POINTS = ('history_handler', 'handler')
+
+_DRIVER = r'''
+import json, os, sys, time
+bench_dir, orchestrator_dir, module_name, standins, client_init_ms = sys.argv[1:6]
+sys.path.insert(0, orchestrator_dir)
+import boto3
+if standins == '1':
+    sys.path.insert(0, bench_dir)
+    import aws_standins
+    aws_standins.install(aws_standins.LatencyModel(scale=0.0))
+
+built = []
+def _counting(factory, kind):
+    def _build(service, *args, **kwargs):
+        built.append(f"{kind}:{service}")
+        if standins == '1' and float(client_init_ms) > 0:
+            time.sleep(float(client_init_ms) / 1000.0)
+        return factory(service, *args, **kwargs)
+    return _build
+boto3.client = _counting(boto3.client, 'client')
+boto3.resource = _counting(boto3.resource, 'resource')
+
+import logging
+logging.disable(logging.WARNING)
+start = time.perf_counter()
+module = __import__(module_name)
+imported = time.perf_counter()
+clients_at_import = list(built)
+
+class _Context:
+    aws_request_id = 'cold-start-bench'
+    function_name = None
+    def get_remaining_time_in_millis(self):
+        return 29000
+
+event = {'httpMethod': 'POST', 'body': json.dumps({'action': 'list_sessions', 'farmer_id': 'anonymous'})}
+response = module.lambda_handler(event, _Context())
+called = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - start) * 1000.0,
+    'first_call_ms': (called - imported) * 1000.0,
+    'status': response.get('statusCode'),
+    'clients_at_import': clients_at_import,
+    'clients_after_call': built[len(clients_at_import):],
+    'modules': len(sys.modules),
+}))
+'''
+
+
+def _sample(module_name, args):
+    env = dict(os.environ)
+    env.setdefault('AWS_REGION', 'ap-south-1')
+    env.setdefault('AWS_DEFAULT_REGION', env['AWS_REGION'])
+    for name in ('LAMBDA_WEATHER', 'LAMBDA_CROP', 'LAMBDA_SCHEMES', 'LAMBDA_PROFILE'):
+        env.setdefault(name, f'smart-rural-ai-{name.lower()}')
+    out = subprocess.run(
+        [sys.executable, '-c', _DRIVER, BENCH_DIR, ORCHESTRATOR_DIR, module_name,
+         '1' if args.standins else '0', str(args.client_init_ms)],
+        capture_output=True, text=True, env=env, cwd=ORCHESTRATOR_DIR,
+    )
+    lines = [line for line in out.stdout.splitlines() if line.startswith('{')]
+    if out.returncode != 0 or not lines:
+        raise RuntimeError(f"{module_name} sample failed:\n{out.stderr[-2000:]}")
+    return json.loads(lines[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--samples', type=int, default=5, help='fresh processes per entry point')
+    parser.add_argument('--standins', action='store_true', help='use aws_standins fakes instead of real boto3 clients')
+    parser.add_argument('--client-init-ms', type=float, default=0.0,
+                        help='with --standins: emulated construction cost per boto3 client/resource')
+    args = parser.parse_args()
+
+    results = {name: [_sample(name, args) for _ in range(args.samples)] for name in ENTRY_POINTS}
+
+    print(f"{'entry point':<16} {'import p50':>11} {'1st call p50':>13} {'total p50':>10} {'modules':>8}  clients (import / first call)")
+    for name, samples in results.items():
+        import_ms = statistics.median(s['import_ms'] for s in samples)
+        call_ms = statistics.median(s['first_call_ms'] for s in samples)
+        total_ms = statistics.median(s['import_ms'] + s['first_call_ms'] for s in samples)
+        last = samples[-1]
+        print(f"{name:<16} {import_ms:9.0f}ms {call_ms:11.0f}ms {total_ms:8.0f}ms {last['modules']:>8}  "
+              f"{len(last['clients_at_import'])} / {len(last['clients_after_call'])}  "
+              f"{', '.join(last['clients_at_import']) or '-'}")
+        if any(s['status'] != 200 for s in samples):
+            print(f"  warning: {name} returned {[s['status'] for s in samples]}")
+
+
+if __name__ == '__main__':
+    main()
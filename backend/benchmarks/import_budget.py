@@ -0,0 +1,177 @@
+# backend/benchmarks/import_budget.py
+# Import-time budget check for every Lambda entry module
+# Owner: Manoj RS
+#
+# Imports each entry module (backend/lambdas/*/handler.py, plus the orchestrator's
+# history_handler.py) in a fresh Python process, the way a cold container does,
+# and measures:
+#   import_ms           wall time of the import (median of --samples runs)
+#   clients at import   boto3 clients/resources built while importing. Helpers
+#                       should take them from utils/aws_clients.py, which builds
+#                       them on first use.
+#
+# Budgets live in import_budget.json: "default" applies to every module, and an
+# entry keyed "<lambda>/<module>" overrides it. Keys:
+#   import_ms                  maximum median import time
+#   max_clients_at_import      clients allowed beyond the allowed list (default 0)
+#   allowed_clients_at_import  e.g. ["client:s3"], for a module that must
+#                              build a client during init.
+# The script exits non-zero when any module is over budget.
+#
+# Default: real boto3, so client construction costs what it costs in Lambda. No
+# credentials or network are needed; nothing is called at import.
+# --standins: aws_standins fakes instead, with --client-init-ms as an emulated
+# construction cost per client.
+#
+# Usage (from repo root):
+#   python backend/benchmarks/import_budget.py
+#   python backend/benchmarks/import_budget.py --importtime 8          # slowest imports per module
+#   python backend/benchmarks/import_budget.py --standins --client-init-ms 60
+
+import argparse
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+LAMBDAS_DIR = os.path.abspath(os.path.join(BENCH_DIR, '..', 'lambdas'))
+DEFAULT_BUDGETS = os.path.join(BENCH_DIR, 'import_budget.json')
+
+_DRIVER = r'''
+import json, sys, time
+bench_dir, lambda_dir, module_name, standins, client_init_ms = sys.argv[1:6]
+sys.path.insert(0, lambda_dir)
+import boto3
+if standins == '1':
+    sys.path.insert(0, bench_dir)
+    import aws_standins
+    aws_standins.install(aws_standins.LatencyModel(scale=0.0))
+
+built = []
+def _counting(factory, kind):
+    def _build(service, *args, **kwargs):
+        built.append(f"{kind}:{service}")
+        if standins == '1' and float(client_init_ms) > 0:
+            time.sleep(float(client_init_ms) / 1000.0)
+        return factory(service, *args, **kwargs)
+    return _build
+boto3.client = _counting(boto3.client, 'client')
+boto3.resource = _counting(boto3.resource, 'resource')
+
+import logging
+logging.disable(logging.CRITICAL)
+start = time.perf_counter()
+__import__(module_name)
+print(json.dumps({'import_ms': (time.perf_counter() - start) * 1000.0, 'clients': built}))
+'''
+
+
+def entry_modules(only=None):
+    entries = []
+    for handler_path in sorted(glob.glob(os.path.join(LAMBDAS_DIR, '*', 'handler.py'))):
+        lambda_name = os.path.basename(os.path.dirname(handler_path))
+        entries.append((lambda_name, 'handler'))
+        if os.path.exists(os.path.join(LAMBDAS_DIR, lambda_name, 'history_handler.py')):
+            entries.append((lambda_name, 'history_handler'))
+    if only:
+        entries = [e for e in entries if e[0] in only or f"{e[0]}/{e[1]}" in only]
+    return entries
+
+
+def _env():
+    env = dict(os.environ)
+    env.setdefault('AWS_REGION', 'ap-south-1')
+    env.setdefault('AWS_DEFAULT_REGION', env['AWS_REGION'])
+    for name in ('LAMBDA_WEATHER', 'LAMBDA_CROP', 'LAMBDA_SCHEMES', 'LAMBDA_PROFILE'):
+        env.setdefault(name, f'smart-rural-ai-{name.lower()}')
+    return env
+
+
+def measure(lambda_name, module_name, args):
+    lambda_dir = os.path.join(LAMBDAS_DIR, lambda_name)
+    samples = []
+    for _ in range(args.samples):
+        out = subprocess.run(
+            [sys.executable, '-c', _DRIVER, BENCH_DIR, lambda_dir, module_name,
+             '1' if args.standins else '0', str(args.client_init_ms)],
+            capture_output=True, text=True, env=_env(), cwd=lambda_dir,
+        )
+        lines = [line for line in out.stdout.splitlines() if line.startswith('{')]
+        if out.returncode != 0 or not lines:
+            raise RuntimeError(f"{lambda_name}/{module_name} import failed:\n{out.stderr[-2000:]}")
+        samples.append(json.loads(lines[-1]))
+    return statistics.median(s['import_ms'] for s in samples), samples[-1]['clients']
+
+
+def slowest_imports(lambda_name, module_name, args, top):
+    """Top modules by cumulative import time (python -X importtime)."""
+    lambda_dir = os.path.join(LAMBDAS_DIR, lambda_name)
+    out = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _DRIVER, BENCH_DIR, lambda_dir, module_name,
+         '1' if args.standins else '0', '0'],
+        capture_output=True, text=True, env=_env(), cwd=lambda_dir,
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        rows.append((int(cumulative_us), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def check(lambda_name, module_name, import_ms, clients, budgets):
+    budget = dict(budgets.get('default', {}))
+    budget.update(budgets.get(f"{lambda_name}/{module_name}", {}))
+    problems = []
+    if 'import_ms' in budget and import_ms > budget['import_ms']:
+        problems.append(f"import {import_ms:.0f}ms > budget {budget['import_ms']}ms")
+    allowed = list(budget.get('allowed_clients_at_import', []))
+    extra = []
+    for client in clients:
+        if client in allowed:
+            allowed.remove(client)
+        else:
+            extra.append(client)
+    if len(extra) > budget.get('max_clients_at_import', 0):
+        problems.append(f"boto3 clients built at import: {', '.join(extra)}")
+    return budget, problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--budgets', default=DEFAULT_BUDGETS)
+    parser.add_argument('--samples', type=int, default=3, help='fresh imports per module (median is checked)')
+    parser.add_argument('--only', nargs='*', help='lambda names or <lambda>/<module> keys')
+    parser.add_argument('--importtime', type=int, default=0, metavar='N', help='also list the N slowest imports')
+    parser.add_argument('--standins', action='store_true', help='use aws_standins fakes instead of real boto3 clients')
+    parser.add_argument('--client-init-ms', type=float, default=0.0,
+                        help='with --standins: emulated construction cost per boto3 client/resource')
+    args = parser.parse_args()
+
+    with open(args.budgets, encoding='utf-8') as f:
+        budgets = json.load(f)
+
+    failures = 0
+    print(f"{'module':<38} {'import':>8} {'budget':>8}  clients at import")
+    for lambda_name, module_name in entry_modules(args.only):
+        key = f"{lambda_name}/{module_name}"
+        import_ms, clients = measure(lambda_name, module_name, args)
+        budget, problems = check(lambda_name, module_name, import_ms, clients, budgets)
+        status = 'FAIL' if problems else 'ok'
+        print(f"{key:<38} {import_ms:6.0f}ms {budget.get('import_ms', '-'):>6}ms  "
+              f"{', '.join(clients) or '-'}  {status}")
+        for problem in problems:
+            print(f"    {problem}")
+        failures += bool(problems)
+        if args.importtime:
+            for cumulative_us, name in slowest_imports(lambda_name, module_name, args, args.importtime):
+                print(f"      {cumulative_us / 1000.0:8.1f}ms  {name}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
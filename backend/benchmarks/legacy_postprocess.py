@@ -0,0 +1,331 @@
+# backend/benchmarks/legacy_postprocess.py
+# Frozen copy of the orchestrator's response post-processing BEFORE utils/response_pipeline.py
+# Owner: Manoj RS
+#
+# Reference implementation only: bench_response_pipeline.py regenerates the
+# golden outputs from these functions and times them against the pipeline.
+# Do not "fix" anything here — it must keep producing the old outputs.
+
+import logging
+import re
+import unicodedata
+
+from utils.translate_helper import normalize_language_code
+
+logger = logging.getLogger()
+
+STRIP_LOCAL_MARKDOWN_SYMBOLS = True
+
+
+def _normalize_translated_agri_terms(text):
+    """Fix common translation artifacts for key agriculture season terms."""
+    normalized = str(text or '')
+    if not normalized:
+        return normalized
+
+    replacements = [
+        (r'\bcardiff\b', 'kharif'),
+        (r'\bharif\b', 'kharif'),
+        (r'\bkhariff\b', 'kharif'),
+        (r'\brabby\b', 'rabi'),
+        (r'\brabbi\b', 'rabi'),
+        (r'\bzaad\b', 'zaid'),
+        (r'\bzaidh\b', 'zaid'),
+    ]
+    for pattern, repl in replacements:
+        normalized = re.sub(pattern, repl, normalized, flags=re.IGNORECASE)
+    return normalized
+
+
+def _strip_sources_line(text):
+    """Remove any 'Sources: ...' line from the text (agent.py may have added it).
+    Returns (cleaned_text, extracted_sources_str_or_None)."""
+    if not text:
+        return text, None
+    match = re.search(r'\n\s*Sources:\s*(.+)$', text)
+    if match:
+        return text[:match.start()].rstrip(), match.group(1).strip()
+    return text, None
+
+
+def _post_process_response(text):
+    """
+    Safety-net post-processing to remove any remaining 'only rice and wheat' type phrases.
+    This catches cases where the model ignores the system prompt instruction.
+    """
+    if not text:
+        return text
+
+    # Normalize known agri-term translation artifacts at final output stage.
+    text = _normalize_translated_agri_terms(text)
+
+    # Patterns that indicate the model is telling the farmer about tool limitations
+    bad_patterns = [
+        r'(?:only|just)\s+(?:have|has|got|received|cover[s]?|include[s]?)\s+(?:data|details?|info(?:rmation)?|advice|tips?|updates?)\s+(?:for|about|on|regarding)\s+(?:rice|wheat)',
+        r'(?:only|just)\s+(?:cover[s]?|include[s]?)\s+rice\s+and\s+wheat',
+        r'(?:tools?|system|database|data|advisory)\s+(?:I\s+(?:have|checked)|(?:only|just))\s+.*?rice\s+and\s+wheat',
+        r'the\s+(?:latest|recent|current)\s+(?:tool\s+)?(?:data|updates?|advisory|information)\s+.*?(?:only|just)\s+.*?rice\s+and\s+wheat',
+        r'(?:unfortunately|sadly),?\s+(?:the\s+)?(?:information|data|tools?|advisory)\s+.*?(?:doesn.?t|don.?t|did\s*n.?t)\s+(?:cover|include|have)\s+.*?(?:specific|detailed)',
+    ]
+
+    text_lower = text.lower()
+    needs_fix = False
+    for pattern in bad_patterns:
+        if re.search(pattern, text_lower):
+            needs_fix = True
+            break
+
+    # Also check for the literal phrase
+    if 'rice and wheat' in text_lower and ('only' in text_lower or 'just' in text_lower):
+        needs_fix = True
+
+    if needs_fix:
+        logger.info("Post-processing: removing 'only rice/wheat' limitation language from response")
+        # Remove sentences that mention the tool limitation
+        sentences = re.split(r'(?<=[.!?])\s+', text)
+        filtered = []
+        for s in sentences:
+            s_lower = s.lower()
+            if ('rice and wheat' in s_lower and ('only' in s_lower or 'just' in s_lower or 'cover' in s_lower)):
+                continue
+            if re.search(r'tool[s]?\s+(?:I\s+)?(?:checked|have|received)\s+only', s_lower):
+                continue
+            if re.search(r"(?:doesn.?t|don.?t|did\s*n.?t)\s+(?:cover|include|have)\s+(?:specific|detailed)\s+(?:data|info|details)", s_lower):
+                continue
+            filtered.append(s)
+        if filtered:
+            text = ' '.join(filtered)
+        # If everything was filtered, keep original (shouldn't happen)
+
+    return text
+
+
+def _normalize_output_markdown(text):
+    """Normalize model markdown so frontend rendering stays deterministic."""
+    if not text:
+        return text
+
+    normalized = text.replace('\r\n', '\n')
+
+    # Headings: remove excessive indentation and enforce space after hashes
+    normalized = re.sub(r'^[\t ]{2,}(#{1,6}\s*)', r'\1', normalized, flags=re.MULTILINE)
+    normalized = re.sub(r'^(#{1,6})([^\s#])', r'\1 \2', normalized, flags=re.MULTILINE)
+
+    # Bullet consistency: convert unicode bullets to markdown dashes
+    normalized = re.sub(r'^[\t ]*•[\t ]+', '- ', normalized, flags=re.MULTILINE)
+
+    # Compact spacing: collapse 3+ blank lines to 1 blank line
+    normalized = re.sub(r'\n{3,}', '\n\n', normalized)
+
+    # Trim trailing spaces line-wise and final body
+    normalized = '\n'.join(line.rstrip() for line in normalized.split('\n')).strip()
+
+    return normalized
+
+
+def _looks_like_symptom_query(text):
+    if not text:
+        return False
+    q = text.lower()
+    symptom_terms = [
+        'yellow', 'spot', 'spots', 'wilting', 'wilt', 'rot', 'blight',
+        'leaf', 'leaves', 'stem', 'fruit', 'disease', 'what disease', 'symptom'
+    ]
+    return any(term in q for term in symptom_terms)
+
+
+def _ensure_cautious_pest_response(text, tools_used, user_query_en):
+    if not text:
+        return text
+    used = set(tools_used or [])
+    if 'get_pest_alert' not in used:
+        return text
+    if not _looks_like_symptom_query(user_query_en):
+        return text
+
+    lowered = text.lower()
+    if 'probable diagnosis' in lowered or 'not a confirmed' in lowered:
+        return text
+
+    caution = (
+        'Based on symptoms alone, this is a probable diagnosis and not a confirmed one. '
+        'Please verify with close leaf/stem/fruit checks or a photo before final treatment.'
+    )
+    return f"{caution}\n\n{text}"
+
+
+def _strip_local_markdown_symbols(text, language_code='en'):
+    """Sanitize text for frontend and remove markdown symbols for cleaner plain-text UX."""
+    if not text:
+        return text
+
+    s = text.replace('\r\n', '\n').replace('\r', '\n')
+    s = re.sub(r'</?span[^>]*>', '', s, flags=re.IGNORECASE)
+    s = s.replace('\uFFFD', '')
+
+    _lang = normalize_language_code(language_code or 'en', default='en')
+    _is_indic = _lang in {'ta', 'te', 'kn', 'ml', 'mr', 'bn', 'gu', 'pa', 'or', 'as', 'ur', 'hi'}
+    if _is_indic:
+        s = re.sub(r'[\u200b\ufeff]', '', s)
+    else:
+        s = re.sub(r'[\u200b\u200c\u200d\ufeff]', '', s)
+
+    filtered = []
+    for ch in s:
+        if ch in ('\n', '\t'):
+            filtered.append(ch)
+            continue
+        cat = unicodedata.category(ch)
+        if cat in {'Cc', 'Cs', 'Co', 'Cn'}:
+            continue
+        filtered.append(ch)
+    s = ''.join(filtered)
+
+    def _normalize_local_units_and_artifacts(value, lang, is_indic):
+        out = value or ''
+
+        def _format_number_for_text(num_value):
+            if abs(num_value - round(num_value)) < 1e-9:
+                return str(int(round(num_value)))
+            return f"{num_value:.2f}".rstrip('0').rstrip('.')
+
+        def _to_quintal_rate(raw_number):
+            try:
+                base = float((raw_number or '').replace(',', ''))
+            except Exception:
+                return None
+            if base < 0:
+                return None
+            return _format_number_for_text(base * 100.0)
+
+        canonical_quintal = {
+            'ta': 'குவிண்டால்',
+            'hi': 'क्विंटल',
+            'te': 'క్వింటాల్',
+        }.get(lang, 'quintal')
+
+        currency_pat = r'(?:₹|Rs\.?|INR|ரூ\.?|रु\.?|రూ\.?)'
+        kg_pat = r'(?:kg|kilo(?:gram)?s?|கிலோ|किलो(?:ग्राम)?|కిలో(?:గ్రాము)?)'
+        per_sep = r'(?:/|\bper\b|\bप्रति\b|\bప్రతి\b|க்கு|\bko\b)'
+
+        def _replace_cur_num_per_kg(match):
+            cur = match.group('cur')
+            num = match.group('num')
+            quintal_rate = _to_quintal_rate(num)
+            if quintal_rate is None:
+                return match.group(0)
+            return f"{cur} {quintal_rate}/{canonical_quintal}"
+
+        out = re.sub(
+            rf'(?P<cur>{currency_pat})\s*(?P<num>\d{{1,3}}(?:,\d{{3}})*(?:\.\d+)?)\s*{per_sep}\s*{kg_pat}',
+            _replace_cur_num_per_kg,
+            out,
+            flags=re.IGNORECASE,
+        )
+
+        if lang == 'ta':
+            out = re.sub(r'கு[யவ]ி?ண?்டா?ல்|கு[யவ]ி?ண?்டல்|காயிண்டல்|காயின்டல்|கிண்டல்', 'குவிண்டால்', out)
+            out = re.sub(r'கிலோகிராம்|கிலோகிராம்கள்|கிலோ\s*கிராம்', 'கிலோ', out)
+        elif lang == 'hi':
+            out = re.sub(r'क्विन्टल|क्विंटल', 'क्विंटल', out)
+            out = re.sub(r'किलोग्राम|किलो\s*ग्राम', 'किलो', out)
+        elif lang == 'te':
+            out = re.sub(r'క్వింటల్|క్వింటాళ్|క్వింటా', 'క్వింటాల్', out)
+            out = re.sub(r'కిలోగ్రాము|కిలోగ్రాములు|కిలో\s*గ్రాము', 'కిలో', out)
+
+        if is_indic:
+            script_ranges = {
+                'ta': '\u0B80-\u0BFF',
+                'hi': '\u0900-\u097F',
+                'te': '\u0C00-\u0C7F',
+                'kn': '\u0C80-\u0CFF',
+                'ml': '\u0D00-\u0D7F',
+                'mr': '\u0900-\u097F',
+                'bn': '\u0980-\u09FF',
+                'as': '\u0980-\u09FF',
+                'gu': '\u0A80-\u0AFF',
+                'pa': '\u0A00-\u0A7F',
+                'or': '\u0B00-\u0B7F',
+                'ur': '\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF',
+            }
+            rg = script_ranges.get(lang)
+            if rg:
+                out = re.sub(fr'(?<![A-Za-z])[A-Za-z](?=[{rg}])', '', out)
+                out = re.sub(fr'(?<=[{rg}])[A-Za-z](?![A-Za-z])', '', out)
+                out = '\n'.join(
+                    re.match(r'^[\t ]*', line).group(0) + re.sub(r' {2,}', ' ', line[len(re.match(r'^[\t ]*', line).group(0)):])
+                    for line in out.split('\n')
+                )
+
+        return out
+
+    if not STRIP_LOCAL_MARKDOWN_SYMBOLS:
+        s = _normalize_local_units_and_artifacts(s, _lang, _is_indic)
+        s = re.sub(r'\n{3,}', '\n\n', s)
+        return '\n'.join(line.rstrip() for line in s.split('\n')).strip()
+
+    lines = s.split('\n')
+    numbered_line_re = re.compile(r'^(?P<indent>[\t ]*)(?P<num>\d{1,2})\.\s+(?P<body>.+)$')
+
+    def _renumber_numbered_runs(line_list):
+        """Normalize contiguous numbered lists to 1..N so repeated '1.' markers become stable points."""
+        output = []
+        run_counters = {}
+
+        for raw in line_list:
+            m = numbered_line_re.match(raw)
+            if not m:
+                # Break numbering runs on blank/non-numbered lines.
+                if not raw.strip():
+                    run_counters.clear()
+                output.append(raw)
+                continue
+
+            indent = m.group('indent')
+            body = m.group('body')
+            next_num = run_counters.get(indent, 0) + 1
+            run_counters[indent] = next_num
+            output.append(f"{indent}{next_num}. {body}")
+
+            # Child indentation should not leak stale counters if parent advances.
+            for key in list(run_counters.keys()):
+                if len(key) > len(indent) and key.startswith(indent):
+                    del run_counters[key]
+
+        return output
+
+    heading_re = re.compile(r'^[\t ]*#{1,6}[\t ]*(.+?)\s*$')
+    should_number_headings = (sum(1 for line in lines if heading_re.match(line)) >= 3) and (not _is_indic)
+    heading_idx = 0
+    cleaned_lines = []
+
+    for raw_line in lines:
+        line = raw_line.rstrip()
+        if not line.strip():
+            cleaned_lines.append('')
+            continue
+
+        heading_match = heading_re.match(line)
+        if heading_match:
+            heading_text = heading_match.group(1).strip()
+            heading_text = heading_text.replace('**', '').replace('*', '').replace('#', '')
+            if should_number_headings:
+                heading_idx += 1
+                cleaned_lines.append(f"{heading_idx}. {heading_text}")
+            else:
+                cleaned_lines.append(heading_text)
+            continue
+
+        line = re.sub(r'^([\t ]*)[•\-\*][\t ]+', r'\1- ', line)
+        # Normalize list markers across locales (e.g., 1), 1., 1।, 1۔) to a stable "1. " format.
+        line = re.sub(r'^([\t ]*)(\d{1,2})[\)\.\u0964\u0965\u06D4][\t ]+', r'\1\2. ', line)
+        line = line.replace('**', '')
+        line = line.replace('*', '')
+        line = re.sub(r'^([\t ]*)#{1,6}[\t ]*', r'\1', line)
+        cleaned_lines.append(line.rstrip())
+
+    s = '\n'.join(cleaned_lines)
+    s = '\n'.join(_renumber_numbered_runs(s.split('\n')))
+    s = _normalize_local_units_and_artifacts(s, _lang, _is_indic)
+    s = re.sub(r'\n{3,}', '\n\n', s)
+    return '\n'.join(line.rstrip() for line in s.split('\n')).strip()
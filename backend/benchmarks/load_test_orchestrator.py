@@ -0,0 +1,410 @@
+# backend/benchmarks/load_test_orchestrator.py
+# Offline load test for agent_orchestrator.handler.lambda_handler
+# Owner: Manoj RS
+#
+# Drives the real orchestrator handler with a recorded multilingual corpus
+# (benchmarks/corpus/farmer_queries.jsonl) while every AWS call goes to the
+# local stand-ins in aws_standins.py (configurable latency, no credentials).
+#
+# Each worker is a separate process = one Lambda container: it imports the
+# handler once (cold start), then serves requests one at a time (warm), which
+# matches Lambda's one-request-per-container model. --concurrency N runs N
+# containers in parallel. DynamoDB/S3 state is per worker, so cache hits only
+# happen when the same worker sees a repeated query (cycle the corpus with
+# --requests > corpus size to get them).
+#
+# Stage timings come from the orchestrator's own span recorder
+# (ENABLE_STAGE_TRACING + ENABLE_TIMINGS_DEBUG are forced on). Bedrock token
+# usage (input / cacheRead / cacheWrite / output) comes from pipeline.token_usage;
+# compare runs with and without --env ENABLE_PROMPT_CACHING=true. The emulated
+# prompt cache is per worker, Bedrock's is shared by all containers.
+#
+# Usage (from repo root):
+#   python backend/benchmarks/load_test_orchestrator.py --requests 200 --concurrency 4
+#   python backend/benchmarks/load_test_orchestrator.py --requests 100 --concurrency 2 \
+#       --latency bedrock-runtime.converse=lognormal:2500:0.5 --latency-scale 0.25 \
+#       --recycle-every 20 --env ENABLE_STREAMING_RESPONSES=true --json-out /tmp/bench.json
+#
+# Requires boto3 to be importable (the stand-ins replace boto3.client/resource).
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import random
+import sys
+import time
+import uuid
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ORCHESTRATOR_DIR = os.path.abspath(os.path.join(BENCH_DIR, '..', 'lambdas', 'agent_orchestrator'))
+DEFAULT_CORPUS = os.path.join(BENCH_DIR, 'corpus', 'farmer_queries.jsonl')
+
+BENCH_ENV = {
+    'AWS_REGION': 'ap-south-1',
+    'LAMBDA_WEATHER': 'bench-weather-lookup',
+    'LAMBDA_CROP': 'bench-crop-advisory',
+    'LAMBDA_SCHEMES': 'bench-govt-schemes',
+    'LAMBDA_PROFILE': 'bench-farmer-profile',
+    'ENABLE_STAGE_TRACING': 'true',
+    'ENABLE_TIMINGS_DEBUG': 'true',
+    # One bench farmer sends every request — lift the per-farmer limits so the
+    # run measures the pipeline, not the limiter (override with --env to test it).
+    'RATE_LIMIT_RPM': '100000',
+    'RATE_LIMIT_RPH': '100000',
+    'RATE_LIMIT_DAILY': '100000',
+}
+
+BENCH_PROFILE = {
+    'farmer_id': 'bench-farmer-1', 'name': 'Bench Farmer', 'state': 'Tamil Nadu',
+    'district': 'Coimbatore', 'crops': ['Rice', 'Banana'], 'soil_type': 'Red soil', 'language': 'en',
+}
+
+
+class BenchContext:
+    """Minimal Lambda context (API Gateway 29s wall + Lambda timeout headroom)."""
+
+    def __init__(self, timeout_ms=60000):
+        self.aws_request_id = str(uuid.uuid4())
+        self.function_name = 'bench-agent-orchestrator'
+        self._deadline = time.time() + timeout_ms / 1000.0
+
+    def get_remaining_time_in_millis(self):
+        return max(0, int((self._deadline - time.time()) * 1000))
+
+
+def load_corpus(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def _pcts(samples):
+    return {
+        'n': len(samples),
+        'p50': round(_percentile(samples, 50), 1),
+        'p95': round(_percentile(samples, 95), 1),
+        'p99': round(_percentile(samples, 99), 1),
+    }
+
+
+# ── Worker (one simulated Lambda container) ──
+
+def _purge_orchestrator_modules():
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, '__file__', '') or ''
+        if name == 'handler' or name == 'utils' or name.startswith('utils.') or name.startswith('_inprocess_') \
+                or path.startswith(ORCHESTRATOR_DIR):
+            del sys.modules[name]
+
+
+def _load_handler():
+    _purge_orchestrator_modules()
+    started = time.perf_counter()
+    module = importlib.import_module('handler')
+    init_ms = (time.perf_counter() - started) * 1000.0
+    if not logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.getLogger().setLevel(logging.ERROR)
+    return module, init_ms
+
+
+def _build_event(query, worker_id):
+    prefix = query.get('session_prefix')
+    if prefix:
+        session_id = f"{prefix}{uuid.uuid4().hex}"
+    else:
+        # One chat session per corpus entry per container → history grows like a real chat.
+        session_id = f"bench-session-{query['id']}-w{worker_id}-{uuid.uuid5(uuid.NAMESPACE_DNS, query['id']).hex}"
+    body = {
+        'message': query['message'],
+        'session_id': session_id,
+        'farmer_id': query.get('farmer_id', 'anonymous'),
+        'language': query.get('language'),
+    }
+    if query.get('gps_location'):
+        body['gps_location'] = query['gps_location']
+    return {'httpMethod': 'POST', 'body': json.dumps(body, ensure_ascii=False)}, session_id
+
+
+def _classify_mode(data, session_id, fast_path_prefixes):
+    data = data or {}
+    if (data.get('policy') or {}).get('rate_limited'):
+        return 'rate_limited'
+    mode = data.get('pipeline_mode') or 'unknown'
+    if mode == 'direct' and session_id.startswith(tuple(fast_path_prefixes)):
+        return 'fast_path'
+    return mode
+
+
+def _drain_async_invocations(handler, standins, quiet):
+    """Run queued InvocationType='Event' self-invocations (e.g. memory refresh).
+    In AWS they run in another container after the response, so they are not timed."""
+    count = 0
+    while standins.async_invocations:
+        _function_name, payload = standins.async_invocations.pop(0)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext():
+                handler.lambda_handler(payload, BenchContext())
+        except Exception:
+            pass
+        count += 1
+    return count
+
+
+def _worker(worker_id, options, corpus, task_q, result_q):
+    for key, value in {**BENCH_ENV, **options['env']}.items():
+        os.environ[key] = value
+    sys.path.insert(0, ORCHESTRATOR_DIR)
+    sys.path.insert(0, BENCH_DIR)
+    import aws_standins
+
+    latency = aws_standins.LatencyModel(options['latency'], scale=options['latency_scale'],
+                                        seed=(options['seed'] or 0) + worker_id)
+    known = {q['message'].strip(): q['message_en'] for q in corpus if q.get('message_en')}
+    standins = aws_standins.install(latency, known_translations=known)
+    profiles = aws_standins.FakeDynamoDBResource(latency, standins.dynamodb_store).Table(
+        os.environ.get('DYNAMODB_PROFILES_TABLE', 'farmer_profiles'))
+    profiles._put(BENCH_PROFILE)
+
+    handler, init_ms = _load_handler()
+    cold = True
+    served = 0
+    quiet = not options['verbose']
+
+    while True:
+        idx = task_q.get()
+        if idx is None:
+            break
+        if options['recycle_every'] and served and served % options['recycle_every'] == 0:
+            handler, init_ms = _load_handler()
+            standins.reset_cold_lambdas()
+            cold = True
+
+        query = corpus[idx % len(corpus)]
+        event, session_id = _build_event(query, worker_id)
+        sink = io.StringIO()
+        started = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(sink) if quiet else contextlib.nullcontext():
+                response = handler.lambda_handler(event, BenchContext())
+            error = None
+        except Exception as err:  # handler catches its own errors; this is a harness failure
+            response, error = None, repr(err)
+        handler_ms = (time.perf_counter() - started) * 1000.0
+        served += 1
+        background = _drain_async_invocations(handler, standins, quiet)
+
+        data = {}
+        status = None
+        if isinstance(response, dict):
+            status = response.get('statusCode')
+            try:
+                data = json.loads(response.get('body') or '{}').get('data') or {}
+            except (TypeError, ValueError):
+                data = {}
+        timings = data.get('timings') or {}
+        result_q.put({
+            'worker': worker_id,
+            'query_id': query['id'],
+            'language': query.get('language'),
+            'mode': _classify_mode(data, session_id, handler.FAST_PATH_PREFIXES),
+            'status': status,
+            'error': error,
+            'cold': cold,
+            'init_ms': round(init_ms, 1) if cold else None,
+            'handler_ms': round(handler_ms, 1),
+            'stages_ms': timings.get('stages_ms') or {},
+            'token_usage': (data.get('pipeline') or {}).get('token_usage'),
+            'async_invocations': background,
+            'model_tier': ((data.get('pipeline') or {}).get('model_route') or {}).get('tier'),
+            'warmup': served <= options['warmup'],
+        })
+        cold = False
+
+    result_q.put(None)
+
+
+# ── Report ──
+
+def _token_totals(rows):
+    keys = ('calls', 'input_tokens', 'output_tokens', 'cache_read_tokens', 'cache_write_tokens')
+    totals = dict.fromkeys(keys, 0)
+    for r in rows:
+        for key in keys:
+            totals[key] += (r.get('token_usage') or {}).get(key, 0)
+    prompt = totals['input_tokens'] + totals['cache_read_tokens'] + totals['cache_write_tokens']
+    totals['cache_read_ratio'] = round(totals['cache_read_tokens'] / prompt, 3) if prompt else 0.0
+    return totals
+
+
+def summarize(results, wall_sec):
+    measured = [r for r in results if not r['warmup']]
+    by_mode = {}
+    for r in measured:
+        by_mode.setdefault(r['mode'], []).append(r)
+
+    def _stage_table(rows):
+        stages = {}
+        for r in rows:
+            for stage, ms in r['stages_ms'].items():
+                stages.setdefault(stage, []).append(ms)
+        return {stage: _pcts(samples) for stage, samples in sorted(stages.items())}
+
+    summary = {
+        'requests': len(measured),
+        'errors': sum(1 for r in measured if r['error'] or (r['status'] or 500) >= 500),
+        'wall_sec': round(wall_sec, 2),
+        'throughput_rps': round(len(measured) / wall_sec, 2) if wall_sec else None,
+        'total': _pcts([r['handler_ms'] for r in measured]),
+        'cold': _pcts([r['handler_ms'] for r in measured if r['cold']]),
+        'warm': _pcts([r['handler_ms'] for r in measured if not r['cold']]),
+        'init_ms': _pcts([r['init_ms'] for r in results if r['init_ms'] is not None]),
+        'by_mode': {},
+        'stages': _stage_table(measured),
+    }
+    summary['tokens'] = _token_totals(measured)
+    summary['by_model_tier'] = {}
+    for tier in sorted({r['model_tier'] for r in measured if r.get('model_tier')}):
+        rows = [r for r in measured if r.get('model_tier') == tier]
+        summary['by_model_tier'][tier] = {
+            'total': _pcts([r['handler_ms'] for r in rows]),
+            'bedrock_ms': _pcts([sum(ms for st, ms in r['stages_ms'].items() if st.startswith('bedrock_turn'))
+                                 for r in rows]),
+            'tokens': _token_totals(rows),
+        }
+    for mode, rows in sorted(by_mode.items()):
+        summary['by_mode'][mode] = {
+            'total': _pcts([r['handler_ms'] for r in rows]),
+            'stages': _stage_table(rows),
+        }
+    return summary
+
+
+def _print_row(label, p):
+    print(f"  {label:<26} n={p['n']:<5} p50={p['p50']:9.1f}ms  p95={p['p95']:9.1f}ms  p99={p['p99']:9.1f}ms")
+
+
+def print_report(summary, show_mode_stages=False):
+    print(f"\nRequests: {summary['requests']}  errors: {summary['errors']}  "
+          f"wall: {summary['wall_sec']}s  throughput: {summary['throughput_rps']} req/s")
+    print("\nHandler latency")
+    _print_row('all', summary['total'])
+    _print_row('cold (first after init)', summary['cold'])
+    _print_row('warm', summary['warm'])
+    _print_row('module init', summary['init_ms'])
+    tokens = summary['tokens']
+    print(f"\nBedrock tokens ({tokens['calls']} calls): input={tokens['input_tokens']}  "
+          f"cache_read={tokens['cache_read_tokens']}  cache_write={tokens['cache_write_tokens']}  "
+          f"output={tokens['output_tokens']}  cache_read_ratio={tokens['cache_read_ratio']}")
+    print("\nBy pipeline_mode")
+    for mode, block in summary['by_mode'].items():
+        _print_row(mode, block['total'])
+    if summary['by_model_tier']:
+        print("\nBy model tier (router decision; applied only with ENABLE_MODEL_ROUTER=true)")
+        for tier, block in summary['by_model_tier'].items():
+            _print_row(f"{tier} total", block['total'])
+            _print_row(f"{tier} bedrock turns", block['bedrock_ms'])
+            print(f"  {'':<26} tokens in={block['tokens']['input_tokens']} out={block['tokens']['output_tokens']} "
+                  f"calls={block['tokens']['calls']}")
+    print("\nBy stage (all modes)")
+    for stage, p in summary['stages'].items():
+        _print_row(stage, p)
+    if show_mode_stages:
+        for mode, block in summary['by_mode'].items():
+            print(f"\nStages — {mode}")
+            for stage, p in block['stages'].items():
+                _print_row(stage, p)
+
+
+def _parse_pairs(pairs, label):
+    parsed = {}
+    for pair in pairs or []:
+        if '=' not in pair:
+            raise SystemExit(f"--{label} expects KEY=VALUE, got {pair!r}")
+        key, value = pair.split('=', 1)
+        parsed[key.strip()] = value.strip()
+    return parsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS)
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=2, help='parallel containers (worker processes)')
+    parser.add_argument('--warmup', type=int, default=0, help='requests per worker excluded from stats')
+    parser.add_argument('--recycle-every', type=int, default=0,
+                        help='re-import the handler (new cold container) every K requests per worker')
+    parser.add_argument('--latency', action='append', metavar='OP=SPEC',
+                        help='override a latency distribution, e.g. translate=lognormal:200:0.3')
+    parser.add_argument('--latency-scale', type=float, default=1.0, help='multiply every simulated latency')
+    parser.add_argument('--env', action='append', metavar='KEY=VALUE', help='orchestrator env / feature flag')
+    parser.add_argument('--shuffle', action='store_true')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--mode-stages', action='store_true', help='print the stage table for every pipeline_mode')
+    parser.add_argument('--json-out', default=None)
+    parser.add_argument('--verbose', action='store_true', help='keep orchestrator stdout (EMF lines)')
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    order = list(range(args.requests))
+    if args.shuffle:
+        random.Random(args.seed).shuffle(order)
+
+    options = {
+        'env': _parse_pairs(args.env, 'env'),
+        'latency': _parse_pairs(args.latency, 'latency'),
+        'latency_scale': args.latency_scale,
+        'seed': args.seed,
+        'recycle_every': args.recycle_every,
+        'warmup': args.warmup,
+        'verbose': args.verbose,
+    }
+
+    ctx = multiprocessing.get_context('spawn')
+    task_q = ctx.Queue()
+    result_q = ctx.Queue()
+    for idx in order:
+        task_q.put(idx)
+    for _ in range(args.concurrency):
+        task_q.put(None)
+
+    started = time.perf_counter()
+    workers = [ctx.Process(target=_worker, args=(w, options, corpus, task_q, result_q))
+               for w in range(args.concurrency)]
+    for w in workers:
+        w.start()
+
+    results = []
+    finished = 0
+    while finished < len(workers):
+        item = result_q.get()
+        if item is None:
+            finished += 1
+            continue
+        results.append(item)
+    wall_sec = time.perf_counter() - started
+    for w in workers:
+        w.join()
+
+    summary = summarize(results, wall_sec)
+    summary['config'] = {k: v for k, v in vars(args).items() if k != 'json_out'}
+    print_report(summary, show_mode_stages=args.mode_stages)
+    if args.json_out:
+        with open(args.json_out, 'w', encoding='utf-8') as f:
+            json.dump({'summary': summary, 'results': results}, f, indent=2, ensure_ascii=False)
+        print(f"\nWrote {args.json_out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+# backend/benchmarks/priming_report.py
+# Priming time per function (the {"prime": true} warm-up event, utils/priming.py)
+# Owner: Manoj RS
+#
+# Local (default): each entry module runs in a fresh Python process, the way a
+# cold container does:
+#   1. import the module
+#   2. lambda_handler({"prime": true})  on the cold container
+#   3. lambda_handler({"prime": true})  again, on the now warm container
+# and the report lists import time, both priming times, the slowest steps and
+# any step errors. Connection steps are skipped unless --network is given (they
+# need credentials; with --standins they hit the aws_standins fakes).
+#
+# --deployed STACK: sends the priming event to every function of a deployed
+# stack (Lambda invoke, LogType=Tail) and reports Init Duration / Duration from
+# the REPORT log line next to the handler's own prime_ms. Run it twice: the
+# first pass lands on cold containers (or primes them), the second shows the
+# steady state. Needs lambda:InvokeFunction and
+# cloudformation:DescribeStackResources.
+#
+# Usage (from repo root):
+#   python backend/benchmarks/priming_report.py
+#   python backend/benchmarks/priming_report.py --standins --network --client-init-ms 60
+#   python backend/benchmarks/priming_report.py --deployed smart-rural-ai
+
+import argparse
+import base64
+import json
+import os
+import re
+import subprocess
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+LAMBDAS_DIR = os.path.abspath(os.path.join(BENCH_DIR, '..', 'lambdas'))
+
+# template.yaml logical id → (lambda directory, entry module)
+FUNCTIONS = {
+    'AgentOrchestratorFunction': ('agent_orchestrator', 'handler'),
+    'ChatHistoryFunction': ('agent_orchestrator', 'history_handler'),
+    'CropAdvisoryFunction': ('crop_advisory', 'handler'),
+    'WeatherFunction': ('weather_lookup', 'handler'),
+    'GovtSchemesFunction': ('govt_schemes', 'handler'),
+    'FarmerProfileFunction': ('farmer_profile', 'handler'),
+    'ImageAnalysisFunction': ('image_analysis', 'handler'),
+    'TranscribeSpeechFunction': ('transcribe_speech', 'handler'),
+}
+
+_DRIVER = r'''
+import json, sys, time
+bench_dir, lambda_dir, module_name, standins, client_init_ms, network = sys.argv[1:7]
+sys.path.insert(0, lambda_dir)
+import boto3
+if standins == '1':
+    sys.path.insert(0, bench_dir)
+    import aws_standins
+    aws_standins.install(aws_standins.LatencyModel(scale=0.0))
+    if float(client_init_ms) > 0:
+        def _slow(factory):
+            def _build(*args, **kwargs):
+                time.sleep(float(client_init_ms) / 1000.0)
+                return factory(*args, **kwargs)
+            return _build
+        boto3.client = _slow(boto3.client)
+        boto3.resource = _slow(boto3.resource)
+
+import logging
+logging.disable(logging.CRITICAL)
+start = time.perf_counter()
+module = __import__(module_name)
+import_ms = (time.perf_counter() - start) * 1000.0
+event = {'prime': True, 'network': network == '1'}
+cold = module.lambda_handler(dict(event), None)
+warm = module.lambda_handler(dict(event), None)
+print(json.dumps({'import_ms': import_ms, 'cold': cold, 'warm': warm}))
+'''
+
+
+def _env():
+    env = dict(os.environ)
+    env.setdefault('AWS_REGION', 'ap-south-1')
+    env.setdefault('AWS_DEFAULT_REGION', env['AWS_REGION'])
+    for name in ('LAMBDA_WEATHER', 'LAMBDA_CROP', 'LAMBDA_SCHEMES', 'LAMBDA_PROFILE'):
+        env.setdefault(name, f'smart-rural-ai-{name.lower()}')
+    return env
+
+
+def prime_locally(lambda_name, module_name, args):
+    lambda_dir = os.path.join(LAMBDAS_DIR, lambda_name)
+    out = subprocess.run(
+        [sys.executable, '-c', _DRIVER, BENCH_DIR, lambda_dir, module_name,
+         '1' if args.standins else '0', str(args.client_init_ms), '1' if args.network else '0'],
+        capture_output=True, text=True, env=_env(), cwd=lambda_dir, timeout=120,
+    )
+    lines = [line for line in out.stdout.splitlines() if line.startswith('{')]
+    if out.returncode != 0 or not lines:
+        raise RuntimeError(f"{lambda_name}/{module_name} priming failed:\n{out.stderr[-2000:]}")
+    return json.loads(lines[-1])
+
+
+def _slowest(steps_ms, top):
+    ranked = sorted(steps_ms.items(), key=lambda kv: kv[1], reverse=True)[:top]
+    return ', '.join(f"{name} {ms:.0f}ms" for name, ms in ranked) or '-'
+
+
+def report_local(args):
+    print(f"{'function':<28} {'import':>8} {'prime cold':>11} {'prime warm':>11}  slowest steps (cold)")
+    for logical_id, (lambda_name, module_name) in FUNCTIONS.items():
+        if args.only and logical_id not in args.only and lambda_name not in args.only:
+            continue
+        result = prime_locally(lambda_name, module_name, args)
+        cold, warm = result['cold'], result['warm']
+        print(f"{logical_id:<28} {result['import_ms']:6.0f}ms {cold['prime_ms']:9.0f}ms {warm['prime_ms']:9.0f}ms  "
+              f"{_slowest(cold['steps_ms'], args.top)}")
+        for name, err in cold['errors'].items():
+            print(f"    error {name}: {err}")
+
+
+_REPORT_RE = {
+    'duration_ms': re.compile(r'\tDuration: ([\d.]+) ms'),
+    'init_ms': re.compile(r'Init Duration: ([\d.]+) ms'),
+}
+
+
+def report_deployed(args):
+    import boto3
+
+    cloudformation = boto3.client('cloudformation')
+    lambda_client = boto3.client('lambda')
+    resources = cloudformation.describe_stack_resources(StackName=args.deployed)['StackResources']
+    physical = {r['LogicalResourceId']: r['PhysicalResourceId'] for r in resources}
+
+    print(f"{'function':<28} {'init':>8} {'duration':>9} {'prime_ms':>9}  slowest steps")
+    for logical_id in FUNCTIONS:
+        if args.only and logical_id not in args.only:
+            continue
+        function_name = physical.get(logical_id)
+        if not function_name:
+            print(f"{logical_id:<28} not in stack {args.deployed}")
+            continue
+        response = lambda_client.invoke(
+            FunctionName=function_name, LogType='Tail',
+            Payload=json.dumps({'prime': True, 'network': not args.no_network}).encode('utf-8'),
+        )
+        payload = json.loads(response['Payload'].read() or b'{}')
+        log_tail = base64.b64decode(response.get('LogResult', '')).decode('utf-8', 'replace')
+        timings = {}
+        for key, pattern in _REPORT_RE.items():
+            match = pattern.search(log_tail)
+            timings[key] = float(match.group(1)) if match else None
+        init = f"{timings['init_ms']:6.0f}ms" if timings['init_ms'] is not None else f"{'warm':>8}"
+        duration = f"{timings['duration_ms']:7.0f}ms" if timings['duration_ms'] is not None else f"{'-':>9}"
+        print(f"{logical_id:<28} {init} {duration} {payload.get('prime_ms', 0):7.0f}ms  "
+              f"{_slowest(payload.get('steps_ms', {}), args.top)}")
+        if response.get('FunctionError'):
+            print(f"    function error: {payload}")
+        for name, err in (payload.get('errors') or {}).items():
+            print(f"    error {name}: {err}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--only', nargs='*', help='logical ids or lambda directory names')
+    parser.add_argument('--top', type=int, default=3, help='slowest steps listed per function')
+    parser.add_argument('--network', action='store_true', help='local: also run the connection steps')
+    parser.add_argument('--standins', action='store_true', help='local: use aws_standins fakes instead of real boto3 clients')
+    parser.add_argument('--client-init-ms', type=float, default=0.0,
+                        help='with --standins: emulated construction cost per boto3 client/resource')
+    parser.add_argument('--deployed', metavar='STACK', help='prime the functions of a deployed stack instead')
+    parser.add_argument('--no-network', action='store_true', help='deployed: skip the connection steps')
+    args = parser.parse_args()
+
+    if args.deployed:
+        report_deployed(args)
+    else:
+        report_local(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,15 +6,13 @@
 
 import json
 import uuid
-import boto3
 import logging
 import os
 import re
-import unicodedata
 import time as _time
 import random
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed, wait
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
@@ -32,19 +30,51 @@ FAST_PATH_PREFIXES = ('crop-recommend-', 'soil-analysis-', 'farm-calendar-', 'pr
 
 from utils.response_helper import success_response, error_response
 from utils.translate_helper import detect_and_translate, translate_response, normalize_language_code, needs_localization_retry
-from utils.polly_helper import text_to_speech, refresh_audio_url
-from utils.dynamodb_helper import save_chat_message, save_chat_messages_batch, get_farmer_profile, get_chat_history, get_session_message_count
+from utils.polly_helper import text_to_speech
+from utils.dynamodb_helper import save_chat_message, save_chat_messages_batch, get_farmer_profile, get_chat_history, get_session_message_count, SESSIONS_TABLE
 
 # Enterprise Guardrails (Gaps #1-#4, #6-#7)
 from utils.guardrails import run_all_guardrails, mask_pii_in_log, run_output_guardrails
 from utils.rate_limiter import check_rate_limit
-from utils.chat_history import list_sessions, get_session_messages, save_session, delete_session as delete_chat_session, rename_session as rename_chat_session
-from utils.response_cache import get_cached_response, cache_response
+from history_handler import is_history_request, handle_history_request
+from utils.response_cache import (
+    get_cached_response, cache_response, cache_key_for,
+    save_localized_variant, audio_for_text, remember_audio_for_text, ENABLE_LOCALIZED_CACHE,
+)
+from utils.audio_urls import presign_audio_url
+from utils.hedging import run_hedged
+from utils.bedrock_limiter import limited_call, is_throttle, max_wait_for as limiter_max_wait, snapshot as limiter_snapshot
+from utils.single_flight import (
+    acquire as acquire_flight, wait_for_result as wait_for_flight, complete as complete_flight,
+)
 from utils.cors_helper import handle_cors_preflight, get_cors_headers
+from utils.stream_pipeline import SentenceStreamPipeline
+from utils.preflight import Preflight, PREFLIGHT_DEADLINE_SEC
+from utils.bulkheads import bulkhead_for_tool, bulkhead_stats, BulkheadFull
+from utils.tool_backends import in_process_enabled, invoke_in_process, preload_in_process_tools, prime_in_process_tools, ToolBackendUnavailable
+from utils.deadline import Deadline, set_request_deadline, current_deadline, client_for, STAGE_MIN_SEC, STAGE_MAX_SEC
+from utils.tracing import SpanRecorder, set_current_recorder, stage_span, record_span, attach_timings
+from utils.metrics import put_metric, count as count_metric, flush_metrics
+from utils.tool_cache import cached_tool_call
+from utils.prompt_cache import (
+    system_blocks, tool_config, has_cache_points, strip_cache_points, is_cache_rejection, mark_unsupported,
+    TokenUsage, set_request_usage, current_usage, record_usage,
+)
+from utils.model_router import route_model, feature_page_type
+from utils.keyword_matcher import KeywordMatcher
+from utils.aws_clients import get_client, get_table
+from utils.priming import is_priming_event, wants_network, run_priming, warm, register_init_hooks
+from utils.response_pipeline import (
+    ResponsePipeline, normalize_agri_terms, clean_model_text, normalize_markdown,
+    strip_sources_line, strip_span_tags, clean_localized_text,
+)
+from utils.conversation_memory import (
+    load_context as load_memory_context, refresh_memory, summary_prompt, SUMMARY_SYSTEM_PROMPT,
+)
 from utils.audit_logger import (
     audit_request_start, audit_guardrail_block, audit_pii_detected,
     audit_tool_invocation, audit_policy_decision, audit_request_complete,
-    audit_bedrock_guardrail,
+    audit_bedrock_guardrail, begin_audit_batch, flush_audit_batch,
 )
 
 ENFORCE_CODE_POLICY = os.environ.get('ENFORCE_CODE_POLICY', 'true').lower() == 'true'
@@ -113,16 +143,62 @@ ENABLE_BACKOFF_JITTER = os.environ.get('ENABLE_BACKOFF_JITTER', 'false').lower()
 ENABLE_MODEL_VALIDATION = os.environ.get('ENABLE_MODEL_VALIDATION', 'false').lower() == 'true'
 ENABLE_TOOL_INVOCATION_TIMEOUT = os.environ.get('ENABLE_TOOL_INVOCATION_TIMEOUT', 'false').lower() == 'true'
 ENABLE_TOOL_METRICS = os.environ.get('ENABLE_TOOL_METRICS', 'false').lower() == 'true'
+# Tool / prefetch / bulkhead metrics: buffered, written as EMF at the end of the request
+TOOLS_METRIC_NAMESPACE = 'SmartRuralAI/Tools'
 ENABLE_UNIFIED_CORS = os.environ.get('ENABLE_UNIFIED_CORS', 'false').lower() == 'true'
 
+# Feature flag: concurrent pre-flight (profile/count/rate limit/translate) (default: OFF)
+ENABLE_CONCURRENT_PREFLIGHT = os.environ.get('ENABLE_CONCURRENT_PREFLIGHT', 'false').lower() == 'true'
 
-def _pool_config():
-    if not ENABLE_CONNECTION_POOLING:
-        return None
-    return Config(max_pool_connections=25)
+# Feature flag: speculative prefetch of the mandatory first tool (default: OFF)
+ENABLE_SPECULATIVE_PREFETCH = os.environ.get('ENABLE_SPECULATIVE_PREFETCH', 'false').lower() == 'true'
+SPECULATIVE_PREFETCH_TOOLS = {
+    t.strip() for t in os.environ.get('SPECULATIVE_PREFETCH_TOOLS', 'get_weather,search_schemes').split(',') if t.strip()
+}
+
+# Feature flag: pre-seeded first turn — run required tools before the first converse() (default: OFF)
+ENABLE_SEEDED_FIRST_TURN = os.environ.get('ENABLE_SEEDED_FIRST_TURN', 'false').lower() == 'true'
+SEEDED_FIRST_TURN_INTENTS = {
+    i.strip() for i in os.environ.get('SEEDED_FIRST_TURN_INTENTS', 'weather,schemes,crop,pest,irrigation').split(',') if i.strip()
+}
+
+# Feature flag: persistent per-dependency tool executors (bulkheads) (default: OFF)
+ENABLE_TOOL_BULKHEADS = os.environ.get('ENABLE_TOOL_BULKHEADS', 'false').lower() == 'true'
+
+# Feature flag: converse_stream() + sentence-level localization/TTS (default: OFF)
+# Overlaps Translate/Polly with generation only; the client still receives one
+# buffered response (the REST API integration cannot stream the body).
+ENABLE_STREAMING_RESPONSES = os.environ.get('ENABLE_STREAMING_RESPONSES', 'false').lower() == 'true'
 
+# Feature flag: request-scoped deadline propagated to every stage (default: OFF)
+ENABLE_DEADLINE_PROPAGATION = os.environ.get('ENABLE_DEADLINE_PROPAGATION', 'false').lower() == 'true'
+
+# Feature flags: per-stage spans → EMF log line + Server-Timing header (default: OFF);
+# ENABLE_TIMINGS_DEBUG additionally returns them as data.timings in the response body.
+ENABLE_STAGE_TRACING = os.environ.get('ENABLE_STAGE_TRACING', 'false').lower() == 'true'
+ENABLE_TIMINGS_DEBUG = os.environ.get('ENABLE_TIMINGS_DEBUG', 'false').lower() == 'true'
+
+# Feature flag: Bedrock cache points after the static system prompt / tool specs (default: OFF)
+ENABLE_PROMPT_CACHING = os.environ.get('ENABLE_PROMPT_CACHING', 'false').lower() == 'true'
+
+# Feature flag: rolling summary + last N turns instead of the 40-message replay (default: OFF)
+ENABLE_CONVERSATION_MEMORY = os.environ.get('ENABLE_CONVERSATION_MEMORY', 'false').lower() == 'true'
+
+# Feature flag: send low-complexity turns to FOUNDATION_MODEL_LITE (default: OFF).
+# The routing decision is logged either way (shadow mode when OFF).
+ENABLE_MODEL_ROUTER = os.environ.get('ENABLE_MODEL_ROUTER', 'false').lower() == 'true'
+
+# Feature flag: coalesce identical in-flight queries on the response-cache key (default: OFF)
+ENABLE_SINGLE_FLIGHT = os.environ.get('ENABLE_SINGLE_FLIGHT', 'false').lower() == 'true'
+
+# Feature flag: hedge a slow/throttled primary converse() with the fallback model (default: OFF).
+# BEDROCK_HEDGE_MODEL overrides the hedge target (e.g. another inference profile).
+ENABLE_BEDROCK_HEDGING = os.environ.get('ENABLE_BEDROCK_HEDGING', 'false').lower() == 'true'
+BEDROCK_HEDGE_MODEL = os.environ.get('BEDROCK_HEDGE_MODEL', '')
+
+# Feature flag: adaptive (AIMD) client-side rate limiter in front of every converse() (default: OFF)
+ENABLE_BEDROCK_LIMITER = os.environ.get('ENABLE_BEDROCK_LIMITER', 'false').lower() == 'true'
 
-_POOL_CONFIG = _pool_config()
 
 
 def _check_timeout_approaching(context):
@@ -180,18 +256,36 @@ def _timeout_http_response(session_id, language='en'):
     }
 
 
-# Bedrock Runtime client for direct model invocation (converse API with tool use)
+# AI-path clients come from the shared registry (utils/aws_clients.py), built on
+# first use: a cold start that only answers a greeting, a guardrail block or a
+# cached reply never builds them. ENABLE_CONNECTION_POOLING is applied there.
 _REGION = os.environ.get('AWS_REGION', 'ap-south-1')
-bedrock_rt = boto3.client('bedrock-runtime', region_name=_REGION, config=_POOL_CONFIG) if _POOL_CONFIG else boto3.client('bedrock-runtime', region_name=_REGION)
-lambda_client = boto3.client('lambda', region_name=_REGION, config=_POOL_CONFIG) if _POOL_CONFIG else boto3.client('lambda', region_name=_REGION)
-if ENABLE_TOOL_INVOCATION_TIMEOUT:
-    _lambda_timeout_config = Config(read_timeout=30, connect_timeout=5, max_pool_connections=25 if ENABLE_CONNECTION_POOLING else 10)
-    lambda_invoke_client = boto3.client('lambda', region_name=_REGION, config=_lambda_timeout_config)
-else:
-    lambda_invoke_client = lambda_client
-cloudwatch_client = boto3.client('cloudwatch', region_name=_REGION, config=_POOL_CONFIG) if (ENABLE_TOOL_METRICS and _POOL_CONFIG) else (boto3.client('cloudwatch', region_name=_REGION) if ENABLE_TOOL_METRICS else None)
+
+
+def _bedrock_rt():
+    """Bedrock Runtime client for direct model invocation (converse API with tool use)."""
+    return get_client('bedrock-runtime', region_name=_REGION)
+
+
+def _lambda_client():
+    return get_client('lambda', region_name=_REGION)
+
+
+def _lambda_invoke_client():
+    if not ENABLE_TOOL_INVOCATION_TIMEOUT:
+        return _lambda_client()
+    return get_client('lambda', name='lambda-invoke', region_name=_REGION, config=Config(
+        read_timeout=30, connect_timeout=5, max_pool_connections=25 if ENABLE_CONNECTION_POOLING else 10,
+    ))
+
+
 logger.info(f"Mode: Direct Bedrock converse() | Model: {FOUNDATION_MODEL}")
 
+# In-process tool handlers are imported during init (cold start), not on the first request.
+_IN_PROCESS_TOOLS_LOADED = preload_in_process_tools()
+if _IN_PROCESS_TOOLS_LOADED:
+    logger.info(f"In-process tool backends: {_IN_PROCESS_TOOLS_LOADED}")
+
 
 AGRI_POLICY_KEYWORDS = {
     # General farming
@@ -311,6 +405,14 @@ OFF_TOPIC_KEYWORDS = {
     'lottery', 'gambling', 'bet ', 'betting',
 }
 
+# Compiled once per container. Phrases (multi-word off-topic) are checked before AGRI
+# keywords, single off-topic words after them — see _is_on_topic_query.
+_TOPIC_MATCHER = KeywordMatcher({
+    'off_topic_phrase': [kw for kw in OFF_TOPIC_KEYWORDS if ' ' in kw],
+    'agri': AGRI_POLICY_KEYWORDS,
+    'off_topic': [kw for kw in OFF_TOPIC_KEYWORDS if ' ' not in kw],
+})
+
 SAFE_CHITCHAT = {'hi', 'hello', 'hey', 'thanks', 'thank you', 'ok', 'okay',
                  'good morning', 'good evening', 'good afternoon', 'good night',
                  'bye', 'goodbye', 'namaste', 'vanakkam', 'namaskar'}
@@ -351,26 +453,6 @@ def _sanitize_user_message(text):
     return cleaned.strip()
 
 
-def _normalize_translated_agri_terms(text):
-    """Fix common translation artifacts for key agriculture season terms."""
-    normalized = str(text or '')
-    if not normalized:
-        return normalized
-
-    replacements = [
-        (r'\bcardiff\b', 'kharif'),
-        (r'\bharif\b', 'kharif'),
-        (r'\bkhariff\b', 'kharif'),
-        (r'\brabby\b', 'rabi'),
-        (r'\brabbi\b', 'rabi'),
-        (r'\bzaad\b', 'zaid'),
-        (r'\bzaidh\b', 'zaid'),
-    ]
-    for pattern, repl in replacements:
-        normalized = re.sub(pattern, repl, normalized, flags=re.IGNORECASE)
-    return normalized
-
-
 def _resolve_reply_language(preferred_language, detected_language, raw_user_message, enforce_preferred=False):
     """Resolve reply language with a single source of truth.
 
@@ -401,19 +483,19 @@ def _is_on_topic_query(text):
     # ── Priority 1: Multi-word off-topic phrases (most specific → check first) ──
     # Phrases like "stock market", "prime minister", "web series" are unambiguous
     # and must override single-word AGRI matches (e.g. "market" in AGRI).
-    off_topic_phrases = [kw for kw in OFF_TOPIC_KEYWORDS if ' ' in kw]
-    if any(phrase in normalized for phrase in off_topic_phrases):
-        logger.info(f"Off-topic blocked (phrase): matched in '{normalized[:80]}'")
+    phrase = _TOPIC_MATCHER.find('off_topic_phrase', normalized)
+    if phrase:
+        logger.info(f"Off-topic blocked (phrase '{phrase}'): matched in '{normalized[:80]}'")
         return False
 
     # ── Priority 2: AGRI keyword match ──
-    if any(keyword in normalized for keyword in AGRI_POLICY_KEYWORDS):
+    if _TOPIC_MATCHER.matches('agri', normalized):
         return True
 
     # ── Priority 3: Single-word off-topic keywords (after AGRI to avoid false positives) ──
-    off_topic_singles = [kw for kw in OFF_TOPIC_KEYWORDS if ' ' not in kw]
-    if any(keyword in normalized for keyword in off_topic_singles):
-        logger.info(f"Off-topic blocked (single): matched in '{normalized[:80]}'")
+    keyword = _TOPIC_MATCHER.find('off_topic', normalized)
+    if keyword:
+        logger.info(f"Off-topic blocked (single '{keyword}'): matched in '{normalized[:80]}'")
         return False
 
     # Lenient fallback: if the query has 3+ words, let it through —
@@ -537,17 +619,6 @@ def _grounding_prompt_for_intents(intents):
     )
 
 
-def _strip_sources_line(text):
-    """Remove any 'Sources: ...' line from the text (agent.py may have added it).
-    Returns (cleaned_text, extracted_sources_str_or_None)."""
-    if not text:
-        return text, None
-    match = re.search(r'\n\s*Sources:\s*(.+)$', text)
-    if match:
-        return text[:match.start()].rstrip(), match.group(1).strip()
-    return text, None
-
-
 def _build_sources_line(tools_used):
     """Build a sources attribution string from tool names (never translated)."""
     if not tools_used:
@@ -571,7 +642,7 @@ def _append_sources(reply_en, tools_used):
         return text
 
     # Strip any existing sources line first (avoid duplicates from agent.py)
-    text, _ = _strip_sources_line(text)
+    text, _ = strip_sources_line(text)
 
     sources = _build_sources_line(tools_used)
     if sources:
@@ -821,28 +892,12 @@ TOOL_TO_LAMBDA = {
 
 
 def _emit_tool_metric(tool_name, duration_ms, success):
-    if not cloudwatch_client:
+    """Buffered; written as EMF when the request ends (utils/metrics.py)."""
+    if not ENABLE_TOOL_METRICS:
         return
-    try:
-        cloudwatch_client.put_metric_data(
-            Namespace='SmartRuralAI/Tools',
-            MetricData=[
-                {
-                    'MetricName': 'ToolExecutionDurationMs',
-                    'Dimensions': [{'Name': 'ToolName', 'Value': str(tool_name)}],
-                    'Value': float(duration_ms),
-                    'Unit': 'Milliseconds',
-                },
-                {
-                    'MetricName': 'ToolExecutionSuccess',
-                    'Dimensions': [{'Name': 'ToolName', 'Value': str(tool_name)}],
-                    'Value': 1.0 if success else 0.0,
-                    'Unit': 'Count',
-                },
-            ],
-        )
-    except Exception as metric_err:
-        logger.warning(f"Tool metric emission failed for {tool_name}: {metric_err}")
+    dims = {'ToolName': str(tool_name)}
+    put_metric('ToolExecutionDurationMs', duration_ms, unit='Milliseconds', dimensions=dims, namespace=TOOLS_METRIC_NAMESPACE)
+    put_metric('ToolExecutionSuccess', 1.0 if success else 0.0, unit='Count', dimensions=dims, namespace=TOOLS_METRIC_NAMESPACE)
 
 
 def _validated_model_id(model_id):
@@ -857,36 +912,50 @@ def _validated_model_id(model_id):
     return model_id
 
 
+def _tool_event(tool_name, tool_input):
+    """Build the API-Gateway-shaped event a tool handler expects."""
+    if tool_name == "get_weather":
+        # Weather Lambda reads from pathParameters.location (API Gateway: /weather/{location})
+        return {"pathParameters": {"location": tool_input.get("location", "Chennai")}}
+    if tool_name in ("get_crop_advisory", "get_pest_alert", "search_schemes"):
+        # Pest queries route to crop advisory Lambda with KB lookup
+        return {"queryStringParameters": dict(tool_input)}
+    if tool_name == "get_farmer_profile":
+        return {"pathParameters": {"farmerId": tool_input.get("farmer_id", "")}}
+    return {"body": json.dumps(tool_input)}
+
+
 def _execute_tool(tool_name, tool_input):
-    """Execute a tool by invoking the corresponding Lambda function."""
+    """Execute a tool in-process (IN_PROCESS_TOOLS) or by invoking the tool Lambda."""
     lambda_name = TOOL_TO_LAMBDA.get(tool_name)
-    if not lambda_name:
+    use_in_process = in_process_enabled(tool_name)
+    if not lambda_name and not use_in_process:
         return {"error": f"Unknown tool: {tool_name}"}
 
     start_time = _time.time()
     try:
-        # Build Lambda payload based on tool
-        if tool_name == "get_weather":
-            # Weather Lambda reads from pathParameters.location (API Gateway: /weather/{location})
-            lambda_payload = {"pathParameters": {"location": tool_input.get("location", "Chennai")}}
-        elif tool_name == "get_crop_advisory":
-            lambda_payload = {"queryStringParameters": tool_input}
-        elif tool_name == "get_pest_alert":
-            # Route pest queries to crop advisory Lambda with KB lookup
-            lambda_payload = {"queryStringParameters": tool_input}
-        elif tool_name == "search_schemes":
-            lambda_payload = {"queryStringParameters": tool_input}
-        elif tool_name == "get_farmer_profile":
-            lambda_payload = {"pathParameters": {"farmerId": tool_input.get("farmer_id", "")}}
-        else:
-            lambda_payload = {"body": json.dumps(tool_input)}
-
-        response = lambda_invoke_client.invoke(
-            FunctionName=lambda_name,
-            InvocationType="RequestResponse",
-            Payload=json.dumps(lambda_payload).encode(),
-        )
-        resp_payload = json.loads(response["Payload"].read().decode())
+        lambda_payload = _tool_event(tool_name, tool_input)
+        deadline = current_deadline()
+        if deadline:
+            # Tool handlers cap their own HTTP/KB timeouts and retries at this.
+            lambda_payload['deadline_epoch_ms'] = deadline.epoch_ms()
+
+        resp_payload = None
+        if use_in_process:
+            try:
+                resp_payload = invoke_in_process(tool_name, lambda_payload)
+            except ToolBackendUnavailable as backend_err:
+                logger.warning(f"In-process {tool_name} unavailable, falling back to Lambda invoke: {backend_err}")
+                if not lambda_name:
+                    raise
+        if resp_payload is None:
+            invoke_client = client_for('tool', _lambda_invoke_client(), 'lambda', region_name=_REGION)
+            response = invoke_client.invoke(
+                FunctionName=lambda_name,
+                InvocationType="RequestResponse",
+                Payload=json.dumps(lambda_payload).encode(),
+            )
+            resp_payload = json.loads(response["Payload"].read().decode())
 
         # Parse Lambda response
         if isinstance(resp_payload, dict) and "body" in resp_payload:
@@ -909,6 +978,11 @@ def _execute_tool(tool_name, tool_input):
         return {"error": "Tool invocation failed"}
 
 
+def _execute_tool_cached(tool_name, tool_input):
+    """_execute_tool behind the tool-result cache (ENABLE_TOOL_RESULT_CACHE, utils/tool_cache.py)."""
+    return cached_tool_call(tool_name, tool_input, _execute_tool)
+
+
 def _is_soil_specific_recommendation_query(user_prompt, tool_input=None):
     """Return True when the request is soil-focused and asks for crop recommendations."""
     ti = tool_input or {}
@@ -1031,6 +1105,353 @@ def _enforce_tool_result_policy(tool_name, result, farmer_context=None, user_pro
     return result
 
 
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#  SPECULATIVE TOOL PREFETCH
+#  _build_tool_first_prompt already forces the first tool. For tools whose
+#  input can be derived deterministically from farmer context, start the
+#  tool Lambda alongside the first converse() call. The prefetched result is
+#  used only if the model's toolUse input canonicalizes (after
+#  _apply_tool_input_policy) to the same value; otherwise it is discarded.
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+_prefetch_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='prefetch')
+_prefetch_counters = {'started': 0, 'hits': 0, 'wasted': 0}  # per warm container
+_prefetch_counters_lock = threading.Lock()
+
+
+def _canonical_tool_input(tool_input):
+    """Order-, case- and whitespace-insensitive key for a tool input dict."""
+    canonical = {}
+    for key, value in (tool_input or {}).items():
+        if value is None or value == '' or value == []:
+            continue
+        if isinstance(value, str):
+            value = ' '.join(value.lower().split())
+        canonical[key] = value
+    return json.dumps(canonical, sort_keys=True, default=str)
+
+
+def _derive_prefetch_input(tool_name, farmer_context, user_prompt):
+    """Predict the mandatory tool's input from farmer context, or None if not derivable."""
+    fc = farmer_context or {}
+    if tool_name == 'get_weather':
+        location = str(fc.get('gps_location') or fc.get('district') or fc.get('state') or '').strip()
+        if not location:
+            return None
+        raw_input = {'location': location}
+    elif tool_name == 'search_schemes':
+        raw_input = {'query': 'all'}
+    else:
+        return None
+    return _apply_tool_input_policy(tool_name, raw_input, farmer_context=farmer_context, user_prompt=user_prompt)
+
+
+def _emit_prefetch_metric(tool_name, outcome):
+    if not ENABLE_TOOL_METRICS:
+        return
+    count_metric('SpeculativePrefetchHit' if outcome == 'hit' else 'SpeculativePrefetchWasted',
+                 dimensions={'ToolName': str(tool_name)}, namespace=TOOLS_METRIC_NAMESPACE)
+
+
+def _start_speculative_prefetch(intents, farmer_context, user_prompt):
+    """Kick off the mandatory first tool in the background. Returns a prefetch handle or None."""
+    if not os.environ.get('ENABLE_SPECULATIVE_PREFETCH', 'false').lower() == 'true':
+        return None
+    tool_name = _mandatory_first_tool(intents)
+    if not tool_name or tool_name not in SPECULATIVE_PREFETCH_TOOLS:
+        return None
+    tool_input = _derive_prefetch_input(tool_name, farmer_context, user_prompt)
+    if not tool_input:
+        return None
+    if ENABLE_TOOL_BULKHEADS:
+        try:
+            future = bulkhead_for_tool(tool_name).submit(_execute_tool_cached, tool_name, tool_input)
+        except BulkheadFull:
+            logger.info(f"Speculative prefetch skipped — {tool_name} bulkhead is full")
+            return None
+    else:
+        future = _prefetch_pool.submit(_execute_tool_cached, tool_name, tool_input)
+    with _prefetch_counters_lock:
+        _prefetch_counters['started'] += 1
+    logger.info(f"Speculative prefetch started: {tool_name}({json.dumps(tool_input)[:100]})")
+    return {
+        'tool': tool_name,
+        'input': tool_input,
+        'key': _canonical_tool_input(tool_input),
+        'future': future,
+        'consumed': False,
+        'lock': threading.Lock(),
+    }
+
+
+def _tool_join_timeout():
+    """Seconds to wait on in-flight tools: TOOL_EXECUTION_TIMEOUT_SEC, capped by the request deadline."""
+    deadline = current_deadline()
+    if deadline is None:
+        return TOOL_EXECUTION_TIMEOUT_SEC
+    return deadline.timeout('tool', cap=TOOL_EXECUTION_TIMEOUT_SEC)
+
+
+def _claim_prefetched_result(prefetch, tool_name, tool_input):
+    """Return (hit, result). A hit consumes the prefetch; mismatches leave it for waste accounting.
+    A prefetch still running at the join timeout is served as a timeout result (same
+    as the parallel path) — re-running it would double the wait. Only a prefetch
+    that raised falls back to a fresh execution."""
+    if not prefetch or prefetch['tool'] != tool_name:
+        return False, None
+    if _canonical_tool_input(tool_input) != prefetch['key']:
+        return False, None
+    with prefetch['lock']:
+        if prefetch['consumed']:
+            return False, None
+        prefetch['consumed'] = True
+    join_timeout = _tool_join_timeout()
+    try:
+        result = prefetch['future'].result(timeout=join_timeout)
+    except FuturesTimeoutError:
+        logger.error(f"Speculative prefetch {tool_name} TIMED OUT after {join_timeout:.1f}s")
+        _emit_tool_metric(tool_name, join_timeout * 1000.0, False)
+        return True, {
+            "error": f"Tool execution timed out after {join_timeout:.0f} seconds",
+            "tool": tool_name,
+            "timeout": True,
+        }
+    except Exception as prefetch_err:
+        logger.warning(f"Speculative prefetch result unavailable for {tool_name}: {prefetch_err}")
+        prefetch['consumed'] = False
+        return False, None
+    with _prefetch_counters_lock:
+        _prefetch_counters['hits'] += 1
+    _emit_prefetch_metric(tool_name, 'hit')
+    logger.info(f"Speculative prefetch HIT: {tool_name}")
+    return True, result
+
+
+def _run_tool(tool_name, tool_input, prefetch=None):
+    """Execute a tool, serving it from the speculative prefetch when inputs match."""
+    with stage_span(f"tool_{tool_name}"):
+        hit, result = _claim_prefetched_result(prefetch, tool_name, tool_input)
+        if hit:
+            return result
+        return _execute_tool_cached(tool_name, tool_input)
+
+
+def _submit_tool_calls(tools, prefetch=None):
+    """Submit tool calls for concurrent execution.
+    With ENABLE_TOOL_BULKHEADS each call goes to its dependency's persistent,
+    bounded executor; a full bulkhead rejects the call instead of queueing.
+    Otherwise a per-turn ThreadPoolExecutor is created (caller shuts it down).
+    Returns (futures {future: tool}, pool or None, rejected [tool])."""
+    futures = {}
+    rejected = []
+    if ENABLE_TOOL_BULKHEADS:
+        for t in tools:
+            try:
+                futures[bulkhead_for_tool(t["name"]).submit(_run_tool, t["name"], t["input"], prefetch)] = t
+            except BulkheadFull:
+                rejected.append(t)
+        return futures, None, rejected
+    pool = ThreadPoolExecutor(max_workers=len(tools))
+    for t in tools:
+        futures[pool.submit(_run_tool, t["name"], t["input"], prefetch)] = t
+    return futures, pool, rejected
+
+
+def _overloaded_tool_result(tool_name):
+    return {
+        "error": "Tool is temporarily overloaded. Answer with available data or ask the farmer to retry.",
+        "tool": tool_name,
+        "overloaded": True,
+    }
+
+
+def _emit_bulkhead_metrics():
+    """Publish queue depth / saturation / rejections for every bulkhead in this container."""
+    stats = bulkhead_stats()
+    if not stats:
+        return stats
+    logger.info(f"Bulkhead stats: {stats}")
+    if not ENABLE_TOOL_METRICS:
+        return stats
+    for st in stats:
+        dims = {'Bulkhead': st['bulkhead']}
+        put_metric('BulkheadQueueDepth', st['queue_depth'], unit='Count', dimensions=dims, namespace=TOOLS_METRIC_NAMESPACE)
+        put_metric('BulkheadSaturation', st['saturation'], unit='None', dimensions=dims, namespace=TOOLS_METRIC_NAMESPACE)
+        put_metric('BulkheadRejected', st['rejected'], unit='Count', dimensions=dims, namespace=TOOLS_METRIC_NAMESPACE)
+    return stats
+
+
+def _finish_speculative_prefetch(prefetch):
+    """Account for an unused prefetch. Returns a summary dict for pipeline metadata."""
+    if not prefetch:
+        return None
+    if not prefetch['consumed']:
+        prefetch['future'].cancel()
+        with _prefetch_counters_lock:
+            _prefetch_counters['wasted'] += 1
+        _emit_prefetch_metric(prefetch['tool'], 'wasted')
+        logger.info(f"Speculative prefetch WASTED: {prefetch['tool']}")
+    with _prefetch_counters_lock:
+        started = _prefetch_counters['started']
+        hit_rate = round(_prefetch_counters['hits'] / started, 3) if started else None
+    return {'tool': prefetch['tool'], 'hit': prefetch['consumed'], 'container_hit_rate': hit_rate}
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#  PRE-SEEDED FIRST TURN
+#  For high-confidence intents the orchestrator runs the required tools
+#  itself and injects a synthetic assistant toolUse / user toolResult pair,
+#  so the first converse() call can answer directly instead of spending a
+#  whole round trip emitting the toolUse block. The model can still ask
+#  for more tools — the normal loop continues from there.
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+# Tools whose seeded input carries the profile location (directly or via _apply_tool_input_policy).
+_SEED_LOCATION_TOOLS = ('get_weather', 'get_crop_advisory', 'search_schemes')
+
+# "weather in Madurai", "rain at Salem", "schemes near Guntur" — the word after
+# the preposition is a place unless it is one of these (time, possessives, farm words).
+_PLACE_PHRASE_RE = re.compile(r'\b(?:in|at|near|around)\s+([a-z][a-z.\-]*(?:\s+[a-z][a-z.\-]*)?)')
+_NOT_A_PLACE = {
+    'the', 'a', 'an', 'my', 'our', 'this', 'that', 'these', 'next', 'coming', 'last', 'few', 'two', 'three',
+    'today', 'tomorrow', 'tonight', 'morning', 'evening', 'night', 'week', 'weeks', 'month', 'months',
+    'day', 'days', 'summer', 'winter', 'monsoon', 'rainy', 'season', 'kharif', 'rabi', 'zaid',
+    'farm', 'field', 'fields', 'village', 'area', 'region', 'district', 'state', 'land', 'soil',
+    'crop', 'crops', 'plant', 'plants', 'leaves', 'leaf', 'water', 'case', 'time', 'order', 'general',
+    'english', 'hindi', 'tamil', 'telugu', 'kannada', 'malayalam', 'marathi', 'bengali', 'gujarati',
+    'punjabi', 'odia', 'detail', 'details', 'short', 'simple', 'advance', 'future', 'india',
+    'black', 'red', 'alluvial', 'clay', 'clayey', 'sandy', 'loamy', 'laterite', 'saline', 'acidic',
+    'low', 'high', 'less', 'more', 'dry', 'wet', 'hot', 'cold', 'heavy', 'light', 'good', 'bad',
+}
+
+
+def _names_other_location(message_en, farmer_context):
+    """True when the message names a state or place that is not the farmer's profile location.
+    Errs towards True: a false positive only costs the seeded-turn shortcut."""
+    text = ' '.join(str(message_en or '').lower().split())
+    if not text:
+        return False
+    fc = farmer_context or {}
+    profile = ' '.join(
+        str(fc.get(k) or '') for k in ('gps_location', 'district', 'state', 'village', 'location')
+    ).lower()
+    for state_name in _INDIA_STATE_UT_NAMES:
+        if state_name not in profile and re.search(r'\b' + re.escape(state_name) + r'\b', text):
+            return True
+    crop_words = {alias for aliases in _SOIL_GUARD_CROP_ALIASES.values() for alias in aliases}
+    for match in _PLACE_PHRASE_RE.finditer(text):
+        first = match.group(1).split()[0].strip('.-')
+        if not first or first in _NOT_A_PLACE or first in crop_words or first.isdigit():
+            continue
+        if re.search(r'\b' + re.escape(first) + r'\b', profile):
+            continue
+        return True
+    return False
+
+
+def _derive_seed_tools(intents, farmer_context, user_prompt, message_en, is_generic=False):
+    """Return [{'name', 'input'}] for the routed tools, or None if any input is not derivable."""
+    if not os.environ.get('ENABLE_SEEDED_FIRST_TURN', 'false').lower() == 'true':
+        return None
+    if is_generic or not intents:
+        return None
+    selected = [i for i in INTENT_TOOL_ORDER if i in intents][:3]
+    if not selected or any(i not in SEEDED_FIRST_TURN_INTENTS for i in selected):
+        return None
+
+    query = ' '.join(str(message_en or '').split())[:300]
+    if (any(INTENT_TOOL_MAP[i] in _SEED_LOCATION_TOOLS for i in selected)
+            and _names_other_location(message_en, farmer_context)):
+        # Seeded inputs come from the profile; a question about another place goes
+        # through the normal tool loop, where the model picks the location.
+        logger.info("Seeded first turn skipped — message names a location outside the profile")
+        return None
+    seed_tools = []
+    for intent in selected:
+        tool_name = INTENT_TOOL_MAP[intent]
+        if any(t['name'] == tool_name for t in seed_tools):
+            continue
+        if tool_name in ('get_weather', 'search_schemes'):
+            raw_input = _derive_prefetch_input(tool_name, farmer_context, user_prompt)
+        elif tool_name == 'get_crop_advisory':
+            raw_input = {'query': query}
+            if intent == 'irrigation':
+                raw_input['query_type'] = 'irrigation'
+        elif tool_name == 'get_pest_alert':
+            raw_input = {'query': query, 'query_type': 'pest'}
+        else:
+            raw_input = None
+        if not raw_input or not query:
+            return None
+        seed_tools.append({
+            'name': tool_name,
+            'input': _apply_tool_input_policy(tool_name, raw_input, farmer_context=farmer_context, user_prompt=user_prompt),
+        })
+    return seed_tools or None
+
+
+def _build_seeded_turn(seed_tools, farmer_context, prompt, prefetch=None):
+    """Execute seed tools (in parallel when 2+) and build the synthetic message pair.
+    Returns (assistant_message, tool_result_message, tool_names, tool_log_entries)."""
+    for t in seed_tools:
+        t['id'] = f"tooluse_seed_{uuid.uuid4().hex[:20]}"
+
+    results = {}
+    if len(seed_tools) >= 2:
+        pool = None
+        try:
+            futures, pool, rejected = _submit_tool_calls(seed_tools, prefetch)
+            for t in rejected:
+                results[t['id']] = _overloaded_tool_result(t['name'])
+            join_timeout = _tool_join_timeout()
+            done, not_done = wait(futures.keys(), timeout=join_timeout)
+            for future in done:
+                try:
+                    results[futures[future]['id']] = future.result()
+                except Exception as e:
+                    results[futures[future]['id']] = {"error": f"Tool execution failed: {str(e)}"}
+            for future in not_done:
+                t = futures[future]
+                logger.error(f"Seeded tool {t['name']} TIMED OUT after {join_timeout:.1f}s")
+                _emit_tool_metric(t['name'], join_timeout * 1000.0, False)
+                results[t['id']] = {
+                    "error": f"Tool execution timed out after {join_timeout:.0f} seconds",
+                    "tool": t['name'],
+                    "timeout": True,
+                }
+        finally:
+            if pool:
+                pool.shutdown(wait=False, cancel_futures=True)
+    else:
+        for t in seed_tools:
+            results[t['id']] = _run_tool(t['name'], t['input'], prefetch)
+
+    tool_uses = []
+    tool_results = []
+    tool_names = []
+    tool_log = []
+    for t in seed_tools:
+        raw_result = results.get(t['id'])
+        timed_out = isinstance(raw_result, dict) and raw_result.get('timeout') is True
+        result = _enrich_tool_result(raw_result, t['name'], t['input'], prompt)
+        result = _enforce_tool_result_policy(t['name'], result, farmer_context, user_prompt=prompt)
+        if not isinstance(result, dict):
+            result = {"result": result}
+        tool_uses.append({"toolUse": {"toolUseId": t['id'], "name": t['name'], "input": t['input']}})
+        tool_results.append({"toolResult": {"toolUseId": t['id'], "content": [{"json": result}]}})
+        # Same naming as the tool loop: a timed-out tool is reported as NAME_TIMEOUT.
+        tool_names.append(f"{t['name']}_TIMEOUT" if timed_out else t['name'])
+        tool_log.append({"tool": t['name'], "input": t['input'], "output": result})
+
+    logger.info(f"Seeded first turn with tools: {tool_names}")
+    return (
+        {"role": "assistant", "content": tool_uses},
+        {"role": "user", "content": tool_results},
+        tool_names,
+        tool_log,
+    )
+
+
 _SOIL_GUARD_CROP_ALIASES = {
     'rice': ('rice', 'paddy'),
     'wheat': ('wheat',),
@@ -1083,24 +1504,11 @@ def _extract_soil_evidence_crops(tool_data_log):
                 corpus_parts.append(str(chunk.get('content') or ''))
 
     corpus = ' '.join(corpus_parts).lower()
-    allowed = set()
-    for canonical, aliases in _SOIL_GUARD_CROP_ALIASES.items():
-        for alias in aliases:
-            if re.search(r'\b' + re.escape(alias) + r'\b', corpus):
-                allowed.add(canonical)
-                break
-    return sorted(allowed)
+    return sorted(_SOIL_GUARD_CROP_MATCHER.categories(corpus))
 
 
 def _mentioned_crops_in_text(text):
-    lowered = str(text or '').lower()
-    mentioned = set()
-    for canonical, aliases in _SOIL_GUARD_CROP_ALIASES.items():
-        for alias in aliases:
-            if re.search(r'\b' + re.escape(alias) + r'\b', lowered):
-                mentioned.add(canonical)
-                break
-    return mentioned
+    return set(_SOIL_GUARD_CROP_MATCHER.categories(str(text or '').lower()))
 
 
 def _apply_strict_soil_response_guard(result_text, user_query_en, farmer_context=None, tool_data_log=None):
@@ -1241,33 +1649,190 @@ def _init_model_fallback():
 _init_model_fallback()
 
 
-def _bedrock_converse_with_retry(bedrock_client, **kwargs):
+_RETRYABLE_BEDROCK_ERRORS = (
+    'ThrottlingException', 'TooManyRequestsException',
+    'ServiceUnavailableException', 'ModelTimeoutException',
+    'InternalServerException', 'ModelStreamErrorException',
+)
+
+
+def _converse_stream_collect(bedrock_client, on_text_delta, cancelled=None, **kwargs):
+    """Call converse_stream() and fold the event stream back into the converse()
+    response shape ({output.message, stopReason, usage}) so the tool-use loop is
+    unchanged. Text deltas are forwarded to on_text_delta as they arrive; toolUse
+    input arrives as JSON fragments and is parsed once the block is complete.
+    When the streamed text will not be the answer (the turn ends in tool_use, the
+    stream fails and will be retried, or a hedge cut it short) on_text_delta(None)
+    tells the consumer to discard it.
+    cancelled: optional callable — when it returns True (hedge lost) reading stops."""
+    streamed = False
+
+    def _forward(text):
+        try:
+            on_text_delta(text)
+        except Exception as cb_err:
+            logger.warning(f"Stream delta callback failed (non-fatal): {cb_err}")
+
+    blocks = {}
+    stop_reason = ''
+    usage = {}
+    cut_short = False
+    try:
+        response = bedrock_client.converse_stream(**kwargs)
+        stream = response.get('stream', [])
+        for event in stream:
+            if cancelled and cancelled():
+                if hasattr(stream, 'close'):
+                    stream.close()
+                cut_short = True
+                break
+            if 'contentBlockStart' in event:
+                start = event['contentBlockStart']
+                tool_start = start.get('start', {}).get('toolUse')
+                if tool_start:
+                    blocks[start.get('contentBlockIndex', 0)] = {
+                        'toolUse': {
+                            'toolUseId': tool_start.get('toolUseId', ''),
+                            'name': tool_start.get('name', ''),
+                            'input': '',
+                        }
+                    }
+            elif 'contentBlockDelta' in event:
+                block_delta = event['contentBlockDelta']
+                idx = block_delta.get('contentBlockIndex', 0)
+                delta = block_delta.get('delta', {})
+                if 'text' in delta:
+                    block = blocks.setdefault(idx, {'text': ''})
+                    block['text'] = block.get('text', '') + delta['text']
+                    if on_text_delta and delta['text']:
+                        streamed = True
+                        _forward(delta['text'])
+                elif 'toolUse' in delta:
+                    block = blocks.setdefault(idx, {'toolUse': {'toolUseId': '', 'name': '', 'input': ''}})
+                    block['toolUse']['input'] += delta['toolUse'].get('input', '')
+            elif 'messageStop' in event:
+                stop_reason = event['messageStop'].get('stopReason', '')
+            elif 'metadata' in event:
+                usage = event['metadata'].get('usage', {})
+    except Exception:
+        if streamed:
+            _forward(None)
+        raise
+    if streamed and (cut_short or stop_reason == 'tool_use'):
+        _forward(None)
+
+    content = []
+    for idx in sorted(blocks):
+        block = blocks[idx]
+        if 'toolUse' in block:
+            raw_input = block['toolUse'].get('input') or ''
+            try:
+                block['toolUse']['input'] = json.loads(raw_input) if raw_input else {}
+            except json.JSONDecodeError:
+                logger.warning(f"Unparseable streamed toolUse input for {block['toolUse'].get('name')}")
+                block['toolUse']['input'] = {}
+        content.append(block)
+    return {
+        'output': {'message': {'role': 'assistant', 'content': content}},
+        'stopReason': stop_reason,
+        'usage': usage,
+    }
+
+
+def _bedrock_limited(model_id, fn, *args, **kwargs):
+    """Run one Bedrock call behind the per-model adaptive limiter (when enabled).
+    Queueing is a fraction of the turn's budget (BEDROCK_LIMITER_MAX_WAIT_FRACTION) and
+    bounded by the request deadline so a wait never eats the call's own budget."""
+    if not ENABLE_BEDROCK_LIMITER:
+        return fn(*args, **kwargs)
+    deadline = current_deadline()
+    if deadline is None:
+        max_wait = limiter_max_wait(STAGE_MAX_SEC['bedrock_turn'])
+    else:
+        max_wait = min(limiter_max_wait(deadline.timeout('bedrock_turn')),
+                       max(0.0, deadline.remaining() - STAGE_MIN_SEC['bedrock_turn']))
+    return limited_call(model_id, fn, *args, max_wait=max_wait, **kwargs)
+
+
+def _bedrock_error_code(exc):
+    """Bedrock error code of a ClientError, normalised to UpperCamel ('' for other errors).
+    Mid-stream errors arrive as lowerCamel event names (e.g. throttlingException)."""
+    if not isinstance(exc, ClientError):
+        return ''
+    error_code = exc.response.get('Error', {}).get('Code', '')
+    return error_code[:1].upper() + error_code[1:]
+
+
+def _bedrock_converse_with_retry(bedrock_client, on_text_delta=None, **kwargs):
     """Wrapper around bedrock_rt.converse() with exponential backoff for throttling.
     After exhausting retries on the primary model, automatically falls back to
     the alternate model (Pro ↔ Lite) for one final attempt.
+    on_text_delta: when set, uses converse_stream() and forwards text deltas.
     Returns the Bedrock response dict, or raises the last exception on exhaustion.
     """
+    def _call(call_kwargs, lane=None):
+        # Under a request deadline the module client is swapped for one whose
+        # read_timeout fits the remaining budget (explicit clients are kept).
+        client = bedrock_client
+        if bedrock_client is _bedrock_rt():
+            client = client_for('bedrock_turn', bedrock_client, 'bedrock-runtime', region_name=_REGION)
+        model_id = call_kwargs.get('modelId', '')
+        if on_text_delta:
+            if lane is not None:
+                return _bedrock_limited(model_id, _converse_stream_collect, client, lane.on_delta,
+                                        cancelled=lane.cancelled, **call_kwargs)
+            return _bedrock_limited(model_id, _converse_stream_collect, client, on_text_delta, **call_kwargs)
+        return _bedrock_limited(model_id, client.converse, **call_kwargs)
+
+    deadline = current_deadline()
+
     primary_model = kwargs.get('modelId', '')
+    hedge_model = BEDROCK_HEDGE_MODEL or MODEL_FALLBACK.get(primary_model)
+    use_hedge = ENABLE_BEDROCK_HEDGING and bool(hedge_model) and hedge_model != primary_model
     last_exc = None
     for attempt in range(1 + MAX_RETRIES):
         try:
-            return bedrock_client.converse(**kwargs)
+            if use_hedge and attempt == 0:
+                # First attempt is raced against the hedge model; retries below are plain calls.
+                _t_hedge = _time.time()
+                response, hedge_info = run_hedged(
+                    _call, kwargs, {**kwargs, 'modelId': hedge_model},
+                    on_text_delta=on_text_delta,
+                    is_retryable=lambda exc: _bedrock_error_code(exc) in _RETRYABLE_BEDROCK_ERRORS,
+                )
+                if hedge_info['hedged']:
+                    record_span(f"bedrock_hedge_{hedge_info['winner']}", _t_hedge)
+            else:
+                response = _call(kwargs)
+            record_usage(response.get('usage'))
+            return response
         except ClientError as e:
-            error_code = e.response.get('Error', {}).get('Code', '')
-            retryable = error_code in (
-                'ThrottlingException', 'TooManyRequestsException',
-                'ServiceUnavailableException', 'ModelTimeoutException',
-                'InternalServerException',
-            )
+            error_code = _bedrock_error_code(e)
+            if has_cache_points(kwargs) and is_cache_rejection(error_code, e.response.get('Error', {}).get('Message', '')):
+                # Model does not support prompt caching — remember it and resend without cache points.
+                logger.warning(f"Prompt caching rejected by {primary_model}; disabling cache points for this model")
+                mark_unsupported(primary_model)
+                kwargs = strip_cache_points(kwargs)
+                last_exc = e
+                continue
+            retryable = error_code in _RETRYABLE_BEDROCK_ERRORS
             if retryable and attempt < MAX_RETRIES:
                 delay = RETRY_BASE_DELAY * (2 ** attempt)
                 if os.environ.get('ENABLE_BACKOFF_JITTER', 'false').lower() == 'true':
                     delay = max(0.1, delay * (1 + random.uniform(-0.25, 0.25)))
+                if ENABLE_BEDROCK_LIMITER and is_throttle(e):
+                    # The limiter already cut the rate; the retry queues on its bucket instead of sleeping.
+                    delay = 0.0
+                if deadline and deadline.remaining() < delay + STAGE_MIN_SEC['bedrock_turn']:
+                    deadline.skip('bedrock_retry', f'({error_code})')
+                    last_exc = e
+                    break
                 logger.warning(
                     f"Bedrock {error_code} (attempt {attempt+1}/{1+MAX_RETRIES}) — "
                     f"retrying in {delay:.1f}s"
                 )
-                _time.sleep(delay)
+                if delay:
+                    _time.sleep(delay)
                 last_exc = e
             else:
                 last_exc = e
@@ -1280,7 +1845,9 @@ def _bedrock_converse_with_retry(bedrock_client, **kwargs):
 
     # ── MODEL FALLBACK (guarded by feature flag) ──
     fallback_model = MODEL_FALLBACK.get(primary_model)
-    if model_fallback_enabled and fallback_model and last_exc:
+    if model_fallback_enabled and fallback_model and last_exc and deadline and not deadline.allows('bedrock_turn'):
+        deadline.skip('model_fallback')
+    elif model_fallback_enabled and fallback_model and last_exc:
         error_code = ''
         if isinstance(last_exc, ClientError):
             error_code = last_exc.response.get('Error', {}).get('Code', '')
@@ -1290,7 +1857,8 @@ def _bedrock_converse_with_retry(bedrock_client, **kwargs):
         )
         try:
             fallback_kwargs = {**kwargs, 'modelId': fallback_model}
-            response = bedrock_client.converse(**fallback_kwargs)
+            response = _call(fallback_kwargs)
+            record_usage(response.get('usage'))
             logger.info(f"Model fallback SUCCESS: {fallback_model}")
             return response
         except Exception as fb_err:
@@ -1308,6 +1876,27 @@ def _bedrock_converse_with_retry(bedrock_client, **kwargs):
     raise RuntimeError('_bedrock_converse_with_retry: unreachable')
 
 
+def _history_items_to_messages(history):
+    """Convert chat_sessions items into converse() message dicts (English preferred, trimmed)."""
+    converse_messages = []
+    for item in history:
+        role = item.get('role', 'user')
+        # Prefer English version for pipeline context (model processes in English)
+        text = item.get('message_en') or item.get('message', '')
+        if not text or not text.strip():
+            continue
+        # Truncate long previous messages to save tokens
+        if len(text) > 500:
+            text = text[:500] + '...'
+        # Remove sources line from previous assistant messages
+        text = re.sub(r'\n\s*Sources:\s*.+$', '', text, flags=re.MULTILINE).strip()
+        # Strip any HTML artifacts from previous messages
+        text = re.sub(r'</?span[^>]*>', '', text, flags=re.IGNORECASE).strip()
+        if role in ('user', 'assistant') and text:
+            converse_messages.append({"role": role, "content": [{"text": text}]})
+    return converse_messages
+
+
 def _build_conversation_history_context(session_id, limit=40):
     """Retrieve recent chat history from DynamoDB and format for the model.
     Returns a list of Bedrock converse() message dicts (role/content pairs).
@@ -1319,28 +1908,74 @@ def _build_conversation_history_context(session_id, limit=40):
         history = get_chat_history(session_id, limit=limit)
         if not history:
             return []
-        converse_messages = []
-        for item in history:
-            role = item.get('role', 'user')
-            # Prefer English version for pipeline context (model processes in English)
-            text = item.get('message_en') or item.get('message', '')
-            if not text or not text.strip():
-                continue
-            # Truncate long previous messages to save tokens
-            if len(text) > 500:
-                text = text[:500] + '...'
-            # Remove sources line from previous assistant messages
-            text = re.sub(r'\n\s*Sources:\s*.+$', '', text, flags=re.MULTILINE).strip()
-            # Strip any HTML artifacts from previous messages
-            text = re.sub(r'</?span[^>]*>', '', text, flags=re.IGNORECASE).strip()
-            if role in ('user', 'assistant') and text:
-                converse_messages.append({"role": role, "content": [{"text": text}]})
-        return converse_messages
+        return _history_items_to_messages(history)
     except Exception as e:
         logger.warning(f"Failed to retrieve chat history: {e}")
         return []
 
 
+def _build_memory_context(session_id):
+    """Conversation memory path: rolling summary (as a leading user/assistant
+    pair) + the last few verbatim messages. Prompt size no longer grows with
+    session length. Returns (converse messages, needs_refresh)."""
+    if not session_id:
+        return [], False
+    try:
+        summary, recent, needs_refresh = load_memory_context(session_id)
+        messages = []
+        if summary:
+            messages.append({"role": "user", "content": [{"text": f"[Summary of our conversation so far]\n{summary}"}]})
+            messages.append({"role": "assistant", "content": [{"text": "Noted — I will keep this context in mind."}]})
+        recent_messages = _history_items_to_messages(recent)
+        # Verbatim window must resume with a user turn after the summary pair
+        while recent_messages and recent_messages[0]['role'] != 'user':
+            recent_messages.pop(0)
+        return messages + recent_messages, needs_refresh
+    except Exception as e:
+        logger.warning(f"Conversation memory unavailable, replaying history: {e}")
+        return _build_conversation_history_context(session_id, limit=40), False
+
+
+def _summarize_conversation(previous_summary, items):
+    """One small Bedrock call that folds `items` into the running summary."""
+    response = _bedrock_converse_with_retry(
+        _bedrock_rt(),
+        modelId=FOUNDATION_MODEL_LITE or FOUNDATION_MODEL,
+        messages=[{"role": "user", "content": [{"text": summary_prompt(previous_summary, items)}]}],
+        system=[{"text": SUMMARY_SYSTEM_PROMPT}],
+        inferenceConfig={"maxTokens": 600, "temperature": 0.0},
+    )
+    blocks = response.get('output', {}).get('message', {}).get('content', [])
+    return '\n'.join(b['text'] for b in blocks if 'text' in b)
+
+
+def _schedule_memory_refresh(session_id, context):
+    """Refresh the summary off the request path: async (Event) self-invoke.
+    Without a Lambda function name (local runs) the refresh runs inline on a thread."""
+    function_name = getattr(context, 'function_name', None)
+    try:
+        if function_name:
+            _lambda_client().invoke(
+                FunctionName=function_name,
+                InvocationType='Event',
+                Payload=json.dumps({'memory_refresh': {'session_id': session_id}}),
+            )
+        else:
+            threading.Thread(target=_refresh_conversation_memory, args=(session_id,), daemon=True).start()
+    except Exception as refresh_err:
+        logger.warning(f"Conversation memory refresh not scheduled (non-fatal): {refresh_err}")
+
+
+def _refresh_conversation_memory(session_id):
+    try:
+        result = refresh_memory(session_id, _summarize_conversation)
+        logger.info(f"Conversation memory refreshed for {session_id}: {result}")
+        return result
+    except Exception as e:
+        logger.error(f"Conversation memory refresh failed for {session_id}: {e}")
+        return {'folded': 0, 'error': str(e)}
+
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 #  TOOL RESULT ENRICHMENT & POST-PROCESSING
 #  Fixes the "only rice and wheat" problem at two levels:
@@ -1416,6 +2051,8 @@ def _expand_soil_aliases_with_crop_ref(base_aliases, crop_ref):
 
 # Ensure strict soil evidence recognises all crops represented in _CROP_REF.
 _SOIL_GUARD_CROP_ALIASES = _expand_soil_aliases_with_crop_ref(_SOIL_GUARD_CROP_ALIASES, _CROP_REF)
+# One compiled regex per crop instead of a fresh r'\balias\b' search per alias per answer.
+_SOIL_GUARD_CROP_MATCHER = KeywordMatcher(_SOIL_GUARD_CROP_ALIASES, word_boundary=True)
 
 
 def _enrich_tool_result(result, tool_name, tool_input, user_prompt):
@@ -1475,90 +2112,16 @@ def _enrich_tool_result(result, tool_name, tool_input, user_prompt):
     return result
 
 
-def _post_process_response(text):
-    """
-    Safety-net post-processing to remove any remaining 'only rice and wheat' type phrases.
-    This catches cases where the model ignores the system prompt instruction.
-    """
-    if not text:
-        return text
-
-    # Normalize known agri-term translation artifacts at final output stage.
-    text = _normalize_translated_agri_terms(text)
-
-    # Patterns that indicate the model is telling the farmer about tool limitations
-    bad_patterns = [
-        r'(?:only|just)\s+(?:have|has|got|received|cover[s]?|include[s]?)\s+(?:data|details?|info(?:rmation)?|advice|tips?|updates?)\s+(?:for|about|on|regarding)\s+(?:rice|wheat)',
-        r'(?:only|just)\s+(?:cover[s]?|include[s]?)\s+rice\s+and\s+wheat',
-        r'(?:tools?|system|database|data|advisory)\s+(?:I\s+(?:have|checked)|(?:only|just))\s+.*?rice\s+and\s+wheat',
-        r'the\s+(?:latest|recent|current)\s+(?:tool\s+)?(?:data|updates?|advisory|information)\s+.*?(?:only|just)\s+.*?rice\s+and\s+wheat',
-        r'(?:unfortunately|sadly),?\s+(?:the\s+)?(?:information|data|tools?|advisory)\s+.*?(?:doesn.?t|don.?t|did\s*n.?t)\s+(?:cover|include|have)\s+.*?(?:specific|detailed)',
-    ]
-
-    text_lower = text.lower()
-    needs_fix = False
-    for pattern in bad_patterns:
-        if re.search(pattern, text_lower):
-            needs_fix = True
-            break
-
-    # Also check for the literal phrase
-    if 'rice and wheat' in text_lower and ('only' in text_lower or 'just' in text_lower):
-        needs_fix = True
-
-    if needs_fix:
-        logger.info("Post-processing: removing 'only rice/wheat' limitation language from response")
-        # Remove sentences that mention the tool limitation
-        sentences = re.split(r'(?<=[.!?])\s+', text)
-        filtered = []
-        for s in sentences:
-            s_lower = s.lower()
-            if ('rice and wheat' in s_lower and ('only' in s_lower or 'just' in s_lower or 'cover' in s_lower)):
-                continue
-            if re.search(r'tool[s]?\s+(?:I\s+)?(?:checked|have|received)\s+only', s_lower):
-                continue
-            if re.search(r"(?:doesn.?t|don.?t|did\s*n.?t)\s+(?:cover|include|have)\s+(?:specific|detailed)\s+(?:data|info|details)", s_lower):
-                continue
-            filtered.append(s)
-        if filtered:
-            text = ' '.join(filtered)
-        # If everything was filtered, keep original (shouldn't happen)
-
-    return text
-
-
-def _normalize_output_markdown(text):
-    """Normalize model markdown so frontend rendering stays deterministic."""
-    if not text:
-        return text
-
-    normalized = text.replace('\r\n', '\n')
-
-    # Headings: remove excessive indentation and enforce space after hashes
-    normalized = re.sub(r'^[\t ]{2,}(#{1,6}\s*)', r'\1', normalized, flags=re.MULTILINE)
-    normalized = re.sub(r'^(#{1,6})([^\s#])', r'\1 \2', normalized, flags=re.MULTILINE)
-
-    # Bullet consistency: convert unicode bullets to markdown dashes
-    normalized = re.sub(r'^[\t ]*•[\t ]+', '- ', normalized, flags=re.MULTILINE)
-
-    # Compact spacing: collapse 3+ blank lines to 1 blank line
-    normalized = re.sub(r'\n{3,}', '\n\n', normalized)
-
-    # Trim trailing spaces line-wise and final body
-    normalized = '\n'.join(line.rstrip() for line in normalized.split('\n')).strip()
-
-    return normalized
+_SYMPTOM_MATCHER = KeywordMatcher({'symptom': [
+    'yellow', 'spot', 'spots', 'wilting', 'wilt', 'rot', 'blight',
+    'leaf', 'leaves', 'stem', 'fruit', 'disease', 'what disease', 'symptom'
+]})
 
 
 def _looks_like_symptom_query(text):
     if not text:
         return False
-    q = text.lower()
-    symptom_terms = [
-        'yellow', 'spot', 'spots', 'wilting', 'wilt', 'rot', 'blight',
-        'leaf', 'leaves', 'stem', 'fruit', 'disease', 'what disease', 'symptom'
-    ]
-    return any(term in q for term in symptom_terms)
+    return _SYMPTOM_MATCHER.matches('symptom', text.lower())
 
 
 def _ensure_cautious_pest_response(text, tools_used, user_query_en):
@@ -1581,181 +2144,26 @@ def _ensure_cautious_pest_response(text, tools_used, user_query_en):
     return f"{caution}\n\n{text}"
 
 
-def _strip_local_markdown_symbols(text, language_code='en'):
-    """Sanitize text for frontend and remove markdown symbols for cleaner plain-text UX."""
-    if not text:
-        return text
-
-    s = text.replace('\r\n', '\n').replace('\r', '\n')
-    s = re.sub(r'</?span[^>]*>', '', s, flags=re.IGNORECASE)
-    s = s.replace('\uFFFD', '')
-
-    _lang = normalize_language_code(language_code or 'en', default='en')
-    _is_indic = _lang in {'ta', 'te', 'kn', 'ml', 'mr', 'bn', 'gu', 'pa', 'or', 'as', 'ur', 'hi'}
-    if _is_indic:
-        s = re.sub(r'[\u200b\ufeff]', '', s)
-    else:
-        s = re.sub(r'[\u200b\u200c\u200d\ufeff]', '', s)
-
-    filtered = []
-    for ch in s:
-        if ch in ('\n', '\t'):
-            filtered.append(ch)
-            continue
-        cat = unicodedata.category(ch)
-        if cat in {'Cc', 'Cs', 'Co', 'Cn'}:
-            continue
-        filtered.append(ch)
-    s = ''.join(filtered)
-
-    def _normalize_local_units_and_artifacts(value, lang, is_indic):
-        out = value or ''
-
-        def _format_number_for_text(num_value):
-            if abs(num_value - round(num_value)) < 1e-9:
-                return str(int(round(num_value)))
-            return f"{num_value:.2f}".rstrip('0').rstrip('.')
-
-        def _to_quintal_rate(raw_number):
-            try:
-                base = float((raw_number or '').replace(',', ''))
-            except Exception:
-                return None
-            if base < 0:
-                return None
-            return _format_number_for_text(base * 100.0)
-
-        canonical_quintal = {
-            'ta': 'குவிண்டால்',
-            'hi': 'क्विंटल',
-            'te': 'క్వింటాల్',
-        }.get(lang, 'quintal')
-
-        currency_pat = r'(?:₹|Rs\.?|INR|ரூ\.?|रु\.?|రూ\.?)'
-        kg_pat = r'(?:kg|kilo(?:gram)?s?|கிலோ|किलो(?:ग्राम)?|కిలో(?:గ్రాము)?)'
-        per_sep = r'(?:/|\bper\b|\bप्रति\b|\bప్రతి\b|க்கு|\bko\b)'
-
-        def _replace_cur_num_per_kg(match):
-            cur = match.group('cur')
-            num = match.group('num')
-            quintal_rate = _to_quintal_rate(num)
-            if quintal_rate is None:
-                return match.group(0)
-            return f"{cur} {quintal_rate}/{canonical_quintal}"
-
-        out = re.sub(
-            rf'(?P<cur>{currency_pat})\s*(?P<num>\d{{1,3}}(?:,\d{{3}})*(?:\.\d+)?)\s*{per_sep}\s*{kg_pat}',
-            _replace_cur_num_per_kg,
-            out,
-            flags=re.IGNORECASE,
-        )
-
-        if lang == 'ta':
-            out = re.sub(r'கு[யவ]ி?ண?்டா?ல்|கு[யவ]ி?ண?்டல்|காயிண்டல்|காயின்டல்|கிண்டல்', 'குவிண்டால்', out)
-            out = re.sub(r'கிலோகிராம்|கிலோகிராம்கள்|கிலோ\s*கிராம்', 'கிலோ', out)
-        elif lang == 'hi':
-            out = re.sub(r'क्विन्टल|क्विंटल', 'क्विंटल', out)
-            out = re.sub(r'किलोग्राम|किलो\s*ग्राम', 'किलो', out)
-        elif lang == 'te':
-            out = re.sub(r'క్వింటల్|క్వింటాళ్|క్వింటా', 'క్వింటాల్', out)
-            out = re.sub(r'కిలోగ్రాము|కిలోగ్రాములు|కిలో\s*గ్రాము', 'కిలో', out)
-
-        if is_indic:
-            script_ranges = {
-                'ta': '\u0B80-\u0BFF',
-                'hi': '\u0900-\u097F',
-                'te': '\u0C00-\u0C7F',
-                'kn': '\u0C80-\u0CFF',
-                'ml': '\u0D00-\u0D7F',
-                'mr': '\u0900-\u097F',
-                'bn': '\u0980-\u09FF',
-                'as': '\u0980-\u09FF',
-                'gu': '\u0A80-\u0AFF',
-                'pa': '\u0A00-\u0A7F',
-                'or': '\u0B00-\u0B7F',
-                'ur': '\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF',
-            }
-            rg = script_ranges.get(lang)
-            if rg:
-                out = re.sub(fr'(?<![A-Za-z])[A-Za-z](?=[{rg}])', '', out)
-                out = re.sub(fr'(?<=[{rg}])[A-Za-z](?![A-Za-z])', '', out)
-                out = '\n'.join(
-                    re.match(r'^[\t ]*', line).group(0) + re.sub(r' {2,}', ' ', line[len(re.match(r'^[\t ]*', line).group(0)):])
-                    for line in out.split('\n')
-                )
-
-        return out
-
-    if not STRIP_LOCAL_MARKDOWN_SYMBOLS:
-        s = _normalize_local_units_and_artifacts(s, _lang, _is_indic)
-        s = re.sub(r'\n{3,}', '\n\n', s)
-        return '\n'.join(line.rstrip() for line in s.split('\n')).strip()
-
-    lines = s.split('\n')
-    numbered_line_re = re.compile(r'^(?P<indent>[\t ]*)(?P<num>\d{1,2})\.\s+(?P<body>.+)$')
-
-    def _renumber_numbered_runs(line_list):
-        """Normalize contiguous numbered lists to 1..N so repeated '1.' markers become stable points."""
-        output = []
-        run_counters = {}
-
-        for raw in line_list:
-            m = numbered_line_re.match(raw)
-            if not m:
-                # Break numbering runs on blank/non-numbered lines.
-                if not raw.strip():
-                    run_counters.clear()
-                output.append(raw)
-                continue
-
-            indent = m.group('indent')
-            body = m.group('body')
-            next_num = run_counters.get(indent, 0) + 1
-            run_counters[indent] = next_num
-            output.append(f"{indent}{next_num}. {body}")
-
-            # Child indentation should not leak stale counters if parent advances.
-            for key in list(run_counters.keys()):
-                if len(key) > len(indent) and key.startswith(indent):
-                    del run_counters[key]
-
-        return output
-
-    heading_re = re.compile(r'^[\t ]*#{1,6}[\t ]*(.+?)\s*$')
-    should_number_headings = (sum(1 for line in lines if heading_re.match(line)) >= 3) and (not _is_indic)
-    heading_idx = 0
-    cleaned_lines = []
-
-    for raw_line in lines:
-        line = raw_line.rstrip()
-        if not line.strip():
-            cleaned_lines.append('')
-            continue
-
-        heading_match = heading_re.match(line)
-        if heading_match:
-            heading_text = heading_match.group(1).strip()
-            heading_text = heading_text.replace('**', '').replace('*', '').replace('#', '')
-            if should_number_headings:
-                heading_idx += 1
-                cleaned_lines.append(f"{heading_idx}. {heading_text}")
-            else:
-                cleaned_lines.append(heading_text)
-            continue
+# English answer post-processing, in order. ctx: query_en, raw_query_en,
+# farmer_context, tools_used, tool_data_log.
+_ANSWER_PIPELINE = ResponsePipeline([
+    ('clean', lambda text, ctx: clean_model_text(text)),
+    ('soil_guard', lambda text, ctx: _apply_strict_soil_response_guard(
+        text, ctx['query_en'], farmer_context=ctx['farmer_context'], tool_data_log=ctx['tool_data_log'])),
+    ('tool_signal_guard', lambda text, ctx: _apply_tool_signal_response_guard(
+        text, ctx['query_en'], tools_used=ctx['tools_used'], tool_data_log=ctx['tool_data_log'])),
+    ('markdown', lambda text, ctx: normalize_markdown(text)),
+    ('pest_caution', lambda text, ctx: _ensure_cautious_pest_response(text, ctx['tools_used'], ctx['raw_query_en'])),
+])
 
-        line = re.sub(r'^([\t ]*)[•\-\*][\t ]+', r'\1- ', line)
-        # Normalize list markers across locales (e.g., 1), 1., 1।, 1۔) to a stable "1. " format.
-        line = re.sub(r'^([\t ]*)(\d{1,2})[\)\.\u0964\u0965\u06D4][\t ]+', r'\1\2. ', line)
-        line = line.replace('**', '')
-        line = line.replace('*', '')
-        line = re.sub(r'^([\t ]*)#{1,6}[\t ]*', r'\1', line)
-        cleaned_lines.append(line.rstrip())
 
-    s = '\n'.join(cleaned_lines)
-    s = '\n'.join(_renumber_numbered_runs(s.split('\n')))
-    s = _normalize_local_units_and_artifacts(s, _lang, _is_indic)
-    s = re.sub(r'\n{3,}', '\n\n', s)
-    return '\n'.join(line.rstrip() for line in s.split('\n')).strip()
+def _strip_local_markdown_symbols(text, language_code='en'):
+    """Sanitize text for frontend and remove markdown symbols for cleaner plain-text UX."""
+    return clean_localized_text(
+        text,
+        normalize_language_code(language_code or 'en', default='en'),
+        strip_symbols=STRIP_LOCAL_MARKDOWN_SYMBOLS,
+    )
 
 
 def _localize_response_hybrid(text_en, target_lang):
@@ -1766,6 +2174,11 @@ def _localize_response_hybrid(text_en, target_lang):
         return text_en, 'en'
     if not HYBRID_LOCALIZATION_ENABLED:
         return translate_response(text_en, 'en', target_lang), 'translate_only'
+    deadline = current_deadline()
+    if deadline and not deadline.allows('localize_model'):
+        # Not enough budget for a model call — Translate is ~10x faster.
+        deadline.skip('localize_model')
+        return translate_response(text_en, 'en', target_lang), 'translate_deadline'
 
     try:
         localize_prompt = (
@@ -1775,7 +2188,10 @@ def _localize_response_hybrid(text_en, target_lang):
             f"Advisory:\n{text_en}"
         )
 
-        response = bedrock_rt.converse(
+        localize_client = client_for('localize_model', _bedrock_rt(), 'bedrock-runtime', region_name=_REGION)
+        response = _bedrock_limited(
+            FOUNDATION_MODEL_LITE or FOUNDATION_MODEL,
+            localize_client.converse,
             modelId=FOUNDATION_MODEL_LITE or FOUNDATION_MODEL,
             messages=[{"role": "user", "content": [{"text": localize_prompt}]}],
             inferenceConfig={"temperature": 0.2},
@@ -1803,7 +2219,7 @@ def _localize_response_hybrid(text_en, target_lang):
     return translate_response(text_en, 'en', target_lang), 'translate_fallback'
 
 
-def _invoke_bedrock_direct(prompt, farmer_context=None, skip_native_guardrail=False, chat_history=None, model_id=None, lambda_context=None):
+def _invoke_bedrock_direct(prompt, farmer_context=None, skip_native_guardrail=False, chat_history=None, model_id=None, lambda_context=None, on_text_delta=None, prefetch=None, seed_tools=None):
     """
     Call Bedrock model directly with tool use (converse API).
     Primary invocation path using Bedrock converse() API with tool use.
@@ -1812,6 +2228,11 @@ def _invoke_bedrock_direct(prompt, farmer_context=None, skip_native_guardrail=Fa
     chat_history: list of previous converse() message dicts for conversation memory.
     model_id: optional override — use FOUNDATION_MODEL_LITE for simple queries.
     lambda_context: optional Lambda context for timeout checking.
+    on_text_delta: optional callback — switches to converse_stream() and receives
+    text deltas as they are generated (tool-use loop is unchanged).
+    prefetch: optional speculative prefetch handle (see _start_speculative_prefetch).
+    seed_tools: optional [{'name', 'input'}] executed up-front and injected as a
+    synthetic toolUse/toolResult pair (see _derive_seed_tools).
     Returns: (result_text, tools_used, tool_data_log, guardrail_intervened)
     """
     tools_used = []
@@ -1819,9 +2240,10 @@ def _invoke_bedrock_direct(prompt, farmer_context=None, skip_native_guardrail=Fa
     guardrail_intervened = False
 
     # Build messages
+    farmer_context_text = f"Farmer context: {json.dumps(farmer_context)}" if farmer_context else None
     system_prompt = DIRECT_SYSTEM_PROMPT
-    if farmer_context:
-        system_prompt += f"\n\nFarmer context: {json.dumps(farmer_context)}"
+    if farmer_context_text:
+        system_prompt += f"\n\n{farmer_context_text}"
 
     # Prepend conversation history for follow-up context
     # Bedrock converse() requires:
@@ -1849,6 +2271,15 @@ def _invoke_bedrock_direct(prompt, farmer_context=None, skip_native_guardrail=Fa
     messages.append({"role": "user", "content": [{"text": prompt}]})
 
     try:
+        if seed_tools:
+            seed_assistant, seed_results, seed_names, seed_log = _build_seeded_turn(
+                seed_tools, farmer_context, prompt, prefetch=prefetch,
+            )
+            messages.append(seed_assistant)
+            messages.append(seed_results)
+            tools_used.extend(seed_names)
+            tool_data_log.extend(seed_log)
+
         # Multi-turn tool use loop (max 5 turns)
         for turn in range(5):
             # NEW: Check timeout before each turn
@@ -1858,13 +2289,24 @@ def _invoke_bedrock_direct(prompt, farmer_context=None, skip_native_guardrail=Fa
                     logger.warning(f"Timeout approaching in turn {turn}: {remaining_ms}ms remaining")
                     return _timeout_fallback_response(), tools_used, tool_data_log, False
 
+            # Deadline: do not start a Bedrock turn that cannot finish in time.
+            deadline = current_deadline()
+            if deadline and not deadline.allows('bedrock_turn'):
+                deadline.skip('bedrock_turn', f'(turn {turn})')
+                return _timeout_fallback_response()['reply'], tools_used, tool_data_log, False
+
+            turn_model = _validated_model_id(model_id)
             converse_kwargs = {
-                "modelId": _validated_model_id(model_id),
+                "modelId": turn_model,
                 "messages": messages,
                 "system": [{"text": system_prompt}],
                 "toolConfig": {"tools": DIRECT_TOOLS},
                 "inferenceConfig": {"maxTokens": 4096, "temperature": 0.3},
             }
+            if ENABLE_PROMPT_CACHING:
+                # Static preamble → cache point → per-farmer context (see utils/prompt_cache.py)
+                converse_kwargs["system"] = system_blocks(DIRECT_SYSTEM_PROMPT, farmer_context_text, model_id=turn_model)
+                converse_kwargs["toolConfig"] = tool_config(DIRECT_TOOLS, model_id=turn_model)
             # Gap #5: Attach Bedrock native guardrail if configured
             # (skipped for feature-page fast paths — their prompts are
             #  code-generated and already passed application guardrails)
@@ -1872,7 +2314,8 @@ def _invoke_bedrock_direct(prompt, farmer_context=None, skip_native_guardrail=Fa
             if gc and not skip_native_guardrail:
                 converse_kwargs['guardrailConfig'] = gc
 
-            response = _bedrock_converse_with_retry(bedrock_rt, **converse_kwargs)
+            with stage_span(f"bedrock_turn_{turn + 1}"):
+                response = _bedrock_converse_with_retry(_bedrock_rt(), on_text_delta=on_text_delta, **converse_kwargs)
             output = response.get("output", {})
             message = output.get("message", {})
             stop_reason = response.get("stopReason", "")
@@ -1925,16 +2368,25 @@ def _invoke_bedrock_direct(prompt, farmer_context=None, skip_native_guardrail=Fa
                         else:
                             tool_data_log.append(entry)
 
-                    pool = ThreadPoolExecutor(max_workers=len(pending_tools))
+                    pool = None
+                    use_join_timeout = ENABLE_TOOL_TIMEOUT or current_deadline() is not None
                     try:
-                        futures = {
-                            pool.submit(_execute_tool, t["name"], t["input"]): t
-                            for t in pending_tools
-                        }
+                        futures, pool, rejected = _submit_tool_calls(pending_tools, prefetch)
+                        for t in rejected:
+                            logger.error(f"Tool {t['name']} rejected — bulkhead saturated")
+                            _safe_append_tool(f"{t['name']}_OVERLOADED")
+                            tool_results.append({
+                                "toolResult": {
+                                    "toolUseId": t["id"],
+                                    "content": [{"json": _overloaded_tool_result(t["name"])}],
+                                }
+                            })
 
                         # Bug 1.2: use wait() with timeout instead of as_completed()
-                        if ENABLE_TOOL_TIMEOUT:
-                            done, not_done = wait(futures.keys(), timeout=TOOL_EXECUTION_TIMEOUT_SEC)
+                        # (always bounded when a request deadline is active)
+                        if use_join_timeout:
+                            join_timeout = _tool_join_timeout()
+                            done, not_done = wait(futures.keys(), timeout=join_timeout)
 
                             # Process completed tools
                             for future in done:
@@ -1968,14 +2420,14 @@ def _invoke_bedrock_direct(prompt, farmer_context=None, skip_native_guardrail=Fa
                                 t = futures[future]
                                 tool_name = t["name"]
                                 tool_id = t["id"]
-                                logger.error(f"Tool {tool_name} TIMED OUT after {TOOL_EXECUTION_TIMEOUT_SEC}s")
+                                logger.error(f"Tool {tool_name} TIMED OUT after {join_timeout:.1f}s")
                                 _safe_append_tool(f"{tool_name}_TIMEOUT")
-                                _emit_tool_metric(tool_name, TOOL_EXECUTION_TIMEOUT_SEC * 1000.0, False)
+                                _emit_tool_metric(tool_name, join_timeout * 1000.0, False)
                                 tool_results.append({
                                     "toolResult": {
                                         "toolUseId": tool_id,
                                         "content": [{"json": {
-                                            "error": f"Tool execution timed out after {TOOL_EXECUTION_TIMEOUT_SEC} seconds",
+                                            "error": f"Tool execution timed out after {join_timeout:.0f} seconds",
                                             "tool": tool_name,
                                             "timeout": True,
                                         }}],
@@ -2001,9 +2453,10 @@ def _invoke_bedrock_direct(prompt, farmer_context=None, skip_native_guardrail=Fa
                                     }
                                 })
                     finally:
-                        if ENABLE_TOOL_TIMEOUT:
+                        # Bulkhead executors are persistent — only per-turn pools are shut down.
+                        if pool and use_join_timeout:
                             pool.shutdown(wait=False, cancel_futures=True)
-                        else:
+                        elif pool:
                             pool.shutdown(wait=True)
                 else:
                     # Single tool — execute directly (no thread overhead)
@@ -2013,7 +2466,9 @@ def _invoke_bedrock_direct(prompt, farmer_context=None, skip_native_guardrail=Fa
                         tool_id = t["id"]
                         logger.info(f"Direct Bedrock tool call: {tool_name}({json.dumps(tool_input)[:100]})")
                         tools_used.append(tool_name)
-                        result = _execute_tool(tool_name, tool_input)
+                        result = _run_tool(tool_name, tool_input, prefetch)
+                        if isinstance(result, dict) and result.get('timeout') is True:
+                            tools_used[-1] = f"{tool_name}_TIMEOUT"   # prefetch join timed out
                         result = _enrich_tool_result(result, tool_name, tool_input, prompt)
                         result = _enforce_tool_result_policy(tool_name, result, farmer_context, user_prompt=prompt)
                         tool_data_log.append({"tool": tool_name, "input": tool_input, "output": result})
@@ -2051,6 +2506,48 @@ def _invoke_bedrock_direct(prompt, farmer_context=None, skip_native_guardrail=Fa
 
 
 
+# Intent keywords: word-boundary match for Latin text, substring for Indic script.
+_WEATHER_INTENT_KEYWORDS = ['weather', 'rain', 'rainfall', 'temperature', 'humidity', 'forecast', 'monsoon', 'mausam',
+                            # Tamil/Hindi/Telugu weather words
+                            'வானிலை', 'மழை', 'வெப்பநிலை', 'मौसम', 'बारिश', 'तापमान',
+                            'వాతావరణం', 'వర్షం', 'ఉష్ణోగ్రత']
+_CROP_INTENT_KEYWORDS = ['crop', 'seed', 'soil', 'fertilizer', 'irrigation', 'yield', 'harvest', 'variety',
+                         'kharif', 'rabi', 'grow', 'plant', 'sow', 'cultivat',
+                         'msp', 'minimum support price', 'market price', 'price', 'mandi', 'procurement',
+                         # Tamil crop words
+                         'பயிர்', 'விதை', 'மண்', 'உரம்', 'நெல்', 'நிலம்', 'வளர்', 'விவசாய',
+                         # Hindi crop words
+                         'फसल', 'बीज', 'मिट्टी', 'खाद', 'उगा', 'खेती',
+                         # Telugu crop words
+                         'పంట', 'విత్తనం', 'నేల', 'ఎరువు', 'వ్యవసాయ']
+_PEST_INTENT_KEYWORDS = ['pest', 'disease', 'fungus', 'insect', 'blight', 'spot', 'rot', 'spray', 'infestation',
+                         'yellow', 'brown', 'wilt', 'curling', 'dying', 'damage', 'attack', 'infection',
+                         'fungicide', 'pesticide', 'medicine', 'treatment', 'cure', 'leaves turning',
+                         # Tamil pest/symptom words
+                         'பூச்சி', 'நோய்', 'கீடம்', 'மஞ்சள்', 'மருந்து', 'தெளிக்க', 'தெளி',
+                         'பழுப்பு', 'வாடி', 'அழுகல்', 'இலைகள்',
+                         # Hindi pest/symptom words
+                         'कीट', 'रोग', 'पीला', 'पीले', 'दवा', 'छिड़काव', 'फफूंद', 'कीटनाशक',
+                         'भूरा', 'मुरझा', 'सड़',
+                         # Telugu pest/symptom words
+                         'పురుగు', 'వ్యాధి', 'పసుపు', 'మందు', 'స్ప్రే', 'ఆకులు',
+                         'గోధుమ', 'వాడి', 'కుళ్ళు']
+_SCHEMES_INTENT_KEYWORDS = ['scheme', 'subsidy', 'loan', 'insurance', 'pm-kisan', 'government', 'yojana', 'benefit',
+                            # Tamil/Hindi/Telugu scheme words
+                            'திட்டம்', 'மானியம்', 'கடன்', 'योजना', 'सब्सिडी', 'ऋण',
+                            'పథకం', 'రాయితీ', 'రుణం']
+_PROFILE_INTENT_KEYWORDS = ['profile', 'my farm', 'my details', 'my crop', 'my soil', 'my state', 'my district']
+
+# Category order = order of the returned intent list.
+_INTENT_MATCHER = KeywordMatcher({
+    'weather': _WEATHER_INTENT_KEYWORDS,
+    'crop': _CROP_INTENT_KEYWORDS,
+    'pest': _PEST_INTENT_KEYWORDS,
+    'schemes': _SCHEMES_INTENT_KEYWORDS,
+    'profile': _PROFILE_INTENT_KEYWORDS,
+}, word_boundary=True)
+
+
 def _classify_intents(message_en, original_message=None):
     """Classify intents from English translation AND original Indic text.
     Uses word-boundary matching for English keywords to prevent false positives
@@ -2059,64 +2556,49 @@ def _classify_intents(message_en, original_message=None):
     text = (message_en or '').lower()
     orig = (original_message or '').lower()
     combined = text + ' ' + orig
-    intents = set()
-
-    def _has_any_keyword(keywords, haystack):
-        """Match keywords with word-boundary for Latin text, substring for Indic."""
-        for kw in keywords:
-            if re.search(r'[\u0900-\u0D7F]', kw):
-                # Indic script: substring match (no word boundaries in Devanagari etc.)
-                if kw in haystack:
-                    return True
-            else:
-                # Latin/English: word-boundary match to avoid 'rain' ⊂ 'drains'
-                if re.search(r'\b' + re.escape(kw) + r'\b', haystack):
-                    return True
-        return False
+    return _INTENT_MATCHER.categories(combined)
+
+
+# Intent → tool routing used by _build_tool_first_prompt (order = priority)
+INTENT_TOOL_ORDER = ['pest', 'weather', 'irrigation', 'crop', 'schemes', 'profile']
+INTENT_TOOL_MAP = {
+    'pest': 'get_pest_alert',
+    'weather': 'get_weather',
+    'irrigation': 'get_crop_advisory',
+    'crop': 'get_crop_advisory',
+    'schemes': 'search_schemes',
+    'profile': 'get_farmer_profile',
+}
 
-    weather_kw = ['weather', 'rain', 'rainfall', 'temperature', 'humidity', 'forecast', 'monsoon', 'mausam',
-                  # Tamil/Hindi/Telugu weather words
-                  'வானிலை', 'மழை', 'வெப்பநிலை', 'मौसम', 'बारिश', 'तापमान',
-                  'వాతావరణం', 'వర్షం', 'ఉష్ణోగ్రత']
-    crop_kw = ['crop', 'seed', 'soil', 'fertilizer', 'irrigation', 'yield', 'harvest', 'variety',
-               'kharif', 'rabi', 'grow', 'plant', 'sow', 'cultivat',
-               'msp', 'minimum support price', 'market price', 'price', 'mandi', 'procurement',
-               # Tamil crop words
-               'பயிர்', 'விதை', 'மண்', 'உரம்', 'நெல்', 'நிலம்', 'வளர்', 'விவசாய',
-               # Hindi crop words
-               'फसल', 'बीज', 'मिट्टी', 'खाद', 'उगा', 'खेती',
-               # Telugu crop words
-               'పంట', 'విత్తనం', 'నేల', 'ఎరువు', 'వ్యవసాయ']
-    pest_kw = ['pest', 'disease', 'fungus', 'insect', 'blight', 'spot', 'rot', 'spray', 'infestation',
-               'yellow', 'brown', 'wilt', 'curling', 'dying', 'damage', 'attack', 'infection',
-               'fungicide', 'pesticide', 'medicine', 'treatment', 'cure', 'leaves turning',
-               # Tamil pest/symptom words
-               'பூச்சி', 'நோய்', 'கீடம்', 'மஞ்சள்', 'மருந்து', 'தெளிக்க', 'தெளி',
-               'பழுப்பு', 'வாடி', 'அழுகல்', 'இலைகள்',
-               # Hindi pest/symptom words
-               'कीट', 'रोग', 'पीला', 'पीले', 'दवा', 'छिड़काव', 'फफूंद', 'कीटनाशक',
-               'भूरा', 'मुरझा', 'सड़',
-               # Telugu pest/symptom words
-               'పురుగు', 'వ్యాధి', 'పసుపు', 'మందు', 'స్ప్రే', 'ఆకులు',
-               'గోధుమ', 'వాడి', 'కుళ్ళు']
-    schemes_kw = ['scheme', 'subsidy', 'loan', 'insurance', 'pm-kisan', 'government', 'yojana', 'benefit',
-                  # Tamil/Hindi/Telugu scheme words
-                  'திட்டம்', 'மானியம்', 'கடன்', 'योजना', 'सब्सिडी', 'ऋण',
-                  'పథకం', 'రాయితీ', 'రుణం']
-    profile_kw = ['profile', 'my farm', 'my details', 'my crop', 'my soil', 'my state', 'my district']
-
-    if _has_any_keyword(weather_kw, combined):
-        intents.add('weather')
-    if _has_any_keyword(crop_kw, combined):
-        intents.add('crop')
-    if _has_any_keyword(pest_kw, combined):
-        intents.add('pest')
-    if _has_any_keyword(schemes_kw, combined):
-        intents.add('schemes')
-    if _has_any_keyword(profile_kw, combined):
-        intents.add('profile')
-
-    return list(intents)
+
+def _route_model_for_request(request_id, intents, english_message, is_generic, chat_history,
+                             session_id, is_feature_page):
+    """Score the request (utils/model_router.py) and log the decision as one JSON line."""
+    tool_intents = [i for i in (intents or []) if i in INTENT_TOOL_ORDER]
+    text = (english_message or '').lower()
+    decision = route_model(
+        tool_intents,
+        is_generic,
+        is_specific=any(re.search(p, text) for p in SPECIFIC_QUERY_INDICATORS),
+        history_len=len(chat_history or []),
+        grounded=_requires_grounded_tools(tool_intents) and not is_generic,
+        tool_count=min(len(tool_intents), 3),
+        feature_page=feature_page_type(session_id, FAST_PATH_PREFIXES) if is_feature_page else None,
+        message_len=len(english_message or ''),
+        pro_model=FOUNDATION_MODEL,
+        lite_model=FOUNDATION_MODEL_LITE,
+    )
+    decision['applied'] = ENABLE_MODEL_ROUTER
+    logger.info(f"MODEL_ROUTE {json.dumps({'request_id': request_id, **decision})}")
+    return decision
+
+
+def _mandatory_first_tool(intents):
+    """Return the tool _build_tool_first_prompt tells the model to call first (or None)."""
+    for intent in INTENT_TOOL_ORDER:
+        if intent in (intents or []):
+            return INTENT_TOOL_MAP.get(intent)
+    return None
 
 
 def _build_tool_first_prompt(message_en, intents, farmer_context=None):
@@ -2125,8 +2607,7 @@ def _build_tool_first_prompt(message_en, intents, farmer_context=None):
     if not text:
         return text
 
-    intent_order = ['pest', 'weather', 'irrigation', 'crop', 'schemes', 'profile']
-    selected = [i for i in intent_order if i in (intents or [])]
+    selected = [i for i in INTENT_TOOL_ORDER if i in (intents or [])]
     if not selected:
         return text
 
@@ -2135,15 +2616,7 @@ def _build_tool_first_prompt(message_en, intents, farmer_context=None):
         logger.warning(f"Too many intents ({len(selected)}), trimming to top 3: {selected[:3]}")
         selected = selected[:3]
 
-    tool_map = {
-        'pest': 'get_pest_alert',
-        'weather': 'get_weather',
-        'irrigation': 'get_crop_advisory',
-        'crop': 'get_crop_advisory',
-        'schemes': 'search_schemes',
-        'profile': 'get_farmer_profile',
-    }
-    required_tools = [tool_map[i] for i in selected if i in tool_map]
+    required_tools = [INTENT_TOOL_MAP[i] for i in selected if i in INTENT_TOOL_MAP]
     first_tool = required_tools[0]
 
     context_hint = ""
@@ -2185,7 +2658,91 @@ def _build_tool_first_prompt(message_en, intents, farmer_context=None):
     return routing + text
 
 
+# Chat session message limit.
+# Cap at 50 user interactions per session (100 messages = 50 user + 50 assistant).
+# Beyond this:
+# - Context quality degrades (model only reads last 6 anyway)
+# - DynamoDB item accumulation becomes wasteful
+# - Forces fresh context for complex new topics
+MAX_MESSAGES_PER_SESSION = 100
+
+
+def _start_preflight(body, user_message, session_id, farmer_id):
+    """Launch the independent pre-Bedrock round trips concurrently.
+    Results are joined lazily (Preflight.get) against one shared deadline; every
+    stage falls back to the same value its helper returns on failure.
+    The rate-limit check consumes quota, so it runs only after the session
+    message-limit check has passed (as in the sequential path).
+    Returns (preflight, guardrail_result)."""
+    deadline = current_deadline()
+    preflight = Preflight(deadline_sec=min(PREFLIGHT_DEADLINE_SEC, deadline.remaining()) if deadline else None)
+    is_feature_page = any(
+        session_id.startswith(p) or body.get('session_id', '').startswith(p) for p in FAST_PATH_PREFIXES
+    )
+    if farmer_id != 'anonymous':
+        preflight.submit('profile', get_farmer_profile, farmer_id, default=None)
+    if not is_feature_page:
+        preflight.submit('message_count', get_session_message_count, session_id, default=0)
+
+    with stage_span('guardrails'):
+        guardrail_result = run_all_guardrails(user_message)
+    if guardrail_result['passed']:
+        def _rate_limit_after_session_check():
+            if preflight.has('message_count') and preflight.get('message_count') >= MAX_MESSAGES_PER_SESSION:
+                return None  # session full — the request is rejected before rate limiting
+            return check_rate_limit(session_id, farmer_id)
+
+        # required: a late result is waited for rather than defaulted to "allowed".
+        preflight.submit('rate_limit', _rate_limit_after_session_check, required=True, default={
+            'allowed': True, 'reason': None, 'retry_after_seconds': None,
+        })
+        sanitized = _sanitize_user_message(guardrail_result['sanitized_message'])
+        if sanitized and sanitized.strip():
+            preflight.submit('detection', detect_and_translate, sanitized, target_language='en', default={
+                'detected_language': 'en', 'translated_text': sanitized, 'target_language': 'en',
+            })
+    return preflight, guardrail_result
+
+
 def lambda_handler(event, context):
+    """Entry point. Buffered metrics (utils/metrics.py) and the request's audit
+    batch (utils/audit_logger.py) are written once, on the way out."""
+    request_id = getattr(context, 'aws_request_id', None)
+    begin_audit_batch(request_id)
+    try:
+        return _dispatch(event, context)
+    finally:
+        flush_audit_batch()
+        flush_metrics({'request_id': request_id})
+
+
+def _dispatch(event, context):
+    """With ENABLE_STAGE_TRACING the request runs under a span recorder and the
+    response carries Server-Timing; stage latencies join the metrics buffer."""
+    # Scheduled warm-up (utils/priming.py): build clients, open connections, return
+    if is_priming_event(event):
+        return prime(network=wants_network(event))
+    # Async self-invocation from _schedule_memory_refresh (never an API Gateway event)
+    if isinstance(event, dict) and isinstance(event.get('memory_refresh'), dict):
+        set_request_deadline(None)
+        set_request_usage(TokenUsage())
+        return _refresh_conversation_memory(event['memory_refresh'].get('session_id'))
+    if not ENABLE_STAGE_TRACING:
+        return _handle_request(event, context)
+    recorder = SpanRecorder(getattr(context, 'aws_request_id', None))
+    set_current_recorder(recorder)
+    try:
+        response = _handle_request(event, context)
+    finally:
+        set_current_recorder(None)
+    try:
+        return attach_timings(response, recorder, include_body=ENABLE_TIMINGS_DEBUG)
+    except Exception as trace_err:
+        logger.warning(f"Stage timing output failed (non-fatal): {trace_err}")
+        return response
+
+
+def _handle_request(event, context):
     """
     Main orchestrator — full flow:
     1. Detect language → translate to English
@@ -2200,49 +2757,28 @@ def lambda_handler(event, context):
             return handle_cors_preflight(methods='GET,POST,OPTIONS')
         return success_response({}, message='OK')
 
+    _t_request = _time.time()  # API Gateway's 29s wall starts here
+
     # Correlation ID for end-to-end request tracing across CloudWatch logs
     _request_id = getattr(context, 'aws_request_id', str(uuid.uuid4())[:8])
     logger.info(f"[{_request_id}] Handler invoked")
 
+    # One deadline per request (29s API Gateway wall, minus response reserve).
+    # Always reset — a warm container must not inherit the previous request's deadline.
+    request_deadline = Deadline(context) if ENABLE_DEADLINE_PROPAGATION else None
+    set_request_deadline(request_deadline)
+    set_request_usage(TokenUsage())
+    flight = None  # single-flight leadership for this request's cache key (released on exit)
+
     try:
         body = json.loads(event.get('body', '{}'))
 
-        # ── Chat History API (DB-backed, cross-device sync) ──
-        action = body.get('action')
-        if action:
-            hist_farmer = body.get('farmer_id', '')
-            hist_session = body.get('session_id', '')
-            if action == 'list_sessions':
-                sessions = list_sessions(hist_farmer)
-                return success_response({'sessions': sessions}, message='Sessions loaded')
-            elif action == 'get_session':
-                msgs = get_session_messages(hist_farmer, hist_session)
-                return success_response({'messages': msgs}, message='Messages loaded')
-            elif action == 'save_session':
-                msgs = body.get('messages', [])
-                preview = body.get('preview', None)
-                ok = save_session(hist_farmer, hist_session, msgs, preview)
-                return success_response({'saved': ok}, message='Session saved' if ok else 'Save failed')
-            elif action == 'delete_session':
-                delete_result = delete_chat_session(hist_farmer, hist_session)
-                deleted = bool(delete_result.get('deleted')) if isinstance(delete_result, dict) else bool(delete_result)
-                payload = delete_result if isinstance(delete_result, dict) else {'deleted': deleted}
-                return success_response(payload, message='Session deleted' if deleted else 'Delete failed')
-            elif action == 'rename_session':
-                new_title = body.get('title', '').strip()
-                if not new_title:
-                    return error_response('title is required', 400)
-                ok = rename_chat_session(hist_farmer, hist_session, new_title)
-                return success_response({'renamed': ok, 'title': new_title[:80]}, message='Session renamed' if ok else 'Rename failed')
-
-        # ── Fast path: Refresh an expired audio presigned URL ──
-        refresh_key = body.get('refresh_audio_key')
-        if refresh_key:
-            fresh_url = refresh_audio_url(refresh_key)
-            if fresh_url:
-                return success_response({'audio_url': fresh_url, 'audio_key': refresh_key},
-                                        message='Audio URL refreshed')
-            return error_response('Audio file not found', 404)
+        # ── Chat History API + audio URL refresh (history_handler.py; /chat/history
+        # serves the same bodies without the orchestrator cold start) ──
+        if is_history_request(body):
+            history_response = handle_history_request(body)
+            if history_response is not None:
+                return history_response
 
         # ── Fast path: Async TTS generation (called separately by frontend) ──
         generate_tts = body.get('generate_tts')
@@ -2258,6 +2794,17 @@ def lambda_handler(event, context):
                 return error_response('tts_text is required', 400)
             try:
                 tts_lang_norm = normalize_language_code(tts_lang, default='en')
+                # Same text already spoken (e.g. a cached answer): sign the stored key, no synthesis.
+                known_audio = audio_for_text(tts_text, tts_lang_norm)
+                known_url = presign_audio_url(known_audio['audio_key']) if known_audio else None
+                if known_url:
+                    return success_response({
+                        'audio_url': known_url,
+                        'audio_key': known_audio['audio_key'],
+                        'truncated': known_audio['polly_text_truncated'],
+                        'partial_audio': False,
+                        'cached': True,
+                    }, message='TTS cached')
                 gtts_budget = ASYNC_GTTS_TIME_BUDGET_SEC if tts_lang_norm not in ('en', 'hi') else None
                 polly_result = text_to_speech(
                     tts_text,
@@ -2270,6 +2817,9 @@ def lambda_handler(event, context):
                         _tts_err = polly_result.get('error') or f'No audio generated for language={tts_lang}'
                         logger.warning(f'Async TTS unavailable: {_tts_err}')
                         return error_response('Audio is temporarily unavailable. Please try again.', 503)
+                    if not polly_result.get('partial_audio'):
+                        remember_audio_for_text(tts_text, tts_lang_norm, polly_result.get('audio_key'),
+                                                polly_result.get('truncated', False))
                     return success_response({
                         'audio_url': polly_result.get('audio_url'),
                         'audio_key': polly_result.get('audio_key'),
@@ -2292,7 +2842,26 @@ def lambda_handler(event, context):
         farmer_id = body.get('farmer_id', 'anonymous')
         idempotency_token = body.get('idempotency_token')
         language = body.get('language', None)
-        profile = get_farmer_profile(farmer_id) if farmer_id != 'anonymous' else None
+
+        # Ensure session ID is long enough for Bedrock session tracking
+        if len(session_id) < 33:
+            session_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, session_id))
+
+        # ── Concurrent pre-flight ──
+        # Profile, message count, rate limit and language detection are independent
+        # round trips: fan them out now and join each one where it is consumed below.
+        # Guardrails are pure regex, so they run inline first — a blocked message
+        # never consumes rate-limit quota or a Translate call.
+        preflight = None
+        preflight_guardrail = None
+        if ENABLE_CONCURRENT_PREFLIGHT and user_message and user_message.strip():
+            preflight, preflight_guardrail = _start_preflight(body, user_message, session_id, farmer_id)
+
+        with stage_span('profile'):
+            if preflight:
+                profile = preflight.get('profile')
+            else:
+                profile = get_farmer_profile(farmer_id) if farmer_id != 'anonymous' else None
         profile_language = None
         if profile and profile.get('language'):
             profile_language = normalize_language_code(profile.get('language'), default='en')
@@ -2309,10 +2878,6 @@ def lambda_handler(event, context):
         gps_location = body.get('gps_location', None)  # e.g. "Coimbatore"
         gps_coords = body.get('gps_coords', None)      # e.g. {"lat": 11.01, "lng": 76.95}
 
-        # Ensure session ID is long enough for Bedrock session tracking
-        if len(session_id) < 33:
-            session_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, session_id))
-
         _t_start = _time.time()
         _is_feature_page = any(session_id.startswith(p) or body.get('session_id', '').startswith(p) for p in FAST_PATH_PREFIXES)
         logger.info(f'Session {session_id} | feature_page={_is_feature_page}')
@@ -2327,15 +2892,10 @@ def lambda_handler(event, context):
             requested_lang = normalize_language_code(effective_preferred_language or 'en', default='en')
             return _timeout_http_response(session_id, requested_lang)
 
-        # ── Chat session message limit ──
-        # Cap at 50 user interactions per session (100 messages = 50 user + 50 assistant).
-        # Beyond this:
-        # - Context quality degrades (model only reads last 6 anyway)
-        # - DynamoDB item accumulation becomes wasteful
-        # - Forces fresh context for complex new topics
-        MAX_MESSAGES_PER_SESSION = 100
+        # ── Chat session message limit (MAX_MESSAGES_PER_SESSION) ──
         if not _is_feature_page:
-            msg_count = get_session_message_count(session_id)
+            with stage_span('message_count'):
+                msg_count = preflight.get('message_count') if preflight else get_session_message_count(session_id)
             if msg_count >= MAX_MESSAGES_PER_SESSION:
                 logger.info(f'Session {session_id} reached message limit ({msg_count}/{MAX_MESSAGES_PER_SESSION})')
                 return success_response({
@@ -2366,7 +2926,11 @@ def lambda_handler(event, context):
 
         # ══════ ENTERPRISE GUARDRAILS (Pre-processing) ══════
         # Gap #1 (PII), #2 (Injection), #4 (Input Length), #7 (Toxicity)
-        guardrail_result = run_all_guardrails(user_message)
+        if preflight_guardrail:
+            guardrail_result = preflight_guardrail
+        else:
+            with stage_span('guardrails'):
+                guardrail_result = run_all_guardrails(user_message)
         pii_safe_msg = guardrail_result.get('pii_masked_message', user_message[:200])
 
         if not guardrail_result['passed']:
@@ -2400,7 +2964,11 @@ def lambda_handler(event, context):
             audit_pii_detected(farmer_id, session_id, guardrail_result['pii_detected'])
 
         # Gap #3: Rate limiting
-        rate_result = check_rate_limit(session_id, farmer_id)
+        with stage_span('rate_limit'):
+            rate_result = preflight.get('rate_limit') if preflight else None
+            if rate_result is None:
+                # Sequential path, or preflight saw a full session that this request's join did not.
+                rate_result = check_rate_limit(session_id, farmer_id)
         if not rate_result['allowed']:
             audit_guardrail_block(
                 block_type='rate_limit',
@@ -2436,13 +3004,18 @@ def lambda_handler(event, context):
         logger.info(f"Query from farmer {farmer_id}: {pii_safe_msg}")
 
         # --- Step 1: Detect language & translate to English ---
-        detection = detect_and_translate(user_message, target_language='en')
+        with stage_span('translate_in'):
+            if preflight and preflight.has('detection'):
+                detection = preflight.get('detection')
+                logger.info(f"Preflight joined: {preflight.summary()}")
+            else:
+                detection = detect_and_translate(user_message, target_language='en')
         detected_lang = _resolve_reply_language(
             effective_preferred_language,
             detection.get('detected_language', 'en'),
             user_message,
         )
-        english_message = _normalize_translated_agri_terms(
+        english_message = normalize_agri_terms(
             detection.get('translated_text', user_message)
         )
         # Keep a clean copy of the English translation (before farmer context prefix)
@@ -2685,66 +3258,127 @@ def lambda_handler(event, context):
         _cache_crop = (_fc.get('crops') or [''])[0] if isinstance(_fc.get('crops'), list) else str(_fc.get('crops', ''))
         _raw_en_for_cache = detection.get('translated_text', user_message)
 
-        cached = get_cached_response(_raw_en_for_cache, _cache_location, _cache_crop, intents=intents) if not _query_is_generic else None
+        with stage_span('cache_lookup'):
+            cached = get_cached_response(_raw_en_for_cache, _cache_location, _cache_crop, intents=intents) if not _query_is_generic else None
+
+        # Single-flight: on a miss, the first request for this key runs the pipeline;
+        # identical requests arriving meanwhile wait briefly for its answer.
+        if not cached and ENABLE_SINGLE_FLIGHT and not _query_is_generic:
+            flight = acquire_flight(cache_key_for(_raw_en_for_cache, _cache_location, _cache_crop), _request_id)
+            if flight.is_follower:
+                if request_deadline:
+                    _remaining_sec = request_deadline.remaining()
+                else:
+                    # No deadline installed: bound the wait by the API Gateway wall and the Lambda timeout.
+                    _remaining_sec = API_GW_TIMEOUT_SEC - (_time.time() - _t_request)
+                    if hasattr(context, 'get_remaining_time_in_millis'):
+                        _remaining_sec = min(_remaining_sec, context.get_remaining_time_in_millis() / 1000.0)
+                with stage_span('single_flight_wait'):
+                    cached = wait_for_flight(
+                        flight,
+                        lambda: get_cached_response(_raw_en_for_cache, _cache_location, _cache_crop, intents=intents,
+                                                    skip_negative=True),
+                        remaining_sec=_remaining_sec,
+                    )
+                logger.info(f"Single-flight follower: {'coalesced' if cached else 'leader result not ready'} "
+                            f"after {flight.waited_ms}ms")
+                if cached:
+                    cached['_coalesced'] = True
         if cached:
-            logger.info(f"CACHE HIT — returning cached response (key={cached.get('_cache_key')})")
+            logger.info(f"CACHE HIT — returning cached response (key={cached.get('_cache_key')}, "
+                        f"tier={cached.get('_cache_tier', 'flight')})")
             # Use cached English reply
             result_text_en = cached.get('reply_en', '')
             cached_tools = cached.get('tools_used', [])
             cached_sources = cached.get('sources')
+            _lang = detected_lang or 'en'
+            # Localized text / audio already stored for this language (ENABLE_LOCALIZED_CACHE)
+            _variant = (cached.get('localized') or {}).get(_lang) or {}
+            _variant_update = {}
 
             # Translate if needed
-            if detected_lang and detected_lang != 'en':
-                translated_reply, _cache_localization_mode = _localize_response_hybrid(result_text_en, detected_lang)
+            if detected_lang and detected_lang != 'en' and _variant.get('reply'):
+                translated_reply, _cache_localization_mode = _variant['reply'], 'cached'
+            elif detected_lang and detected_lang != 'en':
+                with stage_span('localize'):
+                    translated_reply, _cache_localization_mode = _localize_response_hybrid(result_text_en, detected_lang)
                 # Defensive: strip any leftover HTML artifacts from translation
-                translated_reply = re.sub(r'</?span[^>]*>', '', translated_reply, flags=re.IGNORECASE)
+                translated_reply = strip_span_tags(translated_reply)
             else:
                 translated_reply = result_text_en
                 _cache_localization_mode = 'en'
             translated_reply = _strip_local_markdown_symbols(translated_reply, detected_lang)
+            if _cache_localization_mode not in ('en', 'empty', 'cached') and translated_reply != result_text_en:
+                # Not stored when localization fell back to the English text.
+                _variant_update.update(reply=translated_reply, localization_mode=_cache_localization_mode)
 
             # TTS
             audio_url = None
             audio_key = None
             audio_pending = False
             polly_text_truncated = False
-            _lang = detected_lang or 'en'
-            if _lang not in ('en', 'hi'):
+            if ENABLE_LOCALIZED_CACHE and not _variant.get('audio_key') and _lang not in ('en', 'hi'):
+                # gTTS audio is made by the async generate_tts call, remembered by text.
+                _text_audio = audio_for_text(translated_reply, _lang)
+                if _text_audio:
+                    _variant = {**_variant, **_text_audio}
+                    _variant_update.update(audio_key=_text_audio['audio_key'],
+                                           polly_text_truncated=_text_audio['polly_text_truncated'])
+            if _variant.get('audio_key'):
+                audio_key = _variant['audio_key']
+                audio_url = presign_audio_url(audio_key)
+                audio_pending = not audio_url
+                polly_text_truncated = bool(_variant.get('polly_text_truncated', False))
+            elif _lang not in ('en', 'hi'):
                 audio_pending = True
             else:
                 _elapsed_cache = _time.time() - _t_start
-                if _elapsed_cache < TTS_TIME_BUDGET_SEC:
+                if request_deadline and not request_deadline.allows('tts'):
+                    request_deadline.skip('tts')
+                    audio_pending = True
+                elif request_deadline or _elapsed_cache < TTS_TIME_BUDGET_SEC:
                     try:
-                        polly_result = text_to_speech(translated_reply, _lang, return_metadata=True)
+                        with stage_span('tts'):
+                            polly_result = text_to_speech(translated_reply, _lang, return_metadata=True)
                         if isinstance(polly_result, dict):
                             audio_url = polly_result.get('audio_url')
                             audio_key = polly_result.get('audio_key')
                             polly_text_truncated = bool(polly_result.get('truncated', False))
+                            if audio_key:
+                                _variant_update.update(audio_key=audio_key, polly_text_truncated=polly_text_truncated)
                         else:
                             audio_url = polly_result
                     except Exception as polly_err:
                         logger.warning(f"Polly TTS failed (cached, non-fatal): {polly_err}")
 
-            save_chat_messages_batch([
-                {
-                    'session_id': session_id,
-                    'role': 'user',
-                    'message': user_message,
-                    'language': detected_lang,
-                    'farmer_id': farmer_id,
-                    'message_en': _raw_en_for_cache if detected_lang != 'en' else None,
-                    'idempotency_token': f"{idempotency_token}:cache:user" if idempotency_token else None,
-                },
-                {
-                    'session_id': session_id,
-                    'role': 'assistant',
-                    'message': translated_reply,
-                    'language': detected_lang,
-                    'farmer_id': farmer_id,
-                    'message_en': result_text_en if detected_lang != 'en' else None,
-                    'idempotency_token': f"{idempotency_token}:cache:assistant" if idempotency_token else None,
-                },
-            ])
+            if _variant_update and ENABLE_LOCALIZED_CACHE:
+                with stage_span('cache_variant_store'):
+                    save_localized_variant(
+                        cache_key_for(_raw_en_for_cache, _cache_location, _cache_crop), _lang, result_text_en,
+                        **_variant_update,
+                    )
+
+            with stage_span('dynamodb_save'):
+                save_chat_messages_batch([
+                    {
+                        'session_id': session_id,
+                        'role': 'user',
+                        'message': user_message,
+                        'language': detected_lang,
+                        'farmer_id': farmer_id,
+                        'message_en': _raw_en_for_cache if detected_lang != 'en' else None,
+                        'idempotency_token': f"{idempotency_token}:cache:user" if idempotency_token else None,
+                    },
+                    {
+                        'session_id': session_id,
+                        'role': 'assistant',
+                        'message': translated_reply,
+                        'language': detected_lang,
+                        'farmer_id': farmer_id,
+                        'message_en': result_text_en if detected_lang != 'en' else None,
+                        'idempotency_token': f"{idempotency_token}:cache:assistant" if idempotency_token else None,
+                    },
+                ])
 
             _total_elapsed = _time.time() - _t_start
             logger.info(f'Cache hit response in {_total_elapsed:.1f}s')
@@ -2774,21 +3408,47 @@ def lambda_handler(event, context):
                     'grounding_required': False,
                     'grounding_satisfied': True,
                     'cache_hit': True,
+                    'coalesced': bool(cached.get('_coalesced')),
+                    'cache_tier': cached.get('_cache_tier', 'flight'),
                 },
             }, message='Cached advisory', language=detected_lang)
 
         # Save user message EARLY (before Bedrock) — prevents data loss on timeout
-        save_chat_message(session_id, 'user', user_message, detected_lang, farmer_id=farmer_id,
-                message_en=_raw_en_for_cache if detected_lang != 'en' else None,
-                idempotency_token=f"{idempotency_token}:user:early" if idempotency_token else None)
+        with stage_span('dynamodb_save_user'):
+            save_chat_message(session_id, 'user', user_message, detected_lang, farmer_id=farmer_id,
+                    message_en=_raw_en_for_cache if detected_lang != 'en' else None,
+                    idempotency_token=f"{idempotency_token}:user:early" if idempotency_token else None)
 
         # Retrieve conversation history for follow-up context (chat pages only, not feature pages)
         chat_history = []
+        memory_needs_refresh = False
         if not _is_feature_page:
-            chat_history = _build_conversation_history_context(session_id, limit=40)
+            with stage_span('history_load'):
+                if ENABLE_CONVERSATION_MEMORY:
+                    chat_history, memory_needs_refresh = _build_memory_context(session_id)
+                else:
+                    chat_history = _build_conversation_history_context(session_id, limit=40)
             if chat_history:
                 logger.info(f"Loaded {len(chat_history)} prior messages for conversation memory")
 
+        # Streaming mode: converse_stream() deltas feed a sentence pipeline that
+        # localizes/voices finished sentences while the rest is still generating.
+        # Nothing is streamed to the client. Hybrid (model-first) localization
+        # keeps owning the final text, so the pipeline then only does TTS.
+        stream_pipeline = None
+        if ENABLE_STREAMING_RESPONSES:
+            stream_pipeline = SentenceStreamPipeline(detected_lang or 'en', speak=True,
+                                                     translate=not HYBRID_LOCALIZATION_ENABLED)
+        _on_text_delta = stream_pipeline.feed if stream_pipeline else None
+
+        model_route = _route_model_for_request(
+            _request_id, intents, _clean_english_msg, _query_is_generic, chat_history, session_id, _is_feature_page,
+        )
+        routed_model_id = model_route['model_id'] if ENABLE_MODEL_ROUTER else None
+        pipeline_meta_extra['model_route'] = {
+            'tier': model_route['tier'], 'score': model_route['score'], 'applied': ENABLE_MODEL_ROUTER,
+        }
+
         if _is_feature_page:
             # FAST PATH: feature pages use single direct Bedrock call
             # skip_native_guardrail=True because these prompts are code-generated
@@ -2802,8 +3462,13 @@ def lambda_handler(event, context):
                 return _timeout_http_response(session_id, detected_lang)
             
             routed_prompt = _build_tool_first_prompt(english_message, intents, farmer_context)
+            seed_tools = _derive_seed_tools(
+                intents, model_farmer_context, routed_prompt, _clean_english_msg, is_generic=_query_is_generic,
+            )
+            prefetch = None if seed_tools else _start_speculative_prefetch(intents, model_farmer_context, routed_prompt)
             result_text, tools_used, tool_data_log, _gr_intervened = _invoke_bedrock_direct(
-                routed_prompt, model_farmer_context, skip_native_guardrail=True, lambda_context=context
+                routed_prompt, model_farmer_context, skip_native_guardrail=True, lambda_context=context,
+                on_text_delta=_on_text_delta, prefetch=prefetch, seed_tools=seed_tools, model_id=routed_model_id,
             )
 
         else:
@@ -2821,10 +3486,21 @@ def lambda_handler(event, context):
                 intents,
                 model_farmer_context,
             )
+            seed_tools = _derive_seed_tools(
+                intents, model_farmer_context, routed_prompt, _clean_english_msg, is_generic=_query_is_generic,
+            )
+            prefetch = None if seed_tools else _start_speculative_prefetch(intents, model_farmer_context, routed_prompt)
             result_text, tools_used, tool_data_log, _gr_intervened = _invoke_bedrock_direct(
-                routed_prompt, model_farmer_context, chat_history=chat_history, lambda_context=context
+                routed_prompt, model_farmer_context, chat_history=chat_history, lambda_context=context,
+                on_text_delta=_on_text_delta, prefetch=prefetch, seed_tools=seed_tools, model_id=routed_model_id,
             )
 
+        if seed_tools:
+            pipeline_meta_extra['seeded_tools'] = [t['name'] for t in seed_tools]
+        _prefetch_summary = _finish_speculative_prefetch(prefetch)
+        if _prefetch_summary:
+            pipeline_meta_extra['prefetch'] = _prefetch_summary
+
         # Clean up model thinking tags (Claude emits <thinking>...</thinking>)
         result_text = re.sub(r'<thinking>.*?</thinking>\s*', '', result_text, flags=re.DOTALL)
         result_text = result_text.strip()
@@ -2844,6 +3520,7 @@ def lambda_handler(event, context):
             )
             tools_used = []
 
+        _t_post_process = _time.time()
         if _is_feature_page:
             # Feature pages (soil-analysis, crop-recommend, farm-calendar) send
             # self-contained prompts with all context embedded — never replace
@@ -2869,34 +3546,33 @@ def lambda_handler(event, context):
         # Gap #6: Audit policy decision
         audit_policy_decision(farmer_id, session_id, policy_meta)
 
-        # Post-process: remove any "only rice and wheat" limitation language
-        result_text = _post_process_response(result_text)
-        result_text = _apply_strict_soil_response_guard(
-            result_text,
-            english_message,
-            farmer_context=farmer_context,
-            tool_data_log=tool_data_log,
-        )
-        result_text = _apply_tool_signal_response_guard(
-            result_text,
-            english_message,
-            tools_used=tools_used,
-            tool_data_log=tool_data_log,
-        )
-        result_text = _normalize_output_markdown(result_text)
-        result_text = _ensure_cautious_pest_response(result_text, tools_used, _raw_en_for_cache)
+        # Post-process: limitation language, soil/tool-signal guards, markdown, pest caution
+        result_text, post_changed = _ANSWER_PIPELINE.run(result_text, {
+            'query_en': english_message,
+            'raw_query_en': _raw_en_for_cache,
+            'farmer_context': farmer_context,
+            'tools_used': tools_used,
+            'tool_data_log': tool_data_log,
+        })
+        if post_changed:
+            logger.info(f"Post-process stages applied: {post_changed}")
+        record_span('post_process', _t_post_process)
 
         logger.info(f"Agent response: {mask_pii_in_log(result_text[:200])}... tools={tools_used}")
 
         # --- Step 4: Translate response to farmer's language ---
         # Strip sources line BEFORE translation so function names don't get garbled
-        text_for_translation, _ = _strip_sources_line(result_text)
+        text_for_translation, _ = strip_sources_line(result_text)
         sources_line = _build_sources_line(tools_used)
 
         if detected_lang and detected_lang != 'en':
-            translated_reply, localization_mode = _localize_response_hybrid(text_for_translation, detected_lang)
+            with stage_span('localize'):
+                if stream_pipeline and stream_pipeline.translate_enabled:
+                    translated_reply, localization_mode = stream_pipeline.localize(text_for_translation), 'stream_translate'
+                else:
+                    translated_reply, localization_mode = _localize_response_hybrid(text_for_translation, detected_lang)
             # Defensive: strip any leftover HTML artifacts from translation
-            translated_reply = re.sub(r'</?span[^>]*>', '', translated_reply, flags=re.IGNORECASE)
+            translated_reply = strip_span_tags(translated_reply)
         else:
             translated_reply = text_for_translation
             localization_mode = 'en'
@@ -2909,23 +3585,30 @@ def lambda_handler(event, context):
 
         # ══════ CACHE STORE (fire-and-forget) ══════
         # Store the English response for future cache hits on similar queries.
+        _cache_stored = False
         try:
-            cache_response(
+            _t_cache_store = _time.time()
+            _cache_payload = {
+                'reply_en': text_for_translation,
+                'tools_used': tools_used,
+                'sources': sources_line,
+            }
+            _cache_stored = cache_response(
                 _raw_en_for_cache, _cache_location, _cache_crop, None,
-                {
-                    'reply_en': text_for_translation,
-                    'tools_used': tools_used,
-                    'sources': sources_line,
-                },
+                _cache_payload,
                 intents=intents,
             )
+            record_span('cache_store', _t_cache_store)
+            # Hand the answer to waiting single-flight followers (in-process) and drop the lease
+            complete_flight(flight, {**_cache_payload, '_cache_hit': True})
         except Exception as _cache_err:
             logger.warning(f"Cache store failed (non-fatal): {_cache_err}")
 
         # --- Step 4b: Output guardrails (PII leakage, prompt leakage, length cap) ---
-        output_guard = run_output_guardrails(translated_reply, context={
-            'farmer_id': farmer_id, 'session_id': session_id,
-        })
+        with stage_span('output_guardrails'):
+            output_guard = run_output_guardrails(translated_reply, context={
+                'farmer_id': farmer_id, 'session_id': session_id,
+            })
         if output_guard['modified']:
             translated_reply = output_guard['text']
             logger.info(
@@ -2949,15 +3632,22 @@ def lambda_handler(event, context):
             # Defer gTTS to a separate frontend call — return text immediately
             audio_pending = True
             logger.info(f'Deferring gTTS({_lang}) to async call — elapsed {_elapsed:.1f}s')
-        elif _elapsed > TTS_TIME_BUDGET_SEC:
+        elif request_deadline and not request_deadline.allows('tts'):
+            # Lowest-priority stage: hand audio to the async generate_tts call instead.
+            request_deadline.skip('tts')
+            audio_pending = True
+        elif not request_deadline and _elapsed > TTS_TIME_BUDGET_SEC:
             logger.warning(f'Skipping Polly TTS - elapsed {_elapsed:.1f}s > {TTS_TIME_BUDGET_SEC}s budget')
         else:
             try:
-                polly_result = text_to_speech(
-                    translated_reply,
-                    _lang,
-                    return_metadata=True,
-                )
+                with stage_span('tts'):
+                    polly_result = stream_pipeline.speech(translated_reply) if stream_pipeline else None
+                    if not polly_result or not polly_result.get('audio_url'):
+                        polly_result = text_to_speech(
+                            translated_reply,
+                            _lang,
+                            return_metadata=True,
+                        )
                 if isinstance(polly_result, dict):
                     audio_url = polly_result.get('audio_url')
                     audio_key = polly_result.get('audio_key')
@@ -2968,11 +3658,43 @@ def lambda_handler(event, context):
             except Exception as polly_err:
                 logger.warning(f"Polly audio failed (non-fatal): {polly_err}")
 
+        if ENABLE_LOCALIZED_CACHE and _cache_stored:
+            # This request's language is the entry's first variant: later hits in it skip localize + TTS.
+            _localized_now = bool(detected_lang and detected_lang != 'en' and translated_reply != text_for_translation)
+            with stage_span('cache_variant_store'):
+                save_localized_variant(
+                    cache_key_for(_raw_en_for_cache, _cache_location, _cache_crop), _lang, text_for_translation,
+                    reply=translated_reply if _localized_now else None, localization_mode=localization_mode,
+                    audio_key=audio_key, polly_text_truncated=polly_text_truncated,
+                )
+
+        if ENABLE_TOOL_BULKHEADS:
+            _emit_bulkhead_metrics()
+
+        if stream_pipeline:
+            stream_pipeline.close()
+            pipeline_meta_extra['streaming'] = stream_pipeline.stats()
+            logger.info(f"Streaming pipeline stats: {pipeline_meta_extra['streaming']}")
+
+        if request_deadline:
+            pipeline_meta_extra['deadline'] = request_deadline.summary()
+
+        token_usage = current_usage()
+        if token_usage and token_usage.calls:
+            pipeline_meta_extra['token_usage'] = token_usage.summary()
+            logger.info(f"Bedrock token usage: {pipeline_meta_extra['token_usage']}")
+        if ENABLE_BEDROCK_LIMITER:
+            pipeline_meta_extra['bedrock_limiter'] = limiter_snapshot()
+
         # --- Step 6: Save chat history ---
         # User message was already saved before Step 3 (early save for durability)
-        save_chat_message(session_id, 'assistant', translated_reply, detected_lang, farmer_id=farmer_id,
-                message_en=text_for_translation if detected_lang != 'en' else None,
-                idempotency_token=f"{idempotency_token}:assistant:final" if idempotency_token else None)
+        with stage_span('dynamodb_save'):
+            save_chat_message(session_id, 'assistant', translated_reply, detected_lang, farmer_id=farmer_id,
+                    message_en=text_for_translation if detected_lang != 'en' else None,
+                    idempotency_token=f"{idempotency_token}:assistant:final" if idempotency_token else None)
+
+        if memory_needs_refresh:
+            _schedule_memory_refresh(session_id, context)
 
         # --- Step 7: Return response (matches API contract) ---
         _total_elapsed = _time.time() - _t_start
@@ -3013,3 +3735,49 @@ def lambda_handler(event, context):
     except Exception as e:
         logger.error(f"Unhandled error: {str(e)}", exc_info=True)
         return error_response('An internal error occurred. Please try again.', 500)
+    finally:
+        # Leader exiting without caching (error, timeout fallback, early return):
+        # release so followers stop waiting. No-op after complete_flight above.
+        complete_flight(flight)
+
+
+# ── Warm-up (priming event, SnapStart / PRIME_ON_INIT init hooks) ──
+
+_PRIME_QUERY_EN = 'Yellow spots on my wheat leaves after rain, which spray should I use?'
+_PRIME_REPLY_EN = '**Wheat rust** is likely.\n\n- Spray propiconazole 25 EC\n- Avoid irrigation for 3 days\n\nSources: get_pest_alert'
+_PRIME_REPLY_HI = '**गेहूं का रतुआ** रोग संभव है। - प्रोपिकोनाज़ोल का छिड़काव करें'
+
+
+def prime(network=True):
+    """Build clients, warm regex tables and static data, open connections (utils/priming.py)."""
+    return run_priming('agent_orchestrator', [
+        ('client:bedrock-runtime', lambda: bool(_bedrock_rt()), False),
+        ('client:lambda', lambda: bool(_lambda_invoke_client()), False),
+        ('client:translate', lambda: bool(get_client('translate')), False),
+        ('client:polly', lambda: bool(get_client('polly')), False),
+        ('client:s3', lambda: bool(get_client('s3')), False),
+        ('table:sessions', lambda: bool(get_table(SESSIONS_TABLE)), False),
+        ('data:crop_ref', lambda: len(_CROP_REF), False),
+        ('regex:guardrails', lambda: run_all_guardrails(_PRIME_QUERY_EN)['passed'], False),
+        ('regex:topic', lambda: _is_on_topic_query(_PRIME_QUERY_EN), False),
+        ('regex:intents', lambda: sorted(_classify_intents(_PRIME_QUERY_EN)), False),
+        ('regex:answer_pipeline', lambda: _ANSWER_PIPELINE.run(_PRIME_REPLY_EN, {
+            'query_en': _PRIME_QUERY_EN, 'raw_query_en': _PRIME_QUERY_EN, 'farmer_context': None,
+            'tools_used': ['get_pest_alert'], 'tool_data_log': [],
+        })[1], False),
+        ('regex:localized', lambda: len(clean_localized_text(_PRIME_REPLY_HI, 'hi')), False),
+        ('tools:in_process', lambda: prime_in_process_tools(network=network), False),
+        ('connect:bedrock-runtime', lambda: warm(
+            _bedrock_rt().converse, modelId='prime', messages=[{'role': 'user', 'content': [{'text': 'ok'}]}]), True),
+        ('connect:dynamodb', lambda: warm(
+            get_table(SESSIONS_TABLE).get_item, Key={'session_id': 'prime', 'timestamp': 'prime'}), True),
+        ('connect:translate', lambda: warm(
+            get_client('translate').translate_text, Text='ok', SourceLanguageCode='en', TargetLanguageCode='hi'), True),
+        # DryRun checks the invoke permission without running the tool
+        ('connect:lambda', lambda: warm(
+            _lambda_invoke_client().invoke, FunctionName=LAMBDA_WEATHER, InvocationType='DryRun'
+        ) if LAMBDA_WEATHER else 'skipped', True),
+    ], network=network)
+
+
+register_init_hooks(prime)
@@ -0,0 +1,107 @@
+# backend/lambdas/agent_orchestrator/history_handler.py
+# Slim entry point for chat-history and audio-URL requests
+# Owner: Manoj RS
+#
+# list/get/save/delete/rename_session and refresh_audio_key are one DynamoDB or
+# S3 call each, but served by handler.lambda_handler they paid the whole
+# orchestrator cold start: Bedrock/Lambda/CloudWatch/Polly/Translate clients,
+# guardrails, keyword tables, crop reference data, in-process tool preload.
+#
+# This module imports only chat_history, the S3 presign helper and the response
+# envelope. ChatHistoryFunction (infrastructure/template.yaml) serves it on
+# POST /chat/history. The orchestrator still answers the same bodies on /chat
+# through handle_history_request(), so older frontends keep working.
+
+import json
+import logging
+import os
+
+from utils.response_helper import success_response, error_response
+from utils.cors_helper import handle_cors_preflight
+from utils.chat_history import list_sessions, get_session_messages, save_session, delete_session, rename_session, SESSIONS_TABLE
+from utils.audio_urls import refresh_audio_url
+from utils.aws_clients import get_client, get_table
+from utils.priming import is_priming_event, wants_network, run_priming, warm, register_init_hooks
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+HISTORY_ACTIONS = ('list_sessions', 'get_session', 'save_session', 'delete_session', 'rename_session')
+
+
+def is_history_request(body):
+    """True for the bodies this module serves (history action or audio URL refresh)."""
+    return isinstance(body, dict) and (body.get('action') in HISTORY_ACTIONS or bool(body.get('refresh_audio_key')))
+
+
+def handle_history_request(body):
+    """API Gateway response for a history/audio-refresh body, or None if the body is not one."""
+    action = body.get('action')
+    if action in HISTORY_ACTIONS:
+        hist_farmer = body.get('farmer_id', '')
+        hist_session = body.get('session_id', '')
+        if action == 'list_sessions':
+            sessions = list_sessions(hist_farmer)
+            return success_response({'sessions': sessions}, message='Sessions loaded')
+        elif action == 'get_session':
+            msgs = get_session_messages(hist_farmer, hist_session)
+            return success_response({'messages': msgs}, message='Messages loaded')
+        elif action == 'save_session':
+            msgs = body.get('messages', [])
+            preview = body.get('preview', None)
+            ok = save_session(hist_farmer, hist_session, msgs, preview)
+            return success_response({'saved': ok}, message='Session saved' if ok else 'Save failed')
+        elif action == 'delete_session':
+            delete_result = delete_session(hist_farmer, hist_session)
+            deleted = bool(delete_result.get('deleted')) if isinstance(delete_result, dict) else bool(delete_result)
+            payload = delete_result if isinstance(delete_result, dict) else {'deleted': deleted}
+            return success_response(payload, message='Session deleted' if deleted else 'Delete failed')
+        elif action == 'rename_session':
+            new_title = body.get('title', '').strip()
+            if not new_title:
+                return error_response('title is required', 400)
+            ok = rename_session(hist_farmer, hist_session, new_title)
+            return success_response({'renamed': ok, 'title': new_title[:80]}, message='Session renamed' if ok else 'Rename failed')
+
+    # Refresh an expired audio presigned URL
+    refresh_key = body.get('refresh_audio_key')
+    if refresh_key:
+        fresh_url = refresh_audio_url(refresh_key)
+        if fresh_url:
+            return success_response({'audio_url': fresh_url, 'audio_key': refresh_key},
+                                    message='Audio URL refreshed')
+        return error_response('Audio file not found', 404)
+    return None
+
+
+def prime(network=True):
+    """Warm-up for the priming event / init hooks (utils/priming.py)."""
+    return run_priming('chat_history', [
+        ('client:s3', lambda: bool(get_client('s3')), False),
+        ('table:sessions', lambda: bool(get_table(SESSIONS_TABLE)), False),
+        ('connect:dynamodb', lambda: warm(
+            get_table(SESSIONS_TABLE).get_item, Key={'session_id': 'prime', 'timestamp': 'prime'}), True),
+    ], network=network)
+
+
+def lambda_handler(event, context):
+    if is_priming_event(event):
+        return prime(network=wants_network(event))
+    if event.get('httpMethod') == 'OPTIONS':
+        return handle_cors_preflight(methods='POST,OPTIONS')
+    try:
+        body = json.loads(event.get('body') or '{}')
+    except (TypeError, ValueError):
+        return error_response('Invalid JSON body', 400)
+    if not is_history_request(body):
+        return error_response(f"Unsupported request; expected action in {', '.join(HISTORY_ACTIONS)} or refresh_audio_key", 400)
+    try:
+        return handle_history_request(body)
+    except Exception as e:
+        logger.error(f"History request failed ({body.get('action') or 'refresh_audio_key'}): {e}")
+        return error_response('History request failed', 500)
+
+
+# handler.py imports this module too; hook init only when this is the entry point
+if os.environ.get('_HANDLER', '').startswith('history_handler.'):
+    register_init_hooks(prime)
@@ -0,0 +1,41 @@
+# backend/lambdas/agent_orchestrator/utils/audio_urls.py
+# Presigned URLs for audio files already stored in S3
+# Owner: Manoj RS
+#
+# Split out of polly_helper so the chat-history entry point (history_handler.py)
+# can refresh an expired audio URL without importing the TTS stack. The S3
+# client comes from the shared registry (utils/aws_clients.py), built on first use.
+
+import os
+
+from utils.aws_clients import get_client
+
+S3_BUCKET = os.environ.get('S3_KNOWLEDGE_BUCKET', 'smart-rural-ai-knowledge-base')
+
+
+def presign_audio_url(audio_key):
+    """Presigned URL for an audio key, signed locally (no S3 round trip).
+    For keys the caller knows exist, e.g. audio_key stored with a cached response."""
+    if not audio_key or not audio_key.startswith('audio/'):
+        return None
+    try:
+        expiry_seconds = 7200 if os.environ.get('ENABLE_EXTENDED_AUDIO_EXPIRY', 'false').lower() == 'true' else 3600
+        return get_client('s3').generate_presigned_url(
+            'get_object',
+            Params={'Bucket': S3_BUCKET, 'Key': audio_key},
+            ExpiresIn=expiry_seconds
+        )
+    except Exception:
+        return None
+
+
+def refresh_audio_url(audio_key):
+    """Generate a fresh presigned URL for an existing audio file."""
+    if not audio_key or not audio_key.startswith('audio/'):
+        return None
+    try:
+        # Verify the file exists
+        get_client('s3').head_object(Bucket=S3_BUCKET, Key=audio_key)
+    except Exception:
+        return None
+    return presign_audio_url(audio_key)
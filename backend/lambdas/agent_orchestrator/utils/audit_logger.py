@@ -3,14 +3,46 @@
 # Logs every policy decision, guardrail action, and security event
 # Owner: Manoj RS
 # Gap addressed: #6 Audit Trail
+#
+# Batching (ENABLE_AUDIT_BATCHING, default OFF): a request writes up to ~8
+# entries (start, PII, each tool, policy, completion, ...), one log line each.
+# With batching on, lambda_handler opens a request-scoped batch
+# (begin_audit_batch) and the entries are collected in memory, then written
+# as ONE compact AUDIT|{"batch": true, "events": [...]} record by
+# flush_audit_batch() at the end of the request:
+#   - farmer_id / session_id are hoisted to the batch; events keep their own
+#     only when they differ, and carry dt_ms (offset from the first event)
+#   - SECURITY-category and critical entries are still written immediately,
+#     on their own, so an injection or guardrail event is never held back
+#   - AUDIT_INFO_SAMPLE_RATE (default 1.0) samples the high-volume info actions
+#     in AUDIT_SAMPLED_ACTIONS, decided once per request so a sampled request
+#     keeps its whole trail; the batch records how many were dropped
+#   - AUDIT_BATCH_MAX_EVENTS bounds a batch; a full batch is written early
+# The flush is a single synchronous write: a background thread could still be
+# running when Lambda freezes the container, and audit records must not be lost.
+# Records go to a sink (utils/audit_sinks.py): the AUDIT logger by default, or a
+# Firehose-style NDJSON file writer (AUDIT_SINK=ndjson).
 
-import json
 import logging
+import os
+import random
+import threading
 import time
 from datetime import datetime, UTC
 
+from utils.audit_sinks import sink_from_env
+
 logger = logging.getLogger()
 
+ENABLE_AUDIT_BATCHING = os.environ.get('ENABLE_AUDIT_BATCHING', 'false').lower() == 'true'
+AUDIT_INFO_SAMPLE_RATE = float(os.environ.get('AUDIT_INFO_SAMPLE_RATE', '1.0'))
+AUDIT_SAMPLED_ACTIONS = {
+    a.strip() for a in os.environ.get(
+        'AUDIT_SAMPLED_ACTIONS', 'REQUEST_STARTED,TOOL_INVOKED,INPUT_VALIDATED,GROUNDING_ENFORCED',
+    ).split(',') if a.strip()
+}
+AUDIT_BATCH_MAX_EVENTS = int(os.environ.get('AUDIT_BATCH_MAX_EVENTS', '50'))
+
 # Dedicated audit logger — separate from application logs
 # In production, this can be routed to a dedicated CloudWatch log group,
 # S3 bucket, or OpenSearch via a subscription filter
@@ -80,14 +112,129 @@ def audit_log(category, action, farmer_id='anonymous', session_id=None,
         # Ensure no raw PII leaks into audit logs
         entry['details'] = details
 
-    log_line = json.dumps(entry, default=str)
+    batch = _batch
+    if batch is not None and not _writes_immediately(entry):
+        batch.add(entry)
+        return
+    _write([entry])
+
+
+_SEVERITY_RANK = {'info': 0, 'warning': 1, 'critical': 2}
+_sink = sink_from_env()
+_batch = None
+
+
+def set_audit_sink(sink):
+    """Install a sink (any object with write(records)); returns the previous one."""
+    global _sink
+    previous, _sink = _sink, sink
+    return previous
+
+
+def _write(records):
+    try:
+        _sink.write(records)
+    except Exception as sink_err:
+        logger.error(f"Audit sink write failed ({len(records)} records): {sink_err}")
+
+
+def _writes_immediately(entry):
+    return entry['severity'] == 'critical' or entry['category'] == AuditEvent.SECURITY
+
+
+class AuditBatch:
+    """Audit entries of one request, written as one record."""
+
+    def __init__(self, request_id=None, sample_rate=AUDIT_INFO_SAMPLE_RATE, sampled_actions=AUDIT_SAMPLED_ACTIONS,
+                 max_events=AUDIT_BATCH_MAX_EVENTS):
+        self.request_id = request_id
+        self.keep_sampled = sample_rate >= 1.0 or random.random() < sample_rate
+        self.sample_rate = sample_rate
+        self.sampled_actions = sampled_actions
+        self.max_events = max_events
+        self._entries = []
+        self._sampled_out = 0
+        self._lock = threading.Lock()
+
+    def add(self, entry):
+        full = None
+        with self._lock:
+            if (not self.keep_sampled and entry['severity'] == 'info'
+                    and entry['action'] in self.sampled_actions):
+                self._sampled_out += 1
+                return
+            self._entries.append(entry)
+            if len(self._entries) >= self.max_events:
+                full = self._drain()
+        if full:
+            _write([full])
+
+    def _drain(self):
+        entries, self._entries = self._entries, []
+        sampled_out, self._sampled_out = self._sampled_out, 0
+        if not entries:
+            return None
+        last = entries[-1]
+        farmer_id, session_id = last.get('farmer_id'), last.get('session_id')
+        started = entries[0]['epoch']
+        events = []
+        for entry in entries:
+            event = {
+                'dt_ms': round((entry['epoch'] - started) * 1000.0, 1),
+                'category': entry['category'],
+                'action': entry['action'],
+            }
+            if entry['severity'] != 'info':
+                event['severity'] = entry['severity']
+            if entry.get('farmer_id') != farmer_id:
+                event['farmer_id'] = entry.get('farmer_id')
+            if entry.get('session_id') != session_id:
+                event['session_id'] = entry.get('session_id')
+            for key in ('message_preview', 'details'):
+                if entry.get(key):
+                    event[key] = entry[key]
+            events.append(event)
+        record = {
+            'audit': True,
+            'batch': True,
+            'timestamp': entries[0]['timestamp'],
+            'epoch': started,
+            'request_id': self.request_id,
+            'farmer_id': farmer_id,
+            'session_id': session_id,
+            'severity': max((e['severity'] for e in entries), key=lambda sev: _SEVERITY_RANK.get(sev, 0)),
+            'count': len(events),
+            'events': events,
+        }
+        if sampled_out:
+            record['sampled_out'] = sampled_out
+            record['sample_rate'] = self.sample_rate
+        return record
+
+    def flush(self):
+        with self._lock:
+            record = self._drain()
+        if record:
+            _write([record])
+        return record
+
+
+def begin_audit_batch(request_id=None):
+    """Start collecting this request's entries (no-op unless ENABLE_AUDIT_BATCHING)."""
+    global _batch
+    if not ENABLE_AUDIT_BATCHING:
+        return None
+    if _batch is not None:
+        _batch.flush()   # previous request ended without flushing
+    _batch = AuditBatch(request_id)
+    return _batch
+
 
-    if severity == 'critical':
-        audit_logger.critical(f"AUDIT|{log_line}")
-    elif severity == 'warning':
-        audit_logger.warning(f"AUDIT|{log_line}")
-    else:
-        audit_logger.info(f"AUDIT|{log_line}")
+def flush_audit_batch():
+    """Write the request's batch record and close the batch. Returns the record (or None)."""
+    global _batch
+    batch, _batch = _batch, None
+    return batch.flush() if batch is not None else None
 
 
 def audit_request_start(farmer_id, session_id, pii_safe_message, detected_lang=None):
@@ -0,0 +1,87 @@
+# backend/lambdas/agent_orchestrator/utils/audit_sinks.py
+# Where batched audit records go (utils/audit_logger.py)
+# Owner: Manoj RS
+#
+# A sink takes a list of audit records (dicts) and writes them:
+#
+#   LogSink          AUDIT|{...} lines on the AUDIT logger (default), the same
+#                    lines the CloudWatch subscription filter already routes
+#   NdjsonFileSink   Firehose-style stand-in: put_record_batch() appends one
+#                    JSON object per line to a local .ndjson file, rotated by
+#                    size. Used for local runs and the audit benchmark; the
+#                    file layout matches what a Firehose delivery stream
+#                    writes to S3, so the same readers work on both
+#
+# AUDIT_SINK=log|ndjson picks one (AUDIT_NDJSON_DIR, default /tmp/audit).
+# set_audit_sink() in audit_logger installs any object with write(records).
+
+import json
+import logging
+import os
+import threading
+import time
+
+audit_logger = logging.getLogger('AUDIT')
+
+AUDIT_SINK = os.environ.get('AUDIT_SINK', 'log').lower()
+AUDIT_NDJSON_DIR = os.environ.get('AUDIT_NDJSON_DIR', '/tmp/audit')
+AUDIT_NDJSON_MAX_BYTES = int(os.environ.get('AUDIT_NDJSON_MAX_BYTES', str(5 * 1024 * 1024)))
+
+
+def _line(record):
+    return json.dumps(record, default=str, separators=(',', ':'))
+
+
+class LogSink:
+    """AUDIT|<json> on the AUDIT logger, at the record's severity."""
+
+    def write(self, records):
+        for record in records:
+            # Single entries keep the original line format; batches are compact.
+            line = f"AUDIT|{_line(record) if record.get('batch') else json.dumps(record, default=str)}"
+            severity = record.get('severity', 'info')
+            if severity == 'critical':
+                audit_logger.critical(line)
+            elif severity == 'warning':
+                audit_logger.warning(line)
+            else:
+                audit_logger.info(line)
+
+
+class NdjsonFileSink:
+    """Firehose-style delivery to local NDJSON files (one record per line)."""
+
+    def __init__(self, directory=AUDIT_NDJSON_DIR, max_bytes=AUDIT_NDJSON_MAX_BYTES, prefix='audit'):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._path = None
+
+    def _current_path(self):
+        if self._path is None or (os.path.exists(self._path) and os.path.getsize(self._path) >= self.max_bytes):
+            os.makedirs(self.directory, exist_ok=True)
+            self._path = os.path.join(self.directory, f"{self.prefix}-{int(time.time() * 1000)}-{os.getpid()}.ndjson")
+        return self._path
+
+    def put_record_batch(self, Records, DeliveryStreamName=None):
+        """Same call shape as firehose.put_record_batch: Records=[{'Data': bytes}]."""
+        with self._lock:
+            with open(self._current_path(), 'ab') as f:
+                for record in Records:
+                    data = record['Data']
+                    f.write(data if data.endswith(b'\n') else data + b'\n')
+        return {'FailedPutCount': 0, 'RequestResponses': [{} for _ in Records]}
+
+    def write(self, records):
+        self.put_record_batch([{'Data': _line(record).encode('utf-8')} for record in records])
+
+    @property
+    def path(self):
+        return self._path
+
+
+def sink_from_env():
+    if AUDIT_SINK == 'ndjson':
+        return NdjsonFileSink()
+    return LogSink()
@@ -0,0 +1,106 @@
+# backend/lambdas/agent_orchestrator/utils/aws_clients.py
+# Lazy boto3 client registry shared by the handler and every utils helper
+# Owner: Manoj RS
+#
+# Helpers used to build their clients at import (`translate = boto3.client(...)`
+# in translate_helper, polly/s3/cloudwatch in polly_helper, a dynamodb resource
+# in dynamodb_helper AND response_cache, ...). Every cold start paid for all of
+# them, even when the request was a greeting, a guardrail block or a cache hit.
+# Each boto3 client costs tens of ms to build (botocore loads its service model).
+#
+# Here a client is built on first use, then reused by every helper and every
+# warm invocation of the container:
+#
+#   get_client('translate')              the shared client (built if needed)
+#   get_table('chat_sessions')           Table on the shared dynamodb resource
+#   translate = lazy_client('translate') module-level name for helpers: resolves
+#                                        on first attribute access, so existing
+#                                        `translate.translate_text(...)` call sites
+#                                        and client_for(..., translate, ...) keep working
+#
+# ENABLE_CONNECTION_POOLING's Config(max_pool_connections=25) is applied here,
+# once, merged under any per-client config (e.g. the tool-invoke read timeout).
+# built_clients() lists what was built and how long it took (import budget
+# script, cold-start benchmarks).
+
+import os
+import threading
+import time
+
+import boto3
+from botocore.config import Config
+
+ENABLE_CONNECTION_POOLING = os.environ.get('ENABLE_CONNECTION_POOLING', 'false').lower() == 'true'
+POOL_CONFIG = Config(max_pool_connections=25) if ENABLE_CONNECTION_POOLING else None
+
+_registry = {}
+_registry_lock = threading.RLock()   # get_table() builds the resource while holding it
+_built = []   # (key, build_ms) in construction order
+
+
+def _config(config):
+    if POOL_CONFIG is None:
+        return config
+    if config is None:
+        return POOL_CONFIG
+    return POOL_CONFIG.merge(config)
+
+
+def _get(key, build):
+    obj = _registry.get(key)
+    if obj is not None:
+        return obj
+    with _registry_lock:
+        obj = _registry.get(key)
+        if obj is None:
+            start = time.perf_counter()
+            obj = build()
+            _registry[key] = obj
+            _built.append((key, (time.perf_counter() - start) * 1000.0))
+        return obj
+
+
+def get_client(service, name=None, config=None, **kwargs):
+    """Shared boto3 client. name keys a variant with its own config (default: the service)."""
+    return _get(f"client:{name or service}", lambda: boto3.client(service, config=_config(config), **kwargs))
+
+
+def get_resource(service, **kwargs):
+    return _get(f"resource:{service}", lambda: boto3.resource(service, config=_config(None), **kwargs))
+
+
+def get_table(table_name):
+    """DynamoDB Table on the shared resource."""
+    return _get(f"table:{table_name}", lambda: get_resource('dynamodb').Table(table_name))
+
+
+class LazyClient:
+    """Stands in for a module-level client; builds the real one on first attribute access."""
+
+    __slots__ = ('_resolve',)
+
+    def __init__(self, resolve):
+        self._resolve = resolve
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __repr__(self):
+        return f"LazyClient({self._resolve!r})"
+
+
+def lazy_client(service, name=None, config=None, **kwargs):
+    return LazyClient(lambda: get_client(service, name=name, config=config, **kwargs))
+
+
+def lazy_resource(service, **kwargs):
+    return LazyClient(lambda: get_resource(service, **kwargs))
+
+
+def lazy_table(table_name):
+    return LazyClient(lambda: get_table(table_name))
+
+
+def built_clients():
+    """[(key, build_ms)] for every client/resource/table built so far, oldest first."""
+    return list(_built)
@@ -0,0 +1,172 @@
+# backend/lambdas/agent_orchestrator/utils/bedrock_limiter.py
+# Client-side adaptive rate limiter for Bedrock (AIMD token bucket, per model)
+# Owner: Manoj RS
+#
+# Before: every converse() call went straight out; on ThrottlingException the
+# caller slept (exponential backoff) and tried again — a wasted round trip plus
+# a blind sleep, repeated by every thread that hit the same quota.
+#
+# Now each model id has a token bucket whose refill rate is learned from
+# Bedrock's own answers (AIMD, as in TCP congestion control):
+#
+#   success    rate += BEDROCK_LIMITER_INCREASE_RPS          (additive increase)
+#   throttle   rate *= BEDROCK_LIMITER_DECREASE_FACTOR        (multiplicative decrease,
+#              at most once per BEDROCK_LIMITER_COOLDOWN_SEC so one burst of
+#              concurrent throttles counts as one congestion signal)
+#
+# rate is clamped to [BEDROCK_LIMITER_MIN_RPS, BEDROCK_LIMITER_MAX_RPS]. Callers
+# queue on acquire() for up to max_wait seconds instead of failing and
+# sleeping; if no token arrives in time the call goes out anyway (the limiter
+# never turns a slow answer into no answer). Queueing trades tail latency for
+# fewer dropped calls, so callers that know their stage budget cap the wait at
+# BEDROCK_LIMITER_MAX_WAIT_FRACTION of it (max_wait_for()).
+#
+# Limiters are per container: they pace the threads of one invocation (tool
+# loop, parallel localization, stream segments, hedges) and carry the learned
+# rate across warm invocations. Pro and Lite have separate Bedrock quotas, so
+# they get separate buckets.
+#
+# Same module in agent_orchestrator/utils and image_analysis/utils.
+
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger()
+
+BEDROCK_LIMITER_INITIAL_RPS = float(os.environ.get('BEDROCK_LIMITER_INITIAL_RPS', '5'))
+BEDROCK_LIMITER_MIN_RPS = float(os.environ.get('BEDROCK_LIMITER_MIN_RPS', '0.5'))
+BEDROCK_LIMITER_MAX_RPS = float(os.environ.get('BEDROCK_LIMITER_MAX_RPS', '50'))
+BEDROCK_LIMITER_BURST = float(os.environ.get('BEDROCK_LIMITER_BURST', '4'))
+BEDROCK_LIMITER_INCREASE_RPS = float(os.environ.get('BEDROCK_LIMITER_INCREASE_RPS', '0.2'))
+BEDROCK_LIMITER_DECREASE_FACTOR = float(os.environ.get('BEDROCK_LIMITER_DECREASE_FACTOR', '0.5'))
+BEDROCK_LIMITER_COOLDOWN_SEC = float(os.environ.get('BEDROCK_LIMITER_COOLDOWN_SEC', '1.0'))
+BEDROCK_LIMITER_MAX_WAIT_SEC = float(os.environ.get('BEDROCK_LIMITER_MAX_WAIT_SEC', '3.0'))
+BEDROCK_LIMITER_MAX_WAIT_FRACTION = float(os.environ.get('BEDROCK_LIMITER_MAX_WAIT_FRACTION', '0.1'))
+
+_THROTTLE_CODES = ('ThrottlingException', 'TooManyRequestsException')
+
+
+def is_throttle(exc):
+    """True for Bedrock throttling errors (ClientError or mid-stream event names)."""
+    response = getattr(exc, 'response', None)
+    code = response.get('Error', {}).get('Code', '') if isinstance(response, dict) else ''
+    code = code[:1].upper() + code[1:]
+    return code in _THROTTLE_CODES
+
+
+class AdaptiveLimiter:
+    """Token bucket whose refill rate follows AIMD on throttle feedback."""
+
+    def __init__(self, name, rate=BEDROCK_LIMITER_INITIAL_RPS):
+        self.name = name
+        self.rate = max(BEDROCK_LIMITER_MIN_RPS, min(BEDROCK_LIMITER_MAX_RPS, rate))
+        self.capacity = max(1.0, BEDROCK_LIMITER_BURST)
+        self._tokens = self.capacity
+        self._refilled_at = time.monotonic()
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+        self.admitted = 0
+        self.queued = 0
+        self.overflowed = 0
+        self.throttles = 0
+        self.wait_sec_total = 0.0
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def acquire(self, max_wait=BEDROCK_LIMITER_MAX_WAIT_SEC):
+        """Take one token, waiting up to max_wait seconds. Returns seconds waited."""
+        started = time.monotonic()
+        give_up_at = started + max(0.0, max_wait)
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    break
+                if now >= give_up_at:
+                    # Fail open: an over-quota call may still succeed, a dropped one never does.
+                    self.overflowed += 1
+                    break
+                self._cond.wait(min(give_up_at - now, (1.0 - self._tokens) / self.rate))
+            waited = time.monotonic() - started
+            self.admitted += 1
+            if waited > 0.001:
+                self.queued += 1
+                self.wait_sec_total += waited
+        return waited
+
+    def on_success(self):
+        with self._cond:
+            self.rate = min(BEDROCK_LIMITER_MAX_RPS, self.rate + BEDROCK_LIMITER_INCREASE_RPS)
+
+    def on_throttle(self):
+        with self._cond:
+            self.throttles += 1
+            now = time.monotonic()
+            if now - self._last_decrease < BEDROCK_LIMITER_COOLDOWN_SEC:
+                return
+            self._last_decrease = now
+            old = self.rate
+            self.rate = max(BEDROCK_LIMITER_MIN_RPS, self.rate * BEDROCK_LIMITER_DECREASE_FACTOR)
+            # Spend the burst: the next calls wait for the new, slower refill.
+            self._tokens = min(self._tokens, 0.0)
+            self._refilled_at = now
+        logger.warning(f"Bedrock limiter '{self.name}': throttled — rate {old:.2f} → {self.rate:.2f} rps")
+
+    def snapshot(self):
+        with self._cond:
+            return {
+                'rate_rps': round(self.rate, 2),
+                'admitted': self.admitted,
+                'queued': self.queued,
+                'overflowed': self.overflowed,
+                'throttles': self.throttles,
+                'wait_ms_total': int(self.wait_sec_total * 1000),
+            }
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def limiter_for(model_id):
+    """Shared limiter for a model id (created on first use, kept across warm invocations)."""
+    with _limiters_lock:
+        limiter = _limiters.get(model_id)
+        if limiter is None:
+            limiter = _limiters[model_id] = AdaptiveLimiter(model_id or 'default')
+        return limiter
+
+
+def max_wait_for(stage_budget_sec):
+    """Queueing allowance for a call with stage_budget_sec to run in."""
+    return min(BEDROCK_LIMITER_MAX_WAIT_SEC, BEDROCK_LIMITER_MAX_WAIT_FRACTION * max(0.0, stage_budget_sec))
+
+
+def limited_call(model_id, fn, *args, max_wait=BEDROCK_LIMITER_MAX_WAIT_SEC, **kwargs):
+    """Run fn(*args, **kwargs) behind the model's limiter and feed the outcome back.
+
+    Throttles lower the rate and re-raise (the caller's retry loop decides what
+    happens next); every other error is passed through without touching the rate.
+    """
+    limiter = limiter_for(model_id)
+    limiter.acquire(max_wait)
+    try:
+        result = fn(*args, **kwargs)
+    except Exception as exc:
+        if is_throttle(exc):
+            limiter.on_throttle()
+        raise
+    limiter.on_success()
+    return result
+
+
+def snapshot():
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {model_id: limiter.snapshot() for model_id, limiter in limiters.items()}
@@ -0,0 +1,140 @@
+# backend/lambdas/agent_orchestrator/utils/bulkheads.py
+# Persistent, bounded executors with one bulkhead per downstream dependency
+# Owner: Manoj RS
+#
+# Before: every multi-tool turn created and tore down its own
+# ThreadPoolExecutor, and timed-out tools were abandoned with
+# shutdown(wait=False) — in a warm container those stragglers piled up.
+#
+# Now: each dependency (weather HTTP, KB retrieve, Lambda invoke, Translate)
+# gets a module-level pool that survives warm invocations, with a fixed number
+# of workers AND a bounded queue. When a bulkhead is full, submit() raises
+# BulkheadFull immediately instead of queueing behind a slow dependency, so one
+# stuck dependency cannot starve the others.
+#
+# Sizing via env: BULKHEAD_<NAME>_WORKERS / BULKHEAD_<NAME>_QUEUE
+# (e.g. BULKHEAD_WEATHER_HTTP_WORKERS=4).
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger()
+
+# name → (default workers, default queue slots)
+_BULKHEAD_DEFAULTS = {
+    'weather_http': (4, 4),
+    'kb_retrieve': (4, 4),
+    'lambda_invoke': (6, 6),
+    'translate': (4, 8),
+}
+
+# tool name → dependency it ultimately waits on
+TOOL_BULKHEADS = {
+    'get_weather': 'weather_http',
+    'get_crop_advisory': 'kb_retrieve',
+    'get_pest_alert': 'kb_retrieve',
+    'search_schemes': 'lambda_invoke',
+    'get_farmer_profile': 'lambda_invoke',
+}
+
+
+class BulkheadFull(Exception):
+    """Raised when a bulkhead has no free worker and no free queue slot."""
+
+
+class Bulkhead:
+    """ThreadPoolExecutor with a hard cap on in-flight + queued work."""
+
+    def __init__(self, name, max_workers, max_queue):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._capacity = threading.BoundedSemaphore(max_workers + max_queue)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f'bh-{name}')
+        self._lock = threading.Lock()
+        self._in_flight = 0      # submitted and not yet finished (running + queued)
+        self._running = 0
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+
+    def submit(self, fn, *args, **kwargs):
+        if not self._capacity.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            logger.warning(f"Bulkhead '{self.name}' saturated — rejecting call")
+            raise BulkheadFull(self.name)
+
+        def _run():
+            with self._lock:
+                self._running += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        with self._lock:
+            self._in_flight += 1
+            self.submitted += 1
+        try:
+            future = self._pool.submit(_run)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(lambda _f: self._release(completed=True))
+        return future
+
+    def _release(self, completed=False):
+        with self._lock:
+            self._in_flight -= 1
+            if completed:
+                self.completed += 1
+        self._capacity.release()
+
+    def stats(self):
+        with self._lock:
+            queued = max(0, self._in_flight - self._running)
+            return {
+                'bulkhead': self.name,
+                'running': self._running,
+                'queue_depth': queued,
+                'saturation': round(self._in_flight / float(self.max_workers + self.max_queue), 3),
+                'submitted': self.submitted,
+                'rejected': self.rejected,
+                'completed': self.completed,
+            }
+
+
+_bulkheads = {}
+_registry_lock = threading.Lock()
+
+
+def get_bulkhead(name):
+    """Return the process-wide bulkhead for a dependency (created on first use)."""
+    bulkhead = _bulkheads.get(name)
+    if bulkhead is not None:
+        return bulkhead
+    with _registry_lock:
+        bulkhead = _bulkheads.get(name)
+        if bulkhead is None:
+            default_workers, default_queue = _BULKHEAD_DEFAULTS.get(name, (4, 4))
+            env_key = name.upper()
+            workers = max(1, int(os.environ.get(f'BULKHEAD_{env_key}_WORKERS', default_workers)))
+            queue = max(0, int(os.environ.get(f'BULKHEAD_{env_key}_QUEUE', default_queue)))
+            bulkhead = Bulkhead(name, workers, queue)
+            _bulkheads[name] = bulkhead
+        return bulkhead
+
+
+def bulkhead_for_tool(tool_name):
+    return get_bulkhead(TOOL_BULKHEADS.get(tool_name, 'lambda_invoke'))
+
+
+def bulkhead_stats():
+    """Snapshot of every bulkhead created so far in this container."""
+    with _registry_lock:
+        bulkheads = list(_bulkheads.values())
+    return [b.stats() for b in bulkheads]
@@ -3,12 +3,13 @@
 # Uses existing chat_sessions table with 'hist:{farmer_id}' partition key
 # so no new tables or IAM changes are needed.
 
-import boto3
 import os
 import json
 import logging
 import time
 
+from utils.aws_clients import get_table
+
 logger = logging.getLogger()
 
 SESSIONS_TABLE = os.environ.get('DYNAMODB_SESSIONS_TABLE', 'chat_sessions')
@@ -16,16 +17,9 @@ MAX_MESSAGES_PER_SESSION = 100  # 50 user + 50 assistant = 50 interactions
 MAX_SESSIONS_PER_FARMER = 20  # Auto-evict oldest when exceeded
 SESSION_TTL_DAYS = 30  # Auto-expire session blobs after 30 days
 
-_dynamodb = None
-_table = None
-
 
 def _get_table():
-    global _dynamodb, _table
-    if _table is None:
-        _dynamodb = boto3.resource('dynamodb')
-        _table = _dynamodb.Table(SESSIONS_TABLE)
-    return _table
+    return get_table(SESSIONS_TABLE)
 
 
 def list_sessions(farmer_id):
@@ -0,0 +1,108 @@
+# backend/lambdas/agent_orchestrator/utils/conversation_memory.py
+# Rolling conversation summary + last-N verbatim turns per chat session
+# Owner: Manoj RS
+#
+# Before: every converse() turn replayed up to 40 history messages (500 chars
+# each), so prompt size grew with session length.
+#
+# Now the model sees:
+#     [summary of everything older]  +  last MEMORY_RECENT_MESSAGES messages
+# The summary is one item in the existing chat_sessions table, under its own
+# partition key (same approach as chat_history.py's 'hist:{farmer_id}' items),
+# so the session's message partition and its counts are untouched:
+#     session_id = 'mem:{session_id}', timestamp = 'summary'
+#     summary, covered_until (timestamp of the last folded message), folded_count
+#
+# Refresh runs OFF the request path: after each answer the orchestrator
+# invokes itself asynchronously ({'memory_refresh': {...}}); refresh_memory()
+# folds messages that left the verbatim window into the summary with one
+# small Bedrock call. If a refresh is late or fails, messages newer than
+# covered_until are still replayed verbatim (bounded by MEMORY_LAG_MESSAGES),
+# so nothing is lost — the prompt is just slightly longer until it catches up.
+
+import logging
+import os
+
+from utils.dynamodb_helper import get_chat_history, get_session_memory, save_session_memory
+
+logger = logging.getLogger()
+
+MEMORY_RECENT_MESSAGES = int(os.environ.get('MEMORY_RECENT_MESSAGES', '6'))
+# Extra unsummarized messages replayed verbatim while a refresh is pending
+MEMORY_LAG_MESSAGES = int(os.environ.get('MEMORY_LAG_MESSAGES', '6'))
+# Max older messages folded into the summary per refresh
+MEMORY_FOLD_MAX_MESSAGES = int(os.environ.get('MEMORY_FOLD_MAX_MESSAGES', '20'))
+MEMORY_SUMMARY_MAX_CHARS = int(os.environ.get('MEMORY_SUMMARY_MAX_CHARS', '1500'))
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You maintain a running memory of a conversation between an Indian farmer and an "
+    "agricultural advisor. Merge the new messages into the existing summary. Keep: the "
+    "farmer's crops, location, land/soil details, problems raised, advice already given "
+    "(with key numbers such as doses, dates, prices) and open follow-ups. Drop greetings "
+    "and repetition. Write plain English bullet points, at most 12 bullets."
+)
+
+
+def _unsummarized(items, memory):
+    covered_until = (memory or {}).get('covered_until') or ''
+    return [i for i in items if str(i.get('timestamp', '')) > covered_until]
+
+
+def load_context(session_id):
+    """Summary + recent verbatim history items for the request path.
+
+    Returns (summary_text, recent_items, needs_refresh). recent_items are raw
+    chat items, oldest → newest (the current user message, saved early, is last).
+    """
+    memory = get_session_memory(session_id)
+    # +1: the current user message is already stored
+    items = get_chat_history(session_id, limit=MEMORY_RECENT_MESSAGES + MEMORY_LAG_MESSAGES + 1)
+    recent = _unsummarized(items, memory)
+    # Once this answer is saved, anything beyond the verbatim window should be folded.
+    needs_refresh = len(recent) + 1 > MEMORY_RECENT_MESSAGES
+    summary = (memory or {}).get('summary') or ''
+    return summary, recent, needs_refresh
+
+
+def _transcript(items):
+    lines = []
+    for item in items:
+        text = (item.get('message_en') or item.get('message') or '').strip()
+        if not text:
+            continue
+        if len(text) > 800:
+            text = text[:800] + '...'
+        speaker = 'Farmer' if item.get('role') == 'user' else 'Advisor'
+        lines.append(f"{speaker}: {text}")
+    return '\n'.join(lines)
+
+
+def summary_prompt(previous_summary, items):
+    """User prompt for the summarizer call."""
+    return (
+        f"Existing summary:\n{previous_summary or '(none yet)'}\n\n"
+        f"New messages:\n{_transcript(items)}\n\n"
+        "Return only the updated summary."
+    )
+
+
+def refresh_memory(session_id, summarize):
+    """Fold messages that left the verbatim window into the stored summary.
+
+    summarize(previous_summary, items) -> new summary text (one Bedrock call).
+    Returns a small status dict (logged by the caller).
+    """
+    memory = get_session_memory(session_id)
+    items = get_chat_history(session_id, limit=MEMORY_RECENT_MESSAGES + MEMORY_FOLD_MAX_MESSAGES)
+    older = items[:-MEMORY_RECENT_MESSAGES] if len(items) > MEMORY_RECENT_MESSAGES else []
+    to_fold = _unsummarized(older, memory)
+    if not to_fold:
+        return {'folded': 0}
+
+    previous = (memory or {}).get('summary') or ''
+    summary = (summarize(previous, to_fold) or '').strip()
+    if not summary:
+        return {'folded': 0, 'error': 'empty summary'}
+    folded_count = int((memory or {}).get('folded_count', 0)) + len(to_fold)
+    save_session_memory(session_id, summary[:MEMORY_SUMMARY_MAX_CHARS], str(to_fold[-1].get('timestamp', '')), folded_count)
+    return {'folded': len(to_fold), 'folded_total': folded_count, 'summary_chars': len(summary)}
@@ -0,0 +1,204 @@
+# backend/lambdas/agent_orchestrator/utils/deadline.py
+# Request-scoped deadline + latency budget for the orchestrator
+# Owner: Manoj RS
+#
+# API Gateway cuts the connection at 29s no matter what the Lambda is doing.
+# Before: every stage had its own fixed timeout (boto read_timeout=30,
+# TOOL_EXECUTION_TIMEOUT_SEC=25, TTS_TIME_BUDGET_SEC=18), none of which knew
+# how much of the 29s was already spent.
+#
+# Now: lambda_handler creates ONE Deadline per request. Every stage asks it
+#   - allows(stage)   → is there still enough budget to start this stage?
+#   - timeout(stage)  → socket/join timeout capped at the remaining budget
+# and the boto clients used under a deadline come from deadline_client(),
+# whose read_timeout never exceeds what is left. client_for() raises
+# DeadlineExceeded instead of handing out a client when the stage's minimum
+# (or the smallest timeout bucket) no longer fits — the caller's existing
+# error path (English reply, no audio, tool timeout result) takes over.
+#
+# Degradation order when budget runs short (cheapest to lose first):
+#   TTS (audio_pending) → model localization (Translate instead)
+#   → extra Bedrock turns (stop tool loop) → tools (timeout result)
+# DynamoDB writes and the response itself are never skipped — RESPONSE_RESERVE_SEC
+# is held back for them.
+#
+# Lambda runs one request per container at a time, so the current deadline is
+# a module global: helpers and worker threads (bulkheads, preflight) read it
+# via current_deadline() without threading it through every signature.
+
+import logging
+import os
+import threading
+import time
+
+import boto3
+from botocore.config import Config
+
+logger = logging.getLogger()
+
+API_GW_TIMEOUT_SEC = float(os.environ.get('API_GW_TIMEOUT_SEC', '29'))
+RESPONSE_RESERVE_SEC = float(os.environ.get('DEADLINE_RESPONSE_RESERVE_SEC', '1.5'))
+ENABLE_CONNECTION_POOLING = os.environ.get('ENABLE_CONNECTION_POOLING', 'false').lower() == 'true'
+
+# Minimum budget (seconds) a stage needs to be worth starting.
+STAGE_MIN_SEC = {
+    'bedrock_turn': 4.0,
+    'tool': 2.0,
+    'localize_model': 5.0,
+    'translate': 1.0,
+    'tts': 3.0,
+    'dynamodb': 0.5,
+}
+
+# Upper bound per stage — the old fixed timeouts, used when budget is plentiful.
+STAGE_MAX_SEC = {
+    'bedrock_turn': 30.0,
+    'tool': 25.0,
+    'localize_model': 15.0,
+    'translate': 10.0,
+    'tts': 10.0,
+    'dynamodb': 5.0,
+}
+
+# read_timeout buckets for cached deadline clients (floor → never exceeds budget).
+# Coarse on purpose: every bucket is its own client with its own connection
+# pool, so each extra bucket is another cold pool / TLS handshake. Spaced
+# ≤5s apart so the floor never costs a stage more than a few seconds of budget
+# (27.5s left → 25s, not 12s: a long non-streaming converse must still fit).
+_TIMEOUT_BUCKETS = (1, 3, 6, 10, 15, 20, 25, 30)
+
+
+class DeadlineExceeded(Exception):
+    """Not enough request budget left to start a call for this stage."""
+
+
+class Deadline:
+    """Absolute wall-clock deadline for one request, minus the response reserve."""
+
+    def __init__(self, context=None, budget_sec=None, reserve_sec=None):
+        self.started_at = time.time()
+        budget = API_GW_TIMEOUT_SEC if budget_sec is None else float(budget_sec)
+        if context is not None and hasattr(context, 'get_remaining_time_in_millis'):
+            try:
+                budget = min(budget, context.get_remaining_time_in_millis() / 1000.0)
+            except Exception:
+                pass
+        reserve = RESPONSE_RESERVE_SEC if reserve_sec is None else float(reserve_sec)
+        self.expires_at = self.started_at + max(0.0, budget - reserve)
+        self.skipped = []
+        self._lock = threading.Lock()
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.time())
+
+    def remaining_ms(self):
+        return int(self.remaining() * 1000)
+
+    def epoch_ms(self):
+        """Absolute deadline in epoch milliseconds (propagated to tool Lambdas)."""
+        return int(self.expires_at * 1000)
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def allows(self, stage):
+        return self.remaining() >= STAGE_MIN_SEC.get(stage, 0.0)
+
+    def timeout(self, stage, cap=None):
+        """Timeout for one call of `stage`: remaining budget capped at the stage max."""
+        upper = STAGE_MAX_SEC.get(stage, 30.0) if cap is None else cap
+        return max(0.1, min(upper, self.remaining()))
+
+    def skip(self, stage, reason=''):
+        """Record a stage that was skipped/degraded for lack of budget."""
+        with self._lock:
+            self.skipped.append(stage)
+        logger.warning(f"Deadline: degrading '{stage}' ({self.remaining_ms()}ms left) {reason}".rstrip())
+
+    def summary(self):
+        return {
+            'budget_ms': int((self.expires_at - self.started_at) * 1000),
+            'remaining_ms': self.remaining_ms(),
+            'skipped': list(self.skipped),
+        }
+
+
+_current = None
+
+
+def set_request_deadline(deadline):
+    """Install (or clear with None) the deadline for the request being served."""
+    global _current
+    _current = deadline
+
+
+def current_deadline():
+    return _current
+
+
+# ── Deadline-aware boto clients ──
+# Creating a client costs ~10-30ms, so clients are cached per
+# (service, read_timeout bucket) and reused across warm invocations. Pool size
+# follows ENABLE_CONNECTION_POOLING like the shared clients in aws_clients.py.
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def _bucket(timeout_sec):
+    """Largest bucket that fits in timeout_sec (None when even the smallest does not)."""
+    chosen = None
+    for b in _TIMEOUT_BUCKETS:
+        if b <= timeout_sec:
+            chosen = b
+    return chosen
+
+
+def _deadline_config(read_timeout):
+    return Config(
+        read_timeout=read_timeout,
+        connect_timeout=min(2, read_timeout),
+        retries={'total_max_attempts': 2, 'mode': 'standard'},
+        max_pool_connections=25 if ENABLE_CONNECTION_POOLING else 10,
+    )
+
+
+def _cached(kind, service, timeout_sec, **kwargs):
+    read_timeout = _bucket(timeout_sec)
+    if read_timeout is None:
+        raise DeadlineExceeded(f"{timeout_sec:.2f}s left is below the smallest {service} timeout")
+    key = (kind, service, read_timeout)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            factory = boto3.resource if kind == 'resource' else boto3.client
+            client = factory(service, config=_deadline_config(read_timeout), **kwargs)
+            _clients[key] = client
+        return client
+
+
+def deadline_client(service, timeout_sec, **kwargs):
+    """boto3 client whose read_timeout fits inside timeout_sec."""
+    return _cached('client', service, timeout_sec, **kwargs)
+
+
+def deadline_resource(service, timeout_sec, **kwargs):
+    """boto3 resource whose read_timeout fits inside timeout_sec."""
+    return _cached('resource', service, timeout_sec, **kwargs)
+
+
+def client_for(stage, default_client, service, **kwargs):
+    """default_client when no deadline is active; otherwise a client sized to the budget.
+    Raises DeadlineExceeded (the call is skipped, never given a longer timeout)
+    when the remaining budget is below the stage minimum or the smallest bucket."""
+    deadline = _current
+    if deadline is None:
+        return default_client
+    timeout_sec = deadline.timeout(stage)
+    if not deadline.allows(stage) or _bucket(timeout_sec) is None:
+        deadline.skip(stage, f'({service} call)')
+        raise DeadlineExceeded(f"{deadline.remaining():.2f}s left for '{stage}'")
+    return deadline_client(service, timeout_sec, **kwargs)
@@ -8,14 +8,13 @@ import os
 import logging
 import time as _time
 from datetime import datetime, UTC
-from botocore.config import Config
+
+from utils.aws_clients import lazy_table
+from utils.deadline import current_deadline, deadline_resource, RESPONSE_RESERVE_SEC
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-ENABLE_CONNECTION_POOLING = os.environ.get('ENABLE_CONNECTION_POOLING', 'false').lower() == 'true'
-_POOL_CONFIG = Config(max_pool_connections=25) if ENABLE_CONNECTION_POOLING else None
-dynamodb = boto3.resource('dynamodb', config=_POOL_CONFIG) if _POOL_CONFIG else boto3.resource('dynamodb')
 PROFILES_TABLE = os.environ.get('DYNAMODB_PROFILES_TABLE', 'farmer_profiles')
 SESSIONS_TABLE = os.environ.get('DYNAMODB_SESSIONS_TABLE', 'chat_sessions')
 
@@ -47,7 +46,7 @@ def _idempotency_token_exists(session_id, idempotency_token):
         if last_evaluated_key:
             query_kwargs['ExclusiveStartKey'] = last_evaluated_key
 
-        response = sessions_table.query(**query_kwargs)
+        response = _sessions_table().query(**query_kwargs)
         for item in response.get('Items', []):
             if item.get('idempotency_token') == str(idempotency_token):
                 return True
@@ -56,8 +55,27 @@ def _idempotency_token_exists(session_id, idempotency_token):
         if not last_evaluated_key:
             return False
 
-profiles_table = dynamodb.Table(PROFILES_TABLE)
-sessions_table = dynamodb.Table(SESSIONS_TABLE)
+# Built on first use on the shared dynamodb resource (utils/aws_clients.py)
+profiles_table = lazy_table(PROFILES_TABLE)
+sessions_table = lazy_table(SESSIONS_TABLE)
+
+
+def _table(default_table, table_name):
+    """Module table, or the same table on a resource whose read_timeout fits the request deadline.
+    DynamoDB is never skipped: once the budget is spent it runs on the response reserve."""
+    deadline = current_deadline()
+    if deadline is None:
+        return default_table
+    timeout_sec = max(deadline.timeout('dynamodb'), RESPONSE_RESERVE_SEC)
+    return deadline_resource('dynamodb', timeout_sec).Table(table_name)
+
+
+def _profiles_table():
+    return _table(profiles_table, PROFILES_TABLE)
+
+
+def _sessions_table():
+    return _table(sessions_table, SESSIONS_TABLE)
 
 
 def get_farmer_profile(farmer_id):
@@ -69,7 +87,7 @@ def get_farmer_profile(farmer_id):
             return cached.get('profile')
 
     try:
-        response = profiles_table.get_item(Key={'farmer_id': farmer_id})
+        response = _profiles_table().get_item(Key={'farmer_id': farmer_id})
         item = response.get('Item')
         if cache_enabled and farmer_id:
             _profile_cache[farmer_id] = {
@@ -90,7 +108,7 @@ def put_farmer_profile(farmer_id, profile_data):
             **profile_data,
             'updated_at': datetime.now(UTC).replace(tzinfo=None).isoformat()
         }
-        profiles_table.put_item(Item=item)
+        _profiles_table().put_item(Item=item)
         return True
     except Exception as e:
         logger.error(f"DynamoDB put profile error: {e}")
@@ -123,12 +141,12 @@ def save_chat_message(session_id, role, message, language='en', farmer_id=None,
                 logger.info(f"Duplicate chat message skipped for token={idempotency_token}")
                 return True
             item['idempotency_token'] = str(idempotency_token)
-            sessions_table.put_item(
+            _sessions_table().put_item(
                 Item=item,
                 ConditionExpression='attribute_not_exists(idempotency_token)'
             )
         else:
-            sessions_table.put_item(Item=item)
+            _sessions_table().put_item(Item=item)
         return True
     except Exception as e:
         if 'ConditionalCheckFailedException' in str(e):
@@ -173,7 +191,7 @@ def save_chat_messages_batch(messages):
         )
 
     try:
-        with sessions_table.batch_writer() as writer:
+        with _sessions_table().batch_writer() as writer:
             for msg in messages[:25]:
                 timestamp = msg.get('timestamp') or datetime.now(UTC).replace(tzinfo=None).isoformat()
                 ttl_epoch = int(_time.time()) + (CHAT_TTL_DAYS * 86400)
@@ -200,7 +218,7 @@ def get_session_message_count(session_id):
     """Return the number of messages stored for a session.
     Uses Select='COUNT' for efficiency — doesn't transfer item data."""
     try:
-        response = sessions_table.query(
+        response = _sessions_table().query(
             KeyConditionExpression=boto3.dynamodb.conditions.Key('session_id').eq(session_id),
             Select='COUNT',
         )
@@ -221,7 +239,7 @@ def get_chat_history(session_id, limit=40):
         pagination_enabled = os.environ.get('ENABLE_CHAT_PAGINATION', 'false').lower() == 'true'
 
         if not pagination_enabled:
-            response = sessions_table.query(
+            response = _sessions_table().query(
                 KeyConditionExpression=boto3.dynamodb.conditions.Key('session_id').eq(session_id),
                 ScanIndexForward=False,
                 Limit=limit
@@ -239,7 +257,7 @@ def get_chat_history(session_id, limit=40):
                 if last_evaluated_key:
                     query_kwargs['ExclusiveStartKey'] = last_evaluated_key
 
-                response = sessions_table.query(**query_kwargs)
+                response = _sessions_table().query(**query_kwargs)
                 items.extend(response.get('Items', []))
                 last_evaluated_key = response.get('LastEvaluatedKey')
 
@@ -254,3 +272,43 @@ def get_chat_history(session_id, limit=40):
     except Exception as e:
         logger.error(f"DynamoDB get chat history error: {e}")
         return []
+
+
+# ── Conversation memory (rolling summary, see utils/conversation_memory.py) ──
+# Stored in chat_sessions under its own partition so the session's message
+# partition (history queries, message counts) is untouched.
+
+MEMORY_PK_PREFIX = 'mem:'
+MEMORY_SORT_KEY = 'summary'
+
+
+def _memory_key(session_id):
+    return {'session_id': f"{MEMORY_PK_PREFIX}{session_id}", 'timestamp': MEMORY_SORT_KEY}
+
+
+def get_session_memory(session_id):
+    """Return the stored conversation summary item for a session, or None."""
+    if not session_id:
+        return None
+    try:
+        return _sessions_table().get_item(Key=_memory_key(session_id)).get('Item')
+    except Exception as e:
+        logger.warning(f"DynamoDB get session memory error: {e}")
+        return None
+
+
+def save_session_memory(session_id, summary, covered_until, folded_count):
+    """Upsert the conversation summary item. Returns True on success."""
+    try:
+        _sessions_table().put_item(Item={
+            **_memory_key(session_id),
+            'summary': summary,
+            'covered_until': covered_until,
+            'folded_count': int(folded_count),
+            'updated_at': datetime.now(UTC).replace(tzinfo=None).isoformat(),
+            'ttl': int(_time.time()) + (CHAT_TTL_DAYS * 86400),
+        })
+        return True
+    except Exception as e:
+        logger.error(f"DynamoDB save session memory error: {e}")
+        return False
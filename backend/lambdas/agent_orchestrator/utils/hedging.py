@@ -0,0 +1,209 @@
+# backend/lambdas/agent_orchestrator/utils/hedging.py
+# Hedged Bedrock requests: primary model, then fallback model after a p90-derived delay
+# Owner: Manoj RS
+#
+# _bedrock_converse_with_retry used to try the fallback model only after all
+# retries and their exponential sleeps (5-10s on a throttled day). With hedging:
+#
+#   t=0       primary converse() starts
+#   t=delay   still running? → the same request goes to the hedge model
+#             (MODEL_FALLBACK, or BEDROCK_HEDGE_MODEL for another inference profile)
+#   first successful response wins; the loser is cancelled
+#
+# If the primary fails fast with a retryable error (throttling) the hedge is
+# fired immediately instead of sleeping. delay = p90 of recent successful call
+# latencies for the primary model in this container (rolling window), clamped
+# to [HEDGE_MIN_DELAY_SEC, HEDGE_MAX_DELAY_SEC]; HEDGE_DEFAULT_DELAY_SEC until
+# HEDGE_MIN_SAMPLES observations exist.
+#
+# Cancelling: a converse_stream() loser stops reading its event stream as soon
+# as the race is decided (see Lane.cancelled). A plain converse() cannot be
+# interrupted — its result is discarded when it arrives, and it keeps its
+# worker until then. The pool is therefore sized for losers still in flight
+# (HEDGE_WORKERS), every race reserves both of its workers up front, and when
+# they are not free the call runs on the caller's thread without a hedge, so a
+# primary never queues behind someone else's loser. The delay is counted from
+# the moment the primary actually starts.
+# Streaming deltas: only the lane that produced the first delta feeds
+# on_text_delta, so the two streams never interleave. When that lane discards
+# its text (on_delta(None): failed, cut short, or ended in tool_use) it gives
+# up ownership and the other lane may stream. The speculative
+# sentence pipeline re-derives everything from the final text, so a winner
+# that differs from the streaming lane is still correct.
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+logger = logging.getLogger()
+
+HEDGE_DEFAULT_DELAY_SEC = float(os.environ.get('HEDGE_DEFAULT_DELAY_SEC', '4.0'))
+HEDGE_MIN_DELAY_SEC = float(os.environ.get('HEDGE_MIN_DELAY_SEC', '1.0'))
+HEDGE_MAX_DELAY_SEC = float(os.environ.get('HEDGE_MAX_DELAY_SEC', '12.0'))
+HEDGE_PERCENTILE = float(os.environ.get('HEDGE_PERCENTILE', '90'))
+HEDGE_MIN_SAMPLES = int(os.environ.get('HEDGE_MIN_SAMPLES', '5'))
+HEDGE_WINDOW = int(os.environ.get('HEDGE_WINDOW', '50'))
+HEDGE_WORKERS = max(2, int(os.environ.get('HEDGE_WORKERS', '16')))
+
+# Shared across warm invocations — one pool per container.
+_hedge_pool = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix='bedrock-hedge')
+_inflight = 0                 # workers reserved by races (running lanes + unfired hedges)
+_inflight_lock = threading.Lock()
+
+
+def _reserve(n):
+    global _inflight
+    with _inflight_lock:
+        if _inflight + n > HEDGE_WORKERS:
+            return False
+        _inflight += n
+        return True
+
+
+def _release(n=1):
+    global _inflight
+    with _inflight_lock:
+        _inflight = max(0, _inflight - n)
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies (seconds) per model id."""
+
+    def __init__(self, window=HEDGE_WINDOW):
+        self._window = window
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def observe(self, model_id, seconds):
+        with self._lock:
+            self._samples.setdefault(model_id, deque(maxlen=self._window)).append(seconds)
+
+    def percentile(self, model_id, pct=HEDGE_PERCENTILE):
+        with self._lock:
+            samples = sorted(self._samples.get(model_id, ()))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        idx = min(len(samples) - 1, max(0, int(round(pct / 100.0 * (len(samples) - 1)))))
+        return samples[idx]
+
+    def hedge_delay(self, model_id):
+        p = self.percentile(model_id)
+        if p is None:
+            return HEDGE_DEFAULT_DELAY_SEC
+        return min(HEDGE_MAX_DELAY_SEC, max(HEDGE_MIN_DELAY_SEC, p))
+
+
+latency_tracker = LatencyTracker()
+
+
+class _Race:
+    def __init__(self, on_text_delta):
+        self.on_text_delta = on_text_delta
+        self.streaming_lane = None
+        self.winner = None
+        self._lock = threading.Lock()
+
+    def decide(self, name):
+        with self._lock:
+            if self.winner is None:
+                self.winner = name
+            return self.winner == name
+
+
+class Lane:
+    """One side of the race, handed to the call function."""
+
+    def __init__(self, race, name):
+        self._race = race
+        self.name = name
+        self.cut_short = False
+        self.started = threading.Event()
+        self.started_at = None
+
+    def on_delta(self, text):
+        race = self._race
+        with race._lock:
+            if race.streaming_lane is None and text is not None:
+                race.streaming_lane = self.name
+            owner = race.streaming_lane == self.name
+            if owner and text is None:
+                race.streaming_lane = None
+        if owner and race.on_text_delta:
+            race.on_text_delta(text)
+
+    def cancelled(self):
+        """Polled by the streaming loop: True once the other lane has won."""
+        winner = self._race.winner
+        if winner is not None and winner != self.name:
+            self.cut_short = True
+        return self.cut_short
+
+
+def _timed(call, kwargs, lane):
+    lane.started_at = time.time()
+    lane.started.set()
+    try:
+        response = call(kwargs, lane)
+    finally:
+        _release()
+    # Losers that ran to completion are real latency samples (they carry the slow tail);
+    # streams cut off after losing are not.
+    if not lane.cut_short:
+        latency_tracker.observe(kwargs.get('modelId', ''), time.time() - lane.started_at)
+    return response
+
+
+def run_hedged(call, primary_kwargs, hedge_kwargs, on_text_delta=None, is_retryable=None):
+    """Race primary vs hedge. call(kwargs, lane) performs one converse call.
+
+    Returns (response, info) where info = {'winner', 'hedged', 'delay_ms'}.
+    Raises the primary's exception when no lane succeeds.
+    """
+    primary_model = primary_kwargs.get('modelId', '')
+    delay = latency_tracker.hedge_delay(primary_model)
+    race = _Race(on_text_delta)
+    info = {'winner': 'primary', 'hedged': False, 'delay_ms': int(delay * 1000)}
+
+    if not _reserve(2):
+        # Pool busy with earlier losers — run unhedged rather than queue behind them.
+        logger.warning(f"Hedge: no free workers ({HEDGE_WORKERS} in flight) — calling {primary_model} unhedged")
+        return call(primary_kwargs, Lane(race, 'primary')), info
+
+    primary_lane = Lane(race, 'primary')
+    primary = _hedge_pool.submit(_timed, call, primary_kwargs, primary_lane)
+    primary_lane.started.wait()
+    done, _ = wait([primary], timeout=max(0.0, delay - (time.time() - primary_lane.started_at)))
+    if done:
+        exc = primary.exception()
+        if exc is None or not (is_retryable and is_retryable(exc)):
+            _release()   # the hedge worker was never used
+        if exc is None:
+            race.decide('primary')
+            return primary.result(), info
+        if not (is_retryable and is_retryable(exc)):
+            raise exc
+        logger.warning(f"Hedge: primary {primary_model} failed fast ({exc.__class__.__name__}) — hedging now")
+
+    hedge_model = hedge_kwargs.get('modelId', '')
+    logger.info(f"Hedge: firing {hedge_model} after {int((delay if not done else 0) * 1000)}ms "
+                f"(primary {primary_model} {'failed' if done else 'still running'})")
+    info['hedged'] = True
+    hedge = _hedge_pool.submit(_timed, call, hedge_kwargs, Lane(race, 'hedge'))
+    lanes = {hedge: 'hedge'}
+    if not done:
+        lanes[primary] = 'primary'
+
+    pending = set(lanes)
+    while pending:
+        finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in finished:
+            if future.exception() is None and race.decide(lanes[future]):
+                info['winner'] = lanes[future]
+                logger.info(f"Hedge: {info['winner']} won")
+                return future.result(), info
+
+    # Both lanes failed — surface the primary's error (retry loop / fallback handle it).
+    raise primary.exception() or hedge.exception()
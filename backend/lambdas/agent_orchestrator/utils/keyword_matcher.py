@@ -0,0 +1,93 @@
+# backend/lambdas/agent_orchestrator/utils/keyword_matcher.py
+# Compiled multi-keyword matcher for on-topic and intent detection
+# Owner: Manoj RS
+#
+# _is_on_topic_query used to run ~400 Python-level `kw in text` checks per
+# call (rebuilding the off-topic phrase lists every time), and
+# _classify_intents compiled a fresh r'\bkw\b' regex for every keyword on
+# every request.
+#
+# KeywordMatcher compiles each category ONCE, at import, into a single regex
+# whose alternation is factored as a prefix trie:
+#
+#   ['rain', 'rainfall', 'rot', 'rust']  →  r(?:ain(?:fall)?|ot|ust)
+#
+# so the regex engine branches on the next character instead of retrying every
+# keyword at every position — the whole scan runs in C.
+#
+# Matching modes (same semantics as the loops they replace):
+#   word_boundary=False   plain substring, like `kw in text`
+#   word_boundary=True    Latin keywords need \b on both sides ('rain' does not
+#                         match 'drains'); Indic-script keywords are substring
+#                         matches (no \b between Devanagari/Tamil/Telugu letters)
+#
+# Callers lowercase the text; keywords are lowercased here.
+
+import re
+
+_INDIC_RE = re.compile(r'[\u0900-\u0D7F]')
+
+
+def _trie_pattern(words):
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+    return _node_pattern(trie)
+
+
+def _node_pattern(node):
+    branches = [re.escape(ch) + _node_pattern(child) for ch, child in sorted(node.items()) if ch]
+    optional = '' in node
+    if not branches:
+        return ''
+    if len(branches) == 1 and not optional:
+        return branches[0]
+    # Greedy: the longest keyword is tried first, shorter ones on backtrack.
+    return '(?:' + '|'.join(branches) + ')' + ('?' if optional else '')
+
+
+def compile_keywords(keywords, word_boundary=False):
+    """One compiled regex matching any of keywords (None for an empty list)."""
+    words = sorted({str(k).lower() for k in keywords if k})
+    if not words:
+        return None
+    if not word_boundary:
+        return re.compile(_trie_pattern(words))
+    latin = [w for w in words if not _INDIC_RE.search(w)]
+    indic = [w for w in words if _INDIC_RE.search(w)]
+    parts = []
+    if latin:
+        parts.append(r'\b(?:' + _trie_pattern(latin) + r')\b')
+    if indic:
+        parts.append(_trie_pattern(indic))
+    return re.compile('|'.join(parts))
+
+
+class KeywordMatcher:
+    """Named keyword categories, each compiled into one regex at construction."""
+
+    def __init__(self, categories, word_boundary=False):
+        self._patterns = {
+            name: compile_keywords(keywords, word_boundary=word_boundary)
+            for name, keywords in categories.items()
+        }
+
+    def find(self, category, text):
+        """First keyword of category found in text, or None."""
+        pattern = self._patterns[category]
+        if pattern is None or not text:
+            return None
+        match = pattern.search(text)
+        return match.group(0) if match else None
+
+    def matches(self, category, text):
+        return self.find(category, text) is not None
+
+    def categories(self, text):
+        """Every category with at least one keyword in text, in declaration order."""
+        if not text:
+            return []
+        return [name for name, pattern in self._patterns.items() if pattern is not None and pattern.search(text)]
@@ -0,0 +1,162 @@
+# backend/lambdas/agent_orchestrator/utils/metrics.py
+# Buffered CloudWatch metrics, flushed as Embedded Metric Format (EMF) log lines
+# Owner: Manoj RS
+#
+# _emit_tool_metric, the prefetch/bulkhead metrics and the gTTS dependency
+# metric used to call cloudwatch.put_metric_data inline: one network round trip
+# per tool call, on the user's latency. Here metrics are buffered in memory
+# during the request and written ONCE at the end, as EMF JSON on stdout.
+# CloudWatch Logs turns those lines into the same metrics (same namespace, name,
+# dimensions and unit), so dashboards and alarms keep working with zero
+# PutMetricData calls and no cloudwatch client.
+#
+#   put_metric('ToolExecutionDurationMs', 812.0, unit='Milliseconds',
+#              dimensions={'ToolName': 'get_weather'}, namespace='SmartRuralAI/Tools')
+#   count('SpeculativePrefetchHit', dimensions={'ToolName': 'get_weather'}, ...)
+#   flush_metrics(properties={'request_id': ...})   lambda_handler's finally block
+#
+# put_metric() keeps every value (a histogram: CloudWatch computes p50/p99 from
+# the value array); count() sums into one value per flush. high_resolution=True
+# stores the metric at 1-second resolution. Lambda serves one request per
+# container at a time, so the buffer is a module global (same model as
+# utils/tracing.py); worker threads (tools, bulkheads) add to it under a lock.
+#
+# EMF limits are applied at flush: at most 100 metrics per record and 100 values
+# per metric; larger groups are split across records.
+
+import json
+import logging
+import threading
+import time
+
+logger = logging.getLogger()
+
+DEFAULT_NAMESPACE = 'SmartRuralAI/Orchestrator'
+MAX_METRICS_PER_RECORD = 100
+MAX_VALUES_PER_METRIC = 100
+
+VALID_UNITS = {
+    'Seconds', 'Microseconds', 'Milliseconds', 'Bytes', 'Kilobytes', 'Megabytes', 'Gigabytes',
+    'Terabytes', 'Bits', 'Kilobits', 'Megabits', 'Gigabits', 'Terabits', 'Percent', 'Count',
+    'Bytes/Second', 'Kilobytes/Second', 'Megabytes/Second', 'Gigabytes/Second', 'Terabytes/Second',
+    'Bits/Second', 'Kilobits/Second', 'Megabits/Second', 'Gigabits/Second', 'Terabits/Second',
+    'Count/Second', 'None',
+}
+
+
+class MetricsBuffer:
+    """Metrics grouped by (namespace, dimensions); written as EMF records by flush()."""
+
+    def __init__(self, writer=print):
+        self._writer = writer
+        self._lock = threading.Lock()
+        # (namespace, ((dim, value), ...)) → {name: {'unit', 'resolution', 'values', 'counter'}}
+        self._groups = {}
+
+    def _metric(self, name, unit, dimensions, namespace, high_resolution, counter):
+        if unit not in VALID_UNITS:
+            unit = 'None'
+        key = (namespace or DEFAULT_NAMESPACE,
+               tuple(sorted((str(k), str(v)) for k, v in (dimensions or {}).items())))
+        metrics = self._groups.setdefault(key, {})
+        entry = metrics.get(name)
+        if entry is None:
+            entry = metrics[name] = {'unit': unit, 'resolution': 1 if high_resolution else 60,
+                                     'values': [], 'counter': counter}
+        return entry
+
+    def put(self, name, value, unit='None', dimensions=None, namespace=None, high_resolution=False):
+        with self._lock:
+            self._metric(name, unit, dimensions, namespace, high_resolution, False)['values'].append(float(value))
+
+    def count(self, name, value=1.0, unit='Count', dimensions=None, namespace=None, high_resolution=False):
+        with self._lock:
+            entry = self._metric(name, unit, dimensions, namespace, high_resolution, True)
+            if entry['values']:
+                entry['values'][0] += float(value)
+            else:
+                entry['values'].append(float(value))
+
+    def pending(self):
+        with self._lock:
+            return sum(len(metrics) for metrics in self._groups.values())
+
+    def records(self, properties=None):
+        """Drain the buffer into EMF records (dicts)."""
+        with self._lock:
+            groups, self._groups = self._groups, {}
+        timestamp = int(time.time() * 1000)
+        records = []
+        for (namespace, dims), metrics in groups.items():
+            # Histograms past 100 values continue in the next record(s).
+            chunks = []
+            for name, entry in metrics.items():
+                values = entry['values']
+                for i in range(0, max(len(values), 1), MAX_VALUES_PER_METRIC):
+                    chunks.append((i // MAX_VALUES_PER_METRIC, name, entry, values[i:i + MAX_VALUES_PER_METRIC]))
+            batches = {}
+            for part, name, entry, values in chunks:
+                batches.setdefault(part, []).append((name, entry, values))
+            for part in sorted(batches):
+                batch = batches[part]
+                for i in range(0, len(batch), MAX_METRICS_PER_RECORD):
+                    records.append(_emf_record(namespace, dims, batch[i:i + MAX_METRICS_PER_RECORD],
+                                               timestamp, properties))
+        return records
+
+    def flush(self, properties=None):
+        """Write every buffered metric as EMF lines. Returns the number of records written."""
+        records = self.records(properties)
+        for record in records:
+            try:
+                self._writer(json.dumps(record, separators=(',', ':')))
+            except Exception as write_err:
+                logger.warning(f"EMF metrics write failed: {write_err}")
+        return len(records)
+
+
+def _emf_record(namespace, dims, batch, timestamp, properties):
+    definitions = []
+    for name, entry, _values in batch:
+        definition = {'Name': name, 'Unit': entry['unit']}
+        if entry['resolution'] == 1:
+            definition['StorageResolution'] = 1
+        definitions.append(definition)
+    record = {
+        '_aws': {
+            'Timestamp': timestamp,
+            'CloudWatchMetrics': [{
+                'Namespace': namespace,
+                'Dimensions': [[k for k, _ in dims]],
+                'Metrics': definitions,
+            }],
+        },
+    }
+    record.update(properties or {})
+    record.update(dict(dims))
+    for name, _entry, values in batch:
+        record[name] = values[0] if len(values) == 1 else values
+    return record
+
+
+_buffer = MetricsBuffer()
+
+
+def put_metric(name, value, unit='None', dimensions=None, namespace=None, high_resolution=False):
+    """Buffer one observation (every value is kept; CloudWatch computes percentiles)."""
+    _buffer.put(name, value, unit=unit, dimensions=dimensions, namespace=namespace,
+                high_resolution=high_resolution)
+
+
+def count(name, value=1.0, dimensions=None, namespace=None, high_resolution=False):
+    """Buffer a counter; increments are summed until the next flush."""
+    _buffer.count(name, value, dimensions=dimensions, namespace=namespace, high_resolution=high_resolution)
+
+
+def pending_metrics():
+    return _buffer.pending()
+
+
+def flush_metrics(properties=None):
+    """Write the request's metrics (call once, at the end of the invocation)."""
+    return _buffer.flush(properties)
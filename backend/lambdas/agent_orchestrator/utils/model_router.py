@@ -0,0 +1,71 @@
+# backend/lambdas/agent_orchestrator/utils/model_router.py
+# Query-complexity router: FOUNDATION_MODEL (Pro) vs FOUNDATION_MODEL_LITE
+# Owner: Manoj RS
+#
+# Every turn used to go to the Pro model; Lite was only a throttling fallback.
+# route_model() scores the request on cheap signals that are already computed
+# by the time Bedrock is called, and picks the Lite tier when the score is low:
+#
+#   intents       0 → 0, 1 → +1, 2 → +2, 3+ → +3   (multi-topic synthesis)
+#   generic       -2 (definitional / educational, _is_generic_query)
+#   specific      +1 (personalized: "my crop", "my field", ...)
+#   history       +1 at >= 4 prior messages, +2 at >= 10 (follow-up resolution)
+#   tools         +1 when grounded tool data is required, +1 more for 2+ tools
+#   feature page  per-page weight (multi-section reports score higher)
+#   long message  +1 above 300 chars
+#
+#   score <= MODEL_ROUTER_LITE_MAX_SCORE → Lite, otherwise Pro.
+#
+# The decision (score + every signal) is logged as one JSON line so traffic
+# can be replayed offline and latency / tokens compared per tier.
+
+import os
+
+MODEL_ROUTER_LITE_MAX_SCORE = int(os.environ.get('MODEL_ROUTER_LITE_MAX_SCORE', '1'))
+
+# Feature-page session prefix → complexity weight
+FEATURE_PAGE_WEIGHTS = {
+    'crop-recommend-': 2,   # multi-crop comparison report
+    'soil-analysis-': 2,    # soil report + amendments + crop fit
+    'farm-calendar-': 2,    # month-by-month plan
+    'pest-advisory': 1,
+    'price-advisory': 0,
+    'schemes-': 0,
+}
+
+TIER_PRO = 'pro'
+TIER_LITE = 'lite'
+
+
+def feature_page_type(session_id, prefixes):
+    for prefix in prefixes:
+        if (session_id or '').startswith(prefix):
+            return prefix
+    return None
+
+
+def route_model(intents, is_generic, is_specific, history_len, grounded, tool_count,
+                feature_page=None, message_len=0, pro_model=None, lite_model=None):
+    """Score one request and pick a model tier. Returns a decision dict."""
+    n_intents = len(intents or [])
+    signals = {
+        'intents': min(n_intents, 3),
+        'generic': -2 if is_generic else 0,
+        'specific': 1 if is_specific and not is_generic else 0,
+        'history': 2 if history_len >= 10 else (1 if history_len >= 4 else 0),
+        'tools': (1 if grounded else 0) + (1 if tool_count >= 2 else 0),
+        'feature_page': FEATURE_PAGE_WEIGHTS.get(feature_page, 0) if feature_page else 0,
+        'long_message': 1 if message_len > 300 else 0,
+    }
+    score = sum(signals.values())
+    tier = TIER_LITE if score <= MODEL_ROUTER_LITE_MAX_SCORE and lite_model else TIER_PRO
+    return {
+        'tier': tier,
+        'model_id': lite_model if tier == TIER_LITE else pro_model,
+        'score': score,
+        'threshold': MODEL_ROUTER_LITE_MAX_SCORE,
+        'signals': signals,
+        'intents': sorted(intents or []),
+        'history_len': history_len,
+        'feature_page': feature_page,
+    }
@@ -3,7 +3,6 @@
 # Owner: Manoj RS
 # See: Detailed_Implementation_Guide.md Section 11
 
-import boto3
 import os
 import uuid
 import io
@@ -12,16 +11,26 @@ import time
 import random
 import logging
 import unicodedata
-from botocore.config import Config
+
+from utils.aws_clients import lazy_client
+from utils.deadline import client_for, current_deadline
+from utils.metrics import put_metric
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-ENABLE_CONNECTION_POOLING = os.environ.get('ENABLE_CONNECTION_POOLING', 'false').lower() == 'true'
-_POOL_CONFIG = Config(max_pool_connections=25) if ENABLE_CONNECTION_POOLING else None
-polly = boto3.client('polly', config=_POOL_CONFIG) if _POOL_CONFIG else boto3.client('polly')
-s3 = boto3.client('s3', config=_POOL_CONFIG) if _POOL_CONFIG else boto3.client('s3')
-cloudwatch = boto3.client('cloudwatch', config=_POOL_CONFIG) if _POOL_CONFIG else boto3.client('cloudwatch')
+# Built on first use (utils/aws_clients.py) — most requests never synthesize speech.
+polly = lazy_client('polly')
+s3 = lazy_client('s3')
+
+
+def _polly_client():
+    """Module client, or one whose read_timeout fits the request deadline (utils/deadline.py)."""
+    return client_for('tts', polly, 'polly')
+
+
+def _s3_client():
+    return client_for('tts', s3, 's3')
 
 S3_BUCKET = os.environ.get('S3_KNOWLEDGE_BUCKET', 'smart-rural-ai-knowledge-base')
 
@@ -77,25 +86,12 @@ _gtts_dependency_ok = None
 
 
 def _emit_gtts_dependency_metric(is_missing):
-    try:
-        cloudwatch.put_metric_data(
-            Namespace='SmartRuralAI/TTS',
-            MetricData=[
-                {
-                    'MetricName': 'GTTSDependencyMissing',
-                    'Dimensions': [
-                        {
-                            'Name': 'FunctionName',
-                            'Value': os.environ.get('AWS_LAMBDA_FUNCTION_NAME', 'unknown'),
-                        }
-                    ],
-                    'Value': 1.0 if is_missing else 0.0,
-                    'Unit': 'Count',
-                }
-            ],
-        )
-    except Exception as metric_err:
-        logger.warning(f"Unable to publish gTTS dependency metric: {metric_err}")
+    # Buffered (utils/metrics.py): written as EMF with the first request's metrics.
+    put_metric(
+        'GTTSDependencyMissing', 1.0 if is_missing else 0.0, unit='Count',
+        dimensions={'FunctionName': os.environ.get('AWS_LAMBDA_FUNCTION_NAME', 'unknown')},
+        namespace='SmartRuralAI/TTS',
+    )
 
 
 def _validate_gtts_dependency_once():
@@ -255,7 +251,7 @@ def _split_text_for_tts(text, chunk_max_chars):
 
 def _upload_audio_bytes(audio_bytes):
     audio_key = f"audio/{uuid.uuid4()}.mp3"
-    s3.put_object(
+    _s3_client().put_object(
         Bucket=S3_BUCKET,
         Key=audio_key,
         Body=audio_bytes,
@@ -271,23 +267,6 @@ def _upload_audio_bytes(audio_bytes):
     return {'url': presigned, 'key': audio_key}
 
 
-def refresh_audio_url(audio_key):
-    """Generate a fresh presigned URL for an existing audio file."""
-    if not audio_key or not audio_key.startswith('audio/'):
-        return None
-    try:
-        # Verify the file exists
-        s3.head_object(Bucket=S3_BUCKET, Key=audio_key)
-        expiry_seconds = 7200 if os.environ.get('ENABLE_EXTENDED_AUDIO_EXPIRY', 'false').lower() == 'true' else 3600
-        return s3.generate_presigned_url(
-            'get_object',
-            Params={'Bucket': S3_BUCKET, 'Key': audio_key},
-            ExpiresIn=expiry_seconds
-        )
-    except Exception:
-        return None
-
-
 def _polly_tts(safe_text, language_code, voice_id=None):
     selected_voice = voice_id or VOICE_MAP.get(language_code, 'Kajal')
     if os.environ.get('ENABLE_VOICE_VALIDATION', 'false').lower() == 'true' and voice_id and voice_id not in VOICE_MAP.values():
@@ -301,7 +280,7 @@ def _polly_tts(safe_text, language_code, voice_id=None):
     merged_audio = io.BytesIO()
     for idx, chunk in enumerate(chunks, 1):
         logger.info(f'Polly request: chunk={idx}/{total_chunks}, chars={len(chunk)}, lang={language_code}')
-        response = polly.synthesize_speech(
+        response = _polly_client().synthesize_speech(
             Text=chunk,
             OutputFormat='mp3',
             VoiceId=selected_voice,
@@ -435,6 +414,10 @@ def text_to_speech(text, language_code='en', voice_id=None, return_metadata=Fals
             result = _polly_tts(safe_text, language_code, voice_id=voice_id)
         elif language_code in GTTS_SUPPORTED_LANGS:
             if USE_GTTS:
+                deadline = current_deadline()
+                if deadline is not None:
+                    # Never let chunked gTTS run past the request deadline.
+                    gtts_time_budget_sec = min(gtts_time_budget_sec or deadline.remaining(), deadline.remaining())
                 try:
                     result = _gtts_tts(safe_text, language_code, time_budget_sec=gtts_time_budget_sec)
                 except Exception as gtts_err:
@@ -485,3 +468,70 @@ def text_to_speech(text, language_code='en', voice_id=None, return_metadata=Fals
                 'error': tts_error,
             }
         return None
+
+
+def speakable_text(text):
+    """Public form of the TTS text normalisation (markdown/emoji stripped, NFC).
+    Used as a stable key when audio for a text segment is synthesized ahead of time."""
+    return ' '.join(_prepare_text_for_tts(text or '').split())
+
+
+def synthesize_speech_segment(text, language_code='en', voice_id=None):
+    """
+    Synthesize one short text segment with Polly and return raw MP3 bytes.
+    No S3 upload happens here — segments are concatenated and uploaded once via
+    upload_speech_segments(). Returns None for languages Polly does not voice
+    natively (gTTS languages keep using the deferred async path).
+    """
+    language_code = normalize_language_code(language_code, default='en')
+    if language_code not in POLLY_NATIVE_LANGS:
+        return None
+    safe_text = _prepare_text_for_tts(text)
+    if not safe_text:
+        return b''
+    selected_voice = voice_id or VOICE_MAP.get(language_code, 'Kajal')
+    audio = io.BytesIO()
+    for chunk in _split_text_for_tts(safe_text, POLLY_CHUNK_MAX_CHARS):
+        response = _polly_client().synthesize_speech(
+            Text=chunk,
+            OutputFormat='mp3',
+            VoiceId=selected_voice,
+            Engine='neural',
+            LanguageCode=POLLY_LANG_MAP.get(language_code, 'en-IN')
+        )
+        audio.write(response['AudioStream'].read())
+    return audio.getvalue()
+
+
+def upload_speech_segments(audio_segments, total_chars=None):
+    """
+    Upload pre-synthesized MP3 segments as one audio file.
+    Returns the same metadata dict shape as text_to_speech(return_metadata=True).
+    """
+    merged_audio = b''.join(seg for seg in (audio_segments or []) if seg)
+    if not merged_audio:
+        return {
+            'audio_url': None,
+            'audio_key': None,
+            'truncated': False,
+            'error': 'TTS produced no audio segments',
+        }
+    try:
+        result = _upload_audio_bytes(merged_audio)
+    except Exception as upload_err:
+        logger.warning(f"Segment audio upload failed: {upload_err}")
+        return {
+            'audio_url': None,
+            'audio_key': None,
+            'truncated': False,
+            'error': f"TTS upload error: {upload_err}",
+        }
+    return {
+        'audio_url': result.get('url'),
+        'audio_key': result.get('key'),
+        'truncated': False,
+        'error': None,
+        'partial_audio': False,
+        'processed_chars': total_chars,
+        'total_chars': total_chars,
+    }
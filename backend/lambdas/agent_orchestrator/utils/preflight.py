@@ -0,0 +1,89 @@
+# backend/lambdas/agent_orchestrator/utils/preflight.py
+# Concurrent pre-flight stage for the orchestrator
+# Owner: Manoj RS
+#
+# The independent round trips that run before the first Bedrock call
+# (profile load, session message count, rate limit, language detection)
+# are fanned out on a shared, module-level pool and joined against ONE
+# deadline. Each stage declares a fail-open default that matches what the
+# underlying helper already returns on error, so a slow dependency degrades
+# exactly like a failed one instead of stalling the request.
+#
+# Stages submitted with required=True (the rate limit) are the exception: a
+# late result is waited for, never replaced by a default, because the call may
+# still consume quota and an "allowed" default would let the request through
+# unchecked. The helper's own client timeouts bound that wait.
+
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+logger = logging.getLogger()
+
+PREFLIGHT_WORKERS = max(1, int(os.environ.get('PREFLIGHT_WORKERS', '4')))
+PREFLIGHT_DEADLINE_SEC = float(os.environ.get('PREFLIGHT_DEADLINE_SEC', '6'))
+
+# Survives warm invocations — threads are created lazily on first submit.
+_preflight_pool = ThreadPoolExecutor(max_workers=PREFLIGHT_WORKERS, thread_name_prefix='preflight')
+
+
+class Preflight:
+    """Named futures sharing a single deadline.
+
+    Usage:
+        pf = Preflight()
+        pf.submit('profile', get_farmer_profile, farmer_id, default=None)
+        profile = pf.get('profile')
+    """
+
+    def __init__(self, deadline_sec=None):
+        self.started_at = time.time()
+        self.deadline = self.started_at + (deadline_sec if deadline_sec is not None else PREFLIGHT_DEADLINE_SEC)
+        self._futures = {}
+        self._defaults = {}
+        self._required = set()
+        self._durations_ms = {}
+        self.timed_out = []
+
+    def submit(self, name, fn, *args, default=None, required=False, **kwargs):
+        submitted_at = time.time()
+
+        def _run():
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._durations_ms[name] = int((time.time() - submitted_at) * 1000)
+
+        self._futures[name] = _preflight_pool.submit(_run)
+        self._defaults[name] = default
+        if required:
+            self._required.add(name)
+
+    def has(self, name):
+        return name in self._futures
+
+    def get(self, name):
+        """Join one stage against the shared deadline; fall back to its default.
+        Required stages are waited for past the deadline (errors still use the default)."""
+        future = self._futures.get(name)
+        if future is None:
+            return self._defaults.get(name)
+        remaining = None if name in self._required else max(0.0, self.deadline - time.time())
+        try:
+            return future.result(timeout=remaining)
+        except FutureTimeoutError:
+            logger.warning(f"Preflight stage '{name}' missed the deadline — using fail-open default")
+            self.timed_out.append(name)
+            future.cancel()
+            return self._defaults.get(name)
+        except Exception as stage_err:
+            logger.warning(f"Preflight stage '{name}' failed (non-fatal): {stage_err}")
+            return self._defaults.get(name)
+
+    def summary(self):
+        return {
+            'stages_ms': dict(self._durations_ms),
+            'wall_ms': int((time.time() - self.started_at) * 1000),
+            'timed_out': list(self.timed_out),
+        }
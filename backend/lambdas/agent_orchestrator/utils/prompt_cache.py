@@ -0,0 +1,138 @@
+# backend/lambdas/agent_orchestrator/utils/prompt_cache.py
+# Bedrock prompt caching (cachePoint blocks) + per-request token accounting
+# Owner: Manoj RS
+#
+# Every converse() turn resends the same ~2K-token preamble: DIRECT_SYSTEM_PROMPT
+# and the DIRECT_TOOLS spec. Bedrock caches a request prefix up to a
+# {"cachePoint": {"type": "default"}} block (prefix order: tools → system →
+# messages), so the request is laid out as:
+#
+#     toolConfig.tools = [...DIRECT_TOOLS, cachePoint]     (models that accept it)
+#     system           = [static prompt, cachePoint, farmer context]
+#
+# The farmer context changes per farmer, so it sits AFTER the cache point and
+# never invalidates the shared prefix. Cached prefixes live ~5 minutes and are
+# shared by every turn of the tool loop and every request in that window.
+#
+# Models that reject cache points (ValidationException) are remembered per
+# container and called without them from then on.
+#
+# Token usage of every converse() call in a request is summed here so the
+# response (pipeline.token_usage) shows cacheRead vs cacheWrite tokens.
+
+import os
+import threading
+
+CACHE_POINT = {'cachePoint': {'type': 'default'}}
+
+# Model id fragments that accept a cachePoint inside toolConfig.tools
+# (Nova caches system + messages only; Claude also caches tool definitions).
+TOOL_CACHE_MODEL_HINTS = tuple(
+    h.strip() for h in os.environ.get('PROMPT_CACHE_TOOL_MODELS', 'anthropic.').split(',') if h.strip()
+)
+
+_unsupported_models = set()
+
+
+def caching_supported(model_id):
+    return bool(model_id) and model_id not in _unsupported_models
+
+
+def mark_unsupported(model_id):
+    _unsupported_models.add(model_id)
+
+
+def system_blocks(static_prompt, dynamic_text=None, model_id=None, enabled=True):
+    """converse() system list: static prompt, cache point, then per-request text."""
+    blocks = [{'text': static_prompt}]
+    if enabled and caching_supported(model_id):
+        blocks.append(dict(CACHE_POINT))
+    if dynamic_text:
+        blocks.append({'text': dynamic_text})
+    return blocks
+
+
+def tool_config(tools, model_id=None, enabled=True):
+    """converse() toolConfig, with a trailing cache point for models that cache tools."""
+    if enabled and caching_supported(model_id) and any(h in model_id for h in TOOL_CACHE_MODEL_HINTS):
+        return {'tools': list(tools) + [dict(CACHE_POINT)]}
+    return {'tools': tools}
+
+
+def has_cache_points(kwargs):
+    blocks = list(kwargs.get('system') or []) + list((kwargs.get('toolConfig') or {}).get('tools') or [])
+    return any('cachePoint' in b for b in blocks)
+
+
+def strip_cache_points(kwargs):
+    """Copy of converse() kwargs with every cachePoint block removed."""
+    stripped = dict(kwargs)
+    if kwargs.get('system'):
+        stripped['system'] = [b for b in kwargs['system'] if 'cachePoint' not in b]
+    if kwargs.get('toolConfig'):
+        stripped['toolConfig'] = {
+            **kwargs['toolConfig'],
+            'tools': [t for t in kwargs['toolConfig'].get('tools', []) if 'cachePoint' not in t],
+        }
+    return stripped
+
+
+def is_cache_rejection(error_code, message):
+    """True when Bedrock rejected the request because of the cache points."""
+    lowered = (message or '').lower()
+    return error_code == 'ValidationException' and ('cachepoint' in lowered or 'caching' in lowered)
+
+
+# ── Per-request token usage ──
+
+_USAGE_KEYS = ('inputTokens', 'outputTokens', 'cacheReadInputTokens', 'cacheWriteInputTokens')
+
+
+class TokenUsage:
+    """Sum of converse() usage blocks for one request."""
+
+    def __init__(self):
+        self.calls = 0
+        self.totals = dict.fromkeys(_USAGE_KEYS, 0)
+        self._lock = threading.Lock()
+
+    def add(self, usage):
+        if not isinstance(usage, dict):
+            return
+        with self._lock:
+            self.calls += 1
+            for key in _USAGE_KEYS:
+                self.totals[key] += int(usage.get(key) or 0)
+
+    def summary(self):
+        with self._lock:
+            totals = dict(self.totals)
+            calls = self.calls
+        prompt_tokens = totals['inputTokens'] + totals['cacheReadInputTokens'] + totals['cacheWriteInputTokens']
+        return {
+            'calls': calls,
+            'input_tokens': totals['inputTokens'],
+            'output_tokens': totals['outputTokens'],
+            'cache_read_tokens': totals['cacheReadInputTokens'],
+            'cache_write_tokens': totals['cacheWriteInputTokens'],
+            'cache_read_ratio': round(totals['cacheReadInputTokens'] / prompt_tokens, 3) if prompt_tokens else 0.0,
+        }
+
+
+_current = None
+
+
+def set_request_usage(usage):
+    """Install (or clear with None) the usage accumulator for the request being served."""
+    global _current
+    _current = usage
+
+
+def current_usage():
+    return _current
+
+
+def record_usage(usage):
+    accumulator = _current
+    if accumulator is not None:
+        accumulator.add(usage)
@@ -4,7 +4,7 @@
 # Owner: Manoj RS
 # Gap addressed: #3 Rate Limiting
 
-import boto3
+from utils.aws_clients import get_table
 import os
 import logging
 import time
@@ -22,9 +22,6 @@ RATE_LIMIT_DAILY_MAX = int(os.environ.get('RATE_LIMIT_DAILY', '500'))
 RATE_LIMIT_TABLE = os.environ.get('DYNAMODB_RATE_LIMIT_TABLE', 'rate_limits')
 ENABLE_RATE_LIMIT_TTL = os.environ.get('ENABLE_RATE_LIMIT_TTL', 'false').lower() == 'true'
 
-# Lazy-init DynamoDB resource (avoid cold-start cost if rate limiting disabled)
-_dynamodb = None
-_rate_table = None
 RATE_LIMITING_ENABLED = os.environ.get('ENABLE_RATE_LIMITING', 'true').lower() == 'true'
 
 
@@ -42,11 +39,7 @@ def _rate_update_parts(ttl_epoch, now_iso):
 
 def _get_rate_table():
     """Lazy-initialize DynamoDB table for rate limiting."""
-    global _dynamodb, _rate_table
-    if _rate_table is None:
-        _dynamodb = boto3.resource('dynamodb')
-        _rate_table = _dynamodb.Table(RATE_LIMIT_TABLE)
-    return _rate_table
+    return get_table(RATE_LIMIT_TABLE)
 
 
 def check_rate_limit(session_id, farmer_id='anonymous'):
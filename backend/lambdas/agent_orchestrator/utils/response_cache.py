@@ -6,21 +6,59 @@
 # Cache key = hash(normalized_query + location + crop + season)
 # Stored in chat_sessions table with PK "cache:{hash}" to avoid new tables/IAM.
 # TTL-aware: weather=1h, crop=6h, schemes=12h, general=3h
+#
+# ENABLE_RESPONSE_CACHE_LRU (default OFF) puts an in-process tier in front of
+# DynamoDB, so a warm container answers keys it served recently without a
+# get_item:
+#   tier 1  OrderedDict LRU, bounded by entries and bytes; an entry expires
+#           with its DynamoDB item, or after RESPONSE_CACHE_LRU_MAX_TTL_SEC so
+#           updates from other containers are picked up
+#   tier 2  the chat_sessions item (unchanged)
+# cache_response() writes through to both. Recent misses are remembered for
+# RESPONSE_CACHE_NEGATIVE_TTL_SEC (negative caching) so a repeated miss skips
+# the network; single-flight followers poll with skip_negative=True since the
+# leader's answer arrives from another container. response_cache_stats()
+# reports tier-1/tier-2 hit ratios; ResponseCacheHit (CacheTier) and
+# ResponseCacheMiss counters go out through utils/metrics.py.
+#
+# ENABLE_LOCALIZED_CACHE (default OFF) makes a hit in the farmer's language a
+# pure read. The item only held reply_en, so every Tamil/Telugu hit still paid
+# for localization (Bedrock or Translate) and TTS. Per-language variants are
+# added to the same item the first time each language is served:
+#   loc_<lang>    {"reply", "localization_mode", "source"}   localized text
+#   audio_<lang>  {"audio_key", "truncated", "source"}       S3 key of its audio
+# (save_localized_variant, update_item SET, only while the item exists).
+# "source" is a hash of reply_en; a variant written against an older reply_en
+# is ignored. get_cached_response() returns them as cached['localized'][lang].
+# gTTS languages get their audio from the async generate_tts call, which only
+# sees the text, so that audio is also remembered by text (ttsaudio:{hash},
+# audio_for_text / remember_audio_for_text) and picked up by the next hit.
 
 import hashlib
 import json
 import logging
 import os
+import re
+import threading
 import time
+from collections import OrderedDict
 from datetime import datetime, UTC
 
-import boto3
+from utils.aws_clients import lazy_table
+from utils.metrics import count as count_metric
 
 logger = logging.getLogger()
 
-dynamodb = boto3.resource('dynamodb')
 SESSIONS_TABLE = os.environ.get('DYNAMODB_SESSIONS_TABLE', 'chat_sessions')
-_table = dynamodb.Table(SESSIONS_TABLE)
+_table = lazy_table(SESSIONS_TABLE)   # shared dynamodb resource (utils/aws_clients.py)
+
+ENABLE_RESPONSE_CACHE_LRU = os.environ.get('ENABLE_RESPONSE_CACHE_LRU', 'false').lower() == 'true'
+RESPONSE_CACHE_LRU_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_LRU_MAX_ENTRIES', '512'))
+RESPONSE_CACHE_LRU_MAX_BYTES = int(os.environ.get('RESPONSE_CACHE_LRU_MAX_BYTES', str(8 * 1024 * 1024)))
+RESPONSE_CACHE_LRU_MAX_TTL_SEC = float(os.environ.get('RESPONSE_CACHE_LRU_MAX_TTL_SEC', '900'))
+RESPONSE_CACHE_NEGATIVE_TTL_SEC = float(os.environ.get('RESPONSE_CACHE_NEGATIVE_TTL_SEC', '20'))
+ENABLE_LOCALIZED_CACHE = os.environ.get('ENABLE_LOCALIZED_CACHE', 'false').lower() == 'true'
+TTS_AUDIO_CACHE_TTL_SEC = int(os.environ.get('TTS_AUDIO_CACHE_TTL_SEC', '43200'))
 
 # TTL per query category (seconds)
 CACHE_TTL = {
@@ -33,6 +71,130 @@ CACHE_TTL = {
 }
 
 
+class _MemoryTier:
+    """Bounded LRU of serialized responses plus a map of recent misses."""
+
+    def __init__(self, max_entries, max_bytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # cache key → (expires_at, response json, category)
+        self._negative = {}             # cache key → expires_at
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, now):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, expires_at, data, category):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            self._drop(key)
+            self._negative.pop(key, None)
+            self._entries[key] = (expires_at, data, category)
+            self._bytes += len(data)
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                self._drop(next(iter(self._entries)))
+
+    def update(self, key, fn):
+        """Apply fn(dict) to a live entry's response (write-through of variant updates)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            response = json.loads(entry[1])
+            fn(response)
+            data = json.dumps(response, default=str)
+            self._bytes += len(data) - len(entry[1])
+            self._entries[key] = (entry[0], data, entry[2])
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[1])
+
+    def is_negative(self, key, now):
+        with self._lock:
+            expires_at = self._negative.get(key)
+            if expires_at is None:
+                return False
+            if expires_at <= now:
+                del self._negative[key]
+                return False
+            return True
+
+    def put_negative(self, key, expires_at):
+        with self._lock:
+            if len(self._negative) >= self.max_entries:
+                self._negative.clear()
+            self._negative[key] = expires_at
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._negative.clear()
+            self._bytes = 0
+
+    def size(self):
+        with self._lock:
+            return len(self._entries), self._bytes
+
+
+_memory = _MemoryTier(RESPONSE_CACHE_LRU_MAX_ENTRIES, RESPONSE_CACHE_LRU_MAX_BYTES)
+_stats = {'memory': 0, 'dynamodb': 0, 'negative': 0, 'miss': 0}
+_stats_lock = threading.Lock()
+
+
+def _record(outcome):
+    with _stats_lock:
+        _stats[outcome] += 1
+    if outcome in ('memory', 'dynamodb'):
+        count_metric('ResponseCacheHit', dimensions={'CacheTier': outcome})
+    else:
+        count_metric('ResponseCacheMiss', dimensions={'CacheTier': 'negative' if outcome == 'negative' else 'dynamodb'})
+
+
+def _hit(cached, cache_key, tier):
+    cached['_cache_hit'] = True
+    cached['_cache_key'] = cache_key
+    cached['_cache_tier'] = tier
+    return cached
+
+
+def response_cache_stats():
+    """Lookups in this container and the tier-1 (memory) / tier-2 (DynamoDB) hit ratios."""
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = sum(stats.values())
+    tier2_lookups = stats['dynamodb'] + stats['miss']
+    entries, size = _memory.size()
+    stats.update({
+        'lookups': lookups,
+        'tier1_hit_ratio': round(stats['memory'] / lookups, 3) if lookups else 0.0,
+        'tier2_hit_ratio': round(stats['dynamodb'] / tier2_lookups, 3) if tier2_lookups else 0.0,
+        'hit_ratio': round((stats['memory'] + stats['dynamodb']) / lookups, 3) if lookups else 0.0,
+        'memory_entries': entries,
+        'memory_bytes': size,
+    })
+    return stats
+
+
+def clear_memory_tier():
+    """Drop tier 1, the negative entries and the counters (benchmarks, tests)."""
+    _memory.clear()
+    with _stats_lock:
+        for outcome in _stats:
+            _stats[outcome] = 0
+
+
 def _normalize_query(text):
     """Lowercase, strip, collapse whitespace for consistent hashing."""
     if not text:
@@ -79,12 +241,34 @@ def _build_cache_key(query_text, location=None, crop=None, season=None):
     return f"cache:{h}"
 
 
-def get_cached_response(query_text, location=None, crop=None, season=None, intents=None):
+def cache_key_for(query_text, location=None, crop=None, season=None):
+    """Cache key for a query signature (also used to coalesce identical in-flight queries)."""
+    return _build_cache_key(query_text, location, crop, season)
+
+
+def _memory_expiry(expires_at, now):
+    return min(expires_at, now + RESPONSE_CACHE_LRU_MAX_TTL_SEC)
+
+
+def get_cached_response(query_text, location=None, crop=None, season=None, intents=None, skip_negative=False):
     """
     Look up a cached response for this query signature.
     Returns dict with {reply, reply_en, tools_used, sources, ...} or None on miss.
+    skip_negative=True always asks DynamoDB (single-flight followers polling for
+    another container's answer).
     """
     cache_key = _build_cache_key(query_text, location, crop, season)
+    now = time.time()
+    if ENABLE_RESPONSE_CACHE_LRU:
+        entry = _memory.get(cache_key, now)
+        if entry is not None:
+            _record('memory')
+            logger.info(f"Cache HIT: {cache_key} (category={entry[2]}, tier=memory)")
+            return _hit(json.loads(entry[1]), cache_key, 'memory')
+        if not skip_negative and _memory.is_negative(cache_key, now):
+            _record('negative')
+            logger.info(f"Cache MISS: {cache_key} (negative)")
+            return None
     try:
         resp = _table.get_item(Key={
             'session_id': cache_key,
@@ -93,26 +277,41 @@ def get_cached_response(query_text, location=None, crop=None, season=None, inten
         item = resp.get('Item')
         if not item:
             logger.info(f"Cache MISS: {cache_key}")
+            _remember_miss(cache_key, now)
             return None
 
         # Check TTL
         expires_at = float(item.get('expires_at', 0))
-        if time.time() > expires_at:
+        if now > expires_at:
             logger.info(f"Cache EXPIRED: {cache_key}")
+            _remember_miss(cache_key, now)
             return None
 
         # Deserialize
-        cached = json.loads(item.get('response_data', '{}'))
-        cached['_cache_hit'] = True
-        cached['_cache_key'] = cache_key
+        data = item.get('response_data', '{}')
+        cached = json.loads(data)
+        if ENABLE_LOCALIZED_CACHE:
+            localized = _variants_from_item(item, cached.get('reply_en', ''))
+            if localized:
+                cached['localized'] = localized
+                data = json.dumps(cached, default=str)
+        if ENABLE_RESPONSE_CACHE_LRU:
+            _memory.put(cache_key, _memory_expiry(expires_at, now), data, item.get('category', '?'))
+            _record('dynamodb')
         logger.info(f"Cache HIT: {cache_key} (category={item.get('category','?')})")
-        return cached
+        return _hit(cached, cache_key, 'dynamodb')
 
     except Exception as e:
         logger.warning(f"Cache lookup error: {e}")
         return None
 
 
+def _remember_miss(cache_key, now):
+    if ENABLE_RESPONSE_CACHE_LRU:
+        _memory.put_negative(cache_key, now + RESPONSE_CACHE_NEGATIVE_TTL_SEC)
+        _record('miss')
+
+
 def cache_response(query_text, location, crop, season, response_data, intents=None):
     """
     Store a response in the cache. Fire-and-forget — errors are logged but not raised.
@@ -123,12 +322,17 @@ def cache_response(query_text, location, crop, season, response_data, intents=No
     ttl = CACHE_TTL.get(category, CACHE_TTL['general'])
 
     try:
-        ttl_epoch = int(time.time() + ttl)
+        now = time.time()
+        ttl_epoch = int(now + ttl)
+        data = json.dumps(response_data, default=str)
+        if ENABLE_RESPONSE_CACHE_LRU:
+            # Write-through: this container's next lookup is served from memory.
+            _memory.put(cache_key, _memory_expiry(ttl_epoch, now), data, category)
         item = {
             'session_id': cache_key,
             'timestamp': 'cached',
             'category': category,
-            'response_data': json.dumps(response_data, default=str),
+            'response_data': data,
             'query_normalized': _normalize_query(query_text)[:200],
             'location': (location or '')[:100],
             'crop': (crop or '')[:50],
@@ -144,3 +348,120 @@ def cache_response(query_text, location, crop, season, response_data, intents=No
     except Exception as e:
         logger.warning(f"Cache store error: {e}")
         return False
+
+
+# ── Per-language variants (ENABLE_LOCALIZED_CACHE) ──
+
+def _lang_attr(language):
+    return re.sub(r'[^a-z0-9]', '_', (language or 'en').lower())
+
+
+def _source_hash(reply_en):
+    return hashlib.sha256((reply_en or '').encode('utf-8')).hexdigest()[:12]
+
+
+def _variants_from_item(item, reply_en):
+    """{lang: {reply, localization_mode, audio_key, polly_text_truncated}} for variants of this reply_en."""
+    source = _source_hash(reply_en)
+    localized = {}
+    for attr, value in item.items():
+        prefix, _, lang = attr.partition('_')
+        if prefix not in ('loc', 'audio') or not lang:
+            continue
+        try:
+            variant = json.loads(value)
+        except (TypeError, ValueError):
+            continue
+        if variant.get('source') != source:
+            continue
+        entry = localized.setdefault(lang, {})
+        if prefix == 'loc':
+            entry['reply'] = variant.get('reply')
+            entry['localization_mode'] = variant.get('localization_mode')
+        elif variant.get('audio_key'):
+            entry['audio_key'] = variant['audio_key']
+            entry['polly_text_truncated'] = bool(variant.get('truncated', False))
+    return localized
+
+
+def save_localized_variant(cache_key, language, reply_en, reply=None, localization_mode=None,
+                           audio_key=None, polly_text_truncated=False):
+    """Add the localized text and/or audio key for one language to a cached response.
+    Fire-and-forget: returns False (and logs) when the item is gone or the write fails."""
+    if not ENABLE_LOCALIZED_CACHE or not cache_key or (reply is None and not audio_key):
+        return False
+    lang = _lang_attr(language)
+    source = _source_hash(reply_en)
+    assignments, names, values = [], {}, {}
+    fields = {}
+    if reply is not None:
+        assignments.append('#loc = :loc')
+        names['#loc'] = f"loc_{lang}"
+        values[':loc'] = json.dumps({'reply': reply, 'localization_mode': localization_mode, 'source': source})
+        fields.update({'reply': reply, 'localization_mode': localization_mode})
+    if audio_key:
+        assignments.append('#audio = :audio')
+        names['#audio'] = f"audio_{lang}"
+        values[':audio'] = json.dumps({'audio_key': audio_key, 'truncated': bool(polly_text_truncated),
+                                       'source': source})
+        fields.update({'audio_key': audio_key, 'polly_text_truncated': bool(polly_text_truncated)})
+
+    if ENABLE_RESPONSE_CACHE_LRU:
+        def _apply(response):
+            if response.get('reply_en', '') == reply_en:
+                response.setdefault('localized', {}).setdefault(lang, {}).update(fields)
+        _memory.update(cache_key, _apply)
+    try:
+        _table.update_item(
+            Key={'session_id': cache_key, 'timestamp': 'cached'},
+            UpdateExpression='SET ' + ', '.join(assignments),
+            ConditionExpression='attribute_exists(session_id)',
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values,
+        )
+        logger.info(f"Cache VARIANT: {cache_key} lang={lang} text={reply is not None} audio={bool(audio_key)}")
+        return True
+    except Exception as e:
+        logger.warning(f"Cache variant store error ({lang}): {e}")
+        return False
+
+
+def _audio_text_key(text, language):
+    raw = f"{_lang_attr(language)}|{(text or '').strip()}"
+    return f"ttsaudio:{hashlib.sha256(raw.encode('utf-8')).hexdigest()[:24]}"
+
+
+def audio_for_text(text, language):
+    """{'audio_key', 'polly_text_truncated'} for audio already generated for this exact text, or None."""
+    if not ENABLE_LOCALIZED_CACHE or not text:
+        return None
+    try:
+        item = _table.get_item(Key={'session_id': _audio_text_key(text, language), 'timestamp': 'cached'}).get('Item')
+        if not item or time.time() > float(item.get('expires_at', 0)):
+            return None
+        return {'audio_key': item.get('audio_key'), 'polly_text_truncated': bool(item.get('truncated', False))}
+    except Exception as e:
+        logger.warning(f"Audio cache lookup error: {e}")
+        return None
+
+
+def remember_audio_for_text(text, language, audio_key, truncated=False):
+    """Record the S3 audio generated for this exact text (async generate_tts path)."""
+    if not ENABLE_LOCALIZED_CACHE or not text or not audio_key:
+        return False
+    expires_at = int(time.time() + TTS_AUDIO_CACHE_TTL_SEC)
+    try:
+        _table.put_item(Item={
+            'session_id': _audio_text_key(text, language),
+            'timestamp': 'cached',
+            'category': 'tts_audio',
+            'language': _lang_attr(language),
+            'audio_key': audio_key,
+            'truncated': bool(truncated),
+            'expires_at': str(expires_at),
+            'ttl': expires_at,  # DynamoDB TTL attribute
+        })
+        return True
+    except Exception as e:
+        logger.warning(f"Audio cache store error: {e}")
+        return False
@@ -0,0 +1,387 @@
+# backend/lambdas/agent_orchestrator/utils/response_pipeline.py
+# Answer post-processing: precompiled rules, one line traversal per pass
+# Owner: Manoj RS
+#
+# Every answer used to go through a chain of separate helpers in handler.py
+# (_post_process_response, _normalize_output_markdown, _strip_local_markdown_symbols,
+# ...), each re-splitting the text and calling re.sub/re.search with inline
+# patterns — plus a Python loop calling unicodedata.category() on every
+# character of the localized reply.
+#
+# Now:
+#   - every pattern is compiled once at import (unit/script rules per language)
+#   - normalize_markdown()       one traversal of the lines (the old version ran
+#                                5 whole-text regex passes, then split/rstrip)
+#   - clean_localized_text()     junk removal in one regex pass; control characters
+#                                via a per-character category cache + str.translate;
+#                                one traversal for heading/bullet/list cleanup AND
+#                                list renumbering; one final traversal for spacing
+#   - ResponsePipeline           the English answer chain as named stages
+#                                (handler guards plug in as stages)
+#
+# Output is identical to the old helpers — benchmarks/bench_response_pipeline.py
+# checks it against golden outputs and a frozen copy of the old code
+# (benchmarks/legacy_postprocess.py). The per-language unit rules still run on
+# the whole text because they may match across a line break.
+
+import logging
+import re
+import unicodedata
+
+logger = logging.getLogger()
+
+
+class ResponsePipeline:
+    """Named post-processing stages run in order: stage(text, ctx) -> text."""
+
+    def __init__(self, stages):
+        self.stages = list(stages)
+
+    def run(self, text, ctx=None):
+        """Returns (text, names of the stages that changed it)."""
+        changed = []
+        for name, stage in self.stages:
+            updated = stage(text, ctx)
+            if updated != text:
+                changed.append(name)
+            text = updated
+        return text, changed
+
+
+# ── English answer: translation artifacts + tool-limitation language ──
+
+_AGRI_TERM_FIXES = {
+    'cardiff': 'kharif', 'harif': 'kharif', 'khariff': 'kharif',
+    'rabby': 'rabi', 'rabbi': 'rabi',
+    'zaad': 'zaid', 'zaidh': 'zaid',
+}
+_AGRI_TERM_RE = re.compile(r'\b(?:' + '|'.join(_AGRI_TERM_FIXES) + r')\b', re.IGNORECASE)
+
+# Model telling the farmer about tool limitations ("I only have data for rice and wheat").
+# Matched against lowercased text.
+_LIMITATION_RE = re.compile('|'.join('(?:' + p + ')' for p in (
+    r'(?:only|just)\s+(?:have|has|got|received|cover[s]?|include[s]?)\s+(?:data|details?|info(?:rmation)?|advice|tips?|updates?)\s+(?:for|about|on|regarding)\s+(?:rice|wheat)',
+    r'(?:only|just)\s+(?:cover[s]?|include[s]?)\s+rice\s+and\s+wheat',
+    r'(?:tools?|system|database|data|advisory)\s+(?:I\s+(?:have|checked)|(?:only|just))\s+.*?rice\s+and\s+wheat',
+    r'the\s+(?:latest|recent|current)\s+(?:tool\s+)?(?:data|updates?|advisory|information)\s+.*?(?:only|just)\s+.*?rice\s+and\s+wheat',
+    r'(?:unfortunately|sadly),?\s+(?:the\s+)?(?:information|data|tools?|advisory)\s+.*?(?:doesn.?t|don.?t|did\s*n.?t)\s+(?:cover|include|have)\s+.*?(?:specific|detailed)',
+)))
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+_TOOL_ONLY_SENTENCE_RE = re.compile(r'tool[s]?\s+(?:I\s+)?(?:checked|have|received)\s+only')
+_NOT_COVERED_SENTENCE_RE = re.compile(r"(?:doesn.?t|don.?t|did\s*n.?t)\s+(?:cover|include|have)\s+(?:specific|detailed)\s+(?:data|info|details)")
+
+_SOURCES_LINE_RE = re.compile(r'\n\s*Sources:\s*(.+)$')
+_SPAN_TAG_RE = re.compile(r'</?span[^>]*>', re.IGNORECASE)
+
+
+def normalize_agri_terms(text):
+    """Fix common translation artifacts for season terms (cardiff → kharif, rabby → rabi...)."""
+    normalized = str(text or '')
+    if not normalized:
+        return normalized
+    return _AGRI_TERM_RE.sub(lambda m: _AGRI_TERM_FIXES[m.group(0).lower()], normalized)
+
+
+def clean_model_text(text):
+    """Agri-term fixes + drop sentences where the model talks about its tool limits."""
+    if not text:
+        return text
+    text = normalize_agri_terms(text)
+
+    text_lower = text.lower()
+    needs_fix = (
+        ('rice and wheat' in text_lower and ('only' in text_lower or 'just' in text_lower))
+        or _LIMITATION_RE.search(text_lower) is not None
+    )
+    if not needs_fix:
+        return text
+
+    logger.info("Post-processing: removing 'only rice/wheat' limitation language from response")
+    filtered = []
+    for sentence in _SENTENCE_SPLIT_RE.split(text):
+        s_lower = sentence.lower()
+        if 'rice and wheat' in s_lower and ('only' in s_lower or 'just' in s_lower or 'cover' in s_lower):
+            continue
+        if _TOOL_ONLY_SENTENCE_RE.search(s_lower) or _NOT_COVERED_SENTENCE_RE.search(s_lower):
+            continue
+        filtered.append(sentence)
+    # If everything was filtered, keep the original (shouldn't happen)
+    return ' '.join(filtered) if filtered else text
+
+
+def strip_sources_line(text):
+    """Remove a trailing 'Sources: ...' line. Returns (cleaned_text, sources_or_None)."""
+    if not text:
+        return text, None
+    match = _SOURCES_LINE_RE.search(text)
+    if match:
+        return text[:match.start()].rstrip(), match.group(1).strip()
+    return text, None
+
+
+def strip_span_tags(text):
+    return _SPAN_TAG_RE.sub('', text)
+
+
+# ── Markdown normalization (English answer) ──
+
+_HEADING_INDENT_RE = re.compile(r'^[\t ]{2,}(?=#)')
+# An indented hash-only line: the old whole-text rule's trailing \s* ran on into
+# the next line, so that line's indentation was kept — reproduced with a flag.
+_HASH_ONLY_LINE_RE = re.compile(r'^[\t ]{2,}#{1,6}\s*$')
+_HEADING_SPACE_RE = re.compile(r'^(#{1,6})([^\s#])')
+_UNICODE_BULLET_RE = re.compile(r'^[\t ]*•[\t ]+')
+
+
+def normalize_markdown(text):
+    """Normalize model markdown so frontend rendering stays deterministic.
+
+    Headings lose extra indentation and get a space after the hashes, '•'
+    bullets become '- ', runs of blank lines collapse to one, lines are
+    right-trimmed and the body is stripped.
+    """
+    if not text:
+        return text
+
+    out = []
+    blank_run = 0
+    keep_indent = False
+    for line in text.replace('\r\n', '\n').split('\n'):
+        if not line:
+            blank_run += 1
+            if blank_run == 1:
+                out.append('')
+            continue
+        blank_run = 0
+        if line.isspace():
+            out.append('')
+            continue
+        if keep_indent:
+            keep_indent = False
+        elif line[0] in '\t ':
+            keep_indent = _HASH_ONLY_LINE_RE.match(line) is not None
+            line = _HEADING_INDENT_RE.sub('', line, count=1)
+        if line[0] == '#':
+            line = _HEADING_SPACE_RE.sub(r'\1 \2', line, count=1)
+        elif '•' in line:
+            line = _UNICODE_BULLET_RE.sub('- ', line, count=1)
+        out.append(line.rstrip())
+    return '\n'.join(out).strip()
+
+
+# ── Localized reply cleanup ──
+
+INDIC_LANGUAGES = frozenset({'ta', 'te', 'kn', 'ml', 'mr', 'bn', 'gu', 'pa', 'or', 'as', 'ur', 'hi'})
+
+# span tags, U+FFFD and zero-width characters in one pass (ZWNJ/ZWJ are kept for Indic scripts)
+_JUNK_RE_INDIC = re.compile(r'</?span[^>]*>|[\uFFFD\u200B\uFEFF]', re.IGNORECASE)
+_JUNK_RE_LATIN = re.compile(r'</?span[^>]*>|[\uFFFD\u200B\u200C\u200D\uFEFF]', re.IGNORECASE)
+
+_DROPPED_CATEGORIES = frozenset({'Cc', 'Cs', 'Co', 'Cn'})
+_drop_cache = {}            # char → bool, bounded by the distinct characters seen
+_DROP_CACHE_MAX = 8192
+
+
+def _is_dropped_char(ch):
+    dropped = _drop_cache.get(ch)
+    if dropped is None:
+        dropped = ch not in '\n\t' and unicodedata.category(ch) in _DROPPED_CATEGORIES
+        if len(_drop_cache) < _DROP_CACHE_MAX:
+            _drop_cache[ch] = dropped
+    return dropped
+
+
+def _drop_control_chars(text):
+    """Remove control / surrogate / private-use / unassigned characters (keeps \\n and \\t)."""
+    dropped = [ch for ch in set(text) if _is_dropped_char(ch)]
+    if not dropped:
+        return text
+    return text.translate(dict.fromkeys(map(ord, dropped)))
+
+
+_HEADING_RE = re.compile(r'^[\t ]*#{1,6}[\t ]*(.+?)\s*$')
+# Same lines as _HEADING_RE, counted over the whole text in one call.
+_HEADING_LINE_COUNT_RE = re.compile(r'^[\t ]*#[^\n]', re.MULTILINE)
+_BULLET_RE = re.compile(r'^([\t ]*)[•\-\*][\t ]+')
+# List markers across locales (1), 1., 1।, 1॥, 1۔) → "1. "
+_LIST_MARKER_RE = re.compile(r'^([\t ]*)(\d{1,2})[\)\.\u0964\u0965\u06D4][\t ]+')
+_LEADING_HASHES_RE = re.compile(r'^([\t ]*)#{1,6}[\t ]*')
+_NUMBERED_LINE_RE = re.compile(r'^(?P<indent>[\t ]*)(?P<num>\d{1,2})\.\s+(?P<body>.+)$')
+_LEADING_WS_RE = re.compile(r'^[\t ]*')
+_MULTI_SPACE_RE = re.compile(r' {2,}')
+
+_CURRENCY_PAT = r'(?:₹|Rs\.?|INR|ரூ\.?|रु\.?|రూ\.?)'
+_KG_PAT = r'(?:kg|kilo(?:gram)?s?|கிலோ|किलो(?:ग्राम)?|కిలో(?:గ్రాము)?)'
+_PER_SEP_PAT = r'(?:/|\bper\b|\bप्रति\b|\bప్రతి\b|க்கு|\bko\b)'
+_PRICE_PER_KG_RE = re.compile(
+    rf'(?P<cur>{_CURRENCY_PAT})\s*(?P<num>\d{{1,3}}(?:,\d{{3}})*(?:\.\d+)?)\s*{_PER_SEP_PAT}\s*{_KG_PAT}',
+    re.IGNORECASE,
+)
+_CANONICAL_QUINTAL = {
+    'ta': 'குவிண்டால்',
+    'hi': 'क्विंटल',
+    'te': 'క్వింటాల్',
+}
+_UNIT_SPELLING_RULES = {
+    'ta': (
+        (re.compile(r'கு[யவ]ி?ண?்டா?ல்|கு[யவ]ி?ண?்டல்|காயிண்டல்|காயின்டல்|கிண்டல்'), 'குவிண்டால்'),
+        (re.compile(r'கிலோகிராம்|கிலோகிராம்கள்|கிலோ\s*கிராம்'), 'கிலோ'),
+    ),
+    'hi': (
+        (re.compile(r'क्विन्टल|क्विंटल'), 'क्विंटल'),
+        (re.compile(r'किलोग्राम|किलो\s*ग्राम'), 'किलो'),
+    ),
+    'te': (
+        (re.compile(r'క్వింటల్|క్వింటాళ్|క్వింటా'), 'క్వింటాల్'),
+        (re.compile(r'కిలోగ్రాము|కిలోగ్రాములు|కిలో\s*గ్రాము'), 'కిలో'),
+    ),
+}
+_SCRIPT_RANGES = {
+    'ta': '\u0B80-\u0BFF',
+    'hi': '\u0900-\u097F',
+    'te': '\u0C00-\u0C7F',
+    'kn': '\u0C80-\u0CFF',
+    'ml': '\u0D00-\u0D7F',
+    'mr': '\u0900-\u097F',
+    'bn': '\u0980-\u09FF',
+    'as': '\u0980-\u09FF',
+    'gu': '\u0A80-\u0AFF',
+    'pa': '\u0A00-\u0A7F',
+    'or': '\u0B00-\u0B7F',
+    'ur': '\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF',
+}
+# Stray single Latin letters glued to native script (translation artifacts)
+_STRAY_LATIN_RULES = {
+    lang: (
+        re.compile(fr'(?<![A-Za-z])[A-Za-z](?=[{rg}])'),
+        re.compile(fr'(?<=[{rg}])[A-Za-z](?![A-Za-z])'),
+    )
+    for lang, rg in _SCRIPT_RANGES.items()
+}
+
+
+def _format_number_for_text(num_value):
+    if abs(num_value - round(num_value)) < 1e-9:
+        return str(int(round(num_value)))
+    return f"{num_value:.2f}".rstrip('0').rstrip('.')
+
+
+def _to_quintal_rate(raw_number):
+    try:
+        base = float((raw_number or '').replace(',', ''))
+    except Exception:
+        return None
+    if base < 0:
+        return None
+    return _format_number_for_text(base * 100.0)
+
+
+def _normalize_units(text, lang, is_indic):
+    """Per-kg prices → per-quintal, unit spelling fixes, stray Latin letters in native script."""
+    canonical_quintal = _CANONICAL_QUINTAL.get(lang, 'quintal')
+
+    def _replace_price(match):
+        quintal_rate = _to_quintal_rate(match.group('num'))
+        if quintal_rate is None:
+            return match.group(0)
+        return f"{match.group('cur')} {quintal_rate}/{canonical_quintal}"
+
+    text = _PRICE_PER_KG_RE.sub(_replace_price, text)
+    for pattern, replacement in _UNIT_SPELLING_RULES.get(lang, ()):
+        text = pattern.sub(replacement, text)
+    if is_indic and lang in _STRAY_LATIN_RULES:
+        before, after = _STRAY_LATIN_RULES[lang]
+        text = after.sub('', before.sub('', text))
+    return text
+
+
+def _finish_lines(text, collapse_spaces):
+    """Final traversal: collapse inner spaces (Indic), blank-line runs, right-trim, strip."""
+    out = []
+    blank_run = 0
+    for line in text.split('\n'):
+        if collapse_spaces and '  ' in line:
+            indent = _LEADING_WS_RE.match(line).group(0)
+            line = indent + _MULTI_SPACE_RE.sub(' ', line[len(indent):])
+        if not line:
+            blank_run += 1
+            if blank_run == 1:
+                out.append('')
+            continue
+        blank_run = 0
+        out.append(line.rstrip())
+    return '\n'.join(out).strip()
+
+
+def clean_localized_text(text, lang='en', strip_symbols=True):
+    """Sanitize the localized reply for the frontend and (optionally) drop markdown symbols.
+
+    lang must already be a normalized language code.
+    """
+    if not text:
+        return text
+
+    is_indic = lang in INDIC_LANGUAGES
+    s = text.replace('\r\n', '\n').replace('\r', '\n')
+    s = (_JUNK_RE_INDIC if is_indic else _JUNK_RE_LATIN).sub('', s)
+    s = _drop_control_chars(s)
+    collapse_spaces = is_indic and lang in _SCRIPT_RANGES
+
+    if not strip_symbols:
+        return _finish_lines(_normalize_units(s, lang, is_indic), collapse_spaces)
+
+    number_headings = False
+    if not is_indic:
+        headings = 0
+        for _ in _HEADING_LINE_COUNT_RE.finditer(s):
+            headings += 1
+            if headings >= 3:
+                number_headings = True
+                break
+
+    heading_idx = 0
+    run_counters = {}   # indent → last number in the current numbered run
+    cleaned = []
+    for raw_line in s.split('\n'):
+        line = raw_line.rstrip()
+        if not line.strip():
+            run_counters.clear()
+            cleaned.append('')
+            continue
+
+        first = line.lstrip('\t ')[:1]
+        heading_match = _HEADING_RE.match(line) if first == '#' else None
+        if heading_match:
+            heading_text = heading_match.group(1).strip().replace('*', '').replace('#', '')
+            if number_headings:
+                heading_idx += 1
+                line = f"{heading_idx}. {heading_text}"
+            else:
+                line = heading_text
+        else:
+            if first in ('•', '-', '*'):
+                line = _BULLET_RE.sub(r'\1- ', line, count=1)
+            elif first.isdigit():
+                line = _LIST_MARKER_RE.sub(r'\1\2. ', line, count=1)
+            if '*' in line:
+                line = line.replace('*', '')
+            if '#' in line:
+                line = _LEADING_HASHES_RE.sub(r'\1', line, count=1)
+            line = line.rstrip()
+
+        # Renumber contiguous numbered runs to 1..N (repeated '1.' markers become stable points).
+        numbered = _NUMBERED_LINE_RE.match(line)
+        if numbered:
+            indent = numbered.group('indent')
+            next_num = run_counters.get(indent, 0) + 1
+            run_counters[indent] = next_num
+            line = f"{indent}{next_num}. {numbered.group('body')}"
+            # Child indentation should not leak stale counters if the parent advances.
+            for key in [k for k in run_counters if len(k) > len(indent) and k.startswith(indent)]:
+                del run_counters[key]
+        elif not line.strip():
+            run_counters.clear()
+        cleaned.append(line)
+
+    s = _normalize_units('\n'.join(cleaned), lang, is_indic)
+    return _finish_lines(s, collapse_spaces)
@@ -0,0 +1,192 @@
+# backend/lambdas/agent_orchestrator/utils/single_flight.py
+# Single-flight coalescing of identical in-flight queries (keyed on the response-cache key)
+# Owner: Manoj RS
+#
+# During weather events many farmers in one district ask the same question
+# within seconds. All of them miss get_cached_response() because the first
+# answer is not cached yet, and each one runs the full Bedrock + tools pipeline.
+#
+# With single-flight, the first request for a cache key becomes the LEADER and
+# runs the pipeline; identical requests that arrive meanwhile become FOLLOWERS
+# and wait briefly for the leader's answer instead of duplicating the work:
+#
+#   1. In-process: a threading.Event per key. Followers in the same container
+#      get the leader's result directly (only matters when one process serves
+#      concurrent requests — local server, load tests; a Lambda container
+#      serves one request at a time).
+#   2. Cross-container: a lease item in chat_sessions (conditional put,
+#      PK "flight:{hash}", short expiry). Followers poll the response cache
+#      until the leader stores the answer, the lease disappears (leader failed
+#      or finished without caching) or their wait budget runs out — then they
+#      simply run the pipeline themselves. Correctness never depends on the lease.
+#
+# The wait budget is SINGLE_FLIGHT_WAIT_SEC, cut so that at least
+# SINGLE_FLIGHT_PIPELINE_RESERVE_SEC of the request's remaining time is left
+# for running the pipeline after a fruitless wait.
+
+import logging
+import os
+import threading
+import time
+
+from utils.aws_clients import get_table
+from utils.deadline import current_deadline
+
+logger = logging.getLogger()
+
+SESSIONS_TABLE = os.environ.get('DYNAMODB_SESSIONS_TABLE', 'chat_sessions')
+SINGLE_FLIGHT_LEASE_SEC = float(os.environ.get('SINGLE_FLIGHT_LEASE_SEC', '25'))
+SINGLE_FLIGHT_WAIT_SEC = float(os.environ.get('SINGLE_FLIGHT_WAIT_SEC', '12'))
+SINGLE_FLIGHT_POLL_SEC = float(os.environ.get('SINGLE_FLIGHT_POLL_SEC', '0.3'))
+SINGLE_FLIGHT_PIPELINE_RESERVE_SEC = float(os.environ.get('SINGLE_FLIGHT_PIPELINE_RESERVE_SEC', '10'))
+
+LEADER = 'leader'
+FOLLOWER = 'follower'
+SOLO = 'solo'   # lease store unavailable — run without coordination
+
+_local = {}                 # cache key → _LocalFlight (in-process tier)
+_local_lock = threading.Lock()
+
+
+def _get_table():
+    return get_table(SESSIONS_TABLE)
+
+
+class _LocalFlight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+
+class Flight:
+    """One request's role for a cache key."""
+
+    def __init__(self, cache_key, role, owner, local=None):
+        self.cache_key = cache_key
+        self.role = role
+        self.owner = owner
+        self.local = local
+        self.released = False
+        self.waited_ms = 0
+
+    @property
+    def is_follower(self):
+        return self.role == FOLLOWER
+
+    def summary(self):
+        return {'role': self.role, 'waited_ms': self.waited_ms}
+
+
+def _lease_key(cache_key):
+    return {'session_id': f"flight:{cache_key.split(':', 1)[-1]}", 'timestamp': 'lease'}
+
+
+def _take_lease(cache_key, owner):
+    """Conditional put: True if we now hold the lease, False if someone else does."""
+    now = int(time.time())
+    try:
+        _get_table().put_item(
+            Item={
+                **_lease_key(cache_key),
+                'owner': owner,
+                'expires_at': now + int(SINGLE_FLIGHT_LEASE_SEC),
+                'ttl': now + int(SINGLE_FLIGHT_LEASE_SEC) + 3600,
+            },
+            ConditionExpression='attribute_not_exists(session_id) OR expires_at < :now',
+            ExpressionAttributeValues={':now': now},
+        )
+        return True
+    except Exception as e:
+        if 'ConditionalCheckFailed' in str(e):
+            return False
+        raise
+
+
+def _lease_alive(cache_key):
+    try:
+        item = _get_table().get_item(Key=_lease_key(cache_key)).get('Item')
+    except Exception:
+        return False
+    return bool(item) and int(item.get('expires_at', 0)) >= int(time.time())
+
+
+def acquire(cache_key, owner):
+    """Join the flight for cache_key. The returned Flight is LEADER, FOLLOWER or SOLO;
+    leaders/solo flights must be passed to complete() on every exit path."""
+    with _local_lock:
+        local = _local.get(cache_key)
+        if local is not None:
+            return Flight(cache_key, FOLLOWER, owner, local=local)
+        local = _LocalFlight()
+        _local[cache_key] = local
+
+    try:
+        role = LEADER if _take_lease(cache_key, owner) else FOLLOWER
+    except Exception as e:
+        logger.warning(f"Single-flight lease unavailable, running uncoordinated: {e}")
+        role = SOLO
+
+    if role == FOLLOWER:
+        # Another container leads; this container's own waiters should not pile on us.
+        _finish_local(cache_key, local, None)
+        return Flight(cache_key, FOLLOWER, owner)
+    return Flight(cache_key, role, owner, local=local)
+
+
+def wait_for_result(flight, fetch_cached, timeout_sec=None, remaining_sec=None):
+    """Follower: wait for the leader's answer. Returns a cached-response dict or None.
+    remaining_sec: time left for this request (API Gateway / Lambda); defaults to
+    the request deadline when one is installed."""
+    budget = SINGLE_FLIGHT_WAIT_SEC if timeout_sec is None else timeout_sec
+    if remaining_sec is None and current_deadline() is not None:
+        remaining_sec = current_deadline().remaining()
+    if remaining_sec is not None:
+        # Leave enough budget to run the pipeline ourselves if the leader fails.
+        budget = min(budget, max(0.0, remaining_sec - SINGLE_FLIGHT_PIPELINE_RESERVE_SEC))
+    started = time.time()
+    try:
+        if flight.local is not None:
+            flight.local.done.wait(budget)
+            return dict(flight.local.result) if flight.local.result else None
+
+        polls = 0
+        while time.time() - started < budget:
+            time.sleep(SINGLE_FLIGHT_POLL_SEC)
+            polls += 1
+            cached = fetch_cached()
+            if cached:
+                return cached
+            if polls % 3 == 0 and not _lease_alive(flight.cache_key):
+                return fetch_cached()
+        return None
+    finally:
+        flight.waited_ms = int((time.time() - started) * 1000)
+
+
+def _finish_local(cache_key, local, result):
+    with _local_lock:
+        if _local.get(cache_key) is local:
+            del _local[cache_key]
+    local.result = result
+    local.done.set()
+
+
+def complete(flight, result=None):
+    """Leader: publish the result to in-process followers and drop the lease (idempotent)."""
+    if flight is None or flight.released or flight.role == FOLLOWER:
+        return
+    flight.released = True
+    if flight.local is not None:
+        _finish_local(flight.cache_key, flight.local, result)
+    if flight.role == LEADER:
+        try:
+            _get_table().delete_item(
+                Key=_lease_key(flight.cache_key),
+                ConditionExpression='#o = :me',
+                ExpressionAttributeNames={'#o': 'owner'},
+                ExpressionAttributeValues={':me': flight.owner},
+            )
+        except Exception as e:
+            if 'ConditionalCheckFailed' not in str(e):
+                logger.warning(f"Single-flight lease release failed (expires on its own): {e}")
+
@@ -0,0 +1,266 @@
+# backend/lambdas/agent_orchestrator/utils/stream_pipeline.py
+# Sentence-level localization + TTS pipeline fed by Bedrock converse_stream() deltas
+# Owner: Manoj RS
+#
+# While the model is still generating, every finished sentence is handed to
+# Amazon Translate (non-English) and Polly (en/hi) on a small worker pool.
+# Once the final English answer exists (after code policy / post-processing),
+# it is re-split with the SAME splitter and each segment is looked up in the
+# speculative results. Segments that were changed by post-processing simply
+# miss and are translated/synthesized on demand, so the final output is always
+# derived from the final text — speculation only saves time, never changes it.
+#
+# With translate=False (hybrid model localization owns the final text) nothing
+# is translated speculatively: an English reply is still voiced sentence by
+# sentence, and a localized reply is voiced per segment once it exists.
+#
+# Nothing here reaches the client early: the REST API integration returns one
+# buffered body, so the saving is the post-processing overlapped with generation.
+
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+from utils.translate_helper import translate_response, normalize_language_code
+from utils.bulkheads import get_bulkhead, BulkheadFull
+from utils.deadline import current_deadline
+from utils.polly_helper import (
+    speakable_text, synthesize_speech_segment, upload_speech_segments, POLLY_NATIVE_LANGS,
+)
+
+logger = logging.getLogger()
+
+STREAM_SEGMENT_WORKERS = max(1, int(os.environ.get('STREAM_SEGMENT_WORKERS', '4')))
+STREAM_SEGMENT_JOIN_TIMEOUT_SEC = float(os.environ.get('STREAM_SEGMENT_JOIN_TIMEOUT_SEC', '8'))
+# Route Translate calls through the shared 'translate' bulkhead (see utils/bulkheads.py)
+ENABLE_TOOL_BULKHEADS = os.environ.get('ENABLE_TOOL_BULKHEADS', 'false').lower() == 'true'
+
+# Segment boundary: sentence terminator (not a list number like "1.") followed by
+# spaces, or one/more newlines. The capture group keeps separators so the text
+# can be re-assembled exactly.
+_SEGMENT_BOUNDARY_RE = re.compile(r'((?<=[^\d\s][.!?।॥])[ \t]+|\n+)')
+_HAS_WORD_RE = re.compile(r'\w')
+
+# Shared across warm invocations — one small pool per container.
+_segment_pool = ThreadPoolExecutor(max_workers=STREAM_SEGMENT_WORKERS, thread_name_prefix='stream-seg')
+
+
+def split_segments(text):
+    """Split text into [(segment, separator), ...]; ''.join(seg + sep) == text."""
+    parts = _SEGMENT_BOUNDARY_RE.split(text or '')
+    pairs = []
+    for i in range(0, len(parts), 2):
+        segment = parts[i]
+        separator = parts[i + 1] if i + 1 < len(parts) else ''
+        pairs.append((segment, separator))
+    return pairs
+
+
+def _join_timeout(stage):
+    deadline = current_deadline()
+    if deadline is None:
+        return STREAM_SEGMENT_JOIN_TIMEOUT_SEC
+    return deadline.timeout(stage, cap=STREAM_SEGMENT_JOIN_TIMEOUT_SEC)
+
+
+def _segment_key(segment):
+    return ' '.join((segment or '').split())
+
+
+class SentenceStreamPipeline:
+    """Collects streamed text deltas and speculatively localizes/voices finished sentences."""
+
+    def __init__(self, target_language='en', speak=True, translate=True):
+        self.target_language = normalize_language_code(target_language or 'en', default='en')
+        self.translate_enabled = bool(translate) and self.target_language != 'en'
+        self.speak_enabled = bool(speak) and self.target_language in POLLY_NATIVE_LANGS
+        # Streamed English is only worth dispatching if it can be translated here
+        # or is already the reply language.
+        self.speculate_enabled = self.translate_enabled or self.target_language == 'en'
+        self._buffer = ''
+        self._lock = threading.Lock()
+        self._translations = {}   # english segment key → Future[str]
+        self._audio = {}          # speakable localized text → Future[bytes]
+        self._started_at = time.time()
+        self.first_delta_ms = None
+        self.delta_count = 0
+        self.speculative_segments = 0
+        self.translation_hits = 0
+        self.audio_hits = 0
+        self.resets = 0
+        self._generation = 0
+        self._closed = False
+
+    # ── Producer side (called from the converse_stream loop) ──
+
+    def feed(self, delta):
+        """Accept one text delta; dispatch any sentences it completes.
+        feed(None) discards what the current attempt streamed (see reset())."""
+        if delta is None:
+            self.reset()
+            return
+        if not delta or self._closed:
+            return
+        if self.first_delta_ms is None:
+            self.first_delta_ms = int((time.time() - self._started_at) * 1000)
+        self.delta_count += 1
+        if not self.speculate_enabled:
+            return
+        self._buffer += delta
+        pairs = split_segments(self._buffer)
+        if len(pairs) < 2:
+            return
+        # Last pair is still open (no separator yet, or separator may grow).
+        self._buffer = pairs[-1][0] + pairs[-1][1]
+        for segment, _sep in pairs[:-1]:
+            self._dispatch(segment)
+
+    def _dispatch(self, segment):
+        key = _segment_key(segment)
+        if not key or not _HAS_WORD_RE.search(key):
+            return
+        with self._lock:
+            if key in self._translations:
+                return
+            try:
+                future = self._submit_translation(key)
+            except BulkheadFull:
+                return  # speculation is optional; localize() will translate on demand
+            self.speculative_segments += 1
+            generation = self._generation
+        if self.speak_enabled:
+            future.add_done_callback(lambda f: self._on_translated(f, generation))
+
+    def _submit_translation(self, key):
+        if not self.translate_enabled:
+            future = Future()
+            future.set_result(key)
+        elif ENABLE_TOOL_BULKHEADS:
+            future = get_bulkhead('translate').submit(translate_response, key, 'en', self.target_language)
+        else:
+            future = _segment_pool.submit(translate_response, key, 'en', self.target_language)
+        self._translations[key] = future
+        return future
+
+    def _on_translated(self, future, generation):
+        if self._closed or generation != self._generation or future.cancelled() or future.exception():
+            return
+        self._submit_audio(future.result())
+
+    def _submit_audio(self, localized_segment):
+        key = speakable_text(localized_segment)
+        if not key:
+            return None
+        with self._lock:
+            existing = self._audio.get(key)
+            if existing is not None:
+                return existing
+            future = _segment_pool.submit(synthesize_speech_segment, localized_segment, self.target_language)
+            self._audio[key] = future
+            return future
+
+    def reset(self):
+        """Drop the open sentence and cancel speculative work that has not started.
+
+        Called when the streamed text will not be the answer: a turn that ended
+        in tool_use, or an attempt that failed and is about to be retried.
+        Finished results are kept — the next attempt may repeat those sentences."""
+        with self._lock:
+            self._buffer = ''
+            self._generation += 1
+            self.resets += 1
+            for futures in (self._translations, self._audio):
+                for key, future in list(futures.items()):
+                    if not future.done():
+                        future.cancel()
+                        del futures[key]
+
+    # ── Consumer side (called by lambda_handler on the final text) ──
+
+    def localize(self, final_text_en):
+        """Localize the final English text, reusing speculative sentence translations."""
+        if not self.translate_enabled:
+            return final_text_en
+        pairs = split_segments(final_text_en)
+        futures = []
+        unscheduled = set()
+        with self._lock:
+            for segment, _sep in pairs:
+                key = _segment_key(segment)
+                if not key or not _HAS_WORD_RE.search(key):
+                    futures.append(None)
+                    continue
+                future = self._translations.get(key)
+                if future is not None:
+                    self.translation_hits += 1
+                else:
+                    try:
+                        future = self._submit_translation(key)
+                    except BulkheadFull:
+                        future = Future()  # never scheduled → translated inline below
+                        unscheduled.add(id(future))
+                futures.append(future)
+
+        pending = [f for f in futures if f is not None and id(f) not in unscheduled]
+        wait(pending, timeout=_join_timeout('translate'))
+        out = []
+        for (segment, sep), future in zip(pairs, futures):
+            localized = segment
+            if future is not None:
+                try:
+                    if future.done():
+                        localized = future.result()
+                    else:
+                        localized = translate_response(_segment_key(segment), 'en', self.target_language)
+                except Exception as seg_err:
+                    logger.warning(f"Stream segment translation failed; keeping English: {seg_err}")
+            out.append(localized + sep)
+        return ''.join(out)
+
+    def speech(self, final_localized_text):
+        """Return text_to_speech()-style metadata for the final localized text, reusing speculative audio."""
+        if not self.speak_enabled:
+            return None
+        futures = []
+        for segment, _sep in split_segments(final_localized_text):
+            key = speakable_text(segment)
+            if not key:
+                continue
+            with self._lock:
+                hit = key in self._audio
+            if hit:
+                self.audio_hits += 1
+            futures.append(self._submit_audio(segment))
+        futures = [f for f in futures if f is not None]
+        wait(futures, timeout=_join_timeout('tts'))
+        audio_segments = []
+        for future in futures:
+            if not future.done():
+                logger.warning("Stream segment audio not ready within join timeout")
+                return None
+            try:
+                audio_segments.append(future.result())
+            except Exception as seg_err:
+                logger.warning(f"Stream segment audio failed: {seg_err}")
+                return None
+        return upload_speech_segments(audio_segments, total_chars=len(final_localized_text or ''))
+
+    def close(self):
+        """Cancel any speculative work that was never consumed."""
+        self._closed = True
+        with self._lock:
+            for future in list(self._translations.values()) + list(self._audio.values()):
+                future.cancel()
+
+    def stats(self):
+        return {
+            'first_delta_ms': self.first_delta_ms,
+            'deltas': self.delta_count,
+            'speculative_segments': self.speculative_segments,
+            'translation_hits': self.translation_hits,
+            'audio_hits': self.audio_hits,
+            'resets': self.resets,
+        }
@@ -0,0 +1,183 @@
+# backend/lambdas/agent_orchestrator/utils/tool_backends.py
+# In-process tool execution backend for the orchestrator
+# Owner: Manoj RS
+#
+# Default path: _execute_tool() synchronously invokes a separate tool Lambda
+# (cold start + invoke overhead + payload JSON encode/decode on both sides).
+# In-process path: the tool handler modules (weather_lookup, crop_advisory,
+# govt_schemes, farmer_profile) are imported once per container and their
+# lambda_handler is called directly with the same API-Gateway-shaped event.
+#
+# Selection is per tool via IN_PROCESS_TOOLS (comma-separated tool names).
+# Any load or runtime failure raises ToolBackendUnavailable so the caller can
+# fall back to Lambda invoke.
+#
+# Contract (same for both backends):
+#   request  : (tool_name: str, event: dict)   — API Gateway proxy-shaped event
+#   response : dict                            — Lambda proxy response {statusCode, headers, body}
+#
+# Each tool Lambda ships its own `utils` package. Handlers are loaded with an
+# isolated `utils` namespace so their helpers never collide with the
+# orchestrator's utils modules.
+
+import importlib.util
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger()
+
+# tool name → tool Lambda package directory
+TOOL_PACKAGES = {
+    'get_weather': 'weather_lookup',
+    'get_crop_advisory': 'crop_advisory',
+    'get_pest_alert': 'crop_advisory',
+    'search_schemes': 'govt_schemes',
+    'get_farmer_profile': 'farmer_profile',
+}
+
+IN_PROCESS_TOOLS = {
+    t.strip() for t in os.environ.get('IN_PROCESS_TOOLS', '').split(',') if t.strip()
+}
+
+# Where tool packages live: explicit root, the ToolHandlersLayer (/opt), or
+# sibling directories when running from the source tree (local/bench).
+_DEFAULT_TOOL_ROOTS = (
+    os.environ.get('IN_PROCESS_TOOL_ROOT', ''),
+    '/opt',
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')),
+)
+
+_handlers: Dict[str, Any] = {}     # package → lambda_handler (None = load failed)
+_load_lock = threading.Lock()
+
+
+class ToolBackendUnavailable(Exception):
+    """In-process backend cannot serve this call — caller should use Lambda invoke."""
+
+
+class _InProcessContext:
+    """Minimal Lambda context passed to in-process tool handlers."""
+
+    def __init__(self, package, timeout_ms=30000):
+        self.function_name = f"inprocess-{package}"
+        self.aws_request_id = str(uuid.uuid4())
+        self._deadline = time.time() + timeout_ms / 1000.0
+
+    def get_remaining_time_in_millis(self):
+        return max(0, int((self._deadline - time.time()) * 1000))
+
+
+def in_process_enabled(tool_name: str) -> bool:
+    return tool_name in IN_PROCESS_TOOLS and tool_name in TOOL_PACKAGES
+
+
+def _find_package_dir(package: str) -> Optional[str]:
+    for root in _DEFAULT_TOOL_ROOTS:
+        if not root:
+            continue
+        candidate = os.path.join(root, package)
+        if os.path.isfile(os.path.join(candidate, 'handler.py')):
+            return candidate
+    return None
+
+
+def _is_utils_module(name: str) -> bool:
+    return name == 'utils' or name.startswith('utils.')
+
+
+def _load_handler(package: str):
+    """Import <package>/handler.py with its own `utils` package; cache per container."""
+    if package in _handlers:
+        return _handlers[package]
+    with _load_lock:
+        if package in _handlers:
+            return _handlers[package]
+
+        package_dir = _find_package_dir(package)
+        if not package_dir:
+            logger.warning(f"In-process tool package not found: {package}")
+            _handlers[package] = None
+            return None
+
+        started = time.time()
+        saved_utils = {k: m for k, m in sys.modules.items() if _is_utils_module(k)}
+        for name in saved_utils:
+            del sys.modules[name]
+        sys.path.insert(0, package_dir)
+        try:
+            spec = importlib.util.spec_from_file_location(
+                f"_inprocess_{package}_handler", os.path.join(package_dir, 'handler.py'),
+            )
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            _handlers[package] = module.lambda_handler
+            logger.info(f"In-process tool handler loaded: {package} ({(time.time() - started) * 1000:.0f}ms)")
+        except Exception as load_err:
+            logger.error(f"In-process tool handler load failed ({package}): {load_err}")
+            _handlers[package] = None
+        finally:
+            try:
+                sys.path.remove(package_dir)
+            except ValueError:
+                pass
+            # The tool's utils modules stay alive via the handler's globals;
+            # restore the orchestrator's own utils namespace.
+            for name in [k for k in sys.modules if _is_utils_module(k)]:
+                del sys.modules[name]
+            sys.modules.update(saved_utils)
+        return _handlers[package]
+
+
+def invoke_in_process(tool_name: str, event: Dict[str, Any]) -> Dict[str, Any]:
+    """Call the tool handler directly. Raises ToolBackendUnavailable on any failure."""
+    package = TOOL_PACKAGES.get(tool_name)
+    if not package:
+        raise ToolBackendUnavailable(f"No in-process package for tool {tool_name}")
+    handler = _load_handler(package)
+    if handler is None:
+        raise ToolBackendUnavailable(f"In-process handler unavailable for {package}")
+    timeout_ms = 30000
+    if event.get('deadline_epoch_ms'):
+        # Same budget the tool Lambda would see via the propagated deadline.
+        timeout_ms = max(0, int(event['deadline_epoch_ms']) - int(time.time() * 1000))
+    try:
+        response = handler(event, _InProcessContext(package, timeout_ms=timeout_ms))
+    except Exception as run_err:
+        raise ToolBackendUnavailable(f"In-process {package} raised: {run_err}") from run_err
+    if not isinstance(response, dict):
+        raise ToolBackendUnavailable(f"In-process {package} returned {type(response).__name__}")
+    return response
+
+
+def preload_in_process_tools():
+    """Import every enabled tool handler (cold-start / priming path)."""
+    loaded = {}
+    for tool_name in sorted(IN_PROCESS_TOOLS):
+        package = TOOL_PACKAGES.get(tool_name)
+        if package:
+            loaded[package] = _load_handler(package) is not None
+    return loaded
+
+
+def prime_in_process_tools(network=True):
+    """Send the priming event to every enabled tool handler; {package: prime_ms | error}."""
+    primed = {}
+    for tool_name in sorted(IN_PROCESS_TOOLS):
+        package = TOOL_PACKAGES.get(tool_name)
+        if not package or package in primed:
+            continue
+        handler = _load_handler(package)
+        if handler is None:
+            primed[package] = 'unavailable'
+            continue
+        try:
+            report = handler({'prime': True, 'network': network}, _InProcessContext(package))
+            primed[package] = report.get('prime_ms') if isinstance(report, dict) else None
+        except Exception as prime_err:
+            primed[package] = f"error: {prime_err}"
+    return primed
@@ -0,0 +1,217 @@
+# backend/lambdas/agent_orchestrator/utils/tool_cache.py
+# Tool-result cache: in-memory LRU + DynamoDB, keyed on the canonical tool input
+# Owner: Manoj RS
+#
+# get_weather(location=Coimbatore), search_schemes(state=Tamil Nadu) and
+# get_crop_advisory(crop=paddy, state=...) repeat across thousands of farmers,
+# but the final prompts differ, so utils/response_cache.py misses and every
+# request re-invokes the tool Lambda. This cache sits between
+# _apply_tool_input_policy() and _execute_tool():
+#
+#   1. memory    OrderedDict LRU in the container (TOOL_CACHE_MAX_ENTRIES)
+#   2. dynamodb  chat_sessions item, PK "toolcache:{tool}:{hash}" (same table
+#                and IAM as response_cache; DynamoDB TTL removes old items)
+#
+# A DynamoDB hit is copied into memory with the item's own expiry, so both
+# tiers expire together. Key = tool name + canonical input: keys sorted, string
+# values stripped, lowercased and whitespace-collapsed, empty values dropped,
+# and only the fields the tool actually reads (get_weather: location).
+#
+# TTL per tool (seconds): weather 30 min, schemes 12 h, KB advisory/pest 6 h.
+# Tools without a TTL (get_farmer_profile: per-farmer data) are never cached.
+# Only successful results are stored; errors, overload and timeouts are not.
+#
+# Hit/miss counters per tool go to utils/metrics.py (ToolCacheHit with a
+# CacheTier dimension, ToolCacheMiss), namespace SmartRuralAI/Tools.
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from utils.aws_clients import lazy_table
+from utils.metrics import count as count_metric
+
+logger = logging.getLogger()
+
+ENABLE_TOOL_RESULT_CACHE = os.environ.get('ENABLE_TOOL_RESULT_CACHE', 'false').lower() == 'true'
+TOOL_CACHE_MAX_ENTRIES = int(os.environ.get('TOOL_CACHE_MAX_ENTRIES', '256'))
+TOOL_CACHE_MAX_ITEM_BYTES = int(os.environ.get('TOOL_CACHE_MAX_ITEM_BYTES', str(300 * 1024)))
+
+SESSIONS_TABLE = os.environ.get('DYNAMODB_SESSIONS_TABLE', 'chat_sessions')
+_table = lazy_table(SESSIONS_TABLE)   # shared dynamodb resource (utils/aws_clients.py)
+
+METRIC_NAMESPACE = 'SmartRuralAI/Tools'
+
+# TTL per tool (seconds)
+TOOL_CACHE_TTL = {
+    'get_weather': 1800,          # 30 minutes — forecasts move
+    'search_schemes': 43200,      # 12 hours — schemes rarely change
+    'get_crop_advisory': 21600,   # 6 hours — KB advisory is stable
+    'get_pest_alert': 21600,      # 6 hours
+}
+
+# Fields each tool's event is built from (handler._tool_event); None = all.
+TOOL_KEY_FIELDS = {
+    'get_weather': ('location',),
+}
+
+_memory = OrderedDict()   # cache key → (expires_at, result json)
+_lock = threading.Lock()
+_stats = {}               # tool → {'memory': n, 'dynamodb': n, 'miss': n, 'stored': n}
+
+
+def _canonical_value(value):
+    if isinstance(value, str):
+        return ' '.join(value.lower().split())
+    if isinstance(value, dict):
+        return canonical_input(value)
+    if isinstance(value, (list, tuple)):
+        return [_canonical_value(v) for v in value]
+    return value
+
+
+def canonical_input(tool_input, fields=None):
+    """Sorted, normalized copy of a tool input (empty values dropped)."""
+    out = {}
+    for key in sorted(tool_input or {}):
+        if fields is not None and key not in fields:
+            continue
+        value = _canonical_value(tool_input[key])
+        if value in (None, '', [], {}):
+            continue
+        out[str(key)] = value
+    return out
+
+
+def tool_cache_key(tool_name, tool_input):
+    canonical = canonical_input(tool_input, TOOL_KEY_FIELDS.get(tool_name))
+    raw = json.dumps(canonical, sort_keys=True, separators=(',', ':'), default=str)
+    h = hashlib.sha256(f"{tool_name}|{raw}".encode('utf-8')).hexdigest()[:20]
+    return f"toolcache:{tool_name}:{h}"
+
+
+def is_cacheable(tool_name):
+    return ENABLE_TOOL_RESULT_CACHE and tool_name in TOOL_CACHE_TTL
+
+
+def _is_success(result):
+    if not isinstance(result, dict):
+        return False
+    return not result.get('error') and not result.get('overloaded') and result.get('status') != 'error'
+
+
+def _record(tool_name, outcome):
+    with _lock:
+        stats = _stats.setdefault(tool_name, {'memory': 0, 'dynamodb': 0, 'miss': 0, 'stored': 0})
+        stats[outcome] += 1
+    dims = {'ToolName': tool_name}
+    if outcome == 'miss':
+        count_metric('ToolCacheMiss', dimensions=dims, namespace=METRIC_NAMESPACE)
+    elif outcome in ('memory', 'dynamodb'):
+        count_metric('ToolCacheHit', dimensions={**dims, 'CacheTier': outcome}, namespace=METRIC_NAMESPACE)
+
+
+def _memory_get(key, now):
+    with _lock:
+        entry = _memory.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= now:
+            del _memory[key]
+            return None
+        _memory.move_to_end(key)
+        return entry[1]
+
+
+def _memory_put(key, expires_at, data):
+    with _lock:
+        _memory[key] = (expires_at, data)
+        _memory.move_to_end(key)
+        while len(_memory) > TOOL_CACHE_MAX_ENTRIES:
+            _memory.popitem(last=False)
+
+
+def get_cached_tool_result(tool_name, tool_input):
+    """(result, tier) on a hit, (None, None) on a miss. Never raises."""
+    key = tool_cache_key(tool_name, tool_input)
+    now = time.time()
+    data = _memory_get(key, now)
+    if data is not None:
+        _record(tool_name, 'memory')
+        return json.loads(data), 'memory'
+    try:
+        item = _table.get_item(Key={'session_id': key, 'timestamp': 'cached'}).get('Item')
+        if item and float(item.get('expires_at', 0)) > now:
+            data = item.get('result_data', 'null')
+            result = json.loads(data)
+            _memory_put(key, float(item['expires_at']), data)
+            _record(tool_name, 'dynamodb')
+            logger.info(f"Tool cache HIT (dynamodb): {key}")
+            return result, 'dynamodb'
+    except Exception as e:
+        logger.warning(f"Tool cache lookup error ({tool_name}): {e}")
+    _record(tool_name, 'miss')
+    return None, None
+
+
+def cache_tool_result(tool_name, tool_input, result):
+    """Store a successful result in both tiers. Errors are logged, not raised."""
+    if not _is_success(result):
+        return False
+    ttl = TOOL_CACHE_TTL[tool_name]
+    key = tool_cache_key(tool_name, tool_input)
+    data = json.dumps(result, default=str)
+    if len(data) > TOOL_CACHE_MAX_ITEM_BYTES:
+        logger.info(f"Tool cache SKIP: {key} ({len(data)} bytes)")
+        return False
+    expires_at = time.time() + ttl
+    _memory_put(key, expires_at, data)
+    try:
+        _table.put_item(Item={
+            'session_id': key,
+            'timestamp': 'cached',
+            'category': 'tool',
+            'tool_name': tool_name,
+            'result_data': data,
+            'expires_at': str(expires_at),
+            'ttl_seconds': ttl,
+            'ttl': int(expires_at),  # DynamoDB TTL attribute
+        })
+    except Exception as e:
+        logger.warning(f"Tool cache store error ({tool_name}): {e}")
+    _record(tool_name, 'stored')
+    return True
+
+
+def cached_tool_call(tool_name, tool_input, execute):
+    """execute(tool_name, tool_input) behind the cache when the tool is cacheable."""
+    if not is_cacheable(tool_name):
+        return execute(tool_name, tool_input)
+    result, _tier = get_cached_tool_result(tool_name, tool_input)
+    if result is not None:
+        return result
+    result = execute(tool_name, tool_input)
+    cache_tool_result(tool_name, tool_input, result)
+    return result
+
+
+def tool_cache_stats():
+    """Per-tool {'memory', 'dynamodb', 'miss', 'stored', 'hit_ratio'} for this container."""
+    with _lock:
+        out = {}
+        for tool, stats in _stats.items():
+            lookups = stats['memory'] + stats['dynamodb'] + stats['miss']
+            hits = stats['memory'] + stats['dynamodb']
+            out[tool] = {**stats, 'hit_ratio': round(hits / lookups, 3) if lookups else 0.0}
+        return out
+
+
+def clear_tool_cache():
+    """Drop the in-memory tier and counters (benchmarks, tests)."""
+    with _lock:
+        _memory.clear()
+        _stats.clear()
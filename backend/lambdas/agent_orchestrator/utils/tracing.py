@@ -0,0 +1,153 @@
+# backend/lambdas/agent_orchestrator/utils/tracing.py
+# Per-stage latency spans for the orchestrator
+# Owner: Manoj RS
+#
+# One SpanRecorder per request. Stages are timed with:
+#     with stage_span('translate_in'):
+#         ...
+# Spans recorded on worker threads (tools, bulkheads) land in the same
+# recorder — Lambda serves one request per container at a time, so the
+# current recorder is a module global (same model as utils/deadline.py).
+#
+# At the end of the request the spans are:
+#   - added to the request's metrics buffer (utils/metrics.py; namespace
+#     SmartRuralAI/Latency, dimension PipelineMode), which lambda_handler
+#     writes as EMF with the other metrics in its single end-of-request flush
+#   - returned in a Server-Timing response header (visible in browser DevTools)
+#   - optionally returned as data.timings in the response body (debug flag)
+
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+from utils.metrics import put_metric
+
+EMF_NAMESPACE = 'SmartRuralAI/Latency'
+
+_METRIC_NAME_RE = re.compile(r'[^A-Za-z0-9_\-]')
+
+
+class SpanRecorder:
+    """Thread-safe list of (name, start offset ms, duration ms) for one request."""
+
+    def __init__(self, request_id=None):
+        self.request_id = request_id
+        self.started_at = time.time()
+        self._spans = []
+        self._lock = threading.Lock()
+
+    def add(self, name, started_at, ended_at=None):
+        ended_at = ended_at if ended_at is not None else time.time()
+        entry = (
+            _METRIC_NAME_RE.sub('_', str(name)),
+            round((started_at - self.started_at) * 1000.0, 1),
+            round((ended_at - started_at) * 1000.0, 1),
+        )
+        with self._lock:
+            self._spans.append(entry)
+
+    @contextmanager
+    def span(self, name):
+        started_at = time.time()
+        try:
+            yield
+        finally:
+            self.add(name, started_at)
+
+    def spans(self):
+        with self._lock:
+            return list(self._spans)
+
+    def totals(self):
+        """Duration per stage name; repeated stages (e.g. the same tool twice) are summed."""
+        totals = {}
+        for name, _start, dur in self.spans():
+            totals[name] = round(totals.get(name, 0.0) + dur, 1)
+        return totals
+
+    def elapsed_ms(self):
+        return round((time.time() - self.started_at) * 1000.0, 1)
+
+    def server_timing(self):
+        """Server-Timing header value: one entry per span, in start order, plus total."""
+        parts = [f"{name};dur={dur}" for name, _start, dur in sorted(self.spans(), key=lambda s: s[1])]
+        parts.append(f"total;dur={self.elapsed_ms()}")
+        return ', '.join(parts)
+
+    def timings(self):
+        return {
+            'total_ms': self.elapsed_ms(),
+            'stages_ms': self.totals(),
+            'spans': [{'name': n, 'start_ms': s, 'dur_ms': d} for n, s, d in self.spans()],
+        }
+
+    def buffer_metrics(self, pipeline_mode='unknown'):
+        """Add one Milliseconds metric per stage (plus total) to the metrics buffer."""
+        totals = self.totals()
+        totals['total'] = self.elapsed_ms()
+        dimensions = {'PipelineMode': pipeline_mode or 'unknown'}
+        for name, duration_ms in totals.items():
+            put_metric(name, duration_ms, unit='Milliseconds', dimensions=dimensions, namespace=EMF_NAMESPACE)
+
+
+_current = None
+
+
+def set_current_recorder(recorder):
+    global _current
+    _current = recorder
+
+
+def current_recorder():
+    return _current
+
+
+def record_span(name, started_at):
+    """Record a stage that started at started_at (time.time()) and ends now."""
+    recorder = _current
+    if recorder is not None:
+        recorder.add(name, started_at)
+
+
+@contextmanager
+def stage_span(name):
+    """Time a stage against the current recorder (no-op when tracing is off)."""
+    recorder = _current
+    if recorder is None:
+        yield
+        return
+    with recorder.span(name):
+        yield
+
+
+def attach_timings(response, recorder, include_body=False):
+    """Buffer the stage metrics and add Server-Timing (and optionally data.timings) to a proxy response."""
+    if not isinstance(response, dict) or not recorder.spans():
+        return response
+
+    body = None
+    pipeline_mode = None
+    if isinstance(response.get('body'), str):
+        try:
+            body = json.loads(response['body'])
+            data = body.get('data') if isinstance(body, dict) else None
+            if isinstance(data, dict):
+                pipeline_mode = data.get('pipeline_mode')
+        except (TypeError, ValueError):
+            body = None
+
+    # Written by lambda_handler's flush_metrics(), in the same EMF output as every other metric.
+    recorder.buffer_metrics(pipeline_mode)
+
+    headers = response.setdefault('headers', {})
+    headers['Server-Timing'] = recorder.server_timing()
+    if headers.get('Access-Control-Allow-Origin'):
+        # Lets the frontend read the entries via the Resource Timing API (cross-origin).
+        headers['Timing-Allow-Origin'] = headers['Access-Control-Allow-Origin']
+
+    if include_body and isinstance(body, dict) and isinstance(body.get('data'), dict):
+        body['data']['timings'] = recorder.timings()
+        response['body'] = json.dumps(body)
+    return response
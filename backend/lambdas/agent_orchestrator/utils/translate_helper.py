@@ -3,18 +3,22 @@
 # Owner: Manoj RS
 # See: Detailed_Implementation_Guide.md Section 12
 
-import boto3
 import unicodedata
 import os
 import logging
-from botocore.config import Config
+from utils.aws_clients import lazy_client
+from utils.deadline import client_for
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-ENABLE_CONNECTION_POOLING = os.environ.get('ENABLE_CONNECTION_POOLING', 'false').lower() == 'true'
-_POOL_CONFIG = Config(max_pool_connections=25) if ENABLE_CONNECTION_POOLING else None
-translate = boto3.client('translate', config=_POOL_CONFIG) if _POOL_CONFIG else boto3.client('translate')
+translate = lazy_client('translate')   # built on first translate call (utils/aws_clients.py)
+
+
+def _translate_client():
+    """Module client, or one whose read_timeout fits the request deadline (utils/deadline.py)."""
+    return client_for('translate', translate, 'translate')
+
 
 # Supported languages (must match frontend config.js)
 SUPPORTED_LANGUAGES = ["en", "hi", "ta", "te", "kn", "ml", "mr", "bn", "gu", "pa", "or", "as", "ur"]
@@ -91,7 +95,7 @@ def detect_and_translate(text, target_language='en'):
     """
     normalized_target = normalize_language_code(target_language, default='en')
     try:
-        response = translate.translate_text(
+        response = _translate_client().translate_text(
             Text=text,
             SourceLanguageCode='auto',  # Auto-detect!
             TargetLanguageCode=normalized_target
@@ -360,7 +364,7 @@ def translate_response(text, source_language='en', target_language='ta'):
     def _do_translate_protected(source_text):
         """Translate with token-based markdown protection."""
         protected = _protect_markdown(source_text)
-        response = translate.translate_text(
+        response = _translate_client().translate_text(
             Text=protected,
             SourceLanguageCode=normalized_source,
             TargetLanguageCode=normalized_target,
@@ -373,7 +377,7 @@ def translate_response(text, source_language='en', target_language='ta'):
     def _do_translate_plain(source_text):
         """Plain text translation (fallback — no markdown protection)."""
         plain = _light_markdown_to_plain(source_text)
-        response = translate.translate_text(
+        response = _translate_client().translate_text(
             Text=plain,
             SourceLanguageCode=normalized_source,
             TargetLanguageCode=normalized_target,
@@ -13,13 +13,14 @@ from datetime import UTC, datetime
 from typing import Any, Dict, List, Tuple
 from botocore.config import Config
 from utils.response_helper import success_response, error_response
+from utils.aws_clients import lazy_client, get_client
+from utils.priming import is_priming_event, wants_network, run_priming, warm, register_init_hooks
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 ENABLE_CONNECTION_POOLING = os.environ.get('ENABLE_CONNECTION_POOLING', 'false').lower() == 'true'
-_POOL_CONFIG = Config(max_pool_connections=25) if ENABLE_CONNECTION_POOLING else None
-bedrock_kb = boto3.client('bedrock-agent-runtime', config=_POOL_CONFIG) if _POOL_CONFIG else boto3.client('bedrock-agent-runtime')
+bedrock_kb = lazy_client('bedrock-agent-runtime')   # built on first retrieve (utils/aws_clients.py)
 KB_ID = os.environ.get('BEDROCK_KB_ID', '')
 
 # Feature flag: KB retry on throttling (default: OFF) — Bug 1.6
@@ -86,8 +87,37 @@ def _check_injection(text):
     return False
 
 
-def _kb_retrieve_with_retry(bedrock_kb_client, **kwargs):
-    """Call Bedrock KB retrieve with optional throttling retry."""
+# read_timeout buckets for deadline-capped KB clients — same set as the
+# orchestrator's utils/deadline.py (floor → never exceeds the budget). Each
+# bucket is one registry client, so the set stays small.
+_KB_TIMEOUT_BUCKETS = (1, 3, 6, 10, 15, 20, 25, 30)
+
+
+def _budget_remaining(deadline_epoch_ms):
+    """Seconds left before the orchestrator's propagated deadline (None = no deadline)."""
+    if not deadline_epoch_ms:
+        return None
+    return int(deadline_epoch_ms) / 1000.0 - time.time()
+
+
+def _kb_client_for_deadline(bedrock_kb_client, deadline_epoch_ms):
+    """KB client whose read_timeout fits the remaining budget (one registry client per bucket)."""
+    remaining = _budget_remaining(deadline_epoch_ms)
+    if remaining is None:
+        return bedrock_kb_client
+    read_timeout = max([b for b in _KB_TIMEOUT_BUCKETS if b <= remaining] or [_KB_TIMEOUT_BUCKETS[0]])
+    return get_client('bedrock-agent-runtime', name=f'bedrock-agent-runtime@{read_timeout}s', config=Config(
+        read_timeout=read_timeout,
+        connect_timeout=min(2, read_timeout),
+        retries={'total_max_attempts': 1},
+    ))
+
+
+def _kb_retrieve_with_retry(bedrock_kb_client, deadline_epoch_ms=None, **kwargs):
+    """Call Bedrock KB retrieve with optional throttling retry.
+    deadline_epoch_ms: orchestrator deadline — caps the socket timeout and skips
+    retries whose backoff would not fit in the remaining budget."""
+    bedrock_kb_client = _kb_client_for_deadline(bedrock_kb_client, deadline_epoch_ms)
     retry_enabled = os.environ.get('ENABLE_KB_RETRY', 'false').lower() == 'true'
     if not retry_enabled:
         return bedrock_kb_client.retrieve(**kwargs)
@@ -106,7 +136,10 @@ def _kb_retrieve_with_retry(bedrock_kb_client, **kwargs):
             err_name = exc.__class__.__name__
             msg = str(exc)
             is_throttled = 'ThrottlingException' in err_name or 'ThrottlingException' in msg
-            if is_throttled and attempt < max_attempts - 1:
+            remaining = _budget_remaining(deadline_epoch_ms)
+            if is_throttled and attempt < max_attempts - 1 and (
+                remaining is None or remaining > base_delay * (2 ** attempt) + 1.0
+            ):
                 delay = base_delay * (2 ** attempt)
                 logger.warning(
                     f"KB throttled (attempt {attempt + 1}/{max_attempts}), retrying in {delay:.1f}s"
@@ -237,12 +270,30 @@ def _is_scheme_intent_query(text: str) -> bool:
     )
 
 
+_PRIME_QUERY = 'wheat yellow rust symptoms treatment this season 2025-26'
+
+
+def prime(network=True):
+    """Warm-up for the priming event / init hooks (utils/priming.py)."""
+    return run_priming('crop_advisory', [
+        ('client:bedrock-agent-runtime', lambda: bool(get_client('bedrock-agent-runtime')), False),
+        ('regex:injection', lambda: _check_injection(_PRIME_QUERY), False),
+        ('regex:freshness', lambda: (_is_time_sensitive_query(_PRIME_QUERY, 'pest'), _extract_year_tokens(_PRIME_QUERY)), False),
+        ('regex:scheme_intent', lambda: _is_scheme_intent_query(_PRIME_QUERY), False),
+        # Well-formed id that matches no knowledge base: rejected before any retrieval is billed
+        ('connect:bedrock-agent-runtime', lambda: warm(
+            bedrock_kb.retrieve, knowledgeBaseId='PRIMEPRIME', retrievalQuery={'text': 'prime'}), True),
+    ], network=network)
+
+
 def lambda_handler(event, context):
     """
     Retrieves crop advisory from Bedrock Knowledge Base.
     Called by orchestrator Lambda via direct invocation.
     Handles operations: get_crop_advisory, get_pest_alert, get_irrigation_advice.
     """
+    if is_priming_event(event):
+        return prime(network=wants_network(event))
     try:
         # Support both Bedrock agent format (parameters[]) and
         # orchestrator invocation format (queryStringParameters{})
@@ -337,8 +388,11 @@ def lambda_handler(event, context):
             return error_response(msg, 500)
 
         # Query Knowledge Base with natural language query
+        # Set by the orchestrator (epoch ms) — absent for direct API Gateway calls.
+        deadline_epoch_ms = event.get('deadline_epoch_ms')
         response = _kb_retrieve_with_retry(
             bedrock_kb,
+            deadline_epoch_ms=deadline_epoch_ms,
             knowledgeBaseId=KB_ID,
             retrievalQuery={'text': search_query},
             retrievalConfiguration={
@@ -359,7 +413,12 @@ def lambda_handler(event, context):
         fallback_query = ''
 
         # If quality is weak, retry with a broader recall-oriented query.
-        if ENABLE_KB_QUERY_REWRITE and quality['good_count'] < KB_MIN_GOOD_CHUNKS:
+        _remaining = _budget_remaining(deadline_epoch_ms)
+        if (
+            ENABLE_KB_QUERY_REWRITE
+            and quality['good_count'] < KB_MIN_GOOD_CHUNKS
+            and (_remaining is None or _remaining > 2.0)
+        ):
             used_fallback_query = True
             fallback_query = _rewrite_search_query_for_recall(search_query, query_type, crop)
             logger.info(
@@ -370,6 +429,7 @@ def lambda_handler(event, context):
             )
             fallback_response = _kb_retrieve_with_retry(
                 bedrock_kb,
+                deadline_epoch_ms=deadline_epoch_ms,
                 knowledgeBaseId=KB_ID,
                 retrievalQuery={'text': fallback_query},
                 retrievalConfiguration={
@@ -424,3 +484,6 @@ def lambda_handler(event, context):
         logger.error(f"Crop advisory error: {str(e)}", exc_info=True)
         # Security: never expose internal error details
         return error_response("Crop advisory service is temporarily unavailable. Please try again.", 500)
+
+
+register_init_hooks(prime)
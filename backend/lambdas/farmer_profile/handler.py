@@ -6,7 +6,6 @@
 # See: Detailed_Implementation_Guide.md Section 11
 
 import json
-import boto3
 import os
 import logging
 import secrets
@@ -15,8 +14,9 @@ import time
 from datetime import datetime, UTC
 from decimal import Decimal
 from boto3.dynamodb.conditions import Attr
-from botocore.config import Config
 from utils.cors_helper import get_cors_headers, handle_cors_preflight
+from utils.aws_clients import lazy_client, lazy_table, get_client, get_table
+from utils.priming import is_priming_event, wants_network, run_priming, warm, register_init_hooks
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -153,14 +153,12 @@ def convert_decimals(obj):
     return obj
 
 
-ENABLE_CONNECTION_POOLING = os.environ.get('ENABLE_CONNECTION_POOLING', 'false').lower() == 'true'
 ENABLE_FARMER_ID_VALIDATION = os.environ.get('ENABLE_FARMER_ID_VALIDATION', 'false').lower() == 'true'
-_POOL_CONFIG = Config(max_pool_connections=25) if ENABLE_CONNECTION_POOLING else None
 
-dynamodb = boto3.resource('dynamodb', config=_POOL_CONFIG) if _POOL_CONFIG else boto3.resource('dynamodb')
-cognito = boto3.client('cognito-idp', region_name=os.environ.get('AWS_REGION', 'ap-south-1'), config=_POOL_CONFIG) if _POOL_CONFIG else boto3.client('cognito-idp', region_name=os.environ.get('AWS_REGION', 'ap-south-1'))
-table = dynamodb.Table(os.environ.get('DYNAMODB_PROFILES_TABLE', 'farmer_profiles'))
-otp_table = dynamodb.Table(os.environ.get('DYNAMODB_OTP_TABLE', 'otp_codes'))
+# Built on first use (utils/aws_clients.py) — a GET /profile never touches Cognito
+cognito = lazy_client('cognito-idp', region_name=os.environ.get('AWS_REGION', 'ap-south-1'))
+table = lazy_table(os.environ.get('DYNAMODB_PROFILES_TABLE', 'farmer_profiles'))
+otp_table = lazy_table(os.environ.get('DYNAMODB_OTP_TABLE', 'otp_codes'))
 
 COGNITO_USER_POOL_ID = os.environ.get('COGNITO_USER_POOL_ID', '')
 STAGE = os.environ.get('STAGE', 'prod')
@@ -189,8 +187,22 @@ OTP_EXPIRY_SECONDS = 300  # 5 minutes
 ENABLE_DEMO_OTP = os.environ.get('ENABLE_DEMO_OTP', 'false').lower() == 'true'
 
 
+def prime(network=True):
+    """Warm-up for the priming event / init hooks (utils/priming.py)."""
+    profiles_table = os.environ.get('DYNAMODB_PROFILES_TABLE', 'farmer_profiles')
+    return run_priming('farmer_profile', [
+        ('client:cognito-idp', lambda: bool(get_client('cognito-idp', region_name=os.environ.get('AWS_REGION', 'ap-south-1'))), False),
+        ('table:profiles', lambda: bool(get_table(profiles_table)), False),
+        ('table:otp', lambda: bool(get_table(os.environ.get('DYNAMODB_OTP_TABLE', 'otp_codes'))), False),
+        ('regex:validation', lambda: (_validate_phone('9876543210')[0], bool(FARMER_ID_PATTERN.match('ph_9876543210'))), False),
+        ('connect:dynamodb', lambda: warm(table.get_item, Key={'farmer_id': 'prime'}), True),
+    ], network=network)
+
+
 def lambda_handler(event, context):
     """Handle profile CRUD and OTP send/verify."""
+    if is_priming_event(event):
+        return prime(network=wants_network(event))
     try:
         method = event.get('httpMethod', 'GET')
         path = event.get('path', '')
@@ -706,3 +718,6 @@ def reset_pin(body):
             'headers': CORS_HEADERS,
             'body': json.dumps(_error_body('Failed to reset PIN. Please try again.'))
         }
+
+
+register_init_hooks(prime)
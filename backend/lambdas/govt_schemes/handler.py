@@ -10,6 +10,7 @@ import re
 import os
 from utils.response_helper import success_response, error_response
 from utils.cors_helper import handle_cors_preflight
+from utils.priming import is_priming_event, wants_network, run_priming, register_init_hooks
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -205,8 +206,19 @@ def _filter_state_schemes(farmer_state):
     return {}
 
 
+def prime(network=True):
+    """Warm-up for the priming event / init hooks (utils/priming.py). No AWS calls here."""
+    return run_priming('govt_schemes', [
+        ('data:schemes', lambda: len(SCHEMES), False),
+        ('data:state_schemes', lambda: len(_filter_state_schemes(_sanitize_input('Tamil Nadu'))), False),
+        ('json:schemes', lambda: len(json.dumps(SCHEMES, ensure_ascii=False)), False),
+    ], network=network)
+
+
 def lambda_handler(event, context):
     """Returns government scheme information."""
+    if is_priming_event(event):
+        return prime(network=wants_network(event))
     try:
         # Handle CORS preflight
         if event.get('httpMethod') == 'OPTIONS':
@@ -253,3 +265,6 @@ def lambda_handler(event, context):
         logger.error(f"Schemes error: {str(e)}", exc_info=True)
         # Security: never expose internal error details
         return error_response("Government schemes service is temporarily unavailable. Please try again.", 500)
+
+
+register_init_hooks(prime)
@@ -0,0 +1,119 @@
+# backend/lambdas/govt_schemes/utils/priming.py
+# Warm-up ("priming") events and init hooks shared by every Lambda entry point
+# Owner: Manoj RS
+#
+# Cold starts hit hardest in the morning rush, when the first farmer on each new
+# container pays for client construction, the first TLS handshakes and the
+# first pass through every regex table. A priming event does that work ahead of
+# time and returns without touching the request path:
+#
+#   {"prime": true}                   full priming (the scheduler sends this)
+#   {"prime": true, "network": false} skip the steps that open connections
+#
+# Each handler lists its own steps as (name, fn, needs_network) and checks
+# is_priming_event() first thing in lambda_handler. Steps run in order, are
+# timed, and never raise: a failed step is reported and the rest still run.
+#
+# Connection steps go through warm(): it makes one small request on the shared
+# client so botocore keeps the TLS connection in its pool for the next real
+# request. A request the service REJECTS (unknown model id, missing item,
+# DryRun) opens the same connection without doing billable work, so a
+# ClientError counts as warmed.
+#
+# register_init_hooks(prime) is called once at the end of each handler module:
+#   - Lambda SnapStart: prime(network=False) runs before the snapshot is taken
+#     (snapshot_restore_py ships in the SnapStart runtime). Connections are not
+#     opened there; they would not survive the restore.
+#   - PRIME_ON_INIT=true (default OFF): full priming during init, for functions
+#     with provisioned concurrency, whose init runs before traffic arrives.
+#     Skipped during a SnapStart snapshot init (the hook above covers it).
+
+import logging
+import os
+import socket
+import ssl
+import time
+
+from botocore.exceptions import ClientError
+
+from utils.aws_clients import built_clients
+
+logger = logging.getLogger()
+
+PRIME_ON_INIT = os.environ.get('PRIME_ON_INIT', 'false').lower() == 'true'
+
+_prime_counts = {}   # function name → priming runs in this container
+
+
+def is_priming_event(event):
+    return isinstance(event, dict) and event.get('prime') is True
+
+
+def wants_network(event):
+    return event.get('network', True) is not False
+
+
+def warm(call, *args, **kwargs):
+    """One request on a shared client. A service-side rejection still leaves the connection pooled."""
+    try:
+        call(*args, **kwargs)
+        return 'ok'
+    except ClientError as e:
+        return e.response.get('Error', {}).get('Code', 'rejected')
+
+
+def warm_https(host, port=443, timeout=3.0):
+    """DNS lookup, TCP connect and TLS handshake (for endpoints called with urllib)."""
+    context = ssl.create_default_context()
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        with context.wrap_socket(sock, server_hostname=host) as tls:
+            return tls.version()
+
+
+def run_priming(function_name, steps, network=True):
+    """Run (name, fn, needs_network) steps in order; returns the priming report."""
+    run = _prime_counts[function_name] = _prime_counts.get(function_name, 0) + 1
+    start = time.perf_counter()
+    timings = {}
+    results = {}
+    errors = {}
+    for name, fn, needs_network in steps:
+        if needs_network and not network:
+            continue
+        step_start = time.perf_counter()
+        try:
+            result = fn()
+            if result is not None:
+                results[name] = result
+        except Exception as e:
+            errors[name] = str(e)[:200]
+        timings[name] = round((time.perf_counter() - step_start) * 1000.0, 1)
+    total_ms = round((time.perf_counter() - start) * 1000.0, 1)
+    logger.info(f"[prime] {function_name}: {total_ms}ms over {len(timings)} steps "
+                f"(run #{run}, network={network}, errors={sorted(errors)})")
+    return {
+        'primed': True,
+        'function': function_name,
+        'prime_ms': total_ms,
+        'first_prime': run == 1,
+        'network': network,
+        'steps_ms': timings,
+        'results': results,
+        'errors': errors,
+        'clients': [key for key, _ in built_clients()],
+    }
+
+
+def register_init_hooks(prime):
+    """Hook prime(network=...) into SnapStart and, with PRIME_ON_INIT, into init."""
+    try:
+        from snapshot_restore_py import register_before_snapshot
+    except ImportError:
+        register_before_snapshot = None
+    if register_before_snapshot is not None:
+        register_before_snapshot(prime, network=False)
+    if PRIME_ON_INIT and os.environ.get('AWS_LAMBDA_INITIALIZATION_TYPE') != 'snap-start':
+        try:
+            prime(network=True)
+        except Exception as e:
+            logger.warning(f"Init priming failed (non-fatal): {e}")
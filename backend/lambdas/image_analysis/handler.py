@@ -5,21 +5,25 @@
 # See: Detailed_Implementation_Guide.md Section 17
 
 import json
-import boto3
 import logging
 import re
 import base64
 import os
-from botocore.config import Config
 from utils.cors_helper import get_cors_headers, handle_cors_preflight
+from utils.bedrock_limiter import limited_call, is_throttle
+from utils.aws_clients import lazy_client, get_client
+from utils.priming import is_priming_event, wants_network, run_priming, warm, register_init_hooks
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-ENABLE_CONNECTION_POOLING = os.environ.get('ENABLE_CONNECTION_POOLING', 'false').lower() == 'true'
-_POOL_CONFIG = Config(max_pool_connections=25) if ENABLE_CONNECTION_POOLING else None
-bedrock = boto3.client('bedrock-runtime', config=_POOL_CONFIG) if _POOL_CONFIG else boto3.client('bedrock-runtime')
-translate_client = boto3.client('translate', config=_POOL_CONFIG) if _POOL_CONFIG else boto3.client('translate')
+# Built on first use (utils/aws_clients.py)
+bedrock = lazy_client('bedrock-runtime')
+translate_client = lazy_client('translate')
+
+# Adaptive (AIMD) client-side limiter in front of converse(); shares the Vision model's quota
+# with the orchestrator's Pro calls, so throttles are paced instead of retried blindly.
+ENABLE_BEDROCK_LIMITER = os.environ.get('ENABLE_BEDROCK_LIMITER', 'false').lower() == 'true'
 
 # CORS headers — MUST be on EVERY response (200, 400, 500)
 ALLOWED_ORIGIN = os.environ.get('ALLOWED_ORIGIN', 'https://d80ytlzsrax1n.cloudfront.net')
@@ -113,11 +117,29 @@ def make_response(status_code, body_dict):
     }
 
 
+def prime(network=True):
+    """Warm-up for the priming event / init hooks (utils/priming.py)."""
+    return run_priming('image_analysis', [
+        ('client:bedrock-runtime', lambda: bool(get_client('bedrock-runtime')), False),
+        ('client:translate', lambda: bool(get_client('translate')), False),
+        ('regex:input', lambda: _check_prompt_injection(_sanitize_text('tomato leaf curl')), False),
+        ('regex:output', lambda: len(_sanitize_output('Leaf blight. Contact 1234 5678 9012.')), False),
+        # Unknown model id: rejected by Bedrock before any inference is billed
+        ('connect:bedrock-runtime', lambda: warm(
+            bedrock.converse, modelId='prime', messages=[{'role': 'user', 'content': [{'text': 'ok'}]}]), True),
+        ('connect:translate', lambda: warm(
+            translate_client.translate_text, Text='ok', SourceLanguageCode='en', TargetLanguageCode='hi'), True),
+    ], network=network)
+
+
 def lambda_handler(event, context):
     """
     Analyzes crop disease image using Amazon Nova Pro Vision.
     Supports: JPEG, PNG, GIF, WebP  |  Max 4 MB  |  Auto-translates response.
     """
+    if is_priming_event(event):
+        return prime(network=wants_network(event))
+
     # Handle CORS preflight
     if event.get('httpMethod') == 'OPTIONS':
         if ENABLE_UNIFIED_CORS:
@@ -226,7 +248,8 @@ def lambda_handler(event, context):
         analysis = None
         for attempt in range(MAX_RETRIES):
             try:
-                response = bedrock.converse(
+                converse = (lambda **kw: limited_call(VISION_MODEL, bedrock.converse, **kw)) if ENABLE_BEDROCK_LIMITER else bedrock.converse
+                response = converse(
                     modelId=VISION_MODEL,
                     system=[{"text": system_prompt}],
                     messages=[
@@ -250,6 +273,8 @@ def lambda_handler(event, context):
             except Exception as bedrock_err:
                 logger.warning(f"Bedrock attempt {attempt + 1} failed: {str(bedrock_err)}")
                 if attempt < MAX_RETRIES - 1:
+                    if ENABLE_BEDROCK_LIMITER and is_throttle(bedrock_err):
+                        continue  # limiter lowered the rate; the retry queues on its bucket
                     import time
                     time.sleep(0.5 * (attempt + 1))
                 else:
@@ -294,3 +319,6 @@ def lambda_handler(event, context):
         return make_response(500, {
             'error': 'Analysis failed. Please try again or consult your local KVK.'
         })
+
+
+register_init_hooks(prime)
@@ -5,24 +5,24 @@
 # See: Detailed_Implementation_Guide.md Section 12
 
 import json
-import boto3
 import base64
 import uuid
 import time
 import os
 import logging
-from botocore.config import Config
 from utils.response_helper import success_response, error_response
 from utils.cors_helper import handle_cors_preflight
+from utils.aws_clients import lazy_client, get_client
+from utils.priming import is_priming_event, wants_network, run_priming, warm, register_init_hooks
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-ENABLE_CONNECTION_POOLING = os.environ.get('ENABLE_CONNECTION_POOLING', 'false').lower() == 'true'
 ENABLE_UNIFIED_CORS = os.environ.get('ENABLE_UNIFIED_CORS', 'false').lower() == 'true'
-_POOL_CONFIG = Config(max_pool_connections=25) if ENABLE_CONNECTION_POOLING else None
-transcribe = boto3.client('transcribe', config=_POOL_CONFIG) if _POOL_CONFIG else boto3.client('transcribe')
-s3 = boto3.client('s3', config=_POOL_CONFIG) if _POOL_CONFIG else boto3.client('s3')
+
+# Built on first use (utils/aws_clients.py)
+transcribe = lazy_client('transcribe')
+s3 = lazy_client('s3')
 
 BUCKET = os.environ.get('S3_KNOWLEDGE_BUCKET', 'smart-rural-ai-knowledge-base')
 
@@ -53,11 +53,26 @@ def _generate_job_id():
     return f"voice-{uuid.uuid4().hex}"
 
 
+def prime(network=True):
+    """Warm-up for the priming event / init hooks (utils/priming.py)."""
+    return run_priming('transcribe_speech', [
+        ('client:transcribe', lambda: bool(get_client('transcribe')), False),
+        ('client:s3', lambda: bool(get_client('s3')), False),
+        ('data:language_map', lambda: len(LANGUAGE_MAP), False),
+        # Missing job / object: both rejected, both connections stay pooled
+        ('connect:transcribe', lambda: warm(transcribe.get_transcription_job, TranscriptionJobName='prime'), True),
+        ('connect:s3', lambda: warm(s3.head_object, Bucket=BUCKET, Key='prime'), True),
+    ], network=network)
+
+
 def lambda_handler(event, context):
     """
     Receives base64-encoded audio, sends to Amazon Transcribe,
     returns transcribed text. Used as fallback for non-Chrome browsers.
     """
+    if is_priming_event(event):
+        return prime(network=wants_network(event))
+
     # Handle CORS preflight
     if event.get('httpMethod') == 'OPTIONS':
         if ENABLE_UNIFIED_CORS:
@@ -166,3 +181,6 @@ def _cleanup(s3_key, job_id):
         s3.delete_object(Bucket=BUCKET, Key=f'transcriptions/{job_id}.json')
     except Exception:
         pass
+
+
+register_init_hooks(prime)
@@ -9,18 +9,20 @@ import logging
 import time as _time
 from datetime import datetime, UTC
 
+from utils.aws_clients import lazy_table
+
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-dynamodb = boto3.resource('dynamodb')
 PROFILES_TABLE = os.environ.get('DYNAMODB_PROFILES_TABLE', 'farmer_profiles')
 SESSIONS_TABLE = os.environ.get('DYNAMODB_SESSIONS_TABLE', 'chat_sessions')
 
 # TTL: chat messages auto-expire after this many days (DynamoDB TTL attribute = 'ttl')
 CHAT_TTL_DAYS = int(os.environ.get('CHAT_TTL_DAYS', '30'))
 
-profiles_table = dynamodb.Table(PROFILES_TABLE)
-sessions_table = dynamodb.Table(SESSIONS_TABLE)
+# Built on first use on the shared dynamodb resource (utils/aws_clients.py)
+profiles_table = lazy_table(PROFILES_TABLE)
+sessions_table = lazy_table(SESSIONS_TABLE)
 
 
 def get_farmer_profile(farmer_id):
@@ -3,14 +3,16 @@
 # Owner: Manoj RS
 # See: Detailed_Implementation_Guide.md Section 11
 
-import boto3
 import os
 import uuid
 import io
 import re
 
-polly = boto3.client('polly')
-s3 = boto3.client('s3')
+from utils.aws_clients import lazy_client
+
+# Built on first use (utils/aws_clients.py)
+polly = lazy_client('polly')
+s3 = lazy_client('s3')
 
 S3_BUCKET = os.environ.get('S3_KNOWLEDGE_BUCKET', 'smart-rural-ai-knowledge-base')
 POLLY_FORCE_HINDI_FALLBACK = os.environ.get('POLLY_FORCE_HINDI_FALLBACK', 'false').lower() == 'true'
@@ -9,6 +9,7 @@ import os
 import logging
 import re
 import socket
+import time
 import base64
 import urllib.request
 import urllib.error
@@ -16,6 +17,7 @@ import urllib.parse
 import boto3
 from utils.response_helper import success_response, error_response
 from utils.cors_helper import handle_cors_preflight
+from utils.priming import is_priming_event, wants_network, run_priming, warm_https, register_init_hooks
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -283,6 +285,21 @@ LOCATION_ALIASES = {
 }
 
 
+def _http_timeout(deadline_epoch_ms, default=8):
+    """Socket timeout capped at the orchestrator's propagated request deadline."""
+    if not deadline_epoch_ms:
+        return default
+    remaining = int(deadline_epoch_ms) / 1000.0 - time.time()
+    return max(0.5, min(default, remaining))
+
+
+def _budget_left(deadline_epoch_ms, need_sec=1.0):
+    """True when there is no deadline or at least need_sec of it remains (worth a retry)."""
+    if not deadline_epoch_ms:
+        return True
+    return int(deadline_epoch_ms) / 1000.0 - time.time() >= need_sec
+
+
 def _http_get_json(url, timeout=8):
     """HTTP GET JSON using stdlib only (no third-party dependency)."""
     req = urllib.request.Request(url, headers={'User-Agent': 'smart-rural-ai-weather/1.0'})
@@ -380,15 +397,31 @@ def _normalize_cod(payload):
     return None
 
 
+def prime(network=True):
+    """Warm-up for the priming event / init hooks (utils/priming.py).
+    urllib keeps no connection pool, so the OpenWeather step warms DNS and the
+    TLS handshake path; the API key lookup (Secrets Manager) is cached for real."""
+    return run_priming('weather_lookup', [
+        ('data:location_aliases', lambda: len(LOCATION_ALIASES), False),
+        ('regex:location', lambda: _get_location_candidates(clean_location(_validate_location('Coimbatore, TN')[0])), False),
+        ('secret:openweather_key', lambda: bool(_resolve_openweather_api_key()), bool(OPENWEATHER_API_KEY_SECRET_ARN)),
+        ('connect:openweather', lambda: warm_https(urllib.parse.urlsplit(_openweather_base_url()).hostname), True),
+    ], network=network)
+
+
 def lambda_handler(event, context):
     """
     Fetches current weather + 5-day forecast for a given location.
     Called by orchestrator Lambda or directly via API Gateway.
     Response shape matches API contract in Section 2b.
     """
+    if is_priming_event(event):
+        return prime(network=wants_network(event))
     try:
         headers = event.get('headers') or {}
         origin = headers.get('origin') or headers.get('Origin')
+        # Set by the orchestrator (epoch ms) — absent for direct API Gateway calls.
+        deadline_epoch_ms = event.get('deadline_epoch_ms')
 
         # CORS preflight: return immediately (do not run weather logic)
         if event.get('httpMethod') == 'OPTIONS':
@@ -463,7 +496,7 @@ def lambda_handler(event, context):
             for attempt in range(max_retries):
                 try:
                     logger.info(f"Fetching current weather for {candidate} (attempt {attempt + 1}/{max_retries})")
-                    current = _http_get_json(current_url, timeout=8)
+                    current = _http_get_json(current_url, timeout=_http_timeout(deadline_epoch_ms))
                     current_cod = _normalize_cod(current)
 
                     if current_cod == 200:
@@ -471,7 +504,7 @@ def lambda_handler(event, context):
                         break
                     elif current_cod == 429:
                         logger.warning(f"Rate limit hit for {candidate}")
-                        if attempt < max_retries - 1:
+                        if attempt < max_retries - 1 and _budget_left(deadline_epoch_ms, 2.0):
                             import time
                             time.sleep(1)
                             continue
@@ -480,7 +513,7 @@ def lambda_handler(event, context):
                         break
                 except (TimeoutError, socket.timeout, urllib.error.URLError):
                     logger.warning(f"Timeout on attempt {attempt + 1} for {candidate}")
-                    if attempt == max_retries - 1:
+                    if attempt == max_retries - 1 or not _budget_left(deadline_epoch_ms):
                         raise
                 except Exception as e:
                     logger.error(f"Request error on attempt {attempt + 1} for {candidate}: {str(e)}")
@@ -501,7 +534,7 @@ def lambda_handler(event, context):
             })
             coord_url = f"{_openweather_base_url()}/weather?{coord_params}"
             try:
-                coord_data = _http_get_json(coord_url, timeout=8)
+                coord_data = _http_get_json(coord_url, timeout=_http_timeout(deadline_epoch_ms))
                 if _normalize_cod(coord_data) == 200:
                     current = coord_data
                     logger.info(f"Coordinate fallback succeeded for {location}")
@@ -558,15 +591,19 @@ def lambda_handler(event, context):
             forecast_url = f"{_openweather_base_url()}/forecast?{forecast_params}"
         
         forecast_raw = None
-        for attempt in range(max_retries):
+        if not _budget_left(deadline_epoch_ms):
+            # Deadline nearly spent — current conditions alone are still a useful answer.
+            logger.warning(f"Skipping forecast for {location}: request deadline nearly reached")
+            forecast_raw = {'list': []}
+        for attempt in range(0 if forecast_raw is not None else max_retries):
             try:
                 logger.info(f"Fetching forecast for {location} (attempt {attempt + 1}/{max_retries})")
-                forecast_raw = _http_get_json(forecast_url, timeout=8)
+                forecast_raw = _http_get_json(forecast_url, timeout=_http_timeout(deadline_epoch_ms))
                 if _normalize_cod(forecast_raw) == 200:
                     break
             except (TimeoutError, socket.timeout, urllib.error.URLError):
                 logger.warning(f"Forecast timeout on attempt {attempt + 1}")
-                if attempt == max_retries - 1:
+                if attempt == max_retries - 1 or not _budget_left(deadline_epoch_ms):
                     # Continue without forecast if it fails
                     forecast_raw = {'list': []}
                     break
@@ -655,3 +692,6 @@ def lambda_handler(event, context):
         logger.error(f"Weather error: {str(e)}", exc_info=True)
         # Security: never expose internal error details to client
         return error_response("Weather service is temporarily unavailable. Please try again.", 500)
+
+
+register_init_hooks(prime)
@@ -3,9 +3,9 @@
 # Owner: Manoj RS
 # See: Detailed_Implementation_Guide.md Section 12
 
-import boto3
+from utils.aws_clients import lazy_client
 
-translate = boto3.client('translate')
+translate = lazy_client('translate')   # built on first translate call (utils/aws_clients.py)
 
 # Supported languages (must match frontend config.js)
 SUPPORTED_LANGUAGES = ["en", "hi", "ta", "te", "kn", "ml", "mr", "bn", "gu", "pa", "or", "as", "ur"]
@@ -66,7 +66,7 @@ function ChatMessage({ message, onUpdateAudioUrl }) {
                 if (message.audioKey && !refreshingRef.current) {
                     refreshingRef.current = true;
                     try {
-                        const res = await apiFetch(`/chat`, {
+                        const res = await apiFetch(`/chat/history`, {
                             method: 'POST',
                             headers: { 'Content-Type': 'application/json' },
                             body: JSON.stringify({ refresh_audio_key: message.audioKey })
@@ -70,7 +70,7 @@ function normalizeMessagesWithTimestamps(messages) {
 /* ── DynamoDB sync (cross-device, per-farmer) ──────────────── */
 async function dbListSessions(farmerId) {
     try {
-        const res = await apiFetch('/chat', {
+        const res = await apiFetch('/chat/history', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({ action: 'list_sessions', farmer_id: farmerId }),
@@ -82,7 +82,7 @@ async function dbListSessions(farmerId) {
 
 async function dbGetSessionMessages(farmerId, sessionId) {
     try {
-        const res = await apiFetch('/chat', {
+        const res = await apiFetch('/chat/history', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({ action: 'get_session', farmer_id: farmerId, session_id: sessionId }),
@@ -94,7 +94,7 @@ async function dbGetSessionMessages(farmerId, sessionId) {
 
 async function dbSaveSession(farmerId, sessionId, messages, preview) {
     try {
-        await apiFetch('/chat', {
+        await apiFetch('/chat/history', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({ action: 'save_session', farmer_id: farmerId, session_id: sessionId, messages, preview }),
@@ -104,7 +104,7 @@ async function dbSaveSession(farmerId, sessionId, messages, preview) {
 
 async function dbDeleteSession(farmerId, sessionId) {
     try {
-        const res = await apiFetch('/chat', {
+        const res = await apiFetch('/chat/history', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({ action: 'delete_session', farmer_id: farmerId, session_id: sessionId }),
@@ -118,7 +118,7 @@ async function dbDeleteSession(farmerId, sessionId) {
 
 async function dbRenameSession(farmerId, sessionId, title) {
     try {
-        await apiFetch('/chat', {
+        await apiFetch('/chat/history', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({ action: 'rename_session', farmer_id: farmerId, session_id: sessionId, title }),
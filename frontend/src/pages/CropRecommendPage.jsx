@@ -279,7 +279,7 @@ Format clearly with numbered recommendations. Include practical advice specific
                             onError={async (e) => {
                                 if (result.audioKey) {
                                     try {
-                                        const res = await apiFetch(`/chat`, {
+                                        const res = await apiFetch(`/chat/history`, {
                                             method: 'POST',
                                             headers: { 'Content-Type': 'application/json' },
                                             body: JSON.stringify({ refresh_audio_key: result.audioKey })
@@ -357,7 +357,7 @@ Be practical and specific to Indian farming conditions. Use bullet points and or
                             onError={async (e) => {
                                 if (result.audioKey) {
                                     try {
-                                        const res = await apiFetch(`/chat`, {
+                                        const res = await apiFetch(`/chat/history`, {
                                             method: 'POST',
                                             headers: { 'Content-Type': 'application/json' },
                                             body: JSON.stringify({ refresh_audio_key: result.audioKey })
@@ -451,7 +451,7 @@ function PricePage() {
                             onError={async (e) => {
                                 if (aiAudioKey) {
                                     try {
-                                        const res = await apiFetch(`/chat`, {
+                                        const res = await apiFetch(`/chat/history`, {
                                             method: 'POST',
                                             headers: { 'Content-Type': 'application/json' },
                                             body: JSON.stringify({ refresh_audio_key: aiAudioKey })
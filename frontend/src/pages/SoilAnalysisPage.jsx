@@ -341,7 +341,7 @@ Keep advice practical for Indian farmers. Use bullet points.`;
                             onError={async (e) => {
                                 if (result.audioKey) {
                                     try {
-                                        const res = await apiFetch(`/chat`, {
+                                        const res = await apiFetch(`/chat/history`, {
                                             method: 'POST',
                                             headers: { 'Content-Type': 'application/json' },
                                             body: JSON.stringify({ refresh_audio_key: result.audioKey })